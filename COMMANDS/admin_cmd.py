@@ -67,6 +67,19 @@ def reload_firebase_cache_command(app, message):
                 safe_send_message_with_auto_delete(message.chat.id, error_msg, delete_after_seconds=10)
         return
     
+    # Incremental sync: merge only what changed since the last sync into the live cache.
+    # "/reload_cache full" forces a full re-download.
+    force_full = "full" in (getattr(message, "text", "") or "").split()[1:]
+    if getattr(Config, 'FIREBASE_INCREMENTAL_SYNC', False) and not force_full:
+        from DATABASE.cache_db import sync_firebase_cache
+        if sync_firebase_cache():
+            if is_fake_message:
+                send_to_logger(message, "✅ Firebase cache synced incrementally")
+            else:
+                safe_send_message_with_auto_delete(message.chat.id, "✅ Firebase cache synced incrementally", delete_after_seconds=10)
+            return
+        logger.warning("Incremental Firebase sync failed, falling back to full dump download")
+
     try:
         # 1) Download fresh dump via external script path
         script_path = getattr(Config, "DOWNLOAD_FIREBASE_SCRIPT_PATH", "DATABASE/download_firebase.py")
@@ -767,7 +780,7 @@ def uncache_command(app, message):
     Usage: /uncache <URL>
     """
     # Lazy imports to avoid cycles
-    from DATABASE.cache_db import get_url_hash
+    from DATABASE.cache_db import get_url_hash, invalidate_video_cache_index
     from DATABASE.firebase_init import db_child_by_path
 
     user_id = message.chat.id
@@ -786,6 +799,7 @@ def uncache_command(app, message):
         url_hash = get_url_hash(normalized_url)
         video_cache_path = f"{Config.VIDEO_CACHE_DB_PATH}/{url_hash}"
         db_child_by_path(db, video_cache_path).remove()
+        invalidate_video_cache_index(url_hash)
         removed_any = True
         # Clear cache by image posts (for /img)
         try:
@@ -817,6 +831,7 @@ def uncache_command(app, message):
                 norm = normalize_url_for_cache(variant)
                 h = get_url_hash(norm)
                 db_child_by_path(db, f"{Config.VIDEO_CACHE_DB_PATH}/{h}").remove()
+                invalidate_video_cache_index(h)
                 db_child_by_path(db, f"{Config.PLAYLIST_CACHE_DB_PATH}/{h}").remove()
         # Update local cache after deletion in local mode
         use_firebase = getattr(Config, 'USE_FIREBASE', True)
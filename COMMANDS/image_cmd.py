@@ -5,6 +5,8 @@ import subprocess
 import tempfile
 import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait as futures_wait
 from pyrogram import filters
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery, ReplyParameters, InputMediaPhoto, InputMediaVideo, InputPaidMediaPhoto, InputPaidMediaVideo
 from pyrogram import enums
@@ -16,6 +18,7 @@ from CONFIG.domains import DomainsConfig
 from HELPERS.app_instance import get_app
 from HELPERS.safe_messeger import safe_send_message, safe_edit_message_text
 from HELPERS.decorators import background_handler
+from HELPERS.download_scheduler import acquire_download_slot
 import HELPERS.safe_messeger as sm
 from DOWN_AND_UP.gallery_dl_hook import (
     get_image_info,
@@ -25,6 +28,7 @@ from DOWN_AND_UP.gallery_dl_hook import (
     download_image_range_cli,
 )
 from HELPERS.filesystem_hlp import create_directory
+from HELPERS.file_watcher import FileWatcher
 from COMMANDS.proxy_cmd import is_proxy_enabled
 from CONFIG.limits import LimitsConfig
 from CONFIG.config import Config
@@ -44,15 +48,50 @@ def _get_file_mb(file_path):
     except Exception:
         return 0.0
 
-def _get_video_duration_seconds(video_path):
+# ffprobe output per file version: the same video is probed for its thumbnail,
+# its cover and every send path
+_probe_cache = OrderedDict()
+_probe_cache_lock = threading.Lock()
+_PROBE_CACHE_MAX = 512
+
+def _file_version(path):
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+def _ffprobe_json(video_path):
+    """Size of the first video stream and the duration, as parsed ffprobe JSON (cached until the file changes)."""
+    try:
+        key = _file_version(video_path)
+    except OSError:
+        key = None
+    if key is not None:
+        with _probe_cache_lock:
+            data = _probe_cache.get(key)
+            if data is not None:
+                _probe_cache.move_to_end(key)
+                return data
     try:
-        # Minimal ffprobe to get duration
         result = subprocess.run([
-            'ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'format=duration', '-of', 'json', video_path
+            'ffprobe', '-v', 'error',
+            '-select_streams', 'v:0',
+            '-show_entries', 'stream=width,height',
+            '-show_entries', 'format=duration',
+            '-of', 'json',
+            video_path
         ], capture_output=True, text=True, timeout=10)
-        if result.returncode != 0:
-            return 0.0
-        data = json.loads(result.stdout or '{}')
+        data = json.loads(result.stdout or '{}') if result.returncode == 0 else {}
+    except Exception:
+        return {}
+    if key is not None:
+        with _probe_cache_lock:
+            _probe_cache[key] = data
+            while len(_probe_cache) > _PROBE_CACHE_MAX:
+                _probe_cache.popitem(last=False)
+    return data
+
+def _get_video_duration_seconds(video_path):
+    try:
+        data = _ffprobe_json(video_path)
         dur = float(data.get('format', {}).get('duration', 0.0))
         return dur if dur and dur > 0 else 0.0
     except Exception:
@@ -71,15 +110,7 @@ def _probe_video_info(video_path):
     """Return dict with width,height,duration (seconds, int) using ffprobe."""
     info = {"width": None, "height": None, "duration": None}
     try:
-        result = subprocess.run([
-            'ffprobe', '-v', 'error',
-            '-select_streams', 'v:0',
-            '-show_entries', 'stream=width,height',
-            '-show_entries', 'format=duration',
-            '-of', 'json',
-            video_path
-        ], capture_output=True, text=True, timeout=10)
-        data = json.loads(result.stdout or '{}')
+        data = _ffprobe_json(video_path)
         # Duration
         dur = None
         try:
@@ -144,9 +175,12 @@ def ensure_paid_cover_embedded(video_path, existing_thumb=None):
     except Exception:
         return None
 
+# Videos whose cover is already embedded (path -> file version after embedding)
+_embedded_covers = OrderedDict()
+
 def ensure_paid_cover_embedded(video_path, existing_thumb=None):
     """Ensure a small JPEG cover (~<=320x320) preserving aspect ratio (padding) for paid media.
-    For videos >60s or >10MB, also embed the cover into the video file itself."""
+    For videos >60s or >10MB, also embed the cover into the video file itself (once per file)."""
     try:
         if not _should_generate_cover(video_path):
             return None
@@ -161,7 +195,7 @@ def ensure_paid_cover_embedded(video_path, existing_thumb=None):
             duration = _get_video_duration_seconds(video_path)
             size_mb = _get_file_mb(video_path)
             
-            if (duration >= 60.0) or (size_mb >= 10.0):
+            if ((duration >= 60.0) or (size_mb >= 10.0)) and _embedded_covers.get(os.path.abspath(video_path)) != _file_version(video_path):
                 # Create embedded version
                 base_dir = os.path.dirname(video_path)
                 base_name = os.path.splitext(os.path.basename(video_path))[0]
@@ -182,6 +216,10 @@ def ensure_paid_cover_embedded(video_path, existing_thumb=None):
                 if os.path.exists(embedded_path) and os.path.getsize(embedded_path) > 0:
                     # Replace original with embedded version
                     os.replace(embedded_path, video_path)
+                    with _probe_cache_lock:
+                        _embedded_covers[os.path.abspath(video_path)] = _file_version(video_path)
+                        while len(_embedded_covers) > _PROBE_CACHE_MAX:
+                            _embedded_covers.popitem(last=False)
                     logger.info(LoggerMsg.IMG_PAID_EMBEDDED_COVER_LOG_MSG.format(video_path=video_path))
         except Exception as e:
             logger.warning(LoggerMsg.IMG_PAID_FAILED_EMBED_COVER_LOG_MSG.format(video_path=video_path, e=e))
@@ -634,6 +672,29 @@ def is_image_url(url):
     
     return False
 
+# Extension of the file convert_file_to_telegram_format writes for each input extension
+_CONVERTED_SUFFIXES = {
+    '.webp': '.jpg', '.bmp': '.jpg', '.tiff': '.jpg',
+    '.webm': '.mp4', '.avi': '.mp4', '.mov': '.mp4', '.mkv': '.mp4', '.flv': '.mp4', '.m4v': '.mp4',
+    '.mp4': '._fast.mp4',
+}
+
+def _converted_path(file_path):
+    """Path convert_file_to_telegram_format writes for this file (None if the file is sent as is)."""
+    suffix = _CONVERTED_SUFFIXES.get(os.path.splitext(file_path)[1].lower())
+    if not suffix:
+        return None
+    return os.path.join(os.path.dirname(file_path), os.path.splitext(os.path.basename(file_path))[0] + suffix)
+
+def _conversion_outputs(file_path):
+    """Files _prepare_media_file may write next to a download (up to two conversions)."""
+    outputs = []
+    path = _converted_path(file_path)
+    while path and len(outputs) < 2:
+        outputs.append(path)
+        path = _converted_path(path)
+    return outputs
+
 def convert_file_to_telegram_format(file_path):
     """
     Convert unsupported file formats to Telegram-supported formats
@@ -643,13 +704,11 @@ def convert_file_to_telegram_format(file_path):
         return file_path
     
     file_ext = os.path.splitext(file_path)[1].lower()
-    file_dir = os.path.dirname(file_path)
-    file_name = os.path.splitext(os.path.basename(file_path))[0]
     
     try:
         # Convert WebP images to JPEG
         if file_ext == '.webp':
-            output_path = os.path.join(file_dir, f"{file_name}.jpg")
+            output_path = _converted_path(file_path)
             cmd = [
                 'ffmpeg', '-i', file_path, 
                 '-vf', 'scale=trunc(iw/2)*2:trunc(ih/2)*2',  # Ensure dimensions are divisible by 2
@@ -666,7 +725,7 @@ def convert_file_to_telegram_format(file_path):
         
         # Convert WebM videos to MP4 (add thumbnail to avoid black preview)
         elif file_ext == '.webm':
-            output_path = os.path.join(file_dir, f"{file_name}.mp4")
+            output_path = _converted_path(file_path)
             # We will generate/send thumbnail later during sending
             cmd = [
                 'ffmpeg', '-i', file_path,
@@ -684,7 +743,7 @@ def convert_file_to_telegram_format(file_path):
         
         # Faststart remux for MP4 to improve metadata parsing
         elif file_ext == '.mp4':
-            output_path = os.path.join(file_dir, f"{file_name}._fast.mp4")
+            output_path = _converted_path(file_path)
             cmd = [
                 'ffmpeg', '-i', file_path,
                 '-c:v', 'copy', '-c:a', 'copy',
@@ -701,7 +760,7 @@ def convert_file_to_telegram_format(file_path):
 
         # Convert/Remux other video formats to MP4
         elif file_ext in ['.avi', '.mov', '.mkv', '.flv', '.m4v']:
-            output_path = os.path.join(file_dir, f"{file_name}.mp4")
+            output_path = _converted_path(file_path)
             # Prefer stream copy for .m4v (usually MP4 container variant), else re-encode
             if file_ext == '.m4v':
                 cmd = [
@@ -728,7 +787,7 @@ def convert_file_to_telegram_format(file_path):
         
         # Convert other unsupported image formats to JPEG
         elif file_ext in ['.bmp', '.tiff']:
-            output_path = os.path.join(file_dir, f"{file_name}.jpg")
+            output_path = _converted_path(file_path)
             cmd = [
                 'ffmpeg', '-i', file_path,
                 '-vf', 'scale=trunc(iw/2)*2:trunc(ih/2)*2',  # Ensure dimensions are divisible by 2
@@ -754,6 +813,78 @@ def convert_file_to_telegram_format(file_path):
         logger.error(LoggerMsg.IMG_CONVERSION_ERROR_LOG_MSG.format(file_path=file_path, e=e))
         return file_path
 
+_media_prep_pool = None
+_media_prep_slots = None  # bounds the files queued on the pool
+_media_prep_pool_lock = threading.Lock()
+
+def _get_media_prep_pool():
+    """Workers that run the ffmpeg/ffprobe preparation of /img files (shared by all users)."""
+    global _media_prep_pool, _media_prep_slots
+    with _media_prep_pool_lock:
+        if _media_prep_pool is None:
+            workers = max(1, int(getattr(LimitsConfig, "IMG_MEDIA_WORKERS", 4)))
+            queued = max(workers, int(getattr(LimitsConfig, "IMG_MEDIA_MAX_QUEUED", 16)))
+            _media_prep_slots = threading.BoundedSemaphore(queued)
+            _media_prep_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="img-media")
+        return _media_prep_pool
+
+def _submit_media_prep(file_path, paid=False):
+    """Queue _prepare_media_file on the media workers; waits while IMG_MEDIA_MAX_QUEUED files are queued."""
+    pool = _get_media_prep_pool()
+    _media_prep_slots.acquire()
+    try:
+        future = pool.submit(_prepare_media_file, file_path, paid)
+    except BaseException:
+        _media_prep_slots.release()
+        raise
+    # Also runs when the future is cancelled
+    future.add_done_callback(lambda _f: _media_prep_slots.release())
+    return future
+
+def _prepare_media_file(file_path, paid=False):
+    """
+    Prepare one downloaded file for sending (runs on the media workers):
+    convert it to a Telegram format and, for videos, probe it and make its
+    thumbnail (and its paid cover) so the send only reads cached results.
+
+    Returns (media_path, kind, original_path, cleanup_paths); kind is
+    'photo', 'video' or 'other'.
+    """
+    converted = convert_file_to_telegram_format(file_path)
+    cleanup_paths = [converted]
+    if converted != file_path:
+        cleanup_paths.append(file_path)
+    ext = os.path.splitext(converted)[1].lower()
+    if ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff']:
+        kind = 'photo'
+    elif ext in ['.mp4']:
+        kind = 'video'
+    elif ext in ['.avi', '.mov', '.mkv', '.webm', '.flv', '.m4v']:
+        # Try to convert to mp4 if not already; keep as document if still not mp4
+        converted = convert_file_to_telegram_format(converted)
+        kind = 'video' if os.path.splitext(converted)[1].lower() == '.mp4' else 'other'
+    else:
+        kind = 'other'
+    if kind == 'video':
+        _probe_video_info(converted)
+        thumb = generate_video_thumbnail(converted)
+        if paid:
+            ensure_paid_cover_embedded(converted, thumb)
+    return converted, kind, file_path, cleanup_paths
+
+
+# Seconds to wait for a cancelled range download to return
+_RANGE_STOP_TIMEOUT = 30
+
+
+def _stop_range_download(range_job, cancel):
+    """Cancel a background range download and wait (bounded) for its thread to return."""
+    cancel.set()
+    done, _ = futures_wait([range_job], timeout=_RANGE_STOP_TIMEOUT)
+    if not done:
+        logger.warning(f"[IMG BATCH] Range download still running {_RANGE_STOP_TIMEOUT}s after cancel")
+
+
 def get_message_thread_id(message):
     """Extract message_thread_id from message, handling fake messages with original message reference"""
     if hasattr(message, '_is_fake_message') and hasattr(message, '_original_message') and message._original_message is not None:
@@ -804,7 +935,8 @@ def image_command(app, message):
             reply_markup=keyboard,
             parse_mode=enums.ParseMode.HTML,
             reply_parameters=ReplyParameters(message_id=get_reply_message_id(message)),
-            message=message
+            message=message,
+            _wait=False
         )
         send_to_logger(message, LoggerMsg.IMG_HELP_SHOWN)
         return
@@ -882,7 +1014,8 @@ def image_command(app, message):
             safe_get_messages(user_id).INVALID_URL_MSG,
             parse_mode=enums.ParseMode.HTML,
             reply_parameters=ReplyParameters(message_id=get_reply_message_id(message)),
-            message=message
+            message=message,
+            _wait=False
         )
         log_error_to_channel(message, LoggerMsg.INVALID_URL_PROVIDED.format(url=url), url)
         return
@@ -932,7 +1065,8 @@ def image_command(app, message):
                     ),
                     parse_mode=enums.ParseMode.HTML,
                     reply_parameters=ReplyParameters(message_id=get_reply_message_id(message)),
-                    message=message
+                    message=message,
+                    _wait=False
                 )
                 return
     
@@ -1064,6 +1198,7 @@ def image_command(app, message):
                                 user_id, status_msg.id,
                                 safe_get_messages(user_id).SENT_FROM_CACHE_MSG.format(count=cached_sent),
                                 parse_mode=enums.ParseMode.HTML,
+                                _wait=False,
                             )
                         except Exception:
                             pass
@@ -1084,6 +1219,7 @@ def image_command(app, message):
                                 user_id, status_msg.id,
                                 safe_get_messages(user_id).CACHE_CONTINUING_DOWNLOAD_MSG.format(cached=cached_sent),
                                 parse_mode=enums.ParseMode.HTML,
+                                _wait=False,
                             )
                         except Exception:
                             pass
@@ -1094,6 +1230,7 @@ def image_command(app, message):
                             user_id, status_msg.id,
                             safe_get_messages(user_id).CACHE_CONTINUING_DOWNLOAD_MSG.format(cached=cached_sent),
                             parse_mode=enums.ParseMode.HTML,
+                            _wait=False,
                         )
                     except Exception:
                         pass
@@ -1140,6 +1277,7 @@ def image_command(app, message):
                         user_id, status_msg.id,
                         safe_get_messages(user_id).CACHE_CONTINUING_DOWNLOAD_MSG.format(cached=cached_sent),
                         parse_mode=enums.ParseMode.HTML,
+                        _wait=False,
                     )
                 except Exception:
                     pass
@@ -1150,7 +1288,15 @@ def image_command(app, message):
     if not need_download:
         return
     
+    download_slot = None
+    # Background work of this /img; stopped in the finally below, before the slot is released
+    file_watcher = None
+    range_job = None  # Future of the range downloading in the background
+    range_cancel = threading.Event()
+    prepare_queue = deque()  # Downloads being converted/probed on the media workers, in download order
     try:
+        # Wait for a free global/per-domain download slot
+        download_slot = acquire_download_slot(message, url)
         # Get image information first
         image_info = get_image_info(url, user_id, use_proxy)
         # NSFW detection using domain and metadata
@@ -1198,7 +1344,8 @@ def image_command(app, message):
                     safe_edit_message_text(
                         user_id, status_msg.id,
                         safe_get_messages(user_id).FALLBACK_ANALYZE_MEDIA_MSG.format(fallback_limit=fallback_limit),
-                        parse_mode=enums.ParseMode.HTML
+                        parse_mode=enums.ParseMode.HTML,
+                        _wait=False
                     )
                     
                     # Set manual range to max allowed range for fallback only if not already set
@@ -1232,7 +1379,8 @@ def image_command(app, message):
             f"<b>{safe_get_messages(user_id).TITLE_LABEL_MSG}</b> {title}\n"
             f"<b>URL:</b> <code>{url}</code>\n"
             f"<b>{safe_get_messages(user_id).MEDIA_COUNT_LABEL_MSG}</b> {detected_total_value if detected_total_value else 'Unknown'}",
-            parse_mode=enums.ParseMode.HTML
+            parse_mode=enums.ParseMode.HTML,
+            _wait=False
         )
         
         # Create user directory
@@ -1317,7 +1465,8 @@ def image_command(app, message):
                 safe_edit_message_text(
                     user_id, status_msg.id,
                     safe_get_messages(user_id).FALLBACK_DETERMINE_COUNT_MSG.format(total_limit=total_limit),
-                    parse_mode=enums.ParseMode.HTML
+                    parse_mode=enums.ParseMode.HTML,
+                    _wait=False
                 )
                 
                 # Set manual range to max allowed range for fallback only if not already set
@@ -1363,7 +1512,8 @@ def image_command(app, message):
                     f"{safe_get_messages(user_id).IMG_FOUND_MEDIA_ITEMS_MSG.format(count=total_count)}\n\n"
                     f"{safe_get_messages(user_id).IMG_SELECT_DOWNLOAD_RANGE_MSG}",
                     reply_markup=InlineKeyboardMarkup(keyboard),
-                    parse_mode=enums.ParseMode.HTML
+                    parse_mode=enums.ParseMode.HTML,
+                    _wait=False
                 )
                 return
             else:
@@ -1444,7 +1594,8 @@ def image_command(app, message):
                     f"<code>{suggested_command_url_format}</code>",
                     parse_mode=enums.ParseMode.HTML,
                     reply_parameters=ReplyParameters(message_id=get_reply_message_id(message)),
-                    message=message
+                    message=message,
+                    _wait=False
                 )
                 return
             
@@ -1534,6 +1685,7 @@ def image_command(app, message):
                     f"{safe_get_messages(user_id).SENT_STATUS_MSG} <b>{total_sent}</b>\n"
                     f"{safe_get_messages(user_id).PENDING_TO_SEND_STATUS_MSG} <b>{len(photos_videos_buffer) + len(others_buffer)}</b>",
                     parse_mode=enums.ParseMode.HTML,
+                    _wait=False,
                 )
             except Exception:
                 pass
@@ -1628,7 +1780,8 @@ def image_command(app, message):
                         start=manual_range[0], 
                         end=manual_range[1] if manual_range[1] else 'end'
                     ),
-                    parse_mode=enums.ParseMode.HTML
+                    parse_mode=enums.ParseMode.HTML,
+                    _wait=False
                 )
             except Exception as e:
                 logger.warning(f"Failed to update status message: {e}")
@@ -1639,17 +1792,49 @@ def image_command(app, message):
         total_start_time = time.time()
         last_activity_time = time.time()  # Track last time we found new files
         max_inactivity_time = LimitsConfig.MAX_IMG_INACTIVITY_TIME
+        # Finished files arrive as events: inotify on run_dir plus the gallery-dl worker's per-file reports
+        file_watcher = FileWatcher(gallery_dl_dir)
+        on_file_downloaded = file_watcher.notify
+        
+        # Paid albums (NSFW in private chats) also get their video covers made by the media workers
+        paid_media = nsfw_flag and getattr(message.chat, "type", None) == enums.ChatType.PRIVATE
+        if hasattr(message, '_is_fake_message') and message._is_fake_message:
+            original_chat_id = getattr(message, '_original_chat_id', user_id)
+            paid_media = nsfw_flag and not (str(original_chat_id).startswith('-100') or str(original_chat_id).startswith('-'))
+        
+        def ready_prepared_groups(wait):
+            """Prepared files in download order, up to one album per group; with wait, until the queue is empty."""
+            while prepare_queue and (wait or prepare_queue[0].done()):
+                group = []
+                while prepare_queue and len(group) < batch_size and (wait or prepare_queue[0].done()):
+                    group.append(prepare_queue.popleft().result())
+                yield group
+        
+        def start_range_download(target, *args):
+            """Run one range download in the background; finished files are sent while it runs."""
+            future = Future()
         
-        # helper to run one range and wait for files to appear
-        def run_and_collect(next_end: int):
+            def run():
+                try:
+                    future.set_result(target(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+        
+            threading.Thread(target=run, name=f"img-range-{user_id}", daemon=True).start()
+            return future
+        
+        # helper to download one range (runs on the range download thread)
+        def run_and_collect(range_start: int, next_end: int):
             messages = safe_get_messages(user_id)
             # For single item or when total is small, use range 1-1 to avoid API issues
             # Only use 1-1 when we're actually starting from 1 and it's a single item
-            if (current_start == next_end and current_start == 1) or (detected_total and detected_total <= 10 and current_start == 1):
-                logger.info(LoggerMsg.IMG_DOWNLOADING_RANGE_1_1_LOG_MSG.format(detected_total=detected_total, current_start=current_start, next_end=next_end))
-                result = download_image_range_cli(url, "1-1", user_id, use_proxy, output_dir=run_dir)
+            if (range_start == next_end and range_start == 1) or (detected_total and detected_total <= 10 and range_start == 1):
+                logger.info(LoggerMsg.IMG_DOWNLOADING_RANGE_1_1_LOG_MSG.format(detected_total=detected_total, current_start=range_start, next_end=next_end))
+                result = download_image_range_cli(url, "1-1", user_id, use_proxy, output_dir=run_dir, on_file=on_file_downloaded, cancel=range_cancel)
                 if isinstance(result, str):  # 401 Unauthorized error message
                     return result
+                if range_cancel.is_set():
+                    return False
                 if not result:
                     logger.warning(LoggerMsg.IMG_CLI_DOWNLOAD_FAILED_LOG_MSG)
                     result = download_image_range(url, "1-1", user_id, use_proxy, run_dir)
@@ -1658,16 +1843,18 @@ def image_command(app, message):
                     return result
             else:
                 # Build a correct range_expr taking order into account
-                if current_start > next_end:
+                if range_start > next_end:
                     # Reverse order: gallery-dl typically doesn't support this, download items one by one
-                    range_expr = f"{next_end}-{current_start}"
+                    range_expr = f"{next_end}-{range_start}"
                 else:
-                    range_expr = f"{current_start}-{next_end}"
+                    range_expr = f"{range_start}-{next_end}"
                 # Prefer CLI to enforce strict range behavior across gallery-dl versions
                 logger.info(LoggerMsg.IMG_PREPARED_RANGE_LOG_MSG.format(range_expr=range_expr))
-                result = download_image_range_cli(url, range_expr, user_id, use_proxy, output_dir=run_dir)
+                result = download_image_range_cli(url, range_expr, user_id, use_proxy, output_dir=run_dir, on_file=on_file_downloaded, cancel=range_cancel)
                 if isinstance(result, str):  # 401 Unauthorized error message
                     return result
+                if range_cancel.is_set():
+                    return False
                 if not result:
                     logger.warning(LoggerMsg.IMG_CLI_RANGE_FAILED_LOG_MSG.format(range_expr=range_expr))
                     result = download_image_range(url, range_expr, user_id, use_proxy, run_dir)
@@ -1686,18 +1873,20 @@ def image_command(app, message):
             if start > end:
                 # Download descending: start, start-1, ..., end+1, end
                 for idx in range(start, end - 1, -1):
+                    if range_cancel.is_set():
+                        return False
                     range_expr = f"{idx}-{idx}"
                     logger.info(f"[IMG REVERSE] Downloading single item: {range_expr}")
-                    result = download_image_range_cli(url, range_expr, user_id, use_proxy, output_dir=run_dir)
+                    result = download_image_range_cli(url, range_expr, user_id, use_proxy, output_dir=run_dir, on_file=on_file_downloaded, cancel=range_cancel)
                     if isinstance(result, str):  # 401 Unauthorized error message
                         return result
+                    if range_cancel.is_set():
+                        return False
                     if not result:
                         logger.warning(f"[IMG REVERSE] CLI download failed for {range_expr}, trying fallback")
                         result = download_image_range(url, range_expr, user_id, use_proxy, run_dir)
                         if isinstance(result, str):  # 401 Unauthorized error message
                             return result
-                    # Small delay between requests
-                    time.sleep(0.5)
             else:
                 # If start <= end, this is not reverse order (should not happen)
                 logger.warning(f"[IMG REVERSE] start ({start}) <= end ({end}), this should not happen for reverse order")
@@ -1705,6 +1894,7 @@ def image_command(app, message):
 
         consecutive_empty_searches = 0  # Counter for consecutive searches with no new files
         max_consecutive_empty_searches = 3  # Exit after 3 consecutive searches with no new files
+        files_before = 0
         
         while True:
             # Check total timeout
@@ -1713,14 +1903,14 @@ def image_command(app, message):
                 logger.warning(LoggerMsg.IMG_BATCH_TOTAL_TIMEOUT_LOG_MSG.format(max_total_wait_time=max_total_wait_time, total_elapsed=total_elapsed))
                 break
                 
-            # Check inactivity timeout - if no new files found for too long
+            # Check inactivity timeout - if no new files found for too long (a running range is bounded by its own timeout)
             inactivity_elapsed = time.time() - last_activity_time
-            if inactivity_elapsed and inactivity_elapsed > max_inactivity_time:
+            if range_job is None and inactivity_elapsed and inactivity_elapsed > max_inactivity_time:
                 logger.warning(LoggerMsg.IMG_BATCH_INACTIVITY_TIMEOUT_LOG_MSG.format(max_inactivity_time=max_inactivity_time, inactivity_elapsed=inactivity_elapsed))
                 break
                 
-            # Only download next range if buffer is empty (strict batching)
-            if len(photos_videos_buffer) == 0:
+            # Only download next range once the previous one is done and the buffer is empty (strict batching)
+            if range_job is None and len(photos_videos_buffer) == 0:
                 upper_cap = manual_end_cap or total_expected
                 # Reverse-order stopping condition (negative indices or start > end)
                 if is_reverse_order_img:
@@ -1754,161 +1944,83 @@ def image_command(app, message):
                 range_start_time = time.time()
                 
                 # Count files before download
-                files_before = len(seen_files)
+                files_before = total_downloaded
                 # Save original current_start for expected_files calculation
                 original_current_start = current_start
-                # Use the correct range_expr for downloading
+                # Download in the background; the loop below sends each album as soon as its files are done
                 if is_reverse_order_img:
                     # Reverse order: gallery-dl may not support this directly
                     # Download items one by one in reverse order
-                    result = run_and_collect_reverse(current_start, next_end, batch_size)
+                    range_job = start_range_download(run_and_collect_reverse, current_start, next_end, batch_size)
                     # Update current_start for reverse order
                     current_start = next_end - 1
                 else:
-                    result = run_and_collect(next_end)
+                    range_job = start_range_download(run_and_collect, current_start, next_end)
                     # Update current_start for forward order
                     current_start = next_end + 1
-                    
-                    # Debug: Log the result type and content
-                    logger.info(f"[IMG DEBUG] run_and_collect result: type={type(result)}, value={result}")
-                    
-                    # Check for fatal errors
-                    if isinstance(result, str) and ":" in result and any(error_type in result for error_type in [
-                        "Authentication Error", "Account Not Found", "Account Unavailable", 
-                        "Rate Limit Exceeded", "Network Error", "Content Unavailable",
-                        "Geographic Restrictions", "Verification Required", "Policy Violation",
-                        "Unknown Error", "Fatal Error", "Critical Error", "Unexpected Error"
-                    ]):
-                        logger.error(LoggerMsg.IMG_FATAL_ERROR_DETECTED_LOG_MSG.format(result=result))
-                        logger.info(f"[IMG DEBUG] Processing fatal error: status_msg={status_msg}, status_msg.id={status_msg.id if status_msg else 'None'}")
-                        # Send error message to user and stop downloading
-                        error_type = result.split(':')[0]
-                        error_details = result.split(':', 1)[1].strip()
-                        
-                        # Use appropriate error message based on error type
-                        if "Instagram" in error_details or "instagram" in error_details.lower():
-                            error_msg = safe_get_messages(user_id).IMG_INSTAGRAM_AUTH_ERROR_MSG.format(
-                                error_type=error_type,
-                                url=url,
-                                error_details=error_details
-                            )
-                        else:
-                            # Generic error message for other platforms
-                            error_msg = f"❌ <b>{error_type}</b>\n\n<b>URL:</b> <code>{url}</code>\n\n<b>Details:</b> {error_details}\n\nDownload stopped due to critical error."
-                        
-                        logger.info(f"[IMG DEBUG] Updating status message with error: {error_msg[:100]}...")
-                        safe_edit_message_text(
-                            status_msg.chat.id, status_msg.id,
-                            error_msg,
-                            parse_mode=enums.ParseMode.HTML
-                        )
-                        log_error_to_channel(message, f"Fatal error in image download: {result}", url)
-                        return
-                    
-                    # Wait for download to complete before processing files
-                    time.sleep(2)
-                    
-                    # Give additional time for file processing if this is the first range
-                    if current_start == 1:
-                        time.sleep(3)  # Extra wait for first range
-                    
-                    # Count files after download
-                    files_after = len(seen_files)
-                    files_downloaded_in_range = files_after - files_before
-                    # Correct expected_files calculation for reverse order
-                    # Use original_current_start saved above
-                    if is_reverse_order_img:
-                        expected_files = abs(original_current_start - next_end) + 1
-                    else:
-                        expected_files = next_end - original_current_start + 1
-                    
-                    elapsed_time = time.time() - range_start_time
-                    logger.info(LoggerMsg.IMG_BATCH_DOWNLOADED_FILES_LOG_MSG.format(files_downloaded_in_range=files_downloaded_in_range, current_start=original_current_start, next_end=next_end, expected_files=expected_files, elapsed_time=elapsed_time))
-                    
-                    # Check if we got no files at all (gallery-dl found nothing)
-                    # Always proceed to file search - don't break early
-                    # current_start was updated above; do not update it again
-                    if files_downloaded_in_range == 0:
-                        logger.info(LoggerMsg.IMG_BATCH_NO_FILES_DOWNLOADED_LOG_MSG.format(current_start=original_current_start, next_end=next_end))
-                    else:
-                        logger.info(LoggerMsg.IMG_BATCH_FOUND_FILES_LOG_MSG.format(files_downloaded_in_range=files_downloaded_in_range))
-                    
-                    # Check if we got significantly fewer files than expected (less than 50% of expected)
-                    # This indicates the media has ended
-                    # current_start was updated above; do not update it again
-                    if files_downloaded_in_range and files_downloaded_in_range < expected_files * 0.5 and files_downloaded_in_range > 0:
-                        logger.info(LoggerMsg.IMG_BATCH_MEDIA_ENDED_LOG_MSG.format(files_downloaded_in_range=files_downloaded_in_range, expected_files=expected_files))
             
-            # Find new files - search in the actual download directory structure
-            # gallery-dl creates subdirectories like instagram/username/ so we need to search deeper
-            search_dir = gallery_dl_dir
-            logger.info(LoggerMsg.IMG_BATCH_SEARCHING_FILES_LOG_MSG.format(search_dir=search_dir))
+            # Collect the files completed since the last pass; while a range is
+            # downloading, wait for the next one instead of rescanning the folder
+            range_finished = range_job is not None and range_job.done()
+            if range_finished:
+                # Nothing writes to the folder any more: files still settling are complete
+                file_watcher.settle()
+            if range_job is None or range_finished:
+                watch_timeout = 0
+            else:
+                # Files being prepared are picked up again shortly
+                watch_timeout = 0.2 if prepare_queue else 1.0
+            completed_paths = file_watcher.completed(timeout=watch_timeout)
             
             files_found_in_this_search = 0  # Count files found in this search iteration
             
-            if os.path.exists(search_dir):
-                # Debug: list all subdirectories
-                for root, dirs, files in os.walk(search_dir):
-                    if files:
-                        logger.info(LoggerMsg.IMG_BATCH_FOUND_FILES_IN_DIR_LOG_MSG.format(file_count=len(files), root=root))
-                    if dirs:
-                        logger.info(LoggerMsg.IMG_BATCH_FOUND_SUBDIRS_LOG_MSG.format(dirs=dirs))
-                for root, _, files in os.walk(search_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        # Skip special thumbs/covers generated for Telegram
-                        try:
-                            base = os.path.basename(file_path)
-                            if base.endswith('.__tgthumb.jpg') or base.endswith('.__tgcover_paid.jpg'):
-                                continue
-                        except Exception:
-                            pass
-                        if file_path in seen_files:
-                            continue
-                        # Only consider media-like files
-                        if not file.lower().endswith((
-                            '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff',
-                            '.mp4', '.m4v', '.avi', '.mov', '.mkv', '.webm', '.flv',
-                            '.mp3', '.wav', '.ogg', '.m4a',
-                            '.pdf', '.doc', '.docx', '.txt', '.zip', '.rar', '.7z'
-                        )):
-                            continue
-                        # Skip incomplete/zero-byte files
-                        try:
-                            if os.path.getsize(file_path) == 0:
-                                logger.info(LoggerMsg.IMG_BATCH_SKIPPING_ZERO_FILE_LOG_MSG.format(file_path=file_path))
-                                continue
-                        except Exception:
-                            continue
-                        seen_files.add(file_path)
-                        total_downloaded += 1
-                        files_found_in_this_search += 1  # Count files found in this search
-                        last_activity_time = time.time()  # Update activity time when we find new files
+            # Stage 1: hand each new download to the media workers (conversion, probing, thumbnails)
+            for file_path in completed_paths:
+                file = os.path.basename(file_path)
+                # Skip special thumbs/covers generated for Telegram
+                try:
+                    base = os.path.basename(file_path)
+                    if base.endswith('.__tgthumb.jpg') or base.endswith('.__tgcover_paid.jpg') or base.endswith('.__embedded_cover.mp4'):
+                        continue
+                except Exception:
+                    pass
+                if file_path in seen_files:
+                    continue
+                # Only consider media-like files
+                if not file.lower().endswith((
+                    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp', '.tiff',
+                    '.mp4', '.m4v', '.avi', '.mov', '.mkv', '.webm', '.flv',
+                    '.mp3', '.wav', '.ogg', '.m4a',
+                    '.pdf', '.doc', '.docx', '.txt', '.zip', '.rar', '.7z'
+                )):
+                    continue
+                # Skip incomplete/zero-byte files
+                try:
+                    if os.path.getsize(file_path) == 0:
+                        logger.info(LoggerMsg.IMG_BATCH_SKIPPING_ZERO_FILE_LOG_MSG.format(file_path=file_path))
+                        continue
+                except Exception:
+                    continue
+                seen_files.add(file_path)
+                total_downloaded += 1
+                files_found_in_this_search += 1  # Count files found in this search
+                last_activity_time = time.time()  # Update activity time when we find new files
 
-                        # Enforce cap (but not for admins)
-                        if not is_admin and total_downloaded > total_limit:
-                            continue
+                # Enforce cap (but not for admins)
+                if not is_admin and total_downloaded > total_limit:
+                    continue
 
-                        # Convert if needed, then classify
-                        original_path = file_path
-                        converted = convert_file_to_telegram_format(file_path)
-                        files_to_cleanup.append(converted)
-                        if converted != original_path:
-                            files_to_cleanup.append(original_path)
-                        ext = os.path.splitext(converted)[1].lower()
-                        if ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff']:
-                            photos_videos_buffer.append((converted, 'photo', original_path))
-                        elif ext in ['.mp4']:
-                            photos_videos_buffer.append((converted, 'video', original_path))
-                        elif ext in ['.avi', '.mov', '.mkv', '.webm', '.flv', '.m4v']:
-                            # Try to convert to mp4 if not already
-                            converted = convert_file_to_telegram_format(converted)
-                            ext2 = os.path.splitext(converted)[1].lower()
-                            if ext2 != '.mp4':
-                                # keep as document if still not mp4
-                                others_buffer.append((converted, original_path))
-                            else:
-                                photos_videos_buffer.append((converted, 'video', original_path))
+                # Converted copies are written next to the download; they are not new downloads
+                seen_files.update(_conversion_outputs(file_path))
+                prepare_queue.append(_submit_media_prep(file_path, paid_media))
+            
+            # Stage 2: take prepared files back in download order; an album is sent as soon as it is complete
+            if prepare_queue:
+                for prepared_group in ready_prepared_groups(wait=range_job is None or range_finished):
+                    for converted, kind, original_path, cleanup_paths in prepared_group:
+                        files_to_cleanup.extend(cleanup_paths)
+                        if kind in ('photo', 'video'):
+                            photos_videos_buffer.append((converted, kind, original_path))
                         else:
                             others_buffer.append((converted, original_path))
                         
@@ -3036,9 +3148,78 @@ def image_command(app, message):
                         if not is_admin and total_sent >= total_limit:
                             break
 
+            # The range download has returned and all of its files have been collected
+            if range_finished:
+                result = range_job.result()
+                range_job = None
+                
+                # Debug: Log the result type and content
+                logger.info(f"[IMG DEBUG] run_and_collect result: type={type(result)}, value={result}")
+                
+                # Check for fatal errors
+                if isinstance(result, str) and ":" in result and any(error_type in result for error_type in [
+                    "Authentication Error", "Account Not Found", "Account Unavailable", 
+                    "Rate Limit Exceeded", "Network Error", "Content Unavailable",
+                    "Geographic Restrictions", "Verification Required", "Policy Violation",
+                    "Unknown Error", "Fatal Error", "Critical Error", "Unexpected Error"
+                ]):
+                    logger.error(LoggerMsg.IMG_FATAL_ERROR_DETECTED_LOG_MSG.format(result=result))
+                    logger.info(f"[IMG DEBUG] Processing fatal error: status_msg={status_msg}, status_msg.id={status_msg.id if status_msg else 'None'}")
+                    # Send error message to user and stop downloading
+                    error_type = result.split(':')[0]
+                    error_details = result.split(':', 1)[1].strip()
+                    
+                    # Use appropriate error message based on error type
+                    if "Instagram" in error_details or "instagram" in error_details.lower():
+                        error_msg = safe_get_messages(user_id).IMG_INSTAGRAM_AUTH_ERROR_MSG.format(
+                            error_type=error_type,
+                            url=url,
+                            error_details=error_details
+                        )
+                    else:
+                        # Generic error message for other platforms
+                        error_msg = f"❌ <b>{error_type}</b>\n\n<b>URL:</b> <code>{url}</code>\n\n<b>Details:</b> {error_details}\n\nDownload stopped due to critical error."
+                    
+                    logger.info(f"[IMG DEBUG] Updating status message with error: {error_msg[:100]}...")
+                    safe_edit_message_text(
+                        status_msg.chat.id, status_msg.id,
+                        error_msg,
+                        parse_mode=enums.ParseMode.HTML,
+                        _wait=False
+                    )
+                    log_error_to_channel(message, f"Fatal error in image download: {result}", url)
+                    return
+                
+                # Count files after download
+                files_after = total_downloaded
+                files_downloaded_in_range = files_after - files_before
+                # Correct expected_files calculation for reverse order
+                # Use original_current_start saved above
+                if is_reverse_order_img:
+                    expected_files = abs(original_current_start - next_end) + 1
+                else:
+                    expected_files = next_end - original_current_start + 1
+                
+                elapsed_time = time.time() - range_start_time
+                logger.info(LoggerMsg.IMG_BATCH_DOWNLOADED_FILES_LOG_MSG.format(files_downloaded_in_range=files_downloaded_in_range, current_start=original_current_start, next_end=next_end, expected_files=expected_files, elapsed_time=elapsed_time))
+                
+                # Check if we got no files at all (gallery-dl found nothing)
+                # Always proceed to file search - don't break early
+                # current_start was updated above; do not update it again
+                if files_downloaded_in_range == 0:
+                    logger.info(LoggerMsg.IMG_BATCH_NO_FILES_DOWNLOADED_LOG_MSG.format(current_start=original_current_start, next_end=next_end))
+                else:
+                    logger.info(LoggerMsg.IMG_BATCH_FOUND_FILES_LOG_MSG.format(files_downloaded_in_range=files_downloaded_in_range))
+                
+                # Check if we got significantly fewer files than expected (less than 50% of expected)
+                # This indicates the media has ended
+                # current_start was updated above; do not update it again
+                if files_downloaded_in_range and files_downloaded_in_range < expected_files * 0.5 and files_downloaded_in_range > 0:
+                    logger.info(LoggerMsg.IMG_BATCH_MEDIA_ENDED_LOG_MSG.format(files_downloaded_in_range=files_downloaded_in_range, expected_files=expected_files))
+
             # Flush remainder if no more ranges pending
             upper_cap = manual_end_cap or total_expected
-            if (upper_cap and (total_sent >= upper_cap or current_start > upper_cap)) or (not is_admin and total_sent >= total_limit):
+            if (range_job is None and upper_cap and (total_sent >= upper_cap or current_start > upper_cap)) or (not is_admin and total_sent >= total_limit):
                 # Send remaining media groups
                 if photos_videos_buffer:
                     group = photos_videos_buffer[:batch_size]
@@ -3754,6 +3935,7 @@ def image_command(app, message):
                             f"{safe_get_messages(user_id).DOWNLOADED_STATUS_MSG} <b>{total_downloaded}</b> / <b>{final_expected}</b>\n"
                             f"{safe_get_messages(user_id).SENT_STATUS_MSG} <b>{total_sent}</b>",
                             parse_mode=enums.ParseMode.HTML,
+                            _wait=False,
                         )
                         completion_sent = True
                 except Exception:
@@ -3763,24 +3945,37 @@ def image_command(app, message):
             if not is_admin and total_sent >= total_limit:
                 break
 
-            # Check if we've been waiting too long for files in current range
-            # Only apply this timeout if we haven't found any files in this range yet
-            if time.time() - range_start_time > max_range_wait_time:
+            # Check if the current range has been downloading for too long
+            if range_job is not None and time.time() - range_start_time > max_range_wait_time:
                 logger.warning(f"[IMG BATCH] Range timeout reached ({max_range_wait_time}s), no new files found in current range")
                 break
 
-            # Check if we found any new files in this search iteration
-            if files_found_in_this_search == 0:
-                consecutive_empty_searches += 1
-                logger.info(f"[IMG BATCH] No new files found in search iteration {consecutive_empty_searches}/{max_consecutive_empty_searches}")
-                if consecutive_empty_searches >= max_consecutive_empty_searches:
-                    logger.info(f"[IMG BATCH] Exiting loop after {consecutive_empty_searches} consecutive empty searches")
-                    break
-            else:
-                consecutive_empty_searches = 0  # Reset counter when we find files
-                logger.info(f"[IMG BATCH] Found {files_found_in_this_search} new files, resetting empty search counter")
+            # Once nothing is downloading: did the last range (or this pass) bring new files?
+            if range_job is None:
+                if range_finished:
+                    files_found_in_this_search = total_downloaded - files_before
+                if files_found_in_this_search == 0:
+                    consecutive_empty_searches += 1
+                    logger.info(f"[IMG BATCH] No new files found in search iteration {consecutive_empty_searches}/{max_consecutive_empty_searches}")
+                    if consecutive_empty_searches >= max_consecutive_empty_searches:
+                        logger.info(f"[IMG BATCH] Exiting loop after {consecutive_empty_searches} consecutive empty searches")
+                        break
+                else:
+                    consecutive_empty_searches = 0  # Reset counter when we find files
+                    logger.info(f"[IMG BATCH] Found {files_found_in_this_search} new files, resetting empty search counter")
 
-            time.sleep(0.5)
+        if range_job is not None and not range_job.done():
+            logger.warning("[IMG BATCH] Stopped while a range was still downloading; cancelling it")
+            _stop_range_download(range_job, range_cancel)
+        file_watcher.close()
+        # Files already being prepared still go out with the final album
+        for prepared_group in ready_prepared_groups(wait=True):
+            for converted, kind, original_path, cleanup_paths in prepared_group:
+                files_to_cleanup.extend(cleanup_paths)
+                if kind in ('photo', 'video'):
+                    photos_videos_buffer.append((converted, kind, original_path))
+                else:
+                    others_buffer.append((converted, original_path))
 
         # Update status to show completion
         try:
@@ -3793,6 +3988,7 @@ def image_command(app, message):
                     f"{safe_get_messages(user_id).DOWNLOADED_STATUS_MSG} <b>{total_downloaded}</b> / <b>{final_expected}</b>\n"
                     f"{safe_get_messages(user_id).SENT_STATUS_MSG} <b>{total_sent}</b>",
                     parse_mode=enums.ParseMode.HTML,
+                    _wait=False,
                 )
                 completion_sent = True
         except Exception:
@@ -4057,11 +4253,24 @@ def image_command(app, message):
         safe_edit_message_text(
             user_id, status_msg.id,
             safe_get_messages(user_id).ERROR_OCCURRED_MSG.format(url=url, error=str(e)),
-            parse_mode=enums.ParseMode.HTML
+            parse_mode=enums.ParseMode.HTML,
+            _wait=False
         )
         from HELPERS.logger import send_error_to_user
         send_error_to_user(message, safe_get_messages(user_id).ERROR_OCCURRED_MSG.format(url=url, error=str(e)))
         log_error_to_channel(message, LoggerMsg.IMAGE_COMMAND_ERROR.format(url=url, error=e), url)
+    finally:
+        # Nothing of this /img may keep downloading into run_dir once its slot is free
+        if range_job is not None:
+            _stop_range_download(range_job, range_cancel)
+        if file_watcher is not None:
+            file_watcher.close()
+        # Files not prepared yet are not sent any more; free the media workers for other users
+        for prepared in prepare_queue:
+            prepared.cancel()
+        prepare_queue.clear()
+        if download_slot is not None:
+            download_slot.release()
 
 @app.on_callback_query(filters.regex(r"^img_help\|"))
 def img_help_callback(app, callback_query: CallbackQuery):
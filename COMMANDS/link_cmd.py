@@ -18,6 +18,7 @@ from URL_PARSERS.nocookie import is_no_cookie_domain
 from URL_PARSERS.youtube import is_youtube_url
 from HELPERS.proxy_helper import add_proxy_to_ytdl_opts
 from HELPERS.pot_helper import add_pot_to_ytdl_opts
+from HELPERS.info_cache import extract_info_cached
 from COMMANDS.cookies_cmd import ensure_working_youtube_cookies
 
 # Get app instance for decorators
@@ -239,7 +240,7 @@ def get_direct_link(url, user_id, quality_arg=None, cookies_already_checked=Fals
         
         # Get video information
         with yt_dlp.YoutubeDL(ytdl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
+            info = extract_info_cached(ydl, url)
         # Normalize info to a dict
         if isinstance(info, list):
             info = (info[0] if len(info) > 0 else {})
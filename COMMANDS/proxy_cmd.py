@@ -290,47 +290,22 @@ def build_proxy_url(proxy_config):
 
 def select_proxy_for_domain(url):
     """Select appropriate proxy for domain based on PROXY_DOMAINS and PROXY_2_DOMAINS"""
-    from CONFIG.domains import DomainsConfig
+    from HELPERS.domain_classifier import classify_url, get_host, PROXY, PROXY_2
     
-    # Extract domain from URL
-    domain = None
-    if '://' in url:
-        domain = url.split('://')[1].split('/')[0]
-    else:
-        domain = url.split('/')[0]
+    domain = get_host(url)
+    categories = classify_url(url)
     
     logger.info(LoggerMsg.PROXY_CMD_SELECT_PROXY_FOR_DOMAIN_LOG_MSG.format(url=url, domain=domain))
-    logger.info(LoggerMsg.PROXY_CMD_PROXY_2_DOMAINS_LOG_MSG.format(domains=getattr(DomainsConfig, 'PROXY_2_DOMAINS', [])))
-    logger.info(LoggerMsg.PROXY_CMD_PROXY_DOMAINS_LOG_MSG.format(domains=getattr(DomainsConfig, 'PROXY_DOMAINS', [])))
-    
-    # Helper function to check if domain matches any domain in the list (including subdomains)
-    def is_domain_in_list(domain, domain_list):
-        """Check if domain or any of its subdomains match entries in domain_list"""
-        if not domain_list:
-            return False
-        
-        # Direct match
-        if domain in domain_list:
-            return True
-        
-        # Check if any domain in the list is a subdomain of the current domain
-        for listed_domain in domain_list:
-            if domain.endswith('.' + listed_domain) or domain == listed_domain:
-                return True
-        
-        return False
     
     # Check PROXY_2_DOMAINS first
-    if hasattr(DomainsConfig, 'PROXY_2_DOMAINS') and DomainsConfig.PROXY_2_DOMAINS:
-        if is_domain_in_list(domain, DomainsConfig.PROXY_2_DOMAINS):
-            logger.info(LoggerMsg.PROXY_CMD_DOMAIN_FOUND_IN_PROXY_2_LOG_MSG.format(domain=domain))
-            return get_proxy_2_config()
+    if PROXY_2 in categories:
+        logger.info(LoggerMsg.PROXY_CMD_DOMAIN_FOUND_IN_PROXY_2_LOG_MSG.format(domain=domain))
+        return get_proxy_2_config()
     
     # Check PROXY_DOMAINS
-    if hasattr(DomainsConfig, 'PROXY_DOMAINS') and DomainsConfig.PROXY_DOMAINS:
-        if is_domain_in_list(domain, DomainsConfig.PROXY_DOMAINS):
-            logger.info(LoggerMsg.PROXY_CMD_DOMAIN_FOUND_IN_PROXY_1_LOG_MSG.format(domain=domain))
-            return get_proxy_config()
+    if PROXY in categories:
+        logger.info(LoggerMsg.PROXY_CMD_DOMAIN_FOUND_IN_PROXY_1_LOG_MSG.format(domain=domain))
+        return get_proxy_config()
     
     logger.info(LoggerMsg.PROXY_CMD_DOMAIN_NOT_IN_LIST_LOG_MSG.format(domain=domain))
     return None
@@ -14,6 +14,7 @@ from HELPERS.safe_messeger import safe_forward_messages
 from DOWN_AND_UP.yt_dlp_hook import get_video_formats
 from URL_PARSERS.youtube import is_youtube_url
 from HELPERS.pot_helper import add_pot_to_ytdl_opts
+from HELPERS.info_cache import extract_info_cached
 import math
 from pyrogram import filters, enums
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton, ReplyParameters
@@ -871,7 +872,7 @@ def get_available_subs_languages(url, user_id=None, auto_only=False):
                 opts['extractor_args'] = {'youtube': {'player_client': [client]}}
             try:
                 with yt_dlp.YoutubeDL(opts) as ydl:
-                    info = ydl.extract_info(url, download=False)
+                    info = extract_info_cached(ydl, url)
             except yt_dlp.utils.DownloadError as e:
                 if 'Requested format is not available' in str(e):
                     continue
@@ -1269,7 +1270,7 @@ def download_subtitles_ytdlp(url, user_id, video_dir, available_langs):
             info_opts = add_pot_to_ytdl_opts(info_opts, url)
 
             with yt_dlp.YoutubeDL(info_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+                info = extract_info_cached(ydl, url)
 
             # Prefer union view: sometimes only one dict is filled depending on client
             subs_dict = {}
@@ -6,11 +6,16 @@ Handles dynamic loading of messages based on user's selected language
 import os
 import sys
 import ast
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 
 # Add the parent directory to the path to import CONFIG
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Users whose language is kept in memory; the least recently seen are re-read from lang.txt
+_MAX_CACHED_USER_LANGUAGES = 10000
+
 class LanguageRouter:
     """Router for handling multi-language message loading"""
     
@@ -26,25 +31,46 @@ class LanguageRouter:
         }
         self.default_language = 'en'
         self._cached_messages = {}
+        self._load_lock = threading.Lock()
+        # user_id -> language code, least recently used first; lang.txt is
+        # read once per user and the entry is replaced by set_user_language
+        self._user_languages = OrderedDict()
+        self._user_languages_lock = threading.Lock()
         
     def get_user_language(self, user_id: int) -> str:
         """
-        Get user's selected language from lang.txt file in user directory
+        Get user's selected language (from memory, or lang.txt in the user directory on first use)
         Returns default language if not set
         """
+        key = str(user_id)
+        with self._user_languages_lock:
+            lang_code = self._user_languages.get(key)
+            if lang_code is not None:
+                self._user_languages.move_to_end(key)
+                return lang_code
+        lang_code = self.default_language
         try:
-            user_dir = f'./users/{str(user_id)}'
+            user_dir = f'./users/{key}'
             lang_file = os.path.join(user_dir, 'lang.txt')
             
             if os.path.exists(lang_file):
                 with open(lang_file, 'r', encoding='utf-8') as f:
-                    lang_code = f.read().strip()
-                    if lang_code in self.available_languages:
-                        return lang_code
+                    stored = f.read().strip()
+                    if stored in self.available_languages:
+                        lang_code = stored
         except Exception as e:
             print(f"Error reading user language for {user_id}: {e}")
+            return lang_code
         
-        return self.default_language
+        self._remember_user_language(key, lang_code)
+        return lang_code
+    
+    def _remember_user_language(self, key: str, lang_code: str):
+        with self._user_languages_lock:
+            self._user_languages[key] = lang_code
+            self._user_languages.move_to_end(key)
+            while len(self._user_languages) > _MAX_CACHED_USER_LANGUAGES:
+                self._user_languages.popitem(last=False)
     
     def set_user_language(self, user_id: int, language_code: str) -> bool:
         """
@@ -64,9 +90,8 @@ class LanguageRouter:
             with open(lang_file, 'w', encoding='utf-8') as f:
                 f.write(language_code)
             
-            # Clear cache for this user to force reload with new language
-            if language_code in self._cached_messages:
-                del self._cached_messages[language_code]
+            # Remember the new language for this user
+            self._remember_user_language(str(user_id), language_code)
             
             return True
         except Exception as e:
@@ -89,6 +114,12 @@ class LanguageRouter:
         if language_code not in self.available_languages:
             language_code = self.default_language
             
+        with self._load_lock:
+            if language_code in self._cached_messages:
+                return self._cached_messages[language_code]
+            return self._load_messages_locked(language_code)
+    
+    def _load_messages_locked(self, language_code: str) -> Dict[str, Any]:
         # Load messages file
         messages_file = self.available_languages[language_code]
         messages_path = os.path.join(self.languages_dir, messages_file)
@@ -106,7 +137,7 @@ class LanguageRouter:
             print(f"Error loading messages for language {language_code}: {e}")
             # Fall back to default language
             if language_code != self.default_language:
-                return self.load_messages(self.default_language)
+                return self._cached_messages.get(self.default_language) or self._load_messages_locked(self.default_language)
             return {}
     
     def get_message(self, message_key: str, user_id: int = None, language_code: str = None) -> str:
@@ -304,22 +335,31 @@ class LanguageRouter:
             return ()
     
     def clear_cache(self):
-        """Clear cached messages"""
+        """Clear cached messages and user languages"""
         self._cached_messages.clear()
+        with self._user_languages_lock:
+            self._user_languages.clear()
 
 # Global instance
 language_router = LanguageRouter()
 
-def get_messages(user_id: int = None, language_code: str = None) -> Dict[str, Any]:
+def get_language_code(user_id: int = None, language_code: str = None) -> str:
     """
-    Convenience function to get messages for user or language
+    Convenience function to resolve the language code for user or language
     """
     if language_code is None and user_id is not None:
         language_code = language_router.get_user_language(user_id)
     elif language_code is None:
         language_code = language_router.default_language
-        
-    return language_router.load_messages(language_code)
+    if language_code not in language_router.available_languages:
+        language_code = language_router.default_language
+    return language_code
+
+def get_messages(user_id: int = None, language_code: str = None) -> Dict[str, Any]:
+    """
+    Convenience function to get messages for user or language
+    """
+    return language_router.load_messages(get_language_code(user_id, language_code))
 
 def get_message(message_key: str, user_id: int = None, language_code: str = None) -> str:
     """
@@ -2187,3 +2187,6 @@ class Messages(object):
     )
 
     #######################################################
+
+    # Download scheduler messages
+    DOWNLOAD_QUEUE_POSITION_MSG = "⏳ الخادم مشغول، تمت إضافة التنزيل إلى قائمة الانتظار.\n📋 موقعك في قائمة الانتظار: {position}"
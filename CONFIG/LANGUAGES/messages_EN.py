@@ -2209,3 +2209,6 @@ Use:
     )
 
     #######################################################
+
+    # Download scheduler messages
+    DOWNLOAD_QUEUE_POSITION_MSG = "⏳ The server is busy, your download has been queued.\n📋 Position in queue: {position}"
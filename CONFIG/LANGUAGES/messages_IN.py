@@ -2187,3 +2187,6 @@ class Messages(object):
     )
 
     #######################################################
+
+    # Download scheduler messages
+    DOWNLOAD_QUEUE_POSITION_MSG = "⏳ सर्वर व्यस्त है, आपका डाउनलोड कतार में जोड़ दिया गया है।\n📋 कतार में स्थिति: {position}"
@@ -1996,4 +1996,7 @@ class Messages(object):
     URL_EXTRACTOR_VID_HELP_TITLE_MSG = "🎬 ビデオダウンロードコマンド"
     URL_EXTRACTOR_VID_HELP_USAGE_MSG = "使用法: <code>/vid URL</code>"
     URL_EXTRACTOR_VID_HELP_EXAMPLES_MSG = "例:"
-    URL_EXTRACTOR_VID_HELP_EXAMPLE_1_MSG = "• <code>/vid 3-7 https://youtube.com/playlist?list=123abc</code> (直接順)\n• <code>/vid -3-7 https://youtube.com/playlist?list=123abc</code> (逆順)"
\ No newline at end of file
+    URL_EXTRACTOR_VID_HELP_EXAMPLE_1_MSG = "• <code>/vid 3-7 https://youtube.com/playlist?list=123abc</code> (直接順)\n• <code>/vid -3-7 https://youtube.com/playlist?list=123abc</code> (逆順)"
+
+    # Download scheduler messages
+    DOWNLOAD_QUEUE_POSITION_MSG = "⏳ サーバーが混雑しているため、ダウンロードはキューに追加されました。\n📋 キューの順番: {position}"
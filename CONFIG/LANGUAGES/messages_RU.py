@@ -2210,3 +2210,6 @@ class Messages(object):
     )
 
     #######################################################
+
+    # Download scheduler messages
+    DOWNLOAD_QUEUE_POSITION_MSG = "⏳ Сервер загружен, ваша загрузка поставлена в очередь.\n📋 Позиция в очереди: {position}"
@@ -1910,3 +1910,6 @@ Use:
     # Proxy helper messages
     HELPER_PROXY_CONFIG_INCOMPLETE_MSG = "Proxy configuration incomplete, using direct connection"
     HELPER_PROXY_COOKIE_PATH_MSG = "users/{user_id}/cookie.txt"
+
+    # Download scheduler messages
+    DOWNLOAD_QUEUE_POSITION_MSG = "⏳ 服务器繁忙，您的下载已加入队列。\n📋 队列位置: {position}"
@@ -113,10 +113,31 @@ class Config(object):
     COOKIE_FILE_PATH = "TXT/cookie.txt"
     # Do not chanege this
     PIC_FILE_PATH = "pic.jpg"
+    # Downloaded video thumbnails and their 320px copies, shared by all users
+    THUMBNAIL_CACHE_DIR = "thumbnail_cache"
     FIREBASE_CACHE_FILE = "dump.json"
+    # Local storage engine used when USE_FIREBASE = False:
+    # "json" - rewrite FIREBASE_CACHE_FILE on every write
+    # "journal" - append writes to FIREBASE_CACHE_FILE.journal, snapshot periodically
+    # "sqlite" - store data in LOCAL_DB_SQLITE_FILE, export FIREBASE_CACHE_FILE periodically
+    # (a config.py without this setting keeps "json")
+    LOCAL_DB_STORAGE = "journal"
+    LOCAL_DB_SQLITE_FILE = "dump.sqlite3" # seeded from FIREBASE_CACHE_FILE on first start
+    LOCAL_DB_COMPACT_INTERVAL = 60 # in seconds, how often FIREBASE_CACHE_FILE is rewritten from journal/sqlite
+    LOCAL_DB_JOURNAL_FSYNC = False # fsync every journal write (safer on power loss, slower)
     RELOAD_CACHE_EVERY = 1 # in hours
     DOWNLOAD_FIREBASE_SCRIPT_PATH = "DATABASE/download_firebase.py"
     AUTO_CACHE_RELOAD_ENABLED = True # Enable/disable automatic cache reloading
+    # Merge only changes since the last reload into the cache instead of re-downloading
+    # the whole database ("/reload_cache full" still forces a full download)
+    FIREBASE_INCREMENTAL_SYNC = True
+    # Fast startup: register command/callback handlers from CONFIG/.handler_manifest.json
+    # (written by every normal start) and import their modules on first use
+    LAZY_HANDLER_LOADING = False
+    # Print a per-module import time report at startup (like python -X importtime)
+    IMPORT_TIME_REPORT = False
+    FIREBASE_SYNC_WORKERS = 8 # parallel requests when fetching new logs per user
+    FIREBASE_SYNC_MAX_LOG_REQUESTS = 500 # users whose new logs are fetched per sync; the rest in the next syncs
     ########################################################
     # Proxy configuration
     PROXY_TYPE="http" # http, https, socks4, socks5, socks5h
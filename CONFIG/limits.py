@@ -34,10 +34,36 @@ class LimitsConfig(object):
     # For fast internet and small files: MAX_IMG_RANGE_WAIT_TIME = 600 (10 min), MAX_IMG_TOTAL_WAIT_TIME = 3600 (1 hour)
     # For slow internet and large files: MAX_IMG_RANGE_WAIT_TIME = 3600 (1 hour), MAX_IMG_TOTAL_WAIT_TIME = 28800 (8 hours)
     # For very large accounts: MAX_IMG_TOTAL_WAIT_TIME = 43200 (12 hours)
+
+    # gallery-dl runs on long-lived worker processes instead of one process per call
+    GALLERY_DL_WORKERS = 4
+    # A worker is restarted after this many runs (bounds memory growth)
+    GALLERY_DL_WORKER_MAX_JOBS = 200
+    # Seconds between directory scans where inotify is not available (finished downloads are picked up from inotify events otherwise)
+    FILE_WATCHER_POLL_INTERVAL = 0.5
+    # /img files converted/probed (ffmpeg, ffprobe) at once across all users, ahead of the album upload
+    IMG_MEDIA_WORKERS = 4
+    # /img files waiting for or on the media workers at once across all users; a /img hands over more once some are done
+    IMG_MEDIA_MAX_QUEUED = 16
+    # Disk space for cached video thumbnails; the least recently used ones are removed beyond it
+    THUMBNAIL_CACHE_MAX_MB = 200
+    # Thumbnail candidates (e.g. YouTube resolutions) fetched at once across all users
+    THUMBNAIL_FETCH_WORKERS = 8
     ENABLE_LIVE_STREAM_BLOCKING = False
     SPLIT_LIVE_STREAM_BY_HOURS = 1
     MAX_LIVE_STREAM_DURATION = 36000 # 10 hours
     #######################################################
+    # Download scheduler (video/audio/image download jobs)
+    #######################################################
+    # Maximum download jobs running at once across all users (0 = unlimited)
+    DOWNLOAD_GLOBAL_SLOTS = 12
+    # Maximum download jobs running at once against one domain (0 = unlimited)
+    DOWNLOAD_PER_DOMAIN_SLOTS = 4
+    # Parallel ffmpeg processes used to cut one oversized video into parts
+    FFMPEG_SPLIT_WORKERS = 3
+    # Split parts cut ahead of the upload (parts on disk at once while uploading)
+    SPLIT_UPLOAD_LOOKAHEAD = 2
+    #######################################################
     # Animation and HTTP connection limits (prevents hanging)
     #######################################################
     # Maximum animation duration (4 hours) - after this time animation is forcefully stopped
@@ -48,6 +74,17 @@ class LimitsConfig(object):
     
     # HTTP session timeout for individual requests
     HTTP_REQUEST_TIMEOUT = 60  # 60 seconds
+    
+    # Keep-alive connection pools of the managed HTTP sessions (HELPERS/http_manager.py)
+    HTTP_POOL_HOSTS = 10  # hosts with a pool of their own per session
+    HTTP_POOL_MAXSIZE = 10  # open connections kept per host
+    HTTP_POOL_IDLE_TIMEOUT = 60  # seconds; idle connections are closed after this
+
+    # Progress message edits (shared by all running jobs)
+    # Maximum progress edits per second across the whole bot
+    PROGRESS_EDITS_PER_SECOND = 20
+    # Minimum seconds between two progress edits of the same message
+    PROGRESS_MIN_EDIT_INTERVAL = 3
     #######################################################
     # Cookie cache configuration
     #######################################################
@@ -86,6 +123,25 @@ class LimitsConfig(object):
     COMMAND_COOLDOWN_INITIAL = 60  # 1 minute
     # Cooldown multiplier for repeated violations (exponential backoff)
     COMMAND_COOLDOWN_MULTIPLIER = 2
+    # Seconds between background writes of rate/command limiter state
+    LIMITER_FLUSH_INTERVAL = 5
+    #######################################################
+    # Outbound message pipeline (send/edit/forward/delete)
+    # Calls per second for the whole bot
+    OUTBOUND_CALLS_PER_SECOND = 25
+    # Flood waits up to this many seconds are waited out per chat and retried; longer ones fail the call
+    OUTBOUND_MAX_FLOOD_WAIT = 30
+    # Seconds a sync caller waits for its queued call before giving up
+    OUTBOUND_RESULT_TIMEOUT = 120
+    #######################################################
+    # yt-dlp extraction cache shared by the menus, subtitles, /link and downloads
+    # Seconds an extraction result is reused (also capped by the expiry of its signed media URLs; 0 disables the cache)
+    INFO_CACHE_TTL = 600
+    # Maximum number of cached extraction results
+    INFO_CACHE_MAX_ENTRIES = 128
+    #######################################################
+    # Always Ask menu: parsed ask_formats.json / formats_cache_*.json files kept in memory
+    ASK_FORMATS_CACHE_MAX_FILES = 256
     #######################################################
     # Group multipliers (applied in groups/channels) - except quality
     GROUP_MULTIPLIER = 2
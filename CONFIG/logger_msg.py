@@ -408,6 +408,7 @@ class LoggerMsg(object):
     THUMBNAIL_DOWNLOADER_UNIVERSAL_CALLED_LOG_MSG = "Universal thumbnail downloader called for URL: {url}"
     THUMBNAIL_DOWNLOADER_SERVICE_DETECTED_LOG_MSG = "Detected service: {service}, video_id: {video_id}"
     THUMBNAIL_DOWNLOADER_NO_VIDEO_ID_LOG_MSG = "Could not extract video ID from URL: {url}"
+    THUMBNAIL_DOWNLOADER_CACHE_HIT_LOG_MSG = "Using cached {service} thumbnail for video_id: {video_id}"
     THUMBNAIL_DOWNLOADER_SUCCESS_LOG_MSG = "Successfully downloaded {service} thumbnail to {dest}"
     THUMBNAIL_DOWNLOADER_SERVICE_FAILED_LOG_MSG = "Service-specific thumbnail download failed for {service}, will use fallback"
     THUMBNAIL_DOWNLOADER_ERROR_LOG_MSG = "Error in universal thumbnail downloader: {e}"
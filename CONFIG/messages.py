@@ -1,16 +1,20 @@
 # Messages Configuration
 import sys
 import os
+import threading
 
 # Add the LANGUAGES directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'LANGUAGES'))
 
 try:
-    from language_router import get_messages, get_message, set_user_language
+    # The package path, like COMMANDS/lang_cmd.py: one router (and one user language cache) per process
+    from CONFIG.LANGUAGES.language_router import get_messages, get_message, set_user_language, get_language_code
 except ImportError:
     # Fallback if language router is not available
     def get_messages(user_id=None, language_code=None):
         return {}
+    def get_language_code(user_id=None, language_code=None):
+        return language_code or 'en'
     def get_message(message_key, user_id=None, language_code=None):
         return f"[{message_key}]"
     def set_user_language(user_id, language_code):
@@ -23,7 +27,7 @@ class Messages(object):
         """
         self.user_id = user_id
         self.language_code = language_code
-        self._messages = get_messages(user_id, language_code)
+        self._messages = _get_rendered_catalog(get_language_code(user_id, language_code))
     
     def __getattr__(self, name):
         """
@@ -33,11 +37,10 @@ class Messages(object):
             return super().__getattribute__(name)
         
         # STRICT: Only use language-specific messages, NO fallback to English
-        if hasattr(self, '_messages') and self._messages and name in self._messages:
-            value = self._messages[name]
-            if isinstance(value, str):
-                return _format_message(value)
-            return value
+        messages = self.__dict__.get('_messages')
+        if messages and name in messages:
+            # Placeholders were already filled in by _get_rendered_catalog
+            return messages[name]
         
         # If message not found in selected language, return placeholder
         return f"[{name}]"
@@ -95,6 +98,44 @@ def _format_message(template: str) -> str:
     except Exception:
         return template
 
+# Catalogs with placeholders already filled in, one per language code
+_rendered_catalogs = {}
+_rendered_catalogs_lock = threading.Lock()
+
+
+def _get_rendered_catalog(language_code):
+    """
+    Return the messages of a language with _format_message applied to every string.
+    Catalogs are only kept once Config has been loaded, so placeholders
+    rendered with the startup defaults are not cached.
+    """
+    catalog = _rendered_catalogs.get(language_code)
+    if catalog is not None:
+        return catalog
+    with _rendered_catalogs_lock:
+        catalog = _rendered_catalogs.get(language_code)
+        if catalog is not None:
+            return catalog
+        raw = get_messages(None, language_code)
+        placeholders = _SafeFormatDict(_get_message_placeholders())
+        catalog = {}
+        for key, value in raw.items():
+            if isinstance(value, str):
+                try:
+                    value = value.format_map(placeholders)
+                except Exception:
+                    pass
+            catalog[key] = value
+        if catalog and getattr(sys.modules.get("CONFIG.config"), "Config", None) is not None:
+            _rendered_catalogs[language_code] = catalog
+        return catalog
+
+
+def clear_rendered_catalogs():
+    """Drop rendered catalogs (e.g. after changing the branding placeholders in Config)."""
+    with _rendered_catalogs_lock:
+        _rendered_catalogs.clear()
+
 # Global function to get Messages instance with user language
 def get_messages_instance(user_id=None, language_code=None):
     """
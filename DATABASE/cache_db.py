@@ -39,18 +39,40 @@ auto_cache_enabled = getattr(Config, 'AUTO_CACHE_RELOAD_ENABLED', True)
 auto_cache_thread = None
 reload_interval_hours = getattr(Config, 'RELOAD_CACHE_EVERY', 4)
 _thread_lock = threading.RLock()
+# Held while firebase_cache is modified in place or snapshotted, so a delta
+# sync never merges into (or saves) the tree halfway through another write
+_cache_lock = threading.RLock()
 
 ###################################################
 
+def _is_local_journal_mode() -> bool:
+    """True when the local DB adapter persists writes on its own (journal or SQLite)."""
+    return (not getattr(Config, 'USE_FIREBASE', True)
+            and getattr(Config, 'LOCAL_DB_STORAGE', 'json') in ("journal", "sqlite"))
+
+def _compact_local_db():
+    """Flush the local DB journal/SQLite state into the JSON file before it is read."""
+    if _is_local_journal_mode():
+        compact = getattr(db, 'compact', None)
+        if callable(compact):
+            try:
+                compact()
+            except Exception as e:
+                logger.error(f"Error compacting local cache: {e}")
+
 def _sync_local_cache_to_file():
     """Sync local cache to file (used when USE_FIREBASE=False)."""
     global firebase_cache
     use_firebase = getattr(Config, 'USE_FIREBASE', True)
-    if not use_firebase:
+    # In journal mode every write already went through the db adapter,
+    # rewriting the whole file here would only race with the compactor
+    if not use_firebase and not _is_local_journal_mode():
         try:
             cache_file = getattr(Config, 'FIREBASE_CACHE_FILE', 'dump.json')
+            with _cache_lock:
+                data = json.dumps(firebase_cache, ensure_ascii=False, indent=2)
             with open(cache_file, "w", encoding="utf-8") as f:
-                json.dump(firebase_cache, f, ensure_ascii=False, indent=2)
+                f.write(data)
         except Exception as e:
             logger.error(f"Error syncing local cache: {e}")
 
@@ -84,6 +106,81 @@ def log_firebase_access_attempt(path_parts, success=True):
         # Fallback to stdout if logger is not usable for any reason during early init
         print(f"Firebase local-cache access: {path_str} -> {status}")
 
+# Flat index over bot/video_cache: url_hash -> {quality_key: [message_id, ...]}
+# Built from firebase_cache on (re)load and kept current by save_to_video_cache,
+# so lookups on every incoming link skip the tree walk and the id parsing.
+_video_cache_index = {}
+_video_cache_index_lock = threading.RLock()
+# Subtrees of bot/video_cache that are not per-URL video entries
+_VIDEO_CACHE_RESERVED_KEYS = ("playlists", "images")
+
+def _parse_cached_ids(value) -> list:
+    """Parse a cached value ("1,2,3", 1 or ["1", "2"]) into a list of message ids."""
+    try:
+        if isinstance(value, list):
+            return [int(x) for x in value if x not in (None, "")]
+        if isinstance(value, int):
+            return [value]
+        if isinstance(value, str) and value:
+            return [int(x) for x in value.split(',') if x]
+    except (TypeError, ValueError):
+        pass
+    return []
+
+def _rebuild_video_cache_index():
+    """Rebuild the flat video cache index from firebase_cache."""
+    global _video_cache_index
+    index = {}
+    root = firebase_cache.get("bot", {}).get("video_cache", {}) if isinstance(firebase_cache, dict) else {}
+    if isinstance(root, dict):
+        for url_hash, qualities in root.items():
+            if url_hash in _VIDEO_CACHE_RESERVED_KEYS or not isinstance(qualities, dict):
+                continue
+            entry = {}
+            for quality_key, value in qualities.items():
+                ids = _parse_cached_ids(value)
+                if ids:
+                    entry[quality_key] = ids
+            if entry:
+                index[url_hash] = entry
+    with _video_cache_index_lock:
+        _video_cache_index = index
+    logger.info(f"Video cache index built: {len(index)} URLs")
+
+def _update_video_cache_index(url_hash: str, quality_key: str, message_ids: list = None):
+    """Set (or drop, when message_ids is empty) one entry of the video cache index."""
+    with _video_cache_index_lock:
+        if message_ids:
+            _video_cache_index.setdefault(url_hash, {})[quality_key] = [int(x) for x in message_ids]
+            return
+        entry = _video_cache_index.get(url_hash)
+        if entry is not None:
+            entry.pop(quality_key, None)
+            if not entry:
+                _video_cache_index.pop(url_hash, None)
+
+def invalidate_video_cache_index(url_hash: str):
+    """Drop every quality cached for url_hash from the video cache index."""
+    with _video_cache_index_lock:
+        _video_cache_index.pop(url_hash, None)
+
+def _reindex_video_cache_hash(url_hash: str):
+    """Re-read one url_hash from firebase_cache into the video cache index."""
+    if url_hash in _VIDEO_CACHE_RESERVED_KEYS:
+        return
+    qualities = firebase_cache.get("bot", {}).get("video_cache", {}).get(url_hash)
+    entry = {}
+    if isinstance(qualities, dict):
+        for quality_key, value in qualities.items():
+            ids = _parse_cached_ids(value)
+            if ids:
+                entry[quality_key] = ids
+    with _video_cache_index_lock:
+        if entry:
+            _video_cache_index[url_hash] = entry
+        else:
+            _video_cache_index.pop(url_hash, None)
+
 def load_firebase_cache():
     messages = safe_get_messages(None)
     """Load local Firebase cache from JSON file."""
@@ -91,6 +188,7 @@ def load_firebase_cache():
     try:
         cache_file = getattr(Config, 'FIREBASE_CACHE_FILE', 'dump.json')
         use_firebase = getattr(Config, 'USE_FIREBASE', True)
+        _compact_local_db()
         if os.path.exists(cache_file):
             with open(cache_file, "r", encoding="utf-8") as f:
                 firebase_cache = json.load(f)
@@ -111,6 +209,7 @@ def load_firebase_cache():
         else:
             print(f"⚠️ Error loading local cache: {e}")
         firebase_cache = {}
+    _rebuild_video_cache_index()
 
 def reload_firebase_cache():
     messages = safe_get_messages(None)
@@ -118,9 +217,11 @@ def reload_firebase_cache():
     global firebase_cache
     try:
         cache_file = getattr(Config, 'FIREBASE_CACHE_FILE', 'firebase_cache.json')
+        _compact_local_db()
         if os.path.exists(cache_file):
             with open(cache_file, "r", encoding="utf-8") as f:
                 firebase_cache = json.load(f)
+            _rebuild_video_cache_index()
             print(safe_get_messages().DB_FIREBASE_CACHE_RELOADED_MSG.format(count=len(firebase_cache)))
             return True
         else:
@@ -131,6 +232,32 @@ def reload_firebase_cache():
         return False
 
 
+def sync_firebase_cache() -> bool:
+    """Merge Firebase changes since the last sync into firebase_cache in place.
+
+    Falls back to nothing (returns False) when there is no cache to merge into
+    or the delta sync fails; callers then do a full download.
+    """
+    from DATABASE.download_firebase import sync_firebase_delta, save_dump
+    if not isinstance(firebase_cache, dict) or not firebase_cache.get("bot"):
+        return False
+    # _thread_lock only keeps syncs apart; writers wait on _cache_lock for the merge, not the network
+    with _thread_lock:
+        delta = sync_firebase_delta(firebase_cache, lock=_cache_lock)
+        if delta is None:
+            return False
+        with _cache_lock:
+            for url_hash in delta["removed_hashes"]:
+                invalidate_video_cache_index(url_hash)
+            for url_hash in delta["changed_hashes"]:
+                _reindex_video_cache_hash(url_hash)
+            snapshot = json.dumps(firebase_cache, ensure_ascii=False)
+        try:
+            save_dump(snapshot, getattr(Config, 'FIREBASE_CACHE_FILE', 'dump.json'), backfill=delta["backfill"])
+        except Exception as e:
+            logger.error(f"Failed to save synced Firebase cache: {e}")
+    return True
+
 def get_next_reload_time(interval_hours: int) -> datetime:
     """
     Returns Datetime the following reloading point,
@@ -460,8 +587,7 @@ def save_to_playlist_cache(playlist_url: str, quality_key: str, video_indices: l
                            clear: bool = False, original_text: str = None, video_urls_dict: dict = None):
     global firebase_cache
     # Lazy imports to avoid circular imports
-    from URL_PARSERS.normalizer import normalize_url_for_cache, strip_range_from_url
-    from URL_PARSERS.youtube import is_youtube_url, youtube_to_short_url, youtube_to_long_url
+    from URL_PARSERS.normalizer import get_cache_url_variants
     logger.info(
         f"save_to_playlist_cache called: playlist_url={playlist_url}, quality_key={quality_key}, video_indices={video_indices}, message_ids={message_ids}, clear={clear}")
     
@@ -475,12 +601,7 @@ def save_to_playlist_cache(playlist_url: str, quality_key: str, video_indices: l
 
     try:
         # Normalize the URL (without the range) and form all link options
-        urls = [normalize_url_for_cache(strip_range_from_url(playlist_url))]
-        if is_youtube_url(playlist_url):
-            urls.extend([
-                normalize_url_for_cache(strip_range_from_url(youtube_to_short_url(playlist_url))),
-                normalize_url_for_cache(strip_range_from_url(youtube_to_long_url(playlist_url))),
-            ])
+        urls = list(get_cache_url_variants(playlist_url, strip_range=True))
         logger.info(LoggerMsg.DB_NORMALIZED_PLAYLIST_URLS_LOG_MSG.format(urls=urls))
 
         for u in set(urls):
@@ -494,16 +615,17 @@ def save_to_playlist_cache(playlist_url: str, quality_key: str, video_indices: l
                 use_firebase = getattr(Config, 'USE_FIREBASE', True)
                 if not use_firebase:
                     path_parts_clear = ["bot", "video_cache", "playlists", url_hash, quality_key]
-                    current = firebase_cache
-                    for i, part in enumerate(path_parts_clear[:-1]):
-                        if part in current and isinstance(current[part], dict):
-                            current = current[part]
+                    with _cache_lock:
+                        current = firebase_cache
+                        for i, part in enumerate(path_parts_clear[:-1]):
+                            if part in current and isinstance(current[part], dict):
+                                current = current[part]
+                            else:
+                                break
                         else:
-                            break
-                    else:
-                        if path_parts_clear[-1] in current:
-                            del current[path_parts_clear[-1]]
-                            _sync_local_cache_to_file()
+                            if path_parts_clear[-1] in current:
+                                del current[path_parts_clear[-1]]
+                                _sync_local_cache_to_file()
                 continue
 
             if not message_ids or not video_indices:
@@ -525,12 +647,13 @@ def save_to_playlist_cache(playlist_url: str, quality_key: str, video_indices: l
                 logger.info(f"Saved to playlist cache: path={path_parts}, msg_id={msg_id}")
                 
                 # Update local cache for immediate access (both Firebase and local mode)
-                current = firebase_cache
-                for part in path_parts_local:
-                    if part not in current:
-                        current[part] = {}
-                    current = current[part]
-                current[encoded_index] = str(msg_id)
+                with _cache_lock:
+                    current = firebase_cache
+                    for part in path_parts_local:
+                        if part not in current:
+                            current[part] = {}
+                        current = current[part]
+                    current[encoded_index] = str(msg_id)
                 logger.info(f"✅ [CACHE] Local cache updated: path={path_parts_local}, msg_id={msg_id}")
 
         logger.info(f"✅ Saved to playlist cache for hash={url_hash}, quality={quality_key}, indices={video_indices}, message_ids={message_ids}")
@@ -566,18 +689,14 @@ def save_to_playlist_cache(playlist_url: str, quality_key: str, video_indices: l
 
 def get_cached_playlist_videos(playlist_url: str, quality_key: str, requested_indices: list) -> dict:
     messages = safe_get_messages(None)
-    from URL_PARSERS.normalizer import normalize_url_for_cache, strip_range_from_url
-    from URL_PARSERS.youtube import is_youtube_url, youtube_to_short_url, youtube_to_long_url
+    from URL_PARSERS.normalizer import get_cache_url_variants
     logger.info(
         f"get_cached_playlist_videos called: playlist_url={playlist_url}, quality_key={quality_key}, requested_indices={requested_indices}")
     if not quality_key:
         logger.warning(f"get_cached_playlist_videos: quality_key is empty for playlist: {playlist_url}")
         return {}
     try:
-        urls = [normalize_url_for_cache(strip_range_from_url(playlist_url))]
-        if is_youtube_url(playlist_url):
-            urls.append(normalize_url_for_cache(strip_range_from_url(youtube_to_short_url(playlist_url))))
-            urls.append(normalize_url_for_cache(strip_range_from_url(youtube_to_long_url(playlist_url))))
+        urls = list(get_cache_url_variants(playlist_url, strip_range=True))
         quality_keys = [quality_key]
         try:
             if quality_key.endswith('p'):
@@ -639,16 +758,10 @@ def get_cached_playlist_videos(playlist_url: str, quality_key: str, requested_in
 
 def get_cached_playlist_qualities(playlist_url: str) -> set:
     """Gets all available qualities for a cached playlist."""
-    from URL_PARSERS.normalizer import normalize_url_for_cache, strip_range_from_url
-    from URL_PARSERS.youtube import is_youtube_url, youtube_to_short_url, youtube_to_long_url
+    from URL_PARSERS.normalizer import get_cache_url_variants
     try:
         # Normalize the URL (without range) and build all URL variants (same as during save)
-        urls = [normalize_url_for_cache(strip_range_from_url(playlist_url))]
-        if is_youtube_url(playlist_url):
-            urls.extend([
-                normalize_url_for_cache(strip_range_from_url(youtube_to_short_url(playlist_url))),
-                normalize_url_for_cache(strip_range_from_url(youtube_to_long_url(playlist_url))),
-            ])
+        urls = list(get_cache_url_variants(playlist_url, strip_range=True))
         
         # Check all URL variants and collect all qualities
         all_qualities = set()
@@ -675,13 +788,14 @@ def get_cached_playlist_qualities(playlist_url: str) -> set:
                             all_qualities.update(qualities)
                             logger.info(f"get_cached_playlist_qualities: found qualities {qualities} for hash {url_hash} (Firebase)")
                             # Update local cache for future access
-                            if "bot" not in firebase_cache:
-                                firebase_cache["bot"] = {}
-                            if "video_cache" not in firebase_cache["bot"]:
-                                firebase_cache["bot"]["video_cache"] = {}
-                            if "playlists" not in firebase_cache["bot"]["video_cache"]:
-                                firebase_cache["bot"]["video_cache"]["playlists"] = {}
-                            firebase_cache["bot"]["video_cache"]["playlists"][url_hash] = firebase_data.val()
+                            with _cache_lock:
+                                if "bot" not in firebase_cache:
+                                    firebase_cache["bot"] = {}
+                                if "video_cache" not in firebase_cache["bot"]:
+                                    firebase_cache["bot"]["video_cache"] = {}
+                                if "playlists" not in firebase_cache["bot"]["video_cache"]:
+                                    firebase_cache["bot"]["video_cache"]["playlists"] = {}
+                                firebase_cache["bot"]["video_cache"]["playlists"][url_hash] = firebase_data.val()
                     except Exception as e:
                         logger.warning(f"get_cached_playlist_qualities: error checking Firebase for hash {url_hash}: {e}")
         
@@ -707,14 +821,8 @@ def get_cached_qualities(url: str) -> set:
     from URL_PARSERS.normalizer import normalize_url_for_cache
     try:
         url_hash = get_url_hash(normalize_url_for_cache(url))
-        
-        # We use local cache instead of Firebase
-        path_parts = ["bot", "video_cache", url_hash]
-        data = get_from_local_cache(path_parts)
-        
-        if data and isinstance(data, dict):
-            return set(data.keys())
-        return set()
+        entry = _video_cache_index.get(url_hash)
+        return set(entry.keys()) if entry else set()
     except Exception as e:
         logger.error(f"Failed to get cached qualities: {e}")
         return set()
@@ -728,13 +836,9 @@ def get_cached_playlist_count(playlist_url: str, quality_key: str, indices: list
     For large ranges (>100), it uses a fast count.
     """
     messages = safe_get_messages(None)
-    from URL_PARSERS.normalizer import normalize_url_for_cache, strip_range_from_url
-    from URL_PARSERS.youtube import is_youtube_url, youtube_to_short_url, youtube_to_long_url
+    from URL_PARSERS.normalizer import get_cache_url_variants
     try:
-        urls = [normalize_url_for_cache(strip_range_from_url(playlist_url))]
-        if is_youtube_url(playlist_url):
-            urls.append(normalize_url_for_cache(strip_range_from_url(youtube_to_short_url(playlist_url))))
-            urls.append(normalize_url_for_cache(strip_range_from_url(youtube_to_long_url(playlist_url))))
+        urls = list(get_cache_url_variants(playlist_url, strip_range=True))
         quality_keys = [quality_key]
         try:
             if quality_key.endswith('p'):
@@ -829,8 +933,8 @@ def get_url_hash(url: str) -> str:
     """Returns a hash of the URL for use as a cache key."""
     import hashlib
     hash_result = hashlib.md5(url.encode()).hexdigest()
-    logger.info(f"get_url_hash: '{url}' -> '{hash_result}'")
-    return hashlib.md5(url.encode()).hexdigest()
+    logger.debug(f"get_url_hash: '{url}' -> '{hash_result}'")
+    return hash_result
 
 def _split_path_to_parts(path: str) -> list:
     try:
@@ -883,13 +987,14 @@ def save_to_image_cache(url: str, post_index: int, message_ids: list):
             # Update local cache for immediate access
             use_firebase = getattr(Config, 'USE_FIREBASE', True)
             if not use_firebase:
-                current = firebase_cache
-                for part in local_path_parts[:-1]:  # Everything except the last part (post_index)
-                    if part not in current:
-                        current[part] = {}
-                    current = current[part]
-                current[local_path_parts[-1]] = ids_string
-                _sync_local_cache_to_file()
+                with _cache_lock:
+                    current = firebase_cache
+                    for part in local_path_parts[:-1]:  # Everything except the last part (post_index)
+                        if part not in current:
+                            current[part] = {}
+                        current = current[part]
+                    current[local_path_parts[-1]] = ids_string
+                    _sync_local_cache_to_file()
             
             # Optional verification
             try:
@@ -1015,8 +1120,7 @@ def get_cached_image_post_indices(url: str) -> set:
 def save_to_video_cache(url: str, quality_key: str, message_ids: list, clear: bool = False, original_text: str = None, user_id: int = None):
     """Saves message IDs to Firebase video cache after checking local cache to avoid duplication."""
     global firebase_cache
-    from URL_PARSERS.normalizer import normalize_url_for_cache
-    from URL_PARSERS.youtube import is_youtube_url, youtube_to_short_url, youtube_to_long_url
+    from URL_PARSERS.normalizer import get_cache_url_variants
     from URL_PARSERS.playlist_utils import is_playlist_with_range
     found_type = None
     if user_id is not None:
@@ -1048,12 +1152,7 @@ def save_to_video_cache(url: str, quality_key: str, message_ids: list, clear: bo
         return
 
     try:
-        urls = [normalize_url_for_cache(url)]
-        if is_youtube_url(url):
-            urls += [
-                normalize_url_for_cache(youtube_to_short_url(url)),
-                normalize_url_for_cache(youtube_to_long_url(url))
-            ]
+        urls = list(get_cache_url_variants(url))
         
         logger.info(f"save_to_video_cache: normalized URLs: {urls}")
 
@@ -1066,19 +1165,21 @@ def save_to_video_cache(url: str, quality_key: str, message_ids: list, clear: bo
             if clear:
                 logger.info(f"Clearing cache for URL hash {url_hash}, quality {quality_key}")
                 db.child(*path_parts).child(quality_key).remove()
+                _update_video_cache_index(url_hash, quality_key, None)
                 # Update local cache
                 use_firebase = getattr(Config, 'USE_FIREBASE', True)
                 if not use_firebase:
-                    current = firebase_cache
-                    for part in ["bot", "video_cache", url_hash]:
-                        if part in current and isinstance(current[part], dict):
-                            current = current[part]
+                    with _cache_lock:
+                        current = firebase_cache
+                        for part in ["bot", "video_cache", url_hash]:
+                            if part in current and isinstance(current[part], dict):
+                                current = current[part]
+                            else:
+                                break
                         else:
-                            break
-                    else:
-                        if quality_key in current:
-                            del current[quality_key]
-                            _sync_local_cache_to_file()
+                            if quality_key in current:
+                                del current[quality_key]
+                                _sync_local_cache_to_file()
                 continue
 
             if not message_ids:
@@ -1087,8 +1188,7 @@ def save_to_video_cache(url: str, quality_key: str, message_ids: list, clear: bo
 
             # === LOCAL CACHE CHECK ===
             # Note: We now allow overwriting existing cache to ensure consistency
-            existing = get_from_local_cache(path_parts_local + [quality_key])
-            if existing is not None:
+            if quality_key in _video_cache_index.get(url_hash, {}):
                 logger.info(f"Cache already exists for URL hash {url_hash}, quality {quality_key}, but will update with new message_ids.")
 
             cache_ref = db.child(*path_parts)
@@ -1099,12 +1199,13 @@ def save_to_video_cache(url: str, quality_key: str, message_ids: list, clear: bo
                 # Update local cache
                 use_firebase = getattr(Config, 'USE_FIREBASE', True)
                 if not use_firebase:
-                    current = firebase_cache
-                    for part in ["bot", "video_cache", url_hash]:
-                        if part not in current:
-                            current[part] = {}
-                        current = current[part]
-                    current[quality_key] = str(message_ids[0])
+                    with _cache_lock:
+                        current = firebase_cache
+                        for part in ["bot", "video_cache", url_hash]:
+                            if part not in current:
+                                current[part] = {}
+                            current = current[part]
+                        current[quality_key] = str(message_ids[0])
             else:
                 ids_string = ",".join(map(str, message_ids))
                 cache_ref.child(quality_key).set(ids_string)
@@ -1112,12 +1213,14 @@ def save_to_video_cache(url: str, quality_key: str, message_ids: list, clear: bo
                 # Update local cache
                 use_firebase = getattr(Config, 'USE_FIREBASE', True)
                 if not use_firebase:
-                    current = firebase_cache
-                    for part in ["bot", "video_cache", url_hash]:
-                        if part not in current:
-                            current[part] = {}
-                        current = current[part]
-                    current[quality_key] = ids_string
+                    with _cache_lock:
+                        current = firebase_cache
+                        for part in ["bot", "video_cache", url_hash]:
+                            if part not in current:
+                                current[part] = {}
+                            current = current[part]
+                        current[quality_key] = ids_string
+            _update_video_cache_index(url_hash, quality_key, message_ids)
             
             # Sync local cache to file when USE_FIREBASE=False
             use_firebase = getattr(Config, 'USE_FIREBASE', True)
@@ -1130,39 +1233,18 @@ def save_to_video_cache(url: str, quality_key: str, message_ids: list, clear: bo
 
 def get_cached_message_ids(url: str, quality_key: str) -> list:
     """Searches cache for both versions of YouTube link (long/short)."""
-    messages = safe_get_messages(None)
-    from URL_PARSERS.normalizer import normalize_url_for_cache
-    from URL_PARSERS.youtube import is_youtube_url, youtube_to_short_url, youtube_to_long_url
-    logger.info(f"get_cached_message_ids called: url={url}, quality_key={quality_key}")
+    from URL_PARSERS.normalizer import get_cache_url_variants
     if not quality_key:
         logger.warning(f"get_cached_message_ids: quality_key is empty for URL: {url}")
         return None
     try:
-        urls = [normalize_url_for_cache(url)]
-        if is_youtube_url(url):
-            short_url = youtube_to_short_url(url)
-            long_url = youtube_to_long_url(url)
-            urls.append(normalize_url_for_cache(short_url))
-            urls.append(normalize_url_for_cache(long_url))
-            logger.info(f"get_cached_message_ids: original={url}, short={short_url}, long={long_url}")
-        logger.info(f"get_cached_message_ids: checking URLs: {urls}")
-        for u in set(urls):
-            url_hash = get_url_hash(u)
-            logger.info(f"get_cached_message_ids: checking hash {url_hash} for quality {quality_key}")
-            
-            # We use local cache instead of Firebase
-            path_parts = ["bot", "video_cache", url_hash, quality_key]
-            ids_string = get_from_local_cache(path_parts)
-            
-            logger.info(f"get_cached_message_ids: raw value from local cache: {ids_string} (type: {type(ids_string)})")
-            if ids_string:
-                result = [int(msg_id) for msg_id in ids_string.split(',')]
-                logger.info(
-                    f"get_cached_message_ids: found cached message_ids {result} for URL: {url}, quality: {quality_key}")
-                return result
-            else:
-                logger.info(safe_get_messages().DB_GET_CACHED_MESSAGE_IDS_NO_CACHE_MSG.format(url_hash=url_hash, quality_key=quality_key))
-        logger.info(safe_get_messages().DB_GET_CACHED_MESSAGE_IDS_NO_CACHE_ANY_VARIANT_MSG)
+        urls = list(get_cache_url_variants(url))
+        for u in dict.fromkeys(urls):
+            ids = _video_cache_index.get(get_url_hash(u), {}).get(quality_key)
+            if ids:
+                logger.info(f"get_cached_message_ids: found cached message_ids {ids} for URL: {url}, quality: {quality_key}")
+                return list(ids)
+        logger.debug(f"get_cached_message_ids: no cache for URL: {url}, quality: {quality_key}")
         return None
     except Exception as e:
         logger.error(f"Failed to get from cache: {e}")
@@ -7,6 +7,7 @@ Run this script once a day to update the local cache
 import json
 import os
 import sys
+import threading
 from datetime import datetime
 
 # Add parent directory to path for imports BEFORE importing modules
@@ -88,14 +89,7 @@ def download_firebase_dump():
             print(safe_get_messages().DB_API_KEY_NOT_SET_MSG)
             return False
 
-        auth_url = f"https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key={key}"
-        resp = session.post(auth_url, json={
-            "email": FIREBASE_USER,
-            "password": FIREBASE_PASSWORD,
-            "returnSecureToken": True,
-        }, timeout=60)
-        resp.raise_for_status()
-        id_token = resp.json()["idToken"]
+        id_token = _sign_in(session)
         print("✅ Authentication successful")
 
         # Downloading data
@@ -147,6 +141,221 @@ def download_firebase_dump():
         # Always close the managed session
         session_manager.close()
 
+def _sign_in(session) -> str:
+    """Sign in with FIREBASE_USER/FIREBASE_PASSWORD and return an ID token."""
+    key = FIREBASE_CONFIG.get("apiKey")
+    auth_url = f"https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key={key}"
+    resp = session.post(auth_url, json={
+        "email": FIREBASE_USER,
+        "password": FIREBASE_PASSWORD,
+        "returnSecureToken": True,
+    }, timeout=60)
+    resp.raise_for_status()
+    return resp.json()["idToken"]
+
+
+def _rest_get(session, database_url: str, id_token: str, path: str, **params):
+    """GET one node of the Realtime Database (extra params are passed as query args)."""
+    params["auth"] = id_token
+    url = f"{database_url.rstrip('/')}/{path.strip('/')}.json"
+    resp = session.get(url, params=params, timeout=120)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _merge_subtree(local: dict, key: str, remote) -> bool:
+    """Replace local[key] with remote unless equal. Returns True if changed."""
+    if remote is None:
+        return local.pop(key, None) is not None
+    if local.get(key) == remote:
+        return False
+    local[key] = remote
+    return True
+
+
+def sync_firebase_delta(cache: dict, lock=None):
+    """Merge changes made in Firebase since the last sync into cache in place.
+
+    Instead of downloading the whole database:
+      - ``bot`` and ``bot/<name>/logs`` are listed with shallow queries;
+      - new log entries are fetched per user with ``orderBy="$key"`` and
+        ``startAt`` set to the newest timestamp already cached (log keys are
+        unix timestamps, so key order is time order), for at most
+        FIREBASE_SYNC_MAX_LOG_REQUESTS users per sync; the next sync goes on
+        with the users after them;
+      - every other subtree (users, blocked lists, video_cache, ...) is small
+        and fetched whole, then merged key by key.
+
+    Everything is fetched first, reading the cache only under ``lock``; the
+    merge then runs in one go while holding ``lock``, so other threads using
+    the same lock never see (or write into) a half-merged cache.
+
+    Returns a dict with the sets of ``video_cache`` hashes that changed or were
+    removed (so callers can invalidate them individually) and ``backfill``,
+    True when the logs were fetched for only part of the users (this sync or
+    the previous one), so the merged entries can be older than ones already
+    cached; or None if the sync failed and a full download is needed.
+    """
+    if requests is None or Session is None:
+        print(safe_get_messages().DB_DEPENDENCY_NOT_AVAILABLE_MSG)
+        return None
+    database_url = FIREBASE_CONFIG.get("databaseURL")
+    if not database_url or not FIREBASE_CONFIG.get("apiKey"):
+        return None
+
+    from concurrent.futures import ThreadPoolExecutor
+    from HELPERS.http_manager import get_managed_session
+    lock = lock if lock is not None else threading.RLock()
+    session_manager = get_managed_session("firebase-sync")
+    session = session_manager.get_session()
+    workers = max(1, int(getattr(Config, 'FIREBASE_SYNC_WORKERS', 8)))
+    max_log_requests = max(1, int(getattr(Config, 'FIREBASE_SYNC_MAX_LOG_REQUESTS', 500)))
+    try:
+        id_token = _sign_in(session)
+        get = lambda path, **params: _rest_get(session, database_url, id_token, path, **params)
+
+        # 1) Fetch (no cache writes)
+        remote_bot_keys = get("bot", shallow="true") or {}
+        remote_vc = None
+        nodes = {}  # name -> whole value (not a dict locally) or (remote keys, {key: value}, logs)
+        backfill = False
+        for name in remote_bot_keys:
+            if name == "video_cache":
+                remote_vc = get("bot/video_cache") or {}
+                continue
+            with lock:
+                local_node = cache.get("bot", {}).get(name, {})
+                is_dict = isinstance(local_node, dict)
+                local_logs = local_node.get("logs") if is_dict else None
+                # Newest cached log key of every user (None: fetch all of the user's logs)
+                last_keys = {
+                    uid: (max(entries.keys()) if isinstance(entries, dict) and entries else None)
+                    for uid, entries in list(local_logs.items())
+                } if isinstance(local_logs, dict) else {}
+            if not is_dict:
+                nodes[name] = get(f"bot/{name}")
+                continue
+            remote_keys = get(f"bot/{name}", shallow="true") or {}
+            values = {key: get(f"bot/{name}/{key}") for key in remote_keys if key != "logs"}
+            logs = None
+            if "logs" in remote_keys:
+                remote_uids = get(f"bot/{name}/logs", shallow="true") or {}
+                # Users left out by the previous sync get their older entries now
+                backfill = backfill or name in _log_sync_cursor
+                batch = _next_log_batch(name, sorted(remote_uids.keys()), max_log_requests)
+                backfill = backfill or len(batch) < len(remote_uids)
+
+                def fetch_user_logs(uid, _name=name):
+                    last_key = last_keys.get(uid)
+                    if last_key is None:
+                        return uid, get(f"bot/{_name}/logs/{uid}")
+                    return uid, get(f"bot/{_name}/logs/{uid}",
+                                    orderBy=json.dumps("$key"), startAt=json.dumps(last_key))
+
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    fetched = dict(pool.map(fetch_user_logs, batch))
+                logs = (remote_uids, fetched)
+            nodes[name] = (remote_keys, values, logs)
+
+        # 2) Merge
+        with lock:
+            delta = _merge_delta(cache, remote_bot_keys, remote_vc, nodes)
+        delta["backfill"] = backfill
+        print(f"✅ Firebase delta sync: {delta['new_logs']} new log entries, "
+              f"{len(delta['changed_hashes'])} video cache entries changed, {len(delta['removed_hashes'])} removed")
+        return delta
+    except Exception as e:
+        print(safe_get_messages().DB_ERROR_DOWNLOADING_DUMP_MSG.format(error=e))
+        return None
+    finally:
+        session_manager.close()
+
+
+# bot name -> last user whose logs were fetched; each sync goes on after it
+_log_sync_cursor = {}
+
+
+def _next_log_batch(name: str, uids: list, limit: int) -> list:
+    """Up to `limit` of the sorted `uids`, starting after the ones the previous sync fetched."""
+    if len(uids) <= limit:
+        _log_sync_cursor.pop(name, None)
+        return uids
+    cursor = _log_sync_cursor.get(name)
+    start = next((i for i, uid in enumerate(uids) if cursor is not None and uid > cursor), 0)
+    batch = (uids[start:] + uids[:start])[:limit]
+    _log_sync_cursor[name] = batch[-1]
+    return batch
+
+
+def _merge_delta(cache: dict, remote_bot_keys: dict, remote_vc, nodes: dict) -> dict:
+    """Apply what sync_firebase_delta fetched to cache (caller holds the cache lock)."""
+    changed_hashes, removed_hashes = set(), set()
+    new_logs = 0
+    local_bot = cache.setdefault("bot", {})
+    for name in list(local_bot.keys()):
+        if name not in remote_bot_keys:
+            del local_bot[name]
+
+    if remote_vc is not None:
+        local_vc = local_bot.setdefault("video_cache", {})
+        for url_hash in list(local_vc.keys()):
+            if url_hash not in remote_vc:
+                del local_vc[url_hash]
+                removed_hashes.add(url_hash)
+        for url_hash, value in remote_vc.items():
+            if _merge_subtree(local_vc, url_hash, value):
+                changed_hashes.add(url_hash)
+
+    for name, node in nodes.items():
+        if not isinstance(node, tuple):
+            local_bot[name] = node
+            continue
+        remote_keys, values, logs = node
+        local_node = local_bot.setdefault(name, {})
+        if not isinstance(local_node, dict):
+            local_node = local_bot[name] = {}
+        for key in list(local_node.keys()):
+            if key not in remote_keys:
+                del local_node[key]
+        for key, value in values.items():
+            _merge_subtree(local_node, key, value)
+        if logs is None:
+            continue
+        remote_uids, fetched = logs
+        local_logs = local_node.setdefault("logs", {})
+        for uid in list(local_logs.keys()):
+            if uid not in remote_uids:
+                del local_logs[uid]
+        for uid, entries in fetched.items():
+            if not isinstance(entries, dict):
+                continue
+            user_logs = local_logs.setdefault(uid, {})
+            for ts, entry in entries.items():
+                if ts not in user_logs:
+                    new_logs += 1
+                user_logs[ts] = entry
+    return {"changed_hashes": changed_hashes, "removed_hashes": removed_hashes, "new_logs": new_logs}
+
+
+def save_dump(data, output_file: str = None, backfill: bool = False) -> None:
+    """Atomically write an in-memory dump (a dict, or its JSON text) to the cache file.
+
+    ``backfill`` (see sync_firebase_delta) also marks the file for readers
+    that reload it incrementally.
+    """
+    output_file = output_file or OUTPUT_FILE
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        if isinstance(data, str):
+            f.write(data)
+        else:
+            json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_file, output_file)
+    if backfill:
+        from services.dump_reader import mark_dump_backfilled
+        mark_dump_backfilled(output_file)
+
+
 def main():
     messages = safe_get_messages(None)
     print("🚀 Firebase Database Dumper (config-driven)")
@@ -3,6 +3,7 @@ import time
 import threading
 import os
 import json
+import sqlite3
 from typing import Any, Dict, List, Optional
 
 import requests
@@ -438,13 +439,564 @@ class LocalDBAdapter:
         pass
 
 
+class _LocalJournalStore:
+    """In-memory tree backed by a JSON snapshot plus an append-only journal.
+
+    Every mutation is appended as one JSON line to ``<cache_file>.journal``
+    and applied to the in-memory tree, so writes cost O(size of the change)
+    instead of a full rewrite of the dump. A background compactor periodically
+    writes the tree to ``cache_file`` atomically (tmp file + os.replace) and
+    truncates the journal. On startup the snapshot is loaded and the journal
+    replayed on top of it; all journal operations are idempotent, so replaying
+    entries that already made it into the snapshot is harmless.
+    """
+
+    def __init__(self, cache_file: str, compact_interval: float = 60, fsync: bool = False):
+        self._cache_file = cache_file
+        self._journal_file = f"{cache_file}.journal"
+        # Journal rotated out by an in-progress (or interrupted) compaction
+        self._rotated_file = f"{cache_file}.journal.1"
+        self._compact_interval = max(1.0, float(compact_interval))
+        self._fsync = bool(fsync)
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._tree: Dict[str, Any] = {}
+        self._load()
+        self._journal = open(self._journal_file, 'a', encoding='utf-8')
+        if self._dirty:
+            # Fold replayed entries into the snapshot right away so readers of
+            # the dump file (cache_db, dashboard) see a consistent state
+            self.compact()
+        self._thread = threading.Thread(target=self._compactor, name="local-db-compactor", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Loading / replay
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        if os.path.exists(self._cache_file):
+            try:
+                with open(self._cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._tree = data if isinstance(data, dict) else {}
+            except Exception as e:
+                logger.error(f"Error loading local cache snapshot: {e}")
+                self._tree = {}
+        else:
+            with open(self._cache_file, 'w', encoding='utf-8') as f:
+                json.dump({}, f, ensure_ascii=False, indent=2)
+        replayed = 0
+        for journal_file in (self._rotated_file, self._journal_file):
+            replayed += self._replay(journal_file)
+        if replayed:
+            logger.info(f"✅ Local journal replayed ({replayed} entries)")
+            self._dirty = True
+
+    def _replay(self, journal_file: str) -> int:
+        if not os.path.exists(journal_file):
+            return 0
+        count = 0
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    self._apply(entry["op"], entry["path"], entry.get("data"))
+                    count += 1
+                except Exception as e:
+                    # A torn last line after a crash is expected; skip it, and compact
+                    # right away so new entries are not appended to the torn line
+                    logger.warning(f"Skipping invalid journal entry {journal_file}:{line_no}: {e}")
+                    self._dirty = True
+        return count
+
+    # ------------------------------------------------------------------
+    # Tree operations
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _parts(path: str) -> List[str]:
+        return [p for p in path.strip("/").split("/") if p]
+
+    def _apply(self, op: str, path: str, data: Any) -> None:
+        parts = self._parts(path)
+        if op == "remove":
+            if not parts:
+                self._tree.clear()
+                return
+            current = self._tree
+            for part in parts[:-1]:
+                current = current.get(part) if isinstance(current, dict) else None
+                if current is None:
+                    return
+            if isinstance(current, dict):
+                current.pop(parts[-1], None)
+            return
+        if op == "update" and isinstance(data, dict):
+            target = self._lookup(parts)
+            if isinstance(target, dict):
+                target.update(data)
+                return
+        # "set", and "update" of a non-dict node, replace the value
+        if not parts:
+            if not isinstance(data, dict):
+                raise ValueError("Root path value must be a dict")
+            self._tree.update(data)
+            return
+        current = self._tree
+        for part in parts[:-1]:
+            if not isinstance(current.get(part), dict):
+                current[part] = {}
+            current = current[part]
+        current[parts[-1]] = data
+
+    def _lookup(self, parts: List[str]) -> Any:
+        current: Any = self._tree
+        for part in parts:
+            if isinstance(current, dict) and part in current:
+                current = current[part]
+            else:
+                return None
+        return current
+
+    def _append(self, op: str, path: str, data: Any) -> None:
+        line = json.dumps({"op": op, "path": path, "data": data}, ensure_ascii=False, separators=(",", ":"))
+        self._journal.write(line + "\n")
+        self._journal.flush()
+        if self._fsync:
+            os.fsync(self._journal.fileno())
+
+    def mutate(self, op: str, path: str, data: Any = None) -> None:
+        # Serialize through JSON first so the in-memory tree never holds
+        # references to caller-owned objects and matches what replay produces
+        data = json.loads(json.dumps(data, ensure_ascii=False)) if data is not None else None
+        with self._lock:
+            self._apply(op, path, data)
+            self._append(op, path, data)
+            self._dirty = True
+
+    def read(self, path: str) -> Any:
+        with self._lock:
+            value = self._lookup(self._parts(path))
+            # Hand out a copy, like every other adapter returns fresh data
+            return json.loads(json.dumps(value, ensure_ascii=False)) if isinstance(value, (dict, list)) else value
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def compact(self) -> bool:
+        """Write an atomic snapshot of the tree and drop the compacted journal."""
+        with self._compact_lock:
+            with self._lock:
+                if not self._dirty and not os.path.exists(self._rotated_file):
+                    return False
+                # No indent: json only uses its C encoder without one, and this runs under _lock
+                snapshot = json.dumps(self._tree, ensure_ascii=False, separators=(",", ":"))
+                self._journal.close()
+                if os.path.exists(self._rotated_file):
+                    # A previous compaction did not finish: keep its entries
+                    with open(self._journal_file, 'r', encoding='utf-8') as src, \
+                            open(self._rotated_file, 'a', encoding='utf-8') as dst:
+                        dst.write(src.read())
+                    os.remove(self._journal_file)
+                else:
+                    os.replace(self._journal_file, self._rotated_file)
+                self._journal = open(self._journal_file, 'a', encoding='utf-8')
+                self._dirty = False
+            tmp_file = f"{self._cache_file}.tmp"
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    f.write(snapshot)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self._cache_file)
+                os.remove(self._rotated_file)
+            except Exception as e:
+                logger.error(f"Error compacting local cache: {e}")
+                return False
+            return True
+
+    def _compactor(self) -> None:
+        while not self._stop.wait(self._compact_interval):
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Error in local cache compactor: {e}")
+
+    def close(self) -> None:
+        self._stop.set()
+        try:
+            self.compact()
+        finally:
+            with self._lock:
+                try:
+                    self._journal.close()
+                except Exception:
+                    pass
+
+
+_journal_stores: Dict[str, _LocalJournalStore] = {}
+_journal_stores_lock = threading.Lock()
+
+
+def _get_journal_store(cache_file: str) -> _LocalJournalStore:
+    """Return the process-wide journal store for a cache file."""
+    key = os.path.abspath(cache_file)
+    with _journal_stores_lock:
+        store = _journal_stores.get(key)
+        if store is None:
+            store = _LocalJournalStore(
+                cache_file,
+                compact_interval=getattr(Config, 'LOCAL_DB_COMPACT_INTERVAL', 60),
+                fsync=getattr(Config, 'LOCAL_DB_JOURNAL_FSYNC', False),
+            )
+            _journal_stores[key] = store
+        return store
+
+
+class JournaledLocalDBAdapter(LocalDBAdapter):
+    """Local adapter that appends mutations to a journal instead of rewriting the JSON file.
+
+    Reads are served from a shared in-memory tree; the JSON file is refreshed
+    by a background compactor (see ``_LocalJournalStore``).
+    """
+
+    def __init__(self, cache_file: str, path: str = "/", _store: Optional[_LocalJournalStore] = None):
+        self._cache_file = cache_file
+        self._path = path if path.startswith("/") else f"/{path}"
+        self._store = _store or _get_journal_store(cache_file)
+
+    def child(self, *path_parts: str) -> "JournaledLocalDBAdapter":
+        """Create a child adapter with an extended path."""
+        path = self._path.rstrip("/")
+        for part in path_parts:
+            part = str(part).strip("/")
+            if not part:
+                continue
+            path = f"{path}/{part}"
+        return JournaledLocalDBAdapter(self._cache_file, path, _store=self._store)
+
+    def set(self, data: Any) -> None:
+        """Set a value at the current path."""
+        self._store.mutate("set", self._path, data)
+
+    def update(self, data: Dict[str, Any]) -> None:
+        """Update values at the current path."""
+        self._store.mutate("update", self._path, data)
+
+    def remove(self) -> None:
+        """Remove a value at the current path."""
+        self._store.mutate("remove", self._path)
+
+    def push(self, data: Any):
+        """Append to a list-like dict (generates a timestamp key)."""
+        key = str(int(time.time() * 1000))  # timestamp in milliseconds
+        self._store.mutate("set", f"{self._path.rstrip('/')}/{key}", data)
+        return key
+
+    def get(self) -> _SnapshotCompat:
+        """Get a value at the current path."""
+        return _SnapshotCompat(self._store.read(self._path))
+
+    def compact(self) -> bool:
+        """Write the in-memory tree to the JSON file now."""
+        return self._store.compact()
+
+    def close(self):
+        """Flush pending journal entries into the JSON snapshot."""
+        self._store.close()
+
+
+class _LocalSQLiteStore:
+    """Path tree stored in SQLite (WAL mode), one row per leaf path.
+
+    A leaf is any non-dict value (lists are stored whole) or an empty dict.
+    ``path`` is the table's primary key, so "everything under a/b" is an
+    indexed range scan over ``a/b/`` .. ``a/b0`` ('0' sorts right after '/').
+    The JSON ``cache_file`` is kept as an exported snapshot for readers
+    that still load it directly (cache_db, the dashboard process). The
+    database is seeded from that file first; a ``seeded`` row in ``meta``
+    is committed with the import, and until it exists the import is retried
+    and nothing is exported over the file.
+    """
+
+    def __init__(self, db_file: str, cache_file: str, compact_interval: float = 60):
+        self._db_file = db_file
+        self._cache_file = cache_file
+        self._compact_interval = max(1.0, float(compact_interval))
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS nodes (path TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._seeded = self._conn.execute("SELECT 1 FROM meta WHERE key = 'seeded'").fetchone() is not None
+        if not self._seeded:
+            self._seeded = self._import_json()
+        self._thread = threading.Thread(target=self._compactor, name="local-db-export", daemon=True)
+        self._thread.start()
+
+    def _import_json(self) -> bool:
+        """Seed the database from the existing JSON dump; True once it is seeded.
+
+        Values written to the database before (while an earlier import kept
+        failing) take precedence over the dump's.
+        """
+        data = {}
+        if os.path.exists(self._cache_file):
+            try:
+                with open(self._cache_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.error(f"Error importing local cache into SQLite: {e}")
+                return False
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if isinstance(data, dict) and data:
+                    merged = self._merge_under(data, self.read("/"))
+                    self._delete_subtree("")
+                    self._write("", merged)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('seeded', ?)", (str(int(time.time())),)
+                )
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                self._conn.execute("ROLLBACK")
+                logger.error(f"Error importing local cache into SQLite: {e}")
+                return False
+        if isinstance(data, dict) and data:
+            logger.info(f"✅ Imported {self._cache_file} into {self._db_file}")
+        return True
+
+    @staticmethod
+    def _merge_under(base: Dict[str, Any], top: Dict[str, Any]) -> Dict[str, Any]:
+        """base with top's values laid over it (dicts are merged key by key)."""
+        merged = dict(base)
+        for k, v in top.items():
+            if isinstance(v, dict) and v and isinstance(merged.get(k), dict):
+                merged[k] = _LocalSQLiteStore._merge_under(merged[k], v)
+            else:
+                merged[k] = v
+        return merged
+
+    # ------------------------------------------------------------------
+    # Path helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return "/".join(p for p in path.strip("/").split("/") if p)
+
+    @staticmethod
+    def _flatten(prefix: str, value: Any, rows: List[tuple]) -> None:
+        if isinstance(value, dict) and value:
+            for k, v in value.items():
+                k = str(k)
+                _LocalSQLiteStore._flatten(f"{prefix}/{k}" if prefix else k, v, rows)
+        else:
+            rows.append((prefix, json.dumps(value, ensure_ascii=False)))
+
+    def _select(self, key: str) -> List[tuple]:
+        if not key:
+            return self._conn.execute("SELECT path, value FROM nodes ORDER BY path").fetchall()
+        return self._conn.execute(
+            "SELECT path, value FROM nodes WHERE path = ? OR (path > ? AND path < ?) ORDER BY path",
+            (key, f"{key}/", f"{key}0"),
+        ).fetchall()
+
+    def _delete_subtree(self, key: str) -> None:
+        if not key:
+            self._conn.execute("DELETE FROM nodes")
+            return
+        self._conn.execute(
+            "DELETE FROM nodes WHERE path = ? OR (path > ? AND path < ?)",
+            (key, f"{key}/", f"{key}0"),
+        )
+
+    def _write(self, key: str, value: Any) -> None:
+        if not key:
+            if not isinstance(value, dict):
+                raise ValueError("Root path value must be a dict")
+            # Same as the JSON adapter: setting the root merges top-level keys
+            for k, v in value.items():
+                self._write(str(k), v)
+            return
+        # A scalar ancestor is replaced by a dict holding this child
+        parts = key.split("/")
+        ancestors = ["/".join(parts[:i]) for i in range(1, len(parts))]
+        if ancestors:
+            self._conn.executemany("DELETE FROM nodes WHERE path = ?", [(a,) for a in ancestors])
+        self._delete_subtree(key)
+        rows: List[tuple] = []
+        self._flatten(key, value, rows)
+        self._conn.executemany("INSERT OR REPLACE INTO nodes (path, value) VALUES (?, ?)", rows)
+
+    # ------------------------------------------------------------------
+    # Store API
+    # ------------------------------------------------------------------
+
+    def mutate(self, op: str, path: str, data: Any = None) -> None:
+        key = self._key(path)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if op == "remove":
+                    self._delete_subtree(key)
+                elif op == "update" and isinstance(data, dict) and self._is_dict(key):
+                    for k, v in data.items():
+                        self._write(f"{key}/{k}" if key else str(k), v)
+                else:
+                    self._write(key, data)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._dirty = True
+
+    def _is_dict(self, key: str) -> bool:
+        if not key:
+            return True
+        row = self._conn.execute(
+            "SELECT path, value FROM nodes WHERE path = ? OR (path > ? AND path < ?) LIMIT 1",
+            (key, f"{key}/", f"{key}0"),
+        ).fetchone()
+        if row is None:
+            return False
+        return row[0] != key or row[1] == "{}"
+
+    def read(self, path: str) -> Any:
+        key = self._key(path)
+        with self._lock:
+            rows = self._select(key)
+        if not rows:
+            return {} if not key else None
+        if len(rows) == 1 and rows[0][0] == key:
+            return json.loads(rows[0][1])
+        skip = len(key) + 1 if key else 0
+        result: Dict[str, Any] = {}
+        for row_path, raw in rows:
+            parts = row_path[skip:].split("/")
+            current = result
+            for part in parts[:-1]:
+                current = current.setdefault(part, {})
+            current[parts[-1]] = json.loads(raw)
+        return result
+
+    def compact(self) -> bool:
+        """Export the database to the JSON cache file (atomic replace)."""
+        with self._compact_lock:
+            if not self._seeded:
+                # Exporting now would overwrite the dump with what is missing from it
+                self._seeded = self._import_json()
+                if not self._seeded:
+                    return False
+            with self._lock:
+                self._dirty = False
+            snapshot = json.dumps(self.read("/"), ensure_ascii=False, indent=2)
+            tmp_file = f"{self._cache_file}.tmp"
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    f.write(snapshot)
+                os.replace(tmp_file, self._cache_file)
+            except Exception as e:
+                logger.error(f"Error exporting SQLite cache to JSON: {e}")
+                with self._lock:
+                    self._dirty = True
+                return False
+            return True
+
+    def _compactor(self) -> None:
+        while not self._stop.wait(self._compact_interval):
+            if not self._dirty:
+                continue
+            try:
+                self.compact()
+            except Exception as e:
+                logger.error(f"Error in SQLite cache exporter: {e}")
+
+    def close(self) -> None:
+        self._stop.set()
+        try:
+            if self._dirty:
+                self.compact()
+        finally:
+            with self._lock:
+                try:
+                    self._conn.close()
+                except Exception:
+                    pass
+
+
+_sqlite_stores: Dict[str, _LocalSQLiteStore] = {}
+
+
+def _get_sqlite_store(db_file: str, cache_file: str) -> _LocalSQLiteStore:
+    """Return the process-wide SQLite store for a database file."""
+    key = os.path.abspath(db_file)
+    with _journal_stores_lock:
+        store = _sqlite_stores.get(key)
+        if store is None:
+            store = _LocalSQLiteStore(
+                db_file,
+                cache_file,
+                compact_interval=getattr(Config, 'LOCAL_DB_COMPACT_INTERVAL', 60),
+            )
+            _sqlite_stores[key] = store
+        return store
+
+
+class SQLiteDBAdapter(JournaledLocalDBAdapter):
+    """Local adapter storing the path tree in SQLite instead of a JSON file.
+
+    Same API and semantics as LocalDBAdapter; reads of a subtree
+    (all users, all logs of a user) are indexed range scans.
+    """
+
+    def __init__(self, db_file: str, cache_file: str, path: str = "/", _store: Optional[_LocalSQLiteStore] = None):
+        self._db_file = db_file
+        self._cache_file = cache_file
+        self._path = path if path.startswith("/") else f"/{path}"
+        self._store = _store or _get_sqlite_store(db_file, cache_file)
+
+    def child(self, *path_parts: str) -> "SQLiteDBAdapter":
+        """Create a child adapter with an extended path."""
+        path = self._path.rstrip("/")
+        for part in path_parts:
+            part = str(part).strip("/")
+            if not part:
+                continue
+            path = f"{path}/{part}"
+        return SQLiteDBAdapter(self._db_file, self._cache_file, path, _store=self._store)
+
+
 # Initialize db adapter (admin, REST fallback, or local)
 use_firebase = getattr(Config, 'USE_FIREBASE', True)
 if not use_firebase:
     # Local mode: use JSON cache file
     cache_file = getattr(Config, 'FIREBASE_CACHE_FILE', 'dump.json')
-    db = LocalDBAdapter(cache_file, "/")
-    logger.info(f"✅ Local mode enabled (cache: {cache_file})")
+    local_storage = getattr(Config, 'LOCAL_DB_STORAGE', 'json')
+    if local_storage == "journal":
+        db = JournaledLocalDBAdapter(cache_file, "/")
+    elif local_storage == "sqlite":
+        sqlite_file = getattr(Config, 'LOCAL_DB_SQLITE_FILE', 'dump.sqlite3')
+        db = SQLiteDBAdapter(sqlite_file, cache_file, "/")
+    else:
+        db = LocalDBAdapter(cache_file, "/")
+    logger.info(f"✅ Local mode enabled (cache: {cache_file}, storage: {local_storage})")
 else:
     # Firebase mode: use cloud database
     use_admin = _init_firebase_admin_if_needed()
@@ -47,6 +47,7 @@ from DATABASE.cache_db import (
 
 from DOWN_AND_UP.yt_dlp_hook import get_video_formats
 from HELPERS.pot_helper import build_cli_extractor_args
+from HELPERS.ask_formats_cache import read_ask_info, write_ask_info, read_format_lines, write_format_lines
 from COMMANDS.format_cmd import set_session_mkv_override
 from DOWN_AND_UP.down_and_audio import down_and_audio
 from DOWN_AND_UP.down_and_up import down_and_up
@@ -521,55 +522,33 @@ def save_ask_info(user_id, url, info, download_dir=None):
         # Create ask_formats.json directly in download directory if available
         if download_dir and os.path.exists(download_dir):
             download_ask_file = os.path.join(download_dir, _ASK_INFO_CACHE_FILE)
-            data = {}
-            if os.path.exists(download_ask_file):
-                with open(download_ask_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            data[url] = {
-                "title": info.get("title"),
-                "id": info.get("id"),
-                "formats": info.get("formats", [])
-            }
-            with open(download_ask_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            write_ask_info(download_ask_file, url, info)
             logger.info(f"Created ask_formats.json in download directory: {download_ask_file}")
         else:
             # Fallback to user root directory if download directory not available
             path = _ask_cache_path(user_id)
-            data = {}
-            if os.path.exists(path):
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            data[url] = {
-                "title": info.get("title"),
-                "id": info.get("id"),
-                "formats": info.get("formats", [])
-            }
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            write_ask_info(path, url, info)
             logger.info(f"Created ask_formats.json in user directory: {path}")
     except Exception as e:
         logger.warning(f"Failed to save ask_formats.json: {e}")
 
-def load_ask_info(user_id, url):
+def load_ask_info(user_id, url, download_dir=None):
+    """Cached info for url, with a compact format table (shared, do not modify), or None."""
     try:
         # First try to find ask_formats.json in download directory
-        download_dir = get_user_download_dir(user_id)
+        if download_dir is None:
+            download_dir = get_user_download_dir(user_id)
         if download_dir and os.path.exists(download_dir):
             download_cache_file = os.path.join(download_dir, _ASK_INFO_CACHE_FILE)
             if os.path.exists(download_cache_file):
-                with open(download_cache_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                logger.info(f"Using ask_formats.json from download directory: {download_cache_file}")
-                return data.get(url)
+                logger.debug(f"Using ask_formats.json from download directory: {download_cache_file}")
+                return read_ask_info(download_cache_file, url)
         
         # Fallback to user root directory
         path = _ask_cache_path(user_id)
         if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            logger.info(f"Using ask_formats.json from user directory: {path}")
-            return data.get(url)
+            logger.debug(f"Using ask_formats.json from user directory: {path}")
+            return read_ask_info(path, url)
     except Exception as e:
         logger.warning(f"Failed to load ask_formats.json: {e}")
         return None
@@ -799,57 +778,40 @@ def ask_filter_callback(app, callback_query):
         except Exception:
             pass
 
+_MKV_COMPATIBLE_EXTS = ('mkv', 'webm', 'avi', 'mov', 'flv', 'wmv', '3gp', 'ogv', 'ts', 'mts', 'm2ts')
+
+def _codec_family(vcodec):
+    vcodec = (vcodec or '').lower()
+    if vcodec.startswith(('avc1', 'avc', 'h264')):
+        return 'avc1'
+    if vcodec.startswith(('av01', 'av1')):
+        return 'av01'
+    if vcodec.startswith(('vp9', 'vp09')):
+        return 'vp9'
+    return None
+
+def _container_family(ext):
+    ext = (ext or '').lower()
+    if ext == 'mp4':
+        return 'mp4'
+    if ext in _MKV_COMPATIBLE_EXTS:
+        # These formats can be converted to MKV by ffmpeg
+        return 'mkv'
+    return None
+
 def get_available_formats_from_cache(user_id, url, download_dir=None):
-    """Get available codecs and formats from ask_formats.json cache"""
+    """Get available codecs and formats from the cached format table (ask_formats.json)"""
     try:
-        # First try to find ask_formats.json in download directory
-        cache_file = None
-        if download_dir and os.path.exists(download_dir):
-            download_cache_file = os.path.join(download_dir, _ASK_INFO_CACHE_FILE)
-            if os.path.exists(download_cache_file):
-                cache_file = download_cache_file
-                logger.info(f"Using ask_formats.json from download directory: {download_cache_file}")
-        
-        # Fallback to user root directory
-        if not cache_file:
-            user_dir = os.path.join("users", str(user_id))
-            cache_file = os.path.join(user_dir, _ASK_INFO_CACHE_FILE)
-            if os.path.exists(cache_file):
-                logger.info(f"Using ask_formats.json from user directory: {cache_file}")
-        
-        if not cache_file or not os.path.exists(cache_file):
-            return {"codecs": set(), "formats": set()}
-        
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
+        info = load_ask_info(user_id, url, download_dir) or {}
         available_codecs = set()
         available_formats = set()
-        
-        # Check if this URL matches the cached data
-        if data.get('url') == url:
-            formats = data.get('formats', [])
-            
-            for format_line in formats:
-                # Extract codecs and formats using our existing function
-                extracted = extract_button_data(format_line)
-                
-                for item in extracted:
-                    # Check for codecs
-                    if item.lower() in ['avc1', 'avc', 'h264']:
-                        available_codecs.add('avc1')
-                    elif item.lower() in ['av1', 'av01']:
-                        available_codecs.add('av01')
-                    elif item.lower() in ['vp9', 'vp09']:
-                        available_codecs.add('vp9')
-                    
-                    # Check for formats
-                    if item.lower() in ['mp4']:
-                        available_formats.add('mp4')
-                    elif item.lower() in ['mkv', 'webm', 'avi', 'mov', 'flv', 'wmv', '3gp', 'ogv', 'ts', 'mts', 'm2ts']:
-                        # These formats can be converted to MKV by ffmpeg
-                        available_formats.add('mkv')
-        
+        for fmt in info.get('formats', []):
+            codec = _codec_family(fmt.get('vcodec'))
+            if codec:
+                available_codecs.add(codec)
+            container = _container_family(fmt.get('ext'))
+            if container:
+                available_formats.add(container)
         return {"codecs": available_codecs, "formats": available_formats}
     except Exception as e:
         logger.warning(f"{LoggerMsg.ALWAYS_ASK_ERROR_READING_AVAILABLE_FORMATS_FROM_CACHE_LOG_MSG}: {e}")
@@ -863,60 +825,19 @@ def filter_qualities_by_codec_format(user_id, url, qualities, download_dir=None)
         selected_codec = f.get("codec", "avc1")
         selected_format = f.get("ext", "mp4")
         
-        # Get available formats from cache
         user_download_dir = get_user_download_dir(user_id) if download_dir is None else download_dir
-        available_formats = get_available_formats_from_cache(user_id, url, user_download_dir)
-        
-        # If no cache or no specific formats available, return all qualities
-        if not available_formats["codecs"] and not available_formats["formats"]:
-            return qualities
-        
-        # Get all format lines from cache
-        user_dir = os.path.join("users", str(user_id))
-        cache_file = os.path.join(user_dir, _ASK_INFO_CACHE_FILE)
-        
-        if not os.path.exists(cache_file):
-            return qualities
-        
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        info = load_ask_info(user_id, url, user_download_dir) or {}
         
-        if data.get('url') != url:
-            return qualities
-        
-        formats = data.get('formats', [])
         filtered_qualities = set()
-        
-        for format_line in formats:
-            extracted = extract_button_data(format_line)
-            
-            # Check if this format matches selected codec and format
-            has_codec = False
-            has_format = False
-            
-            for item in extracted:
-                # Check codec
-                if selected_codec == 'avc1' and item.lower() in ['avc1', 'avc', 'h264']:
-                    has_codec = True
-                elif selected_codec == 'av01' and item.lower() in ['av1', 'av01']:
-                    has_codec = True
-                elif selected_codec == 'vp9' and item.lower() in ['vp9', 'vp09']:
-                    has_codec = True
-                
-                # Check format
-                if selected_format == 'mp4' and item.lower() == 'mp4':
-                    has_format = True
-                elif selected_format == 'mkv' and item.lower() in ['mkv', 'webm', 'avi', 'mov', 'flv', 'wmv', '3gp', 'ogv', 'ts', 'mts', 'm2ts']:
-                    has_format = True
-            
-            # If both codec and format match, extract quality
-            if has_codec and has_format:
-                for item in extracted:
-                    # Look for quality patterns (e.g., 720p, 1080p)
-                    if 'p' in item and any(char.isdigit() for char in item):
-                        quality_match = re.search(r'(\d+p\d*)', item)
-                        if quality_match:
-                            filtered_qualities.add(quality_match.group(1))
+        for fmt in info.get('formats', []):
+            # If both codec and format match, take its quality
+            if _codec_family(fmt.get('vcodec')) != selected_codec or _container_family(fmt.get('ext')) != selected_format:
+                continue
+            quality_match = re.search(r'(\d+p\d*)', fmt.get('format_note') or '')
+            if quality_match:
+                filtered_qualities.add(quality_match.group(1))
+            elif fmt.get('width') and fmt.get('height'):
+                filtered_qualities.add(get_quality_by_min_side(fmt['width'], fmt['height']))
         
         # Return intersection of available qualities and filtered qualities
         if filtered_qualities:
@@ -1744,12 +1665,10 @@ def askq_callback(app, callback_query):
                 cache_file = current_cache_file
                 if os.path.exists(cache_file):
                     try:
-                        with open(cache_file, 'r', encoding='utf-8') as f:
-                            cached_data = json.load(f)
-                            format_lines = cached_data.get('formats', [])
-                            if format_lines:
-                                show_formats_from_cache(app, callback_query, format_lines, page, url)
-                                return
+                        format_lines = read_format_lines(cache_file, url)
+                        if format_lines:
+                            show_formats_from_cache(app, callback_query, format_lines, page, url)
+                            return
                     except Exception:
                         pass
         
@@ -2844,14 +2763,12 @@ def show_other_qualities_menu(app, callback_query, page=0):
         if os.path.exists(cache_file):
             # Use cached formats for any page
             try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                    format_lines = cached_data.get('formats', [])
-                    if format_lines:
-                        # Show cached formats immediately
-                        logger.info(f"Using cached formats for page {page + 1}, {len(format_lines)} formats found")
-                        show_formats_from_cache(app, callback_query, format_lines, page, url)
-                        return
+                format_lines = read_format_lines(cache_file, url)
+                if format_lines:
+                    # Show cached formats immediately
+                    logger.info(f"Using cached formats for page {page + 1}, {len(format_lines)} formats found")
+                    show_formats_from_cache(app, callback_query, format_lines, page, url)
+                    return
             except Exception as e:
                 logger.warning(f"Failed to read cache file {cache_file}: {e}")
                 pass  # Fall back to fresh fetch
@@ -2946,11 +2863,9 @@ def show_other_qualities_menu(app, callback_query, page=0):
         if os.path.exists(cache_file):
             # Use cached data if available
             try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                    format_lines = cached_data.get('formats', [])
-                    if format_lines:
-                        logger.info(f"Using cached formats from {cache_file}")
+                format_lines = read_format_lines(cache_file, url)
+                if format_lines:
+                    logger.info(f"Using cached formats from {cache_file}")
             except Exception as e:
                 logger.warning(f"Failed to read cache file {cache_file}: {e}")
         
@@ -3026,13 +2941,7 @@ def show_other_qualities_menu(app, callback_query, page=0):
                 # Cache the fallback formats for future use
                 if format_lines:
                     try:
-                        cache_data = {
-                            'url': url,
-                            'timestamp': datetime.now().isoformat(),
-                            'formats': format_lines
-                        }
-                        with open(cache_file, 'w', encoding='utf-8') as f:
-                            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+                        write_format_lines(cache_file, url, format_lines, datetime.now().isoformat())
                         logger.info(f"Cached {len(format_lines)} fallback formats to {cache_file}")
                     except Exception as e:
                         logger.warning(f"Failed to cache fallback formats: {e}")
@@ -3083,13 +2992,7 @@ def show_other_qualities_menu(app, callback_query, page=0):
                 # Cache the formats for future use
                 if format_lines:
                     try:
-                        cache_data = {
-                            'url': url,
-                            'timestamp': datetime.now().isoformat(),
-                            'formats': format_lines
-                        }
-                        with open(cache_file, 'w', encoding='utf-8') as f:
-                            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+                        write_format_lines(cache_file, url, format_lines, datetime.now().isoformat())
                         logger.info(f"Cached {len(format_lines)} formats to {cache_file}")
                     except Exception as e:
                         logger.warning(f"Failed to cache formats: {e}")
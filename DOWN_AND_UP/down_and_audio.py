@@ -14,6 +14,8 @@ from HELPERS.app_instance import get_app
 from HELPERS.logger import logger, send_to_logger, send_to_user, send_to_all, send_error_to_user, log_error_to_channel
 from HELPERS.limitter import TimeFormatter, humanbytes, check_user
 from HELPERS.download_status import set_active_download, clear_download_start_time, check_download_timeout, start_hourglass_animation, start_cycle_progress, playlist_errors, playlist_errors_lock
+from HELPERS.download_scheduler import acquire_download_slot
+from HELPERS.progress_dispatcher import get_progress_dispatcher
 from HELPERS.safe_messeger import safe_delete_messages, safe_edit_message_text, safe_forward_messages
 from HELPERS.filesystem_hlp import sanitize_filename, sanitize_filename_strict, create_directory, check_disk_space, cleanup_user_temp_files
 from DATABASE.firebase_init import write_logs
@@ -25,6 +27,7 @@ from URL_PARSERS.filter_utils import create_smart_match_filter, create_legacy_ma
 from URL_PARSERS.youtube import is_youtube_url, download_thumbnail
 from URL_PARSERS.thumbnail_downloader import download_thumbnail as download_universal_thumbnail
 from HELPERS.pot_helper import add_pot_to_ytdl_opts
+from HELPERS.info_cache import extract_info_cached
 from CONFIG.limits import LimitsConfig
 from HELPERS.fallback_helper import should_fallback_to_gallery_dl
 import subprocess
@@ -479,7 +482,10 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
     hourglass_msg_id = None
     download_started_msg_id = None
     audio_files = []
+    download_slot = None
     try:
+        # Wait for a free global/per-domain download slot (cache hits above never queue)
+        download_slot = acquire_download_slot(message, url)
         # Check if there is a saved waiting time
         user_dir = os.path.join("users", str(user_id))
         flood_time_file = os.path.join(user_dir, "flood_wait.txt")
@@ -818,7 +824,8 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
                     progress_hook.progress_data['total_bytes'] = total
                 
                 try:
-                    safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).AUDIO_DOWNLOADING_PROGRESS_MSG.format(process=current_total_process, bar=bar, percent=percent))
+                    # Coalesced with all other jobs' progress edits; superseded frames are dropped
+                    get_progress_dispatcher().update(user_id, proc_msg_id, safe_get_messages(user_id).AUDIO_DOWNLOADING_PROGRESS_MSG.format(process=current_total_process, bar=bar, percent=percent))
                 except Exception as e:
                     logger.error(f"Error updating progress: {e}")
                 last_update = current_time
@@ -838,7 +845,8 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
                 try:
                     full_bar = "🟩" * 10
                     safe_edit_message_text(user_id, proc_msg_id,
-                        f"{current_total_process}\n{safe_get_messages(user_id).ALWAYS_ASK_DOWNLOADING_QUALITY_MSG} audio:\n{full_bar}   100.0%\n{safe_get_messages(user_id).AUDIO_DOWNLOAD_FINISHED_PROCESSING_MSG}")
+                        f"{current_total_process}\n{safe_get_messages(user_id).ALWAYS_ASK_DOWNLOADING_QUALITY_MSG} audio:\n{full_bar}   100.0%\n{safe_get_messages(user_id).AUDIO_DOWNLOAD_FINISHED_PROCESSING_MSG}",
+                        _wait=False)
                 except Exception as e:
                     logger.error(f"Error updating progress: {e}")
                 last_update = current_time
@@ -857,7 +865,7 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
                 except Exception as e:
                     logger.debug(f"Failed to update download progress on error: {e}")
                 try:
-                    safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).AUDIO_DOWNLOAD_ERROR_MSG)
+                    safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).AUDIO_DOWNLOAD_ERROR_MSG, _wait=False)
                 except Exception as e:
                     logger.error(f"Error updating progress: {e}")
                 last_update = current_time
@@ -1010,7 +1018,7 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
             
             try:
                 with yt_dlp.YoutubeDL(ytdl_opts) as ydl:
-                    info_dict = ydl.extract_info(url, download=False)
+                    info_dict = extract_info_cached(ydl, url)
                 # Normalize info_dict to dict
                 if isinstance(info_dict, list):
                     info_dict = (info_dict[0] if len(info_dict) > 0 else {})
@@ -1054,10 +1062,12 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
                 try:
                     if is_hls:
                         safe_edit_message_text(user_id, proc_msg_id,
-                            f"{current_total_process}\n<i>Detected HLS audio stream.\n{safe_get_messages(user_id).ALWAYS_ASK_DOWNLOADING_HLS_MSG}</i>")
+                            f"{current_total_process}\n<i>Detected HLS audio stream.\n{safe_get_messages(user_id).ALWAYS_ASK_DOWNLOADING_HLS_MSG}</i>",
+                            _wait=False)
                     else:
                         safe_edit_message_text(user_id, proc_msg_id,
-                            f"{current_total_process}\n> <i>{safe_get_messages(user_id).ALWAYS_ASK_DOWNLOADING_AUDIO_FORMAT_USING_MSG} {download_format}...</i>")
+                            f"{current_total_process}\n> <i>{safe_get_messages(user_id).ALWAYS_ASK_DOWNLOADING_AUDIO_FORMAT_USING_MSG} {download_format}...</i>",
+                            _wait=False)
                 except Exception as e:
                     logger.error(f"Status update error: {e}")
                 
@@ -1089,7 +1099,7 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
                 
                 try:
                     full_bar = "🟩" * 10
-                    safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).AUDIO_DOWNLOAD_COMPLETE_MSG.format(process=current_total_process, bar=full_bar))
+                    safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).AUDIO_DOWNLOAD_COMPLETE_MSG.format(process=current_total_process, bar=full_bar), _wait=False)
                 except Exception as e:
                     logger.error(f"Final progress update error: {e}")
                 
@@ -1155,7 +1165,8 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
                     else:
                         try:
                             safe_edit_message_text(user_id, proc_msg_id,
-                                f"{current_total_process}\n🔄 yt-dlp failed, trying gallery-dl…")
+                                f"{current_total_process}\n🔄 yt-dlp failed, trying gallery-dl…",
+                                _wait=False)
                         except Exception:
                             pass
                         try:
@@ -1586,7 +1597,7 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
                         
                         # Try download with safe filename
                         with yt_dlp.YoutubeDL(ytdl_opts) as ydl:
-                            info_dict = ydl.extract_info(url, download=False)
+                            info_dict = extract_info_cached(ydl, url)
                             if "entries" in info_dict:
                                 entries = info_dict["entries"]
                                 if len(entries) > 1:
@@ -1771,7 +1782,7 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
 
             try:
                 full_bar = "🟩" * 10
-                safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).AUDIO_UPLOADING_MSG.format(process=current_total_process, bar=full_bar))
+                safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).AUDIO_UPLOADING_MSG.format(process=current_total_process, bar=full_bar), _wait=False)
             except Exception as e:
                 logger.error(f"Error updating upload status: {e}")
 
@@ -1932,7 +1943,7 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
                     log_channel_paid = get_log_channel("video", paid=True)
                     try:
                         # Forward the paid audio to LOGS_PAID_ID
-                        safe_forward_messages(log_channel_paid, user_id, [audio_msg.id])
+                        safe_forward_messages(log_channel_paid, user_id, [audio_msg.id], _wait=False)
                         logger.info(f"down_and_audio: NSFW audio paid copy sent to PAID channel")
                     except Exception as e:
                         logger.error(f"down_and_audio: failed to send paid copy to PAID channel: {e}")
@@ -2012,7 +2023,7 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
             success_msg = f"{safe_get_messages(user_id).AUDIO_PARTIALLY_COMPLETED_MSG.format(successful_uploads=successful_uploads, total_files=len(indices_to_download))}\n{safe_get_messages(user_id).CREDITS_MSG}"
             
         try:
-            safe_edit_message_text(user_id, proc_msg_id, success_msg)
+            safe_edit_message_text(user_id, proc_msg_id, success_msg, _wait=False)
         except Exception as e:
             logger.error(f"Error updating final status: {e}")
 
@@ -2045,11 +2056,11 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
         # Immediate cleanup on error
         try:
             if status_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[status_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[status_msg_id], revoke=True, _wait=False)
             if hourglass_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[hourglass_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[hourglass_msg_id], revoke=True, _wait=False)
             if download_started_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[download_started_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[download_started_msg_id], revoke=True, _wait=False)
             stop_anim.set()
         except Exception:
             pass
@@ -2061,9 +2072,9 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
 
         try:
             if status_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[status_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[status_msg_id], revoke=True, _wait=False)
             if hourglass_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[hourglass_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[hourglass_msg_id], revoke=True, _wait=False)
         except Exception as e:
             logger.error(f"Error deleting status messages: {e}")
 
@@ -2113,6 +2124,8 @@ def down_and_audio(app, message, url, tags, quality_key=None, playlist_name=None
         except Exception as e:
             logger.error(f"Error cleaning up thumbnails: {e}")
 
+        if download_slot is not None:
+            download_slot.release()
         set_active_download(user_id, False)
         clear_download_start_time(user_id)  # Cleaning the start time
 
@@ -18,9 +18,11 @@ from CONFIG.logger_msg import LoggerMsg
 from CONFIG.messages import Messages, safe_get_messages
 from HELPERS.limitter import TimeFormatter, humanbytes, check_user, check_file_size_limit, check_subs_limits
 from HELPERS.download_status import set_active_download, clear_download_start_time, check_download_timeout, start_hourglass_animation, start_cycle_progress, playlist_errors_lock, playlist_errors
+from HELPERS.download_scheduler import acquire_download_slot
+from HELPERS.progress_dispatcher import get_progress_dispatcher
 from HELPERS.safe_messeger import safe_delete_messages, safe_edit_message_text, safe_forward_messages
 from HELPERS.filesystem_hlp import sanitize_filename, sanitize_filename_strict, cleanup_user_temp_files, cleanup_subtitle_files, create_directory, check_disk_space
-from DOWN_AND_UP.ffmpeg import get_duration_thumb, get_video_info_ffprobe, embed_subs_to_video, create_default_thumbnail, split_video_2
+from DOWN_AND_UP.ffmpeg import get_duration_thumb, get_video_info_ffprobe, embed_subs_to_video, create_default_thumbnail, SplitVideoParts
 from DOWN_AND_UP.sender import send_videos
 from DATABASE.firebase_init import write_logs
 from URL_PARSERS.tags import generate_final_tags, save_user_tags
@@ -31,6 +33,7 @@ from URL_PARSERS.filter_check import is_no_filter_domain
 from URL_PARSERS.filter_utils import create_smart_match_filter, create_legacy_match_filter
 from URL_PARSERS.thumbnail_downloader import download_thumbnail as download_universal_thumbnail
 from HELPERS.pot_helper import add_pot_to_ytdl_opts
+from HELPERS.info_cache import extract_info_cached
 from CONFIG.config import Config
 from CONFIG.limits import LimitsConfig
 from COMMANDS.subtitles_cmd import is_subs_enabled, check_subs_availability, get_user_subs_auto_mode, _subs_check_cache, download_subtitles_ytdlp, get_user_subs_language, clear_subs_check_cache, is_subs_always_ask
@@ -66,7 +69,7 @@ def _handle_quality_key_error(e: Exception, split_msg_ids: list, is_playlist: bo
     if (successful_uploads == len(indices_to_download)) or (split_msg_ids and not is_playlist):
         logger.info(f"Upload complete condition met after quality_key error, replacing status message")
         success_msg = f"<b>{safe_get_messages(user_id).DOWN_UP_UPLOAD_COMPLETE_MSG}</b> - {video_count} {safe_get_messages(user_id).DOWN_UP_FILES_UPLOADED_MSG}.\n{safe_get_messages(user_id).CREDITS_MSG}"
-        safe_edit_message_text(user_id, proc_msg_id, success_msg)
+        safe_edit_message_text(user_id, proc_msg_id, success_msg, _wait=False)
         send_to_logger(message, success_msg)
         try:
             from COMMANDS.subtitles_cmd import clear_subs_cache_for
@@ -499,7 +502,10 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
     download_started_msg_id = None
     proc_msg = None
     proc_msg_id = None
+    download_slot = None
     try:
+        # Wait for a free global/per-domain download slot (cache hits above never queue)
+        download_slot = acquire_download_slot(message, url)
         # Check if there is a saved waiting time
         user_dir = os.path.join("users", str(user_id))
         flood_time_file = os.path.join(user_dir, "flood_wait.txt")
@@ -755,7 +761,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                 ydl_opts['cookiefile'] = user_cookie_path
                 logger.info(f"Using cookies from user directory: {user_cookie_path}")
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                pre_info = ydl.extract_info(url, download=False)
+                pre_info = extract_info_cached(ydl, url)
             # Normalize to dict and check None
             if isinstance(pre_info, list):
                 pre_info = (pre_info[0] if len(pre_info) > 0 else {})
@@ -955,10 +961,9 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                         first_progress_update = False
 
                     progress_text = f"{current_total_process}\n{bar}   {percent:.1f}%"
-                    logger.info(f"Updating progress for user {user_id}, message {proc_msg_id}: {progress_text}")
-                    result = safe_edit_message_text(user_id, proc_msg_id, progress_text)
-                    if result is None:
-                        logger.warning(f"Failed to update progress message {proc_msg_id} for user {user_id} - message may have been deleted")
+                    logger.debug(f"Updating progress for user {user_id}, message {proc_msg_id}: {progress_text}")
+                    # Coalesced with all other jobs' progress edits; superseded frames are dropped
+                    get_progress_dispatcher().update(user_id, proc_msg_id, progress_text)
                 except Exception as e:
                     logger.error(f"Error updating progress: {e}")
                     # Check if error is related to quality_key
@@ -978,7 +983,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                 except Exception as e:
                     logger.debug(f"Failed to update download progress on finish: {e}")
                 try:
-                    safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).VIDEO_DOWNLOAD_COMPLETE_MSG.format(process=current_total_process, bar=full_bar))
+                    safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).VIDEO_DOWNLOAD_COMPLETE_MSG.format(process=current_total_process, bar=full_bar), _wait=False)
                 except Exception as e:
                     logger.error(f"Error updating progress: {e}")
                     # Check if error is related to quality_key
@@ -1401,7 +1406,8 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                                 formats_text = "\n".join(available_formats_list) if available_formats_list else "• No video formats available"
                                 
                                 safe_edit_message_text(user_id, proc_msg_id, 
-                                    f"{current_total_process}\n{safe_get_messages(user_id).DOWN_UP_AV1_NOT_AVAILABLE_MSG.format(formats_text=formats_text)}")
+                                    f"{current_total_process}\n{safe_get_messages(user_id).DOWN_UP_AV1_NOT_AVAILABLE_MSG.format(formats_text=formats_text)}",
+                                    _wait=False)
                             except Exception as e:
                                 logger.error(f"Failed to notify user about format unavailability: {e}")
                             
@@ -1429,7 +1435,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                     messages = safe_get_messages(message.chat.id)
                     with yt_dlp.YoutubeDL(opts) as ydl:
                         logger.info("yt-dlp instance created, starting extract_info...")
-                        info_dict = ydl.extract_info(url, download=False)
+                        info_dict = extract_info_cached(ydl, url)
                         logger.info("extract_info completed successfully")
                         return info_dict
                 
@@ -1502,10 +1508,12 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                 try:
                     if is_hls:
                         safe_edit_message_text(user_id, proc_msg_id,
-                            f"{current_total_process}\n<i>Detected HLS stream.\n{safe_get_messages(user_id).ALWAYS_ASK_DOWNLOADING_HLS_MSG}</i>")
+                            f"{current_total_process}\n<i>Detected HLS stream.\n{safe_get_messages(user_id).ALWAYS_ASK_DOWNLOADING_HLS_MSG}</i>",
+                            _wait=False)
                     else:
                         safe_edit_message_text(user_id, proc_msg_id,
-                            f"{current_total_process}\n> <i>{safe_get_messages(user_id).ALWAYS_ASK_DOWNLOADING_FORMAT_USING_MSG} {ytdl_opts.get('format', 'default')}...</i>")
+                            f"{current_total_process}\n> <i>{safe_get_messages(user_id).ALWAYS_ASK_DOWNLOADING_FORMAT_USING_MSG} {ytdl_opts.get('format', 'default')}...</i>",
+                            _wait=False)
                 except Exception as e:
                     logger.error(f"Status update error: {e}")
                     # Check if error is related to quality_key
@@ -1539,7 +1547,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                 if result is None:
                     raise Exception("Failed to download video with all available proxies")
                 try:
-                    safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).VIDEO_DOWNLOAD_COMPLETE_MSG.format(process=current_total_process, bar=full_bar))
+                    safe_edit_message_text(user_id, proc_msg_id, safe_get_messages(user_id).VIDEO_DOWNLOAD_COMPLETE_MSG.format(process=current_total_process, bar=full_bar), _wait=False)
                 except Exception as e:
                     logger.error(f"Final progress update error: {e}")
                 
@@ -1612,7 +1620,8 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                     else:
                         try:
                             safe_edit_message_text(user_id, proc_msg_id,
-                                f"{current_total_process}\n🔄 yt-dlp failed, trying gallery-dl…")
+                                f"{current_total_process}\n🔄 yt-dlp failed, trying gallery-dl…",
+                                _wait=False)
                         except Exception:
                             pass
                         try:
@@ -1801,7 +1810,8 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                     else:
                         try:
                             safe_edit_message_text(user_id, proc_msg_id,
-                                f"{current_total_process}\n🔄 yt-dlp failed, trying gallery-dl…")
+                                f"{current_total_process}\n🔄 yt-dlp failed, trying gallery-dl…",
+                                _wait=False)
                         except Exception:
                             pass
                         try:
@@ -2162,7 +2172,8 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
 
             try:
                 safe_edit_message_text(user_id, proc_msg_id,
-                    f"{info_text}\n{full_bar}   100.0%\n<i>{safe_get_messages(user_id).DOWN_UP_DOWNLOADED_VIDEO_MSG}\n{safe_get_messages(user_id).DOWN_UP_PROCESSING_UPLOAD_MSG}</i>")
+                    f"{info_text}\n{full_bar}   100.0%\n<i>{safe_get_messages(user_id).DOWN_UP_DOWNLOADED_VIDEO_MSG}\n{safe_get_messages(user_id).DOWN_UP_PROCESSING_UPLOAD_MSG}</i>",
+                    _wait=False)
             except Exception as e:
                 logger.error(f"Status update error after download: {e}")
                 # Check if error is related to quality_key
@@ -2319,7 +2330,8 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
             if final_name.lower().endswith((".webm", ".ts")):
                 try:
                     safe_edit_message_text(user_id, proc_msg_id,
-                        f"{info_text}\n{full_bar}   100.0%\nConverting video using ffmpeg... ⏳")
+                        f"{info_text}\n{full_bar}   100.0%\nConverting video using ffmpeg... ⏳",
+                        _wait=False)
                 except Exception as e:
                     logger.error(f"Error updating status before conversion: {e}")
 
@@ -2477,184 +2489,232 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
             max_size = get_user_split_size(user_id)  # 1.95 GB - close to Telegram's 2GB limit with 50MB safety margin
             if int(video_size_in_bytes) > max_size:
                 safe_edit_message_text(user_id, proc_msg_id,
-                    f"{info_text}\n{full_bar}   100.0%\n<i>⚠️ Your video size ({video_size}) is too large.</i>\n<i>Splitting file...</i> ✂️")
-                returned = split_video_2(dir_path, sanitize_filename_strict(caption_name), after_rename_abs_path, int(video_size_in_bytes), max_size, int(duration), user_id)
-                caption_lst = returned.get("video")
-                path_lst = returned.get("path")
+                    f"{info_text}\n{full_bar}   100.0%\n<i>⚠️ Your video size ({video_size}) is too large.</i>\n<i>Splitting file...</i> ✂️",
+                    _wait=False)
+                # Parts are cut while earlier parts upload; at most SPLIT_UPLOAD_LOOKAHEAD parts sit on disk
+                split_parts = SplitVideoParts(dir_path, sanitize_filename_strict(caption_name), after_rename_abs_path, int(video_size_in_bytes), max_size, int(duration), user_id, lookahead=getattr(LimitsConfig, 'SPLIT_UPLOAD_LOOKAHEAD', 2))
+                caption_lst = split_parts.captions
+                path_lst = split_parts.paths
                 # Accumulate all IDs of split video parts
                 # Note: split_msg_ids is already initialized at function start, don't reset it here
-                for p in range(len(caption_lst) if caption_lst else 0):
-                    caption_name = caption_lst[p] if caption_lst and p < len(caption_lst) else f"part_{p+1}"
-                    part_result = get_duration_thumb(message, dir_path, path_lst[p], sanitize_filename_strict(caption_name))
-                    if part_result is None:
-                        continue
-                    part_duration, splited_thumb_dir = part_result
-                    # --- TikTok: Don't Pass Title ---
-                    video_msg = send_videos(message, path_lst[p], '' if force_no_title else caption_name, part_duration, splited_thumb_dir, info_text, proc_msg.id, full_video_title, tags_text_final)
-                    if not video_msg:
-                        logger.error("send_videos returned None for split part; skipping cache save for this part")
-                        continue
-                    #found_type = None
-                    # Note: Forwarding to log channels is now handled in send_videos function
-                    # We need to get the forwarded message IDs from the log channel for caching
-                    try:
-                        # Determine the correct log channel based on content type
-                        from HELPERS.porn import is_porn
-                        is_nsfw = is_porn(url, "", "", None) or user_forced_nsfw
-                        logger.info(f"[FALLBACK] is_porn check for {url}: {is_porn(url, '', '', None)}, user_forced_nsfw: {user_forced_nsfw}, final is_nsfw: {is_nsfw}")
-                        is_private_chat = getattr(message.chat, "type", None) == enums.ChatType.PRIVATE
-                        is_paid = is_nsfw and is_private_chat
-                        logger.info(f"[VIDEO CACHE] URL analysis: url={url}, is_nsfw={is_nsfw}, is_private_chat={is_private_chat}, is_paid={is_paid}")
+                try:
+                    for p, _, part_path in split_parts:
+                        if part_path is None:
+                            continue
+                        caption_name = caption_lst[p] if caption_lst and p < len(caption_lst) else f"part_{p+1}"
+                        part_result = get_duration_thumb(message, dir_path, path_lst[p], sanitize_filename_strict(caption_name))
+                        if part_result is None:
+                            if os.path.exists(path_lst[p]):
+                                os.remove(path_lst[p])
+                            continue
+                        part_duration, splited_thumb_dir = part_result
+                        # --- TikTok: Don't Pass Title ---
+                        video_msg = send_videos(message, path_lst[p], '' if force_no_title else caption_name, part_duration, splited_thumb_dir, info_text, proc_msg.id, full_video_title, tags_text_final)
+                        if not video_msg:
+                            logger.error("send_videos returned None for split part; skipping cache save for this part")
+                            if os.path.exists(path_lst[p]):
+                                os.remove(path_lst[p])
+                            continue
+                        #found_type = None
+                        # Note: Forwarding to log channels is now handled in send_videos function
+                        # We need to get the forwarded message IDs from the log channel for caching
+                        try:
+                            # Determine the correct log channel based on content type
+                            from HELPERS.porn import is_porn
+                            is_nsfw = is_porn(url, "", "", None) or user_forced_nsfw
+                            logger.info(f"[FALLBACK] is_porn check for {url}: {is_porn(url, '', '', None)}, user_forced_nsfw: {user_forced_nsfw}, final is_nsfw: {is_nsfw}")
+                            is_private_chat = getattr(message.chat, "type", None) == enums.ChatType.PRIVATE
+                            is_paid = is_nsfw and is_private_chat
+                            logger.info(f"[VIDEO CACHE] URL analysis: url={url}, is_nsfw={is_nsfw}, is_private_chat={is_private_chat}, is_paid={is_paid}")
                         
-                        # Handle different content types according to new logic
-                        if is_paid:
-                            # For NSFW content in private chat, send_videos already sent paid media to user
-                            # Send paid copy to LOGS_PAID_ID and open copy to LOGS_NSFW_ID for history
-                            
-                            # Send paid copy to LOGS_PAID_ID
-                            log_channel_paid = get_log_channel("video", paid=True)
-                            try:
-                                # Forward the paid video to LOGS_PAID_ID
-                                safe_forward_messages(log_channel_paid, user_id, [video_msg.id])
-                                logger.info(f"down_and_up: NSFW content paid copy sent to PAID channel")
-                            except Exception as e:
-                                logger.error(f"down_and_up: failed to send paid copy to PAID channel: {e}")
+                            # Handle different content types according to new logic
+                            if is_paid:
+                                # For NSFW content in private chat, send_videos already sent paid media to user
+                                # Send paid copy to LOGS_PAID_ID and open copy to LOGS_NSFW_ID for history
                             
-                            # Send open copy to LOGS_NSFW_ID for history
-                            log_channel_nsfw = get_log_channel("video", nsfw=True)
-                            if log_channel_nsfw and log_channel_nsfw != 0:
+                                # Send paid copy to LOGS_PAID_ID
+                                log_channel_paid = get_log_channel("video", paid=True)
                                 try:
-                                    # Get video dimensions for proper aspect ratio
-                                    try:
-                                        v_w, v_h, v_dur = get_video_info_ffprobe(path_lst[p])
-                                    except Exception:
-                                        v_w, v_h, v_dur = width, height, part_duration
-                                    
-                                    # Create open copy for history (without stars) - send directly to NSFW channel
-                                    open_video_msg = app.send_video(
-                                        chat_id=log_channel_nsfw,
-                                        video=path_lst[p],
-                                        caption=caption_lst[p] if caption_lst and p < len(caption_lst) else f"part_{p+1}",
-                                        duration=int(v_dur) if v_dur else part_duration,
-                                        width=int(v_w) if v_w else width,
-                                        height=int(v_h) if v_h else height,
-                                        thumb=splited_thumb_dir,
-                                        reply_parameters=ReplyParameters(message_id=message.id)
-                                    )
-                                    logger.info(f"down_and_up: NSFW content open copy sent to NSFW channel for history")
-                                    already_forwarded_to_log = True
+                                    # Forward the paid video to LOGS_PAID_ID
+                                    safe_forward_messages(log_channel_paid, user_id, [video_msg.id], _wait=False)
+                                    logger.info(f"down_and_up: NSFW content paid copy sent to PAID channel")
                                 except Exception as e:
-                                    logger.error(f"down_and_up: failed to send open copy to NSFW channel: {e}")
-                            else:
-                                logger.warning(f"down_and_up: NSFW channel not available (ID: {log_channel_nsfw}), skipping open copy")
-                            
-                            # Don't cache NSFW content
-                            logger.info(f"down_and_up: NSFW content sent to user (paid), PAID channel (paid copy), and NSFW channel (open copy), not cached")
-                            forwarded_msgs = None
+                                    logger.error(f"down_and_up: failed to send paid copy to PAID channel: {e}")
                             
-                        elif is_nsfw:
-                            # NSFW content in groups -> LOGS_NSFW_ID only
-                            # For split videos, always forward each part to NSFW channel
-                            # For playlists, always forward each video to NSFW channel (don't use already_forwarded_to_log)
-                            # IMPORTANT: For split videos in playlists, only forward once (split video takes priority)
-                            if caption_lst and len(caption_lst) > 1:
-                                # This is a split video - always forward each part (even if it's in a playlist)
-                                log_channel = get_log_channel("video", nsfw=True)
-                                if log_channel and log_channel != 0:
+                                # Send open copy to LOGS_NSFW_ID for history
+                                log_channel_nsfw = get_log_channel("video", nsfw=True)
+                                if log_channel_nsfw and log_channel_nsfw != 0:
                                     try:
-                                        forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
-                                        logger.info(f"down_and_up: NSFW content sent to NSFW channel")
+                                        # Get video dimensions for proper aspect ratio
+                                        try:
+                                            v_w, v_h, v_dur = get_video_info_ffprobe(path_lst[p])
+                                        except Exception:
+                                            v_w, v_h, v_dur = width, height, part_duration
+                                    
+                                        # Create open copy for history (without stars) - send directly to NSFW channel
+                                        open_video_msg = app.send_video(
+                                            chat_id=log_channel_nsfw,
+                                            video=path_lst[p],
+                                            caption=caption_lst[p] if caption_lst and p < len(caption_lst) else f"part_{p+1}",
+                                            duration=int(v_dur) if v_dur else part_duration,
+                                            width=int(v_w) if v_w else width,
+                                            height=int(v_h) if v_h else height,
+                                            thumb=splited_thumb_dir,
+                                            reply_parameters=ReplyParameters(message_id=message.id)
+                                        )
+                                        logger.info(f"down_and_up: NSFW content open copy sent to NSFW channel for history")
+                                        already_forwarded_to_log = True
                                     except Exception as e:
-                                        logger.error(f"down_and_up: failed to forward to NSFW channel: {e}")
-                                        forwarded_msgs = None
+                                        logger.error(f"down_and_up: failed to send open copy to NSFW channel: {e}")
                                 else:
-                                    logger.warning(f"down_and_up: NSFW channel not available (ID: {log_channel}), skipping forward")
-                                    forwarded_msgs = None
-                            elif is_playlist:
-                                # For playlists (non-split videos), always forward each video to NSFW channel
-                                log_channel = get_log_channel("video", nsfw=True)
-                                if log_channel and log_channel != 0:
-                                    try:
-                                        forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
-                                        logger.info(f"down_and_up: NSFW content sent to NSFW channel")
-                                    except Exception as e:
-                                        logger.error(f"down_and_up: failed to forward to NSFW channel: {e}")
+                                    logger.warning(f"down_and_up: NSFW channel not available (ID: {log_channel_nsfw}), skipping open copy")
+                            
+                                # Don't cache NSFW content
+                                logger.info(f"down_and_up: NSFW content sent to user (paid), PAID channel (paid copy), and NSFW channel (open copy), not cached")
+                                forwarded_msgs = None
+                            
+                            elif is_nsfw:
+                                # NSFW content in groups -> LOGS_NSFW_ID only
+                                # For split videos, always forward each part to NSFW channel
+                                # For playlists, always forward each video to NSFW channel (don't use already_forwarded_to_log)
+                                # IMPORTANT: For split videos in playlists, only forward once (split video takes priority)
+                                if caption_lst and len(caption_lst) > 1:
+                                    # This is a split video - always forward each part (even if it's in a playlist)
+                                    log_channel = get_log_channel("video", nsfw=True)
+                                    if log_channel and log_channel != 0:
+                                        try:
+                                            forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
+                                            logger.info(f"down_and_up: NSFW content sent to NSFW channel")
+                                        except Exception as e:
+                                            logger.error(f"down_and_up: failed to forward to NSFW channel: {e}")
+                                            forwarded_msgs = None
+                                    else:
+                                        logger.warning(f"down_and_up: NSFW channel not available (ID: {log_channel}), skipping forward")
                                         forwarded_msgs = None
-                                else:
-                                    logger.warning(f"down_and_up: NSFW channel not available (ID: {log_channel}), skipping forward")
-                                    forwarded_msgs = None
-                            elif not already_forwarded_to_log:
-                                already_forwarded_to_log = True  # Set flag BEFORE forward to prevent duplicates
-                                log_channel = get_log_channel("video", nsfw=True)
-                                if log_channel and log_channel != 0:
-                                    try:
-                                        forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
-                                        logger.info(f"down_and_up: NSFW content sent to NSFW channel")
-                                    except Exception as e:
-                                        logger.error(f"down_and_up: failed to forward to NSFW channel: {e}")
+                                elif is_playlist:
+                                    # For playlists (non-split videos), always forward each video to NSFW channel
+                                    log_channel = get_log_channel("video", nsfw=True)
+                                    if log_channel and log_channel != 0:
+                                        try:
+                                            forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
+                                            logger.info(f"down_and_up: NSFW content sent to NSFW channel")
+                                        except Exception as e:
+                                            logger.error(f"down_and_up: failed to forward to NSFW channel: {e}")
+                                            forwarded_msgs = None
+                                    else:
+                                        logger.warning(f"down_and_up: NSFW channel not available (ID: {log_channel}), skipping forward")
+                                        forwarded_msgs = None
+                                elif not already_forwarded_to_log:
+                                    already_forwarded_to_log = True  # Set flag BEFORE forward to prevent duplicates
+                                    log_channel = get_log_channel("video", nsfw=True)
+                                    if log_channel and log_channel != 0:
+                                        try:
+                                            forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
+                                            logger.info(f"down_and_up: NSFW content sent to NSFW channel")
+                                        except Exception as e:
+                                            logger.error(f"down_and_up: failed to forward to NSFW channel: {e}")
+                                            forwarded_msgs = None
+                                    else:
+                                        logger.warning(f"down_and_up: NSFW channel not available (ID: {log_channel}), skipping forward")
                                         forwarded_msgs = None
                                 else:
-                                    logger.warning(f"down_and_up: NSFW channel not available (ID: {log_channel}), skipping forward")
+                                    logger.info("down_and_up: skipping forward to NSFW channel - already forwarded to log")
                                     forwarded_msgs = None
-                            else:
-                                logger.info("down_and_up: skipping forward to NSFW channel - already forwarded to log")
-                                forwarded_msgs = None
                             
-                            # Don't cache NSFW content
-                            logger.info(f"down_and_up: NSFW content sent to NSFW channel, not cached")
+                                # Don't cache NSFW content
+                                logger.info(f"down_and_up: NSFW content sent to NSFW channel, not cached")
                             
-                        else:
-                            # Regular content -> LOGS_VIDEO_ID and cache
-                            # For split videos, always forward each part to log channel
-                            # For playlists, always forward each video to log channel (don't use already_forwarded_to_log)
-                            # IMPORTANT: For split videos in playlists, only forward once (split video takes priority)
-                            if caption_lst and len(caption_lst) > 1:
-                                # This is a split video - always forward each part (even if it's in a playlist)
-                                log_channel = get_log_channel("video")
-                                forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
-                            elif is_playlist:
-                                # For playlists (non-split videos), always forward each video to log channel
-                                log_channel = get_log_channel("video")
-                                forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
-                            elif not already_forwarded_to_log:
-                                already_forwarded_to_log = True  # Set flag BEFORE forward to prevent duplicates
-                                log_channel = get_log_channel("video")
-                                forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
                             else:
-                                logger.info("down_and_up: skipping forward to LOGS_VIDEO_ID - already forwarded to log")
-                                forwarded_msgs = None
-                        logger.info(f"down_and_up: forwarded_msgs result: {forwarded_msgs}")
-                        if forwarded_msgs:
-                            logger.info(f"down_and_up: collecting forwarded message IDs for split video: {[m.id for m in forwarded_msgs]}")
-                            if is_playlist:
-                                # For playlists, save to playlist cache with index
-                                current_video_index = current_index
-                                rounded_quality_key = safe_quality_key
-                                try:
-                                    if safe_quality_key.endswith('p'):
-                                        rounded_quality_key = f"{ceil_to_popular(int(safe_quality_key[:-1]))}p"
-                                except Exception:
-                                    pass
-                                # Use the already determined subtitle availability
-                                if not need_subs:
-                                    # Only cache regular content (not NSFW)
-                                    if not is_nsfw:
+                                # Regular content -> LOGS_VIDEO_ID and cache
+                                # For split videos, always forward each part to log channel
+                                # For playlists, always forward each video to log channel (don't use already_forwarded_to_log)
+                                # IMPORTANT: For split videos in playlists, only forward once (split video takes priority)
+                                if caption_lst and len(caption_lst) > 1:
+                                    # This is a split video - always forward each part (even if it's in a playlist)
+                                    log_channel = get_log_channel("video")
+                                    forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
+                                elif is_playlist:
+                                    # For playlists (non-split videos), always forward each video to log channel
+                                    log_channel = get_log_channel("video")
+                                    forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
+                                elif not already_forwarded_to_log:
+                                    already_forwarded_to_log = True  # Set flag BEFORE forward to prevent duplicates
+                                    log_channel = get_log_channel("video")
+                                    forwarded_msgs = safe_forward_messages(log_channel, user_id, [video_msg.id])
+                                else:
+                                    logger.info("down_and_up: skipping forward to LOGS_VIDEO_ID - already forwarded to log")
+                                    forwarded_msgs = None
+                            logger.info(f"down_and_up: forwarded_msgs result: {forwarded_msgs}")
+                            if forwarded_msgs:
+                                logger.info(f"down_and_up: collecting forwarded message IDs for split video: {[m.id for m in forwarded_msgs]}")
+                                if is_playlist:
+                                    # For playlists, save to playlist cache with index
+                                    current_video_index = current_index
+                                    rounded_quality_key = safe_quality_key
+                                    try:
+                                        if safe_quality_key.endswith('p'):
+                                            rounded_quality_key = f"{ceil_to_popular(int(safe_quality_key[:-1]))}p"
+                                    except Exception:
+                                        pass
+                                    # Use the already determined subtitle availability
+                                    if not need_subs:
+                                        # Only cache regular content (not NSFW)
+                                        if not is_nsfw:
+                                            # Pass the video's unique URL for additional caching
+                                            video_urls_dict = {current_video_index: playlist_video_urls.get(current_video_index)} if current_video_index in playlist_video_urls else None
+                                            save_to_playlist_cache(get_clean_playlist_url(url), rounded_quality_key, [current_video_index], [m.id for m in forwarded_msgs], original_text=message.text or message.caption or "", video_urls_dict=video_urls_dict)
+                                        else:
+                                            logger.info(f"NSFW content not cached (found_type={found_type}, auto_mode={auto_mode})")
+                                    else:
+                                        logger.info(f"Video with subtitles is not cached (found_type={found_type}, auto_mode={auto_mode})")
+                                    cached_check = get_cached_playlist_videos(get_clean_playlist_url(url), rounded_quality_key, [current_video_index])
+                                    logger.info(f"Checking the cache immediately after writing: {cached_check}")
+                                    playlist_indices.append(current_video_index)
+                                    playlist_msg_ids.extend([m.id for m in forwarded_msgs])
+                                else:
+                                    # Accumulate IDs of parts for split video
+                                    split_msg_ids.extend([m.id for m in forwarded_msgs])
+                            else:
+                                logger.info(f"down_and_up: collecting video_msg.id for split video: {video_msg.id}")
+                                if is_playlist:
+                                    # For playlists, save to playlist cache with video index
+                                    current_video_index = current_index
+                                    #found_type = check_subs_availability(url, user_id, safe_quality_key, return_type=True)
+                                    subs_enabled = is_subs_enabled(user_id)
+                                    auto_mode = get_user_subs_auto_mode(user_id)
+                                    need_subs = determine_need_subs(subs_enabled, found_type, user_id)
+                                    if not need_subs:
                                         # Pass the video's unique URL for additional caching
                                         video_urls_dict = {current_video_index: playlist_video_urls.get(current_video_index)} if current_video_index in playlist_video_urls else None
-                                        save_to_playlist_cache(get_clean_playlist_url(url), rounded_quality_key, [current_video_index], [m.id for m in forwarded_msgs], original_text=message.text or message.caption or "", video_urls_dict=video_urls_dict)
+                                        save_to_playlist_cache(get_clean_playlist_url(url), safe_quality_key, [current_video_index], [video_msg.id], original_text=message.text or message.caption or "", video_urls_dict=video_urls_dict)
                                     else:
-                                        logger.info(f"NSFW content not cached (found_type={found_type}, auto_mode={auto_mode})")
+                                        logger.info("Video with subtitles (subs.txt found) is not cached!")
+                                    cached_check = get_cached_playlist_videos(get_clean_playlist_url(url), safe_quality_key, [current_video_index])
+                                    logger.info(f"Checking the cache immediately after writing: {cached_check}")
+                                    playlist_indices.append(current_video_index)
+                                    playlist_msg_ids.append(video_msg.id)
                                 else:
-                                    logger.info(f"Video with subtitles is not cached (found_type={found_type}, auto_mode={auto_mode})")
-                                cached_check = get_cached_playlist_videos(get_clean_playlist_url(url), rounded_quality_key, [current_video_index])
-                                logger.info(f"Checking the cache immediately after writing: {cached_check}")
-                                playlist_indices.append(current_video_index)
-                                playlist_msg_ids.extend([m.id for m in forwarded_msgs])
+                                    # Accumulate IDs of parts for split video
+                                    split_msg_ids.append(video_msg.id)
+                                    logger.info(f"down_and_up: added video_msg.id to split_msg_ids: {video_msg.id}, current split_msg_ids: {split_msg_ids}")
+                        except Exception as e:
+                            # Check if error is related to quality_key - if so, ignore it completely
+                            if "'quality_key'" in str(e):
+                                logger.info(f"quality_key error ignored (non-critical): {e}")
+                                # Quality_key errors don't affect functionality, just continue
                             else:
-                                # Accumulate IDs of parts for split video
-                                split_msg_ids.extend([m.id for m in forwarded_msgs])
-                        else:
-                            logger.info(f"down_and_up: collecting video_msg.id for split video: {video_msg.id}")
+                                logger.error(f"Error forwarding video to logger: {e}")
+                            logger.info(f"down_and_up: collecting video_msg.id after error for split video: {video_msg.id}")
+                        
+                            # PREVENTIVE FIX: Handle split video completion even after quality_key error
+                            if split_msg_ids and not is_playlist:
+                                logger.info(f"PREVENTIVE FIX: Processing split video completion after quality_key error in loop: {split_msg_ids}")
+                                actual_video_count = len(split_msg_ids)
+                                success_msg = f"<b>{safe_get_messages(user_id).DOWN_UP_UPLOAD_COMPLETE_MSG}</b> - {actual_video_count} {safe_get_messages(user_id).DOWN_UP_FILES_UPLOADED_MSG}.\n{safe_get_messages(user_id).CREDITS_MSG}"
+                                logger.info(f"PREVENTIVE FIX: sending final success message for split video: {success_msg}")
+                                safe_edit_message_text(user_id, proc_msg_id, success_msg, _wait=False)
+                                send_to_logger(message, safe_get_messages(user_id).VIDEO_UPLOAD_COMPLETED_SPLITTING_LOG_MSG)
+                                break
                             if is_playlist:
                                 # For playlists, save to playlist cache with video index
                                 current_video_index = current_index
@@ -2675,55 +2735,20 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                             else:
                                 # Accumulate IDs of parts for split video
                                 split_msg_ids.append(video_msg.id)
-                                logger.info(f"down_and_up: added video_msg.id to split_msg_ids: {video_msg.id}, current split_msg_ids: {split_msg_ids}")
-                    except Exception as e:
-                        # Check if error is related to quality_key - if so, ignore it completely
-                        if "'quality_key'" in str(e):
-                            logger.info(f"quality_key error ignored (non-critical): {e}")
-                            # Quality_key errors don't affect functionality, just continue
-                        else:
-                            logger.error(f"Error forwarding video to logger: {e}")
-                        logger.info(f"down_and_up: collecting video_msg.id after error for split video: {video_msg.id}")
-                        
-                        # PREVENTIVE FIX: Handle split video completion even after quality_key error
-                        if split_msg_ids and not is_playlist:
-                            logger.info(f"PREVENTIVE FIX: Processing split video completion after quality_key error in loop: {split_msg_ids}")
-                            actual_video_count = len(split_msg_ids)
-                            success_msg = f"<b>{safe_get_messages(user_id).DOWN_UP_UPLOAD_COMPLETE_MSG}</b> - {actual_video_count} {safe_get_messages(user_id).DOWN_UP_FILES_UPLOADED_MSG}.\n{safe_get_messages(user_id).CREDITS_MSG}"
-                            logger.info(f"PREVENTIVE FIX: sending final success message for split video: {success_msg}")
-                            safe_edit_message_text(user_id, proc_msg_id, success_msg)
-                            send_to_logger(message, safe_get_messages(user_id).VIDEO_UPLOAD_COMPLETED_SPLITTING_LOG_MSG)
-                            break
-                        if is_playlist:
-                            # For playlists, save to playlist cache with video index
-                            current_video_index = current_index
-                            #found_type = check_subs_availability(url, user_id, safe_quality_key, return_type=True)
-                            subs_enabled = is_subs_enabled(user_id)
-                            auto_mode = get_user_subs_auto_mode(user_id)
-                            need_subs = determine_need_subs(subs_enabled, found_type, user_id)
-                            if not need_subs:
-                                # Pass the video's unique URL for additional caching
-                                video_urls_dict = {current_video_index: playlist_video_urls.get(current_video_index)} if current_video_index in playlist_video_urls else None
-                                save_to_playlist_cache(get_clean_playlist_url(url), safe_quality_key, [current_video_index], [video_msg.id], original_text=message.text or message.caption or "", video_urls_dict=video_urls_dict)
-                            else:
-                                logger.info("Video with subtitles (subs.txt found) is not cached!")
-                            cached_check = get_cached_playlist_videos(get_clean_playlist_url(url), safe_quality_key, [current_video_index])
-                            logger.info(f"Checking the cache immediately after writing: {cached_check}")
-                            playlist_indices.append(current_video_index)
-                            playlist_msg_ids.append(video_msg.id)
-                        else:
-                            # Accumulate IDs of parts for split video
-                            split_msg_ids.append(video_msg.id)
-                            logger.info(f"down_and_up: added video_msg.id to split_msg_ids after error: {video_msg.id}, current split_msg_ids: {split_msg_ids}")
-                            safe_edit_message_text(user_id, proc_msg_id,
-                                f"{info_text}\n{full_bar}   100.0%\n<i>{safe_get_messages(user_id).DOWN_UP_SPLITTED_PART_UPLOADED_MSG.format(part=p + 1)}</i>")
-                    if caption_lst and p < len(caption_lst) - 1:
-                        pass
-                    if os.path.exists(splited_thumb_dir):
-                        os.remove(splited_thumb_dir)
-                    send_mediainfo_if_enabled(user_id, path_lst[p], message)
-                    if os.path.exists(path_lst[p]):
-                        os.remove(path_lst[p])
+                                logger.info(f"down_and_up: added video_msg.id to split_msg_ids after error: {video_msg.id}, current split_msg_ids: {split_msg_ids}")
+                                safe_edit_message_text(user_id, proc_msg_id,
+                                    f"{info_text}\n{full_bar}   100.0%\n<i>{safe_get_messages(user_id).DOWN_UP_SPLITTED_PART_UPLOADED_MSG.format(part=p + 1)}</i>",
+                                    _wait=False)
+                        if caption_lst and p < len(caption_lst) - 1:
+                            pass
+                        if os.path.exists(splited_thumb_dir):
+                            os.remove(splited_thumb_dir)
+                        send_mediainfo_if_enabled(user_id, path_lst[p], message)
+                        if os.path.exists(path_lst[p]):
+                            os.remove(path_lst[p])
+                finally:
+                    # Stop cutting if the loop ended early (or an upload raised), before the source file is removed
+                    split_parts.close()
                 
                 # Save all parts of split video to cache after the loop is completed
                 logger.info(f"down_and_up: checking split_msg_ids for cache save: {split_msg_ids}, is_playlist={is_playlist}")
@@ -2758,7 +2783,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                 actual_video_count = len(split_msg_ids) if split_msg_ids else video_count
                 success_msg = f"<b>{safe_get_messages(user_id).DOWN_UP_UPLOAD_COMPLETE_MSG}</b> - {actual_video_count} {safe_get_messages(user_id).DOWN_UP_FILES_UPLOADED_MSG}.\n{safe_get_messages(user_id).CREDITS_MSG}"
                 logger.info(f"down_and_up: sending final success message for split video: {success_msg}")
-                safe_edit_message_text(user_id, proc_msg_id, success_msg)
+                safe_edit_message_text(user_id, proc_msg_id, success_msg, _wait=False)
                 send_to_logger(message, safe_get_messages(user_id).VIDEO_UPLOAD_COMPLETED_SPLITTING_LOG_MSG)
                 
             else:
@@ -2953,7 +2978,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                                 log_channel_paid = get_log_channel("video", paid=True)
                                 try:
                                     # Forward the paid video to LOGS_PAID_ID
-                                    safe_forward_messages(log_channel_paid, user_id, [video_msg.id])
+                                    safe_forward_messages(log_channel_paid, user_id, [video_msg.id], _wait=False)
                                     logger.info(f"down_and_up: NSFW content paid copy sent to PAID channel")
                                 except Exception as e:
                                     logger.error(f"down_and_up: failed to send paid copy to PAID channel: {e}")
@@ -3100,7 +3125,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                                             # NSFW content in groups -> LOGS_NSFW_ID only
                                             log_channel = get_log_channel("video", nsfw=True)
                                             try:
-                                                safe_forward_messages(log_channel, user_id, [video_msg.id])
+                                                safe_forward_messages(log_channel, user_id, [video_msg.id], _wait=False)
                                                 logger.info(f"down_and_up: NSFW content sent to NSFW channel (manual)")
                                             except Exception as e:
                                                 logger.error(f"down_and_up: failed to forward to NSFW channel (manual): {e}")
@@ -3169,7 +3194,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                                     actual_video_count = len(split_msg_ids)
                                     success_msg = f"<b>{safe_get_messages(user_id).DOWN_UP_UPLOAD_COMPLETE_MSG}</b> - {actual_video_count} {safe_get_messages(user_id).DOWN_UP_FILES_UPLOADED_MSG}.\n{safe_get_messages(user_id).CREDITS_MSG}"
                                     logger.info(f"PREVENTIVE FIX: sending final success message for split video: {success_msg}")
-                                    safe_edit_message_text(user_id, proc_msg_id, success_msg)
+                                    safe_edit_message_text(user_id, proc_msg_id, success_msg, _wait=False)
                                     send_to_logger(message, safe_get_messages(user_id).VIDEO_UPLOAD_COMPLETED_SPLITTING_LOG_MSG)
                 
                             else:
@@ -3194,7 +3219,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                                     log_channel_paid = get_log_channel("video", paid=True)
                                     try:
                                         # Forward the paid video to LOGS_PAID_ID
-                                        safe_forward_messages(log_channel_paid, user_id, [video_msg.id])
+                                        safe_forward_messages(log_channel_paid, user_id, [video_msg.id], _wait=False)
                                         logger.info(f"down_and_up: NSFW content paid copy sent to PAID channel (error recovery)")
                                     except Exception as e:
                                         logger.error(f"down_and_up: failed to send paid copy to PAID channel (error recovery): {e}")
@@ -3232,7 +3257,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                                     # NSFW content in groups -> LOGS_NSFW_ID only
                                     log_channel = get_log_channel("video", nsfw=True)
                                     try:
-                                        safe_forward_messages(log_channel, user_id, [video_msg.id])
+                                        safe_forward_messages(log_channel, user_id, [video_msg.id], _wait=False)
                                         logger.info(f"down_and_up: NSFW content sent to NSFW channel (error recovery)")
                                     except Exception as e:
                                         logger.error(f"down_and_up: failed to forward to NSFW channel (error recovery): {e}")
@@ -3294,13 +3319,14 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                                         actual_video_count = len(split_msg_ids)
                                         success_msg = f"<b>{safe_get_messages(user_id).DOWN_UP_UPLOAD_COMPLETE_MSG}</b> - {actual_video_count} {safe_get_messages(user_id).DOWN_UP_FILES_UPLOADED_MSG}.\n{safe_get_messages(user_id).CREDITS_MSG}"
                                         logger.info(f"PREVENTIVE FIX: sending final success message for split video: {success_msg}")
-                                        safe_edit_message_text(user_id, proc_msg_id, success_msg)
+                                        safe_edit_message_text(user_id, proc_msg_id, success_msg, _wait=False)
                                         send_to_logger(message, safe_get_messages(user_id).VIDEO_UPLOAD_COMPLETED_SPLITTING_LOG_MSG)
                 # end-of-task subs cache clearing handled in unified success branches below
                                 else:
                                     logger.error(f"Error in manual forward after error: {e2}")
                         safe_edit_message_text(user_id, proc_msg_id,
-                            f"{info_text}\n{full_bar}   100.0%\n<b>{safe_get_messages(user_id).DOWN_UP_VIDEO_DURATION_MSG}</b> <i>{TimeFormatter(duration * 1000)}</i>\n{safe_get_messages(user_id).DOWN_UP_ONE_FILE_UPLOADED_MSG}")
+                            f"{info_text}\n{full_bar}   100.0%\n<b>{safe_get_messages(user_id).DOWN_UP_VIDEO_DURATION_MSG}</b> <i>{TimeFormatter(duration * 1000)}</i>\n{safe_get_messages(user_id).DOWN_UP_ONE_FILE_UPLOADED_MSG}",
+                            _wait=False)
                         send_mediainfo_if_enabled(user_id, after_rename_abs_path, message)
                         
                         # Clean up video file and thumbnail
@@ -3316,7 +3342,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                         continue
         if successful_uploads == len(indices_to_download):
             success_msg = f"<b>{safe_get_messages(user_id).DOWN_UP_UPLOAD_COMPLETE_MSG}</b> - {video_count} {safe_get_messages(user_id).DOWN_UP_FILES_UPLOADED_MSG}.\n{safe_get_messages(user_id).CREDITS_MSG}"
-            safe_edit_message_text(user_id, proc_msg_id, success_msg)
+            safe_edit_message_text(user_id, proc_msg_id, success_msg, _wait=False)
             send_to_logger(message, success_msg)
             try:
                 from COMMANDS.subtitles_cmd import clear_subs_cache_for
@@ -3359,7 +3385,7 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
                 actual_video_count = len(split_msg_ids)
                 success_msg = f"<b>{safe_get_messages(user_id).DOWN_UP_UPLOAD_COMPLETE_MSG}</b> - {actual_video_count} {safe_get_messages(user_id).DOWN_UP_FILES_UPLOADED_MSG}.\n{safe_get_messages(user_id).CREDITS_MSG}"
                 logger.info(f"HARD FIX: sending final success message for split video: {success_msg}")
-                safe_edit_message_text(user_id, proc_msg_id, success_msg)
+                safe_edit_message_text(user_id, proc_msg_id, success_msg, _wait=False)
                 send_to_logger(message, safe_get_messages(user_id).VIDEO_UPLOAD_COMPLETED_SPLITTING_LOG_MSG)
                 try:
                     from COMMANDS.subtitles_cmd import clear_subs_cache_for
@@ -3376,11 +3402,11 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
         # Immediate cleanup of temporary status messages on error
         try:
             if status_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[status_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[status_msg_id], revoke=True, _wait=False)
             if hourglass_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[hourglass_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[hourglass_msg_id], revoke=True, _wait=False)
             if download_started_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[download_started_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[download_started_msg_id], revoke=True, _wait=False)
             stop_anim.set()
         except Exception:
             pass
@@ -3391,6 +3417,8 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
         except Exception as cleanup_error:
             logger.error(f"Error cleaning up temp files after error for user {user_id}: {cleanup_error}")
     finally:
+        if download_slot is not None:
+            download_slot.release()
         set_active_download(user_id, False)
         clear_download_start_time(user_id)  # Clear the download start time
         if playlist_name:
@@ -3407,15 +3435,15 @@ def down_and_up(app, message, url, playlist_name, video_count, video_start_with,
 
         try:
             if status_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[status_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[status_msg_id], revoke=True, _wait=False)
             if hourglass_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[hourglass_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[hourglass_msg_id], revoke=True, _wait=False)
         except Exception as e:
             logger.error(f"Error deleting status messages: {e}")
         # Also try to delete the 'Download started' message if it still exists
         try:
             if download_started_msg_id:
-                safe_delete_messages(chat_id=user_id, message_ids=[download_started_msg_id], revoke=True)
+                safe_delete_messages(chat_id=user_id, message_ids=[download_started_msg_id], revoke=True, _wait=False)
         except Exception:
             pass
 
@@ -136,6 +136,209 @@ def get_ytdlp_path():
     
     return ytdlp_path
 
+def probe_keyframes(video_path, start_time=None, end_time=None):
+    """
+    Return [(time_seconds, byte_offset), ...] for the keyframes of the first
+    video stream, read from the container packet index (no decoding). With
+    start_time/end_time only packets in that time range are read
+    (ffprobe -read_intervals) instead of the whole file.
+    Returns an empty list if ffprobe is unavailable or reports no offsets.
+    """
+    cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0']
+    if start_time is not None or end_time is not None:
+        interval = f"{start_time:.3f}" if start_time is not None else ""
+        if end_time is not None:
+            interval += f"%{end_time:.3f}"
+        cmd += ['-read_intervals', interval]
+    cmd += ['-show_entries', 'packet=pts_time,pos,flags', '-of', 'compact=p=0:nk=0', video_path]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace')
+    except Exception as e:
+        logger.error(f'ffprobe keyframe probe error: {e}')
+        return []
+    if result.returncode != 0:
+        logger.warning(f"ffprobe keyframe probe failed (code {result.returncode}): {result.stderr[:300]}")
+        return []
+    keyframes = []
+    for line in result.stdout.splitlines():
+        fields = dict(item.split('=', 1) for item in line.split('|') if '=' in item)
+        if not fields.get('flags', '').startswith('K'):
+            continue
+        try:
+            keyframes.append((float(fields['pts_time']), int(fields['pos'])))
+        except (KeyError, ValueError):
+            continue
+    keyframes.sort()
+    return keyframes
+
+
+# Seconds of packets probed on each side of an estimated cut point
+_SPLIT_PROBE_WINDOW = 30.0
+# Probes per cut point before settling for the best keyframe found so far
+_SPLIT_PROBE_ATTEMPTS = 8
+
+
+def plan_split_points(probe, video_size, max_size, duration, safety=0.97):
+    """
+    Choose part boundaries on keyframes so each part stays under max_size bytes.
+
+    Each part is extended to the furthest keyframe whose byte offset keeps it
+    within max_size * safety (the margin covers the rewritten container
+    header). Only the packets around each estimated cut point are probed:
+    probe(start_time, end_time) returns the keyframes in that range (see
+    probe_keyframes). The first estimate comes from the average bitrate and
+    is corrected from the offsets of the keyframes probed.
+    Returns [(start_time, end_time_or_None), ...], the last part has end_time
+    None and runs to the end of the file; or None if no usable keyframe was
+    found (the caller then cuts by duration).
+    """
+    budget = max_size * safety
+    if duration <= 0 or video_size <= 0:
+        return None
+    parts = []
+    # The first part also carries everything before the first keyframe (container header)
+    start_time, start_pos = 0.0, 0
+    while video_size - start_pos > budget:
+        target = start_time + budget * duration / video_size
+        best = None
+        for _ in range(_SPLIT_PROBE_ATTEMPTS):
+            window_start, window_end = max(start_time, target - _SPLIT_PROBE_WINDOW), target + _SPLIT_PROBE_WINDOW
+            keyframes = [kf for kf in probe(window_start, window_end) if kf[0] > start_time]
+            fitting = [kf for kf in keyframes if kf[1] - start_pos <= budget]
+            if fitting and (best is None or fitting[-1] > best):
+                best = fitting[-1]
+            if best is not None and (len(fitting) < len(keyframes) or window_end >= duration):
+                break
+            if not keyframes or (not fitting and window_start <= start_time):
+                break
+            # Re-estimate from the bitrate between the part start and this window, moving past it
+            t, pos = keyframes[-1] if fitting else keyframes[0]
+            target = start_time + budget * (t - start_time) / max(1, pos - start_pos)
+            if fitting:
+                target = max(target, t + _SPLIT_PROBE_WINDOW)
+            else:
+                target = min(target, t - _SPLIT_PROBE_WINDOW)
+        if best is None:
+            return None
+        parts.append((start_time, best[0]))
+        start_time, start_pos = best
+    parts.append((start_time, None))
+    return parts
+
+
+def _cut_part_stream_copy(ffmpeg_path, video_path, start_time, end_time, target_name):
+    """Stream-copy [start_time, end_time) into target_name using input seeking."""
+    cmd = [ffmpeg_path, '-y', '-v', 'error', '-ss', f"{start_time:.3f}", '-i', video_path]
+    if end_time is not None:
+        cmd += ['-t', f"{end_time - start_time:.3f}"]
+    cmd += ['-map', '0', '-c', 'copy', '-avoid_negative_ts', 'make_zero', target_name]
+    result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace')
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg exited with code {result.returncode}: {result.stderr[:500]}")
+    return target_name
+
+
+class SplitVideoParts(object):
+    """
+    Cut a video into parts and iterate over them in order as they become ready.
+
+    Cut points are keyframe-aligned and sized from the keyframe byte offsets
+    around each cut point (see plan_split_points); if the keyframe index cannot be probed the video
+    is cut into equal-duration parts as before. Cuts are stream copies run in
+    parallel, at most LimitsConfig.FFMPEG_SPLIT_WORKERS at a time.
+
+    With lookahead=N at most N parts are cut ahead of the consumer, so while
+    part k is being uploaded part k+1 is being cut and disk usage stays at
+    about N parts (the consumer is expected to delete each part after use).
+    Iteration yields (index, caption, path); path is None for a part that
+    failed to cut. ``captions``/``paths`` list all planned parts up front.
+    """
+
+    def __init__(self, dir, video_name, video_path, video_size, max_size, duration, user_id, lookahead=None):
+        self.video_path = video_path
+        self.max_size = max_size
+        self.duration = duration
+        self.user_id = user_id
+        self._ffmpeg_path = get_ffmpeg_path()
+        plan = None
+        if self._ffmpeg_path:
+            plan = plan_split_points(lambda start, end: probe_keyframes(video_path, start, end), video_size, max_size, duration)
+        if plan:
+            self.plan = plan
+        else:
+            rounds = (math.floor(video_size / max_size)) + 1
+            n = duration / rounds
+            self.plan = [(x * n, min((x + 1) * n, duration) if x + 1 < rounds else None) for x in range(rounds)]
+        rounds = len(self.plan)
+        if rounds and rounds > 20:
+            logger.warning(safe_get_messages(user_id).FFMPEG_VIDEO_SPLIT_EXCESSIVE_MSG.format(rounds=rounds))
+        self.captions = [video_name + " - Part " + str(x + 1) for x in range(rounds)]
+        self.paths = [os.path.join(dir, cap_name + ".mp4") for cap_name in self.captions]
+        self.lookahead = max(1, lookahead or rounds or 1)
+        self._pool = None
+        self._futures = []
+        self._consumed = 0
+
+    def __len__(self):
+        return len(self.plan)
+
+    def _cut(self, x):
+        start_time, end_time = self.plan[x]
+        target_name = self.paths[x]
+        logger.info(safe_get_messages(self.user_id).FFMPEG_SPLITTING_VIDEO_PART_MSG.format(current=x+1, total=len(self.plan), start_time=start_time, end_time=end_time if end_time is not None else self.duration))
+        if self._ffmpeg_path:
+            _cut_part_stream_copy(self._ffmpeg_path, self.video_path, start_time, end_time, target_name)
+        else:
+            ffmpeg_extract_subclip(self.video_path, start_time, end_time if end_time is not None else self.duration, targetname=target_name)
+        if not os.path.exists(target_name) or os.path.getsize(target_name) == 0:
+            logger.error(safe_get_messages(self.user_id).FFMPEG_FAILED_CREATE_SPLIT_PART_MSG.format(part=x+1, target_name=target_name))
+            return None
+        part_size = os.path.getsize(target_name)
+        logger.info(safe_get_messages(self.user_id).FFMPEG_SUCCESSFULLY_CREATED_SPLIT_PART_MSG.format(part=x+1, target_name=target_name, size=part_size))
+        if part_size > self.max_size:
+            logger.warning(f"Split part {x+1} is {part_size} bytes, above the {self.max_size} bytes limit")
+        return target_name
+
+    def _submit_until(self, limit):
+        while len(self._futures) < min(limit, len(self.plan)):
+            self._futures.append(self._pool.submit(self._cut, len(self._futures)))
+
+    def __iter__(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from CONFIG.limits import LimitsConfig
+
+        workers = max(1, int(getattr(LimitsConfig, 'FFMPEG_SPLIT_WORKERS', 3)))
+        self._pool = ThreadPoolExecutor(max_workers=max(1, min(workers, self.lookahead, len(self.plan))))
+        try:
+            for x in range(len(self.plan)):
+                self._submit_until(x + self.lookahead)
+                try:
+                    target_name = self._futures[x].result()
+                except Exception as e:
+                    logger.error(safe_get_messages(self.user_id).FFMPEG_ERROR_SPLITTING_VIDEO_PART_MSG.format(part=x+1, error=e))
+                    # If a part fails, we continue with the others
+                    target_name = None
+                self._consumed = x + 1
+                yield x, self.captions[x], target_name
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop cutting, wait for running cuts and remove parts that were never handed out."""
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        for future in self._futures[self._consumed:]:
+            future.cancel()
+        pool.shutdown(wait=True)
+        for path in self.paths[self._consumed:len(self._futures)]:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError as e:
+                logger.warning(f"Failed to remove unused split part {path}: {e}")
+
+
 def split_video_2(dir, video_name, video_path, video_size, max_size, duration, user_id):
     messages = safe_get_messages(None)
     """
@@ -152,43 +355,16 @@ def split_video_2(dir, video_name, video_path, video_size, max_size, duration, u
     Returns:
         dict: Dictionary with video parts information
     """
-    rounds = (math.floor(video_size / max_size)) + 1
-    n = duration / rounds
     caption_lst = []
     path_lst = []
 
     try:
-        if rounds and rounds > 20:
-            logger.warning(safe_get_messages(user_id).FFMPEG_VIDEO_SPLIT_EXCESSIVE_MSG.format(rounds=rounds))
-
-        for x in range(rounds):
-            start_time = x * n
-            end_time = (x * n) + n
-
-            # Ensure end_time doesn't exceed duration
-            end_time = min(end_time, duration)
-
-            cap_name = video_name + " - Part " + str(x + 1)
-            target_name = os.path.join(dir, cap_name + ".mp4")
-
+        for _, cap_name, target_name in SplitVideoParts(dir, video_name, video_path, video_size, max_size, duration, user_id):
+            if target_name is None:
+                continue
             caption_lst.append(cap_name)
             path_lst.append(target_name)
 
-            try:
-                # Use progress logging
-                logger.info(safe_get_messages(user_id).FFMPEG_SPLITTING_VIDEO_PART_MSG.format(current=x+1, total=rounds, start_time=start_time, end_time=end_time))
-                ffmpeg_extract_subclip(video_path, start_time, end_time, targetname=target_name)
-
-                # Verify the split was successful
-                if not os.path.exists(target_name) or os.path.getsize(target_name) == 0:
-                    logger.error(safe_get_messages(user_id).FFMPEG_FAILED_CREATE_SPLIT_PART_MSG.format(part=x+1, target_name=target_name))
-                else:
-                    logger.info(safe_get_messages(user_id).FFMPEG_SUCCESSFULLY_CREATED_SPLIT_PART_MSG.format(part=x+1, target_name=target_name, size=os.path.getsize(target_name)))
-
-            except Exception as e:
-                logger.error(safe_get_messages(user_id).FFMPEG_ERROR_SPLITTING_VIDEO_PART_MSG.format(part=x+1, error=e))
-                # If a part fails, we continue with the others
-
         split_vid_dict = {
             "video": caption_lst,
             "path": path_lst
@@ -19,8 +19,8 @@ from HELPERS.filesystem_hlp import create_directory
 from URL_PARSERS.nocookie import is_no_cookie_domain
 from URL_PARSERS.youtube import is_youtube_url
 import subprocess
-import sys
-import tempfile
+
+from DOWN_AND_UP.gallery_dl_pool import run_gallery_dl
 
 
 # ---------- Low-level helpers ----------
@@ -609,61 +609,52 @@ def get_total_media_count(url: str, user_id=None, use_proxy: bool = False) -> in
     }
     cfg = _prepare_user_cookies_and_proxy(url, user_id, use_proxy, cfg)
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(cfg, f)
-            cfg_path = f.name
-        try:
-            # For VK specifically, --simulate is notoriously slow; jump straight to --get-urls
-            if 'vk.com' in url.lower():
-                logger.info("VK domain detected, skipping --simulate and using --get-urls directly")
-                return _get_total_media_count_fallback(url, user_id, use_proxy, cfg_path)
+        # For VK specifically, --simulate is notoriously slow; jump straight to --get-urls
+        if 'vk.com' in url.lower():
+            logger.info("VK domain detected, skipping --simulate and using --get-urls directly")
+            return _get_total_media_count_fallback(url, user_id, use_proxy, cfg)
             
-            # For Instagram, use special method with Instagram-specific config
-            if 'instagram.com' in url.lower():
-                # Check if Instagram should skip simulation (from GALLERYDL_FALLBACK_DOMAINS)
-                from CONFIG.domains import DomainsConfig
-                if 'instagram.com' in DomainsConfig.GALLERYDL_FALLBACK_DOMAINS:
-                    logger.info("Instagram domain in GALLERYDL_FALLBACK_DOMAINS, skipping simulation")
-                    return None  # Skip simulation for fallback domains
-                else:
-                    logger.info("Instagram domain detected, using Instagram-specific method")
-                    return _get_instagram_media_count(url, user_id, use_proxy, cfg_path)
+        # For Instagram, use special method with Instagram-specific config
+        if 'instagram.com' in url.lower():
+            # Check if Instagram should skip simulation (from GALLERYDL_FALLBACK_DOMAINS)
+            from CONFIG.domains import DomainsConfig
+            if 'instagram.com' in DomainsConfig.GALLERYDL_FALLBACK_DOMAINS:
+                logger.info("Instagram domain in GALLERYDL_FALLBACK_DOMAINS, skipping simulation")
+                return None  # Skip simulation for fallback domains
+            else:
+                logger.info("Instagram domain detected, using Instagram-specific method")
+                return _get_instagram_media_count(url, user_id, use_proxy, cfg)
 
-            # Use gallery-dl extractor to get all media info (not just URLs)
-            logger.info(f"[gallery-dl] cookies for media count: {cfg.get('extractor',{}).get('cookies')}")
-            cmd = [sys.executable, "-m", "gallery_dl", "--config", cfg_path, "--simulate", url]
-            cmd = _add_cookies_to_cmd(cmd, url, user_id)
-            logger.info(f"Counting total media via: {' '.join(cmd)}")
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-            except subprocess.TimeoutExpired:
-                logger.warning("--simulate timed out after 15s, falling back to --get-urls")
-                return _get_total_media_count_fallback(url, user_id, use_proxy, cfg_path)
+        # Use gallery-dl extractor to get all media info (not just URLs)
+        logger.info(f"[gallery-dl] cookies for media count: {cfg.get('extractor',{}).get('cookies')}")
+        cmd = ["--simulate", url]
+        cmd = _add_cookies_to_cmd(cmd, url, user_id)
+        logger.info(f"Counting total media via: gallery-dl {' '.join(cmd)}")
+        try:
+            result = run_gallery_dl(cmd, cfg, timeout=15)
+        except subprocess.TimeoutExpired:
+            logger.warning("--simulate timed out after 15s, falling back to --get-urls")
+            return _get_total_media_count_fallback(url, user_id, use_proxy, cfg)
 
-            if result.returncode == 0:
-                # Count lines that contain media info (not just URLs)
-                lines = [ln for ln in result.stdout.splitlines() if ln.strip() and ('"url"' in ln or '"filename"' in ln or '"extension"' in ln)]
-                media_count = len(lines)
-                if media_count and media_count > 0:
-                    logger.info(f"Detected {media_count} total media items (images + videos)")
-                    return media_count
-                else:
-                    logger.warning("--simulate returned 0 media items, trying --get-urls fallback")
-                    return _get_total_media_count_fallback(url, user_id, use_proxy, cfg_path)
+        if result.returncode == 0:
+            # Count lines that contain media info (not just URLs)
+            lines = [ln for ln in result.stdout.splitlines() if ln.strip() and ('"url"' in ln or '"filename"' in ln or '"extension"' in ln)]
+            media_count = len(lines)
+            if media_count and media_count > 0:
+                logger.info(f"Detected {media_count} total media items (images + videos)")
+                return media_count
             else:
-                logger.warning(f"get_total_media_count failed: {result.stderr[:400]}")
-                # Fallback to --get-urls for sites that don't work with --simulate
-                return _get_total_media_count_fallback(url, user_id, use_proxy, cfg_path)
-        finally:
-            try:
-                os.unlink(cfg_path)
-            except Exception:
-                pass
+                logger.warning("--simulate returned 0 media items, trying --get-urls fallback")
+                return _get_total_media_count_fallback(url, user_id, use_proxy, cfg)
+        else:
+            logger.warning(f"get_total_media_count failed: {result.stderr[:400]}")
+            # Fallback to --get-urls for sites that don't work with --simulate
+            return _get_total_media_count_fallback(url, user_id, use_proxy, cfg)
     except Exception as e:
         logger.error(f"get_total_media_count error: {e}")
         return None
 
-def _get_total_media_count_fallback(url: str, user_id, use_proxy: bool, cfg_path: str) -> int | None:
+def _get_total_media_count_fallback(url: str, user_id, use_proxy: bool, cfg: dict) -> int | None:
     """Fallback method using --get-urls for sites that don't work with --simulate"""
     try:
         # Special handling for Instagram - use different approach
@@ -674,15 +665,15 @@ def _get_total_media_count_fallback(url: str, user_id, use_proxy: bool, cfg_path
                 logger.info("Instagram domain in GALLERYDL_FALLBACK_DOMAINS, skipping simulation in fallback")
                 return None  # Skip simulation for fallback domains
             else:
-                return _get_instagram_media_count(url, user_id, use_proxy, cfg_path)
+                return _get_instagram_media_count(url, user_id, use_proxy, cfg)
         
-        cmd = [sys.executable, "-m", "gallery_dl", "--config", cfg_path, "--get-urls", url]
+        cmd = ["--get-urls", url]
         cmd = _add_cookies_to_cmd(cmd, url, user_id)
-        logger.info(f"Fallback counting via --get-urls: {' '.join(cmd)}")
+        logger.info(f"Fallback counting via --get-urls: gallery-dl {' '.join(cmd)}")
         # VK albums can be large; increase timeout for VK
         timeout_sec = 30 if 'vk.com' in url.lower() else 15
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_sec)
+            result = run_gallery_dl(cmd, cfg, timeout=timeout_sec)
         except subprocess.TimeoutExpired:
             logger.warning(f"--get-urls timed out after {timeout_sec}s")
             return None
@@ -698,13 +689,13 @@ def _get_total_media_count_fallback(url: str, user_id, use_proxy: bool, cfg_path
             # Try without cookies for problematic sites
             if any(domain in url.lower() for domain in ['vk.com', 'instagram.com', 'tiktok.com']):
                 logger.info(f"Trying {url.split('/')[2]} without cookies...")
-                return _try_without_cookies(url, cfg_path, user_id)
+                return _try_without_cookies(url, cfg, user_id)
             return None
     except Exception as e:
         logger.error(f"Fallback get_total_media_count error: {e}")
         return None
 
-def _get_instagram_media_count(url: str, user_id, use_proxy: bool, cfg_path: str) -> int | None:
+def _get_instagram_media_count(url: str, user_id, use_proxy: bool, cfg: dict) -> int | None:
     """Special method for Instagram media count using --simulate with Instagram-specific config"""
     try:
         # Create Instagram-specific config with higher limits
@@ -735,53 +726,43 @@ def _get_instagram_media_count(url: str, user_id, use_proxy: bool, cfg_path: str
             if proxy:
                 instagram_config["extractor"]["proxy"] = proxy
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(instagram_config, f)
-            instagram_cfg_path = f.name
-        
-        try:
-            # Use --simulate with Instagram-specific config
-            cmd = [sys.executable, "-m", "gallery_dl", "--config", instagram_cfg_path, "--simulate", url]
-            logger.info(f"Instagram media count via --simulate: {' '.join(cmd)}")
+        # Use --simulate with Instagram-specific config
+        cmd = ["--simulate", url]
+        logger.info(f"Instagram media count via --simulate: gallery-dl {' '.join(cmd)}")
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
+        result = run_gallery_dl(cmd, instagram_config, timeout=15)
             
+        if result.returncode == 0:
+            # Count lines that contain media info
+            lines = [ln for ln in result.stdout.splitlines() if ln.strip() and ('"url"' in ln or '"filename"' in ln or '"extension"' in ln)]
+            media_count = len(lines)
+            logger.info(f"Instagram detected {media_count} media items via --simulate")
+            return media_count
+        else:
+            logger.warning(f"Instagram --simulate failed: {result.stderr[:400]}")
+            # Fallback to --get-urls with Instagram config
+            cmd = ["--get-urls", url]
+            cmd = _add_cookies_to_cmd(cmd, url, user_id)
+            logger.info(f"Instagram fallback via --get-urls: gallery-dl {' '.join(cmd)}")
+                
+            result = run_gallery_dl(cmd, instagram_config, timeout=15)
             if result.returncode == 0:
-                # Count lines that contain media info
-                lines = [ln for ln in result.stdout.splitlines() if ln.strip() and ('"url"' in ln or '"filename"' in ln or '"extension"' in ln)]
+                lines = [ln for ln in result.stdout.splitlines() if ln.strip()]
                 media_count = len(lines)
-                logger.info(f"Instagram detected {media_count} media items via --simulate")
+                logger.info(f"Instagram detected {media_count} media items via --get-urls")
+                # If still very few items, likely Instagram is blocking - return None to trigger manual input
+                if media_count and media_count < 5:
+                    logger.warning(f"Instagram returned only {media_count} items, likely blocked - suggesting manual input")
+                    return None
                 return media_count
             else:
-                logger.warning(f"Instagram --simulate failed: {result.stderr[:400]}")
-                # Fallback to --get-urls with Instagram config
-                cmd = [sys.executable, "-m", "gallery_dl", "--config", instagram_cfg_path, "--get-urls", url]
-                cmd = _add_cookies_to_cmd(cmd, url, user_id)
-                logger.info(f"Instagram fallback via --get-urls: {' '.join(cmd)}")
-                
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-                if result.returncode == 0:
-                    lines = [ln for ln in result.stdout.splitlines() if ln.strip()]
-                    media_count = len(lines)
-                    logger.info(f"Instagram detected {media_count} media items via --get-urls")
-                    # If still very few items, likely Instagram is blocking - return None to trigger manual input
-                    if media_count and media_count < 5:
-                        logger.warning(f"Instagram returned only {media_count} items, likely blocked - suggesting manual input")
-                        return None
-                    return media_count
-                else:
-                    logger.warning(f"Instagram --get-urls also failed: {result.stderr[:400]}")
-                    return None
-        finally:
-            try:
-                os.unlink(instagram_cfg_path)
-            except Exception:
-                pass
+                logger.warning(f"Instagram --get-urls also failed: {result.stderr[:400]}")
+                return None
     except Exception as e:
         logger.error(f"Instagram media count error: {e}")
         return None
 
-def _try_without_cookies(url: str, cfg_path: str, user_id: int = None) -> int | None:
+def _try_without_cookies(url: str, cfg: dict, user_id: int = None) -> int | None:
     """Try without cookies as fallback for problematic sites"""
     try:
         # Create config without cookies
@@ -792,27 +773,17 @@ def _try_without_cookies(url: str, cfg_path: str, user_id: int = None) -> int |
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(no_cookies_cfg, f)
-            no_cookies_cfg_path = f.name
-        
-        try:
-            cmd = [sys.executable, "-m", "gallery_dl", "--config", no_cookies_cfg_path, "--get-urls", url]
-            cmd = _add_cookies_to_cmd(cmd, url, user_id)
-            logger.info(f"Without cookies: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
-            if result.returncode == 0:
-                lines = [ln for ln in result.stdout.splitlines() if ln.strip()]
-                logger.info(f"Without cookies detected {len(lines)} media items")
-                return len(lines)
-            else:
-                logger.warning(f"Without cookies failed: {result.stderr[:400]}")
-                return None
-        finally:
-            try:
-                os.unlink(no_cookies_cfg_path)
-            except Exception:
-                pass
+        cmd = ["--get-urls", url]
+        cmd = _add_cookies_to_cmd(cmd, url, user_id)
+        logger.info(f"Without cookies: gallery-dl {' '.join(cmd)}")
+        result = run_gallery_dl(cmd, no_cookies_cfg, timeout=15)
+        if result.returncode == 0:
+            lines = [ln for ln in result.stdout.splitlines() if ln.strip()]
+            logger.info(f"Without cookies detected {len(lines)} media items")
+            return len(lines)
+        else:
+            logger.warning(f"Without cookies failed: {result.stderr[:400]}")
+            return None
     except Exception as e:
         logger.error(f"Without cookies error: {e}")
         return None
@@ -1108,9 +1079,23 @@ def _get_error_type(stderr_text: str, user_id=None) -> str:
     return safe_get_messages(user_id).GALLERY_DL_UNKNOWN_ERROR_MSG
 
 
-def download_image_range_cli(url: str, range_expr: str, user_id=None, use_proxy: bool = False, output_dir: str | None = None) -> bool | str:
+def _file_event_handler(on_file):
+    """Turn gallery-dl output lines ("<path>" when downloaded, "# <path>" when skipped) into on_file(path) calls."""
+    if on_file is None:
+        return None
+
+    def on_line(line):
+        path = line[2:] if line.startswith("# ") else line
+        if path and os.path.isfile(path):
+            on_file(path)
+    return on_line
+
+
+def download_image_range_cli(url: str, range_expr: str, user_id=None, use_proxy: bool = False, output_dir: str | None = None, on_file=None, cancel=None) -> bool | str:
     """
     Strict range download using gallery-dl CLI with --range to avoid Python API variances.
+    Runs on a pooled gallery-dl worker; on_file(path) is called as soon as each file is
+    downloaded (or found already downloaded). Setting the `cancel` event stops the download.
     Returns True if exit code 0, False for other errors, or error message string for 401 Unauthorized.
     """
     # Validate range expression to avoid accidental full downloads
@@ -1132,59 +1117,52 @@ def download_image_range_cli(url: str, range_expr: str, user_id=None, use_proxy:
         cfg["base-directory"] = output_dir
     cfg = _prepare_user_cookies_and_proxy(url, user_id, use_proxy, cfg)
     try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(cfg, f)
-            cfg_path = f.name
-        try:
-            # Use module invocation to avoid PATH issues
-            logger.info(f"[gallery-dl] cookies for --range {range_expr}: {cfg.get('extractor',{}).get('cookies')}")
-            cmd = [sys.executable, "-m", "gallery_dl", "--config", cfg_path, "--range", range_expr, url]
+        logger.info(f"[gallery-dl] cookies for --range {range_expr}: {cfg.get('extractor',{}).get('cookies')}")
+        cmd = ["--range", range_expr, url]
             
-            # Add cookies via CLI for social media sites
-            cmd = _add_cookies_to_cmd(cmd, url, user_id)
-            cmd_pretty = ' '.join(cmd)
-            # Final safety check that command includes proper --range
-            if "--range" not in cmd or range_expr not in cmd:
-                logger.error(f"Safety check failed for command (missing --range): {cmd_pretty}")
-                return False
-            logger.info(f"Downloading range via CLI: {cmd_pretty}")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
-            if result.returncode != 0:
-                stderr_text = result.stderr[:400]
-                logger.warning(f"CLI range download failed [{result.returncode}]: {stderr_text}")
+        # Add cookies via CLI for social media sites
+        cmd = _add_cookies_to_cmd(cmd, url, user_id)
+        cmd_pretty = ' '.join(cmd)
+        # Final safety check that command includes proper --range
+        if "--range" not in cmd or range_expr not in cmd:
+            logger.error(f"Safety check failed for command (missing --range): {cmd_pretty}")
+            return False
+        logger.info(f"Downloading range via CLI: gallery-dl {cmd_pretty}")
+        result = run_gallery_dl(cmd, cfg, timeout=600, on_line=_file_event_handler(on_file), cancel=cancel)
+        if cancel is not None and cancel.is_set():
+            logger.info(f"Range download cancelled: gallery-dl {cmd_pretty}")
+            return False
+        if result.returncode != 0:
+            stderr_text = result.stderr[:400]
+            logger.warning(f"CLI range download failed [{result.returncode}]: {stderr_text}")
                 
-                # Check for common authentication and access errors
-                if _is_fatal_error(stderr_text):
-                    error_type = _get_error_type(stderr_text)
-                    error_msg = f"{error_type}: {stderr_text}"
-                    logger.error(f"Fatal error in gallery-dl: {error_msg}")
+            # Check for common authentication and access errors
+            if _is_fatal_error(stderr_text):
+                error_type = _get_error_type(stderr_text)
+                error_msg = f"{error_type}: {stderr_text}"
+                logger.error(f"Fatal error in gallery-dl: {error_msg}")
                     
-                    # Log error to exception channel (skip if no message object available)
-                    try:
-                        from HELPERS.logger import log_error_to_channel
-                        # Create a minimal message object for logging
-                        class MinimalMessage:
-                            def __init__(self, chat_id, first_name="Unknown"):
-                                self.chat = type('Chat', (), {'id': chat_id, 'first_name': first_name})()
+                # Log error to exception channel (skip if no message object available)
+                try:
+                    from HELPERS.logger import log_error_to_channel
+                    # Create a minimal message object for logging
+                    class MinimalMessage:
+                        def __init__(self, chat_id, first_name="Unknown"):
+                            self.chat = type('Chat', (), {'id': chat_id, 'first_name': first_name})()
                         
-                        minimal_msg = MinimalMessage(-1, "Gallery-dl")
-                        log_error_to_channel(minimal_msg, f"Gallery-dl fatal error: {error_msg}", url)
-                    except Exception as log_e:
-                        logger.error(f"Failed to log gallery-dl error: {log_e}")
+                    minimal_msg = MinimalMessage(-1, "Gallery-dl")
+                    log_error_to_channel(minimal_msg, f"Gallery-dl fatal error: {error_msg}", url)
+                except Exception as log_e:
+                    logger.error(f"Failed to log gallery-dl error: {log_e}")
                     
-                    return error_msg
+                return error_msg
                 
-                return False
-            # Log short stdout to confirm ranged downloads occurred
-            if result.stdout:
-                preview = '\n'.join(result.stdout.splitlines()[:5])
-                logger.info(f"CLI stdout (first lines):\n{preview}")
-            return True
-        finally:
-            try:
-                os.unlink(cfg_path)
-            except Exception:
-                pass
+            return False
+        # Log short stdout to confirm ranged downloads occurred
+        if result.stdout:
+            preview = '\n'.join(result.stdout.splitlines()[:5])
+            logger.info(f"CLI stdout (first lines):\n{preview}")
+        return True
     except Exception as e:
         logger.error(f"download_image_range_cli error: {e}")
         return False
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Pool of long-lived gallery-dl workers (see DOWN_AND_UP/gallery_dl_worker.py).
+
+run_gallery_dl() replaces `subprocess.run([sys.executable, "-m", "gallery_dl", ...])`:
+the command runs on an idle worker, preferably the one that last ran the same
+URL so its logins and HTTP session are reused, and every line gallery-dl
+prints can be handed to a callback as soon as it is printed.
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+from CONFIG.limits import LimitsConfig
+from HELPERS.logger import logger
+
+_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gallery_dl_worker.py")
+# Seconds between checks of a command's cancel event
+_CANCEL_CHECK_INTERVAL = 0.5
+
+
+class GalleryDlWorker(object):
+    """One worker process; runs one command at a time."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-u", _WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+        )
+        self.jobs_run = 0
+        self.killed = False
+        self._next_id = 0
+        self._messages = queue.Queue()
+        threading.Thread(target=self._read, name=f"gallery-dl-worker-{self.proc.pid}", daemon=True).start()
+
+    def _read(self):
+        for line in self.proc.stdout:
+            try:
+                self._messages.put(json.loads(line))
+            except ValueError:
+                continue
+        self._messages.put(None)
+
+    def alive(self):
+        return not self.killed and self.proc.poll() is None
+
+    def run(self, args, config, timeout, on_line=None, cancel=None):
+        """
+        Run one gallery-dl command; returns a CompletedProcess, raises subprocess.TimeoutExpired.
+        Setting the `cancel` event stops the command (the worker is killed, it cannot be reused).
+        """
+        self._next_id += 1
+        job_id = self._next_id
+        self.jobs_run += 1
+        try:
+            self.proc.stdin.write(json.dumps({"id": job_id, "args": args, "config": config}) + "\n")
+            self.proc.stdin.flush()
+        except OSError as e:
+            self.kill()
+            return subprocess.CompletedProcess(args, -1, "", f"gallery-dl worker is gone: {e}")
+        deadline = time.monotonic() + timeout
+        lines = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if cancel is not None and cancel.is_set():
+                self.kill()
+                return subprocess.CompletedProcess(args, -1, "\n".join(lines), "gallery-dl command cancelled")
+            try:
+                if remaining <= 0:
+                    raise queue.Empty
+                message = self._messages.get(timeout=remaining if cancel is None else min(remaining, _CANCEL_CHECK_INTERVAL))
+            except queue.Empty:
+                if remaining > 0:
+                    continue
+                # The command is stuck somewhere in gallery-dl; the worker cannot be reused
+                self.kill()
+                raise subprocess.TimeoutExpired(["gallery-dl"] + args, timeout)
+            if message is None:
+                self.kill()
+                return subprocess.CompletedProcess(args, -1, "\n".join(lines), "gallery-dl worker exited unexpectedly")
+            if message.get("id") != job_id:
+                continue
+            if message.get("type") == "line":
+                text = message.get("text", "")
+                lines.append(text)
+                if on_line is not None:
+                    try:
+                        on_line(text)
+                    except Exception as e:
+                        logger.warning(f"[gallery-dl] line callback failed: {e}")
+            elif message.get("type") == "done":
+                stdout = "\n".join(lines) + ("\n" if lines else "")
+                return subprocess.CompletedProcess(args, message.get("code", 1), stdout, message.get("stderr", ""))
+
+    def kill(self):
+        self.killed = True
+        try:
+            self.proc.kill()
+            self.proc.wait(timeout=5)
+        except Exception:
+            pass
+
+
+class GalleryDlPool(object):
+    """
+    Up to `size` workers. A command goes to the idle worker that last ran
+    its URL, else to any idle worker, else to a new worker while the pool is
+    below size; otherwise it waits. Workers are replaced after
+    `max_jobs` commands, and right away when they die or time out.
+    """
+
+    def __init__(self, size=4, max_jobs=200):
+        self.size = max(1, int(size))
+        self.max_jobs = max_jobs
+        self._idle = []
+        self._busy = 0
+        self._last_worker = {}  # url -> worker
+        self._cond = threading.Condition()
+
+    def _acquire(self, url):
+        with self._cond:
+            while True:
+                self._idle = [w for w in self._idle if w.alive()]
+                if self._idle:
+                    worker = self._last_worker.get(url)
+                    if worker not in self._idle:
+                        worker = self._idle[-1]
+                    self._idle.remove(worker)
+                    self._busy += 1
+                    return worker
+                if self._busy < self.size:
+                    self._busy += 1
+                    break
+                self._cond.wait()
+        try:
+            return GalleryDlWorker()
+        except Exception:
+            with self._cond:
+                self._busy -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, worker, url):
+        with self._cond:
+            self._busy -= 1
+            if worker.alive() and worker.jobs_run < self.max_jobs:
+                self._idle.append(worker)
+                self._last_worker[url] = worker
+                if len(self._last_worker) > 1000:
+                    self._last_worker = {u: w for u, w in self._last_worker.items() if w in self._idle}
+            else:
+                worker.kill()
+            self._cond.notify()
+
+    def run(self, args, config, timeout, on_line=None, cancel=None):
+        url = args[-1] if args else ""
+        worker = self._acquire(url)
+        try:
+            return worker.run(args, config, timeout, on_line, cancel)
+        finally:
+            self._release(worker, url)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_gallery_dl_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = GalleryDlPool(
+                    size=getattr(LimitsConfig, "GALLERY_DL_WORKERS", 4),
+                    max_jobs=getattr(LimitsConfig, "GALLERY_DL_WORKER_MAX_JOBS", 200),
+                )
+    return _pool
+
+
+def run_gallery_dl(args, config, timeout, on_line=None, cancel=None):
+    """
+    Run `gallery-dl --config <config> *args` (URL last) on a pooled worker.
+
+    Returns a subprocess.CompletedProcess (returncode, stdout, stderr) and
+    raises subprocess.TimeoutExpired like subprocess.run(..., timeout=...).
+    on_line(text) is called for every stdout line while the command runs
+    (downloaded file paths for download runs). Setting the optional `cancel`
+    threading.Event stops a running command (returncode -1).
+    """
+    return get_gallery_dl_pool().run(list(args), config, timeout, on_line, cancel)
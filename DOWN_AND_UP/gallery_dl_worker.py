@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Long-lived gallery-dl worker (started by DOWN_AND_UP/gallery_dl_pool.py).
+
+Runs gallery-dl command lines one after another in a single interpreter, so
+the interpreter start, the extractor imports and gallery-dl's login cache are
+paid once per worker instead of once per call. HTTP sessions are kept per
+command line (all arguments but the --range value) and config, so
+consecutive ranges of the same URL reuse connections and the cookies the
+site set, while different users (their --cookies files) never share one.
+
+Line protocol, one JSON object per line:
+  stdin:  {"id": 1, "args": ["--range", "1-10", URL], "config": {...}}
+  stdout: {"id": 1, "type": "line", "text": "..."}      (each line gallery-dl prints)
+          {"id": 1, "type": "done", "code": 0, "stderr": "..."}
+
+This file is run as a script and must not import bot modules.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+from collections import OrderedDict
+
+# Sessions kept for reuse; the oldest ones are closed beyond this
+_MAX_SESSIONS = 32
+# stderr returned with each result is cut to this many characters
+_MAX_STDERR = 20000
+
+
+def _session_scope(cfg_path, args):
+    """Key of the HTTP sessions a command may reuse: its config and arguments except the --range value."""
+    key = []
+    skip = False
+    for arg in args:
+        if skip:
+            skip = False
+        elif arg == "--range":
+            skip = True
+        elif not arg.startswith("--range="):
+            key.append(arg)
+    return (cfg_path,) + tuple(key)
+
+
+class _LineWriter(io.TextIOBase):
+    """Text stream that sends every complete line it receives as a protocol message."""
+
+    def __init__(self, send, job_id):
+        self._send = send
+        self._job_id = job_id
+        self._partial = ""
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return False
+
+    def reconfigure(self, **options):
+        # gallery-dl sets encoding/error handling on the standard streams; not needed here
+        pass
+
+    def write(self, s):
+        self._partial += s
+        while "\n" in self._partial:
+            line, self._partial = self._partial.split("\n", 1)
+            self._send({"id": self._job_id, "type": "line", "text": line})
+        return len(s)
+
+    def close_line(self):
+        if self._partial:
+            self._send({"id": self._job_id, "type": "line", "text": self._partial})
+            self._partial = ""
+
+
+class _Capture(io.StringIO):
+    """stderr (and an empty stdin) of one command."""
+
+    def reconfigure(self, **options):
+        pass
+
+
+class Worker(object):
+
+    def __init__(self, protocol_out):
+        import gallery_dl
+        from gallery_dl import config as gdl_config
+        self.gallery_dl = gallery_dl
+        self.config = gdl_config
+        self._out = protocol_out
+        self._config_dir = tempfile.TemporaryDirectory(prefix="gallery-dl-worker-")
+        self._sessions = OrderedDict()
+        self._session_scope = None
+        self._patch_sessions()
+
+    def send(self, message):
+        self._out.write(json.dumps(message, ensure_ascii=False) + "\n")
+        self._out.flush()
+
+    def _config_path(self, cfg):
+        # One file per distinct config for the life of the worker
+        text = json.dumps(cfg, sort_keys=True)
+        path = os.path.join(self._config_dir.name, hashlib.sha1(text.encode("utf-8")).hexdigest() + ".json")
+        if not os.path.exists(path):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return path
+
+    def _patch_sessions(self):
+        try:
+            from gallery_dl.extractor.common import Extractor
+        except ImportError:
+            return
+        original = getattr(Extractor, "_init_session", None)
+        if original is None:
+            return
+        worker = self
+
+        def _init_session(extractor):
+            if worker._session_scope is None:
+                return original(extractor)
+            key = (worker._session_scope, type(extractor))
+            session = worker._sessions.get(key)
+            if session is None:
+                original(extractor)
+                worker._sessions[key] = extractor.session
+                while len(worker._sessions) > _MAX_SESSIONS:
+                    _, old = worker._sessions.popitem(last=False)
+                    try:
+                        old.close()
+                    except Exception:
+                        pass
+            else:
+                worker._sessions.move_to_end(key)
+                extractor.session = session
+
+        Extractor._init_session = _init_session
+
+    def run_job(self, job):
+        job_id = job.get("id")
+        args = [str(a) for a in job.get("args") or ()]
+        cfg_path = self._config_path(job.get("config") or {})
+        stdout = _LineWriter(self.send, job_id)
+        stderr = _Capture()
+        root = logging.getLogger()
+        saved_handlers = list(root.handlers)
+        saved = (sys.argv, sys.stdin, sys.stdout, sys.stderr)
+        # Sessions are shared between runs with the same config and arguments (URL,
+        # the user's --cookies file...) that differ only in --range
+        self._session_scope = _session_scope(cfg_path, args)
+        self.config.clear()
+        sys.argv = ["gallery-dl", "--config", cfg_path] + args
+        # The real stdin carries the protocol; gallery-dl gets an empty one
+        sys.stdin, sys.stdout, sys.stderr = _Capture(), stdout, stderr
+        try:
+            code = self.gallery_dl.main()
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            if isinstance(e.code, str):
+                stderr.write(e.code + "\n")
+        except BaseException as e:
+            code = 1
+            stderr.write(f"{type(e).__name__}: {e}\n")
+        finally:
+            sys.argv, sys.stdin, sys.stdout, sys.stderr = saved
+            root.handlers[:] = saved_handlers
+            self._session_scope = None
+        stdout.close_line()
+        self.send({"id": job_id, "type": "done", "code": int(code or 0), "stderr": stderr.getvalue()[-_MAX_STDERR:]})
+
+    def serve(self, requests):
+        for line in requests:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError:
+                continue
+            self.run_job(job)
+
+
+def main():
+    # Bot modules next to this script (ffmpeg.py, sender.py...) must not shadow installed packages
+    if sys.path and os.path.abspath(sys.path[0]) == os.path.dirname(os.path.abspath(__file__)):
+        del sys.path[0]
+    # The protocol owns the real stdout; anything else printed goes to stderr
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "w", encoding="utf-8")
+    sys.stdout = sys.stderr
+    Worker(protocol_out).serve(sys.stdin)
+
+
+if __name__ == "__main__":
+    main()
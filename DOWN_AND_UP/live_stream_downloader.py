@@ -222,7 +222,7 @@ def download_live_stream_chunked(
                     f"Chunk {chunk_idx + 1}/{max_chunks}\n"
                     f"Duration: {split_hours} hour(s) per chunk"
                 )
-                safe_edit_message_text(user_id, proc_msg_id, progress_text)
+                safe_edit_message_text(user_id, proc_msg_id, progress_text, _wait=False)
             except Exception as e:
                 logger.error(f"Error updating progress: {e}")
             
@@ -352,7 +352,7 @@ def download_live_stream_chunked(
                 f"✅ <b>Live Stream Download Complete</b>\n"
                 f"Downloaded {successful_chunks} chunk(s)"
             )
-            safe_edit_message_text(user_id, proc_msg_id, final_text)
+            safe_edit_message_text(user_id, proc_msg_id, final_text, _wait=False)
         except Exception as e:
             logger.error(f"Error updating final progress: {e}")
         
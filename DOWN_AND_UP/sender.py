@@ -209,17 +209,6 @@ def send_videos(
             except Exception:
                 return None
 
-        def _resize_to_thumb_free(src_path: str, dest_path: str) -> bool:
-            try:
-                subprocess.run([
-                    'ffmpeg','-y','-i', src_path,
-                    '-vf','scale=320:-1',
-                    '-vframes','1','-q:v','4', dest_path
-                ], capture_output=True, text=True, timeout=30)
-                return os.path.exists(dest_path) and os.path.getsize(dest_path) > 0
-            except Exception:
-                return False
-
         def _gen_free_cover(video_path: str) -> str | None:
             try:
                 # Generate thumbnail only if file >10MB or duration >=60s
@@ -230,22 +219,10 @@ def send_videos(
                 cover_path = os.path.join(base_dir, base_name + '.__tgthumb_ext.jpg')
                 if os.path.exists(cover_path) and os.path.getsize(cover_path) > 0:
                     return cover_path
-                # 1) Try downloading an external thumbnail (no padding, scale width to 640)
+                # 1) Try an external thumbnail (no padding, fitted within 320x320; resized once in the thumbnail cache)
                 try:
-                    tmp_dl = os.path.join(base_dir, base_name + '.__ext_thumb.jpg')
-                    if video_url and download_thumbnail(video_url, tmp_dl):
-                        if _resize_to_thumb_free(tmp_dl, cover_path):
-                            try:
-                                if os.path.exists(tmp_dl):
-                                    os.remove(tmp_dl)
-                            except Exception:
-                                pass
-                            return cover_path
-                    try:
-                        if os.path.exists(tmp_dl):
-                            os.remove(tmp_dl)
-                    except Exception:
-                        pass
+                    if video_url and download_thumbnail(video_url, cover_path, max_side=320):
+                        return cover_path
                 except Exception:
                     pass
                 # 2) Fallback: extract a frame from the video (as before)
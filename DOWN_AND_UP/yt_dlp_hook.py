@@ -10,6 +10,7 @@ from URL_PARSERS.youtube import is_youtube_url
 from URL_PARSERS.filter_check import is_no_filter_domain
 from URL_PARSERS.filter_utils import create_smart_match_filter, create_legacy_match_filter
 from HELPERS.pot_helper import add_pot_to_ytdl_opts
+from HELPERS.info_cache import extract_info_cached
 from CONFIG.limits import LimitsConfig
 from HELPERS.fallback_helper import should_fallback_to_gallery_dl
 
@@ -316,7 +317,7 @@ def get_video_formats(url, user_id=None, playlist_start_index=1, cookies_already
             logger.info(f"   opts keys: {list(opts.keys())}")
             
             with yt_dlp.YoutubeDL(opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+                info = extract_info_cached(ydl, url)
             
             logger.info("✅ [DEBUG] extract_info_operation: extraction finished")
             logger.info(f"   info type: {type(info)}")
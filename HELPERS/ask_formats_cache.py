@@ -0,0 +1,155 @@
+# Compact, in-memory copies of the Always Ask format caches
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from CONFIG.limits import LimitsConfig
+from HELPERS.limiter_state import write_json_atomic
+from HELPERS.logger import logger
+
+# Format fields the Always Ask menus read; everything else yt-dlp returns
+# (fragments, http_headers, downloader_options...) is dropped before caching
+_FORMAT_FIELDS = (
+    "format_id", "format_note", "ext", "protocol", "width", "height", "fps",
+    "vcodec", "acodec", "filesize", "filesize_approx", "tbr", "abr", "vbr",
+    "language",
+)
+
+
+def compact_format(fmt):
+    """Keep only the fields the menus use (None values are left out)."""
+    row = {name: fmt[name] for name in _FORMAT_FIELDS if fmt.get(name) is not None}
+    if not (fmt.get("width") and fmt.get("height")) and fmt.get("url"):
+        # Without dimensions the quality is guessed from the media URL
+        row["url"] = fmt["url"]
+    if fmt.get("manifest_url") is not None:
+        # Only its presence is checked (HLS/DASH detection), not the URL itself
+        row["manifest_url"] = ""
+    return row
+
+
+_SCALARS = (str, int, float, bool)
+
+
+def _scalar_fields(info):
+    """Top-level fields holding a plain value or a list of plain values (e.g. tags)."""
+    row = {}
+    for name, value in info.items():
+        if isinstance(value, _SCALARS):
+            row[name] = value
+        elif isinstance(value, list) and all(isinstance(item, _SCALARS) for item in value):
+            row[name] = value
+    return row
+
+
+def compact_info(info):
+    """
+    The part of an info dict saved for the Always Ask menus: every top-level
+    plain field (duration, thumbnail, webpage_url, uploader, channel, ... are
+    read by the menus and the tag generator), the compact format table and,
+    for playlists, the plain fields of each entry (used for their thumbnails).
+    """
+    row = _scalar_fields(info)
+    row["formats"] = [compact_format(f) for f in info.get("formats") or () if isinstance(f, dict)]
+    entries = info.get("_playlist_entries")
+    if isinstance(entries, list):
+        row["_playlist_entries"] = [_scalar_fields(e) if isinstance(e, dict) else None for e in entries]
+    return row
+
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class JsonFileCache(object):
+    """
+    LRU of parsed JSON files, so a menu tap does not parse the same file again.
+
+    A cached copy is used only while the file on disk is unchanged (same
+    mtime and size): files removed by the menu cleanups or rewritten by
+    another process are read again. Files pushed out of memory stay on disk
+    and are parsed again on their next use. Returned data is shared between
+    callers and must not be modified.
+    """
+
+    def __init__(self, max_files=256):
+        self.max_files = max_files
+        self._files = OrderedDict()  # path -> (stamp, data)
+        self._lock = threading.Lock()
+
+    def read(self, path, convert=None):
+        """Return the parsed content of path (after convert(data) if given), or None if missing or broken."""
+        stamp = _file_stamp(path)
+        if stamp is None:
+            self.forget(path)
+            return None
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is not None and entry[0] == stamp:
+                self._files.move_to_end(path)
+                return entry[1]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to read {path}: {e}")
+            return None
+        if convert is not None:
+            data = convert(data)
+        self._store(path, stamp, data)
+        return data
+
+    def write(self, path, data):
+        write_json_atomic(path, data)
+        self._store(path, _file_stamp(path), data)
+
+    def forget(self, path):
+        with self._lock:
+            self._files.pop(path, None)
+
+    def _store(self, path, stamp, data):
+        with self._lock:
+            self._files[path] = (stamp, data)
+            self._files.move_to_end(path)
+            while len(self._files) > self.max_files:
+                self._files.popitem(last=False)
+
+
+_files = JsonFileCache(max_files=getattr(LimitsConfig, "ASK_FORMATS_CACHE_MAX_FILES", 256))
+
+
+def _compact_ask_file(data):
+    # ask_formats.json written by older versions holds full info dicts
+    if not isinstance(data, dict):
+        return {}
+    return {url: compact_info(info) for url, info in data.items() if isinstance(info, dict)}
+
+
+def read_ask_info(path, url):
+    """Cached entry for url in an ask_formats.json file (see compact_info), or None."""
+    data = _files.read(path, _compact_ask_file)
+    return data.get(url) if data else None
+
+
+def write_ask_info(path, url, info):
+    """Add or replace url's entry in an ask_formats.json file, in compact form."""
+    data = dict(_files.read(path, _compact_ask_file) or {})
+    data[url] = compact_info(info)
+    _files.write(path, data)
+
+
+def read_format_lines(path, url):
+    """`yt-dlp -F` lines cached in a formats_cache_*.json file for url, or []."""
+    data = _files.read(path)
+    if not isinstance(data, dict) or data.get("url") != url:
+        return []
+    return data.get("formats") or []
+
+
+def write_format_lines(path, url, format_lines, timestamp):
+    _files.write(path, {"url": url, "timestamp": timestamp, "formats": list(format_lines)})
@@ -91,6 +91,7 @@ def send_reply_keyboard_always(user_id, mode="2x3"):
 
 def reply_with_keyboard(func):
     """Wrapper for any custom action that adds reply keyboard"""
+    @wraps(func)
     def wrapper(*args, **kwargs):
         result = func(*args, **kwargs)
         # Determine user_id from arguments (Pyrogram message/chat)
@@ -0,0 +1,165 @@
+# Delayed message deletion: one scheduler thread for all auto-deletes
+import heapq
+import json
+import logging
+import os
+import threading
+import time
+
+from HELPERS.app_instance import get_app
+from HELPERS.limiter_state import get_state_flusher, write_json_atomic
+from HELPERS.outbound_queue import get_outbound_queue
+
+# Local logger (HELPERS.logger imports safe_messeger, which imports this module)
+logger = logging.getLogger(__name__)
+
+_PENDING_DELETES_FILE = "CONFIG/.pending_deletes.json"
+# Telegram accepts at most 100 message ids per delete_messages call
+_MAX_IDS_PER_CALL = 100
+# Seconds to wait before retrying when the client is not connected yet
+_NOT_READY_RETRY = 5
+# Deletions due this close together go out in the same batch
+_BATCH_WINDOW = 1.0
+
+
+class DeleteScheduler(object):
+    """
+    Deletes messages at a given time from a single daemon thread.
+
+    Pending deletions sit in a heap ordered by due time. Whenever some are
+    due, they are grouped by chat and removed with one delete_messages call
+    per chat (per 100 ids). The pending set is saved to disk by the
+    background state flusher and loaded again on start, so deletions
+    scheduled before a restart still happen.
+    """
+
+    def __init__(self, delete_func, path=_PENDING_DELETES_FILE):
+        self._delete_func = delete_func
+        self._path = path
+        self._heap = []
+        self._pending = set()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def schedule(self, chat_id, message_ids, delay):
+        due = time.time() + max(0.0, float(delay))
+        with self._cond:
+            for message_id in message_ids:
+                key = (chat_id, message_id)
+                if key in self._pending:
+                    continue
+                self._pending.add(key)
+                heapq.heappush(self._heap, (due, chat_id, message_id))
+            self._ensure_thread()
+            self._cond.notify()
+        get_state_flusher().mark_dirty("pending_deletes")
+
+    def pending_count(self):
+        with self._cond:
+            return len(self._pending)
+
+    def load(self):
+        if not os.path.exists(self._path):
+            return
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load pending message deletions: {e}")
+            return
+        loaded = 0
+        with self._cond:
+            for entry in entries if isinstance(entries, list) else []:
+                try:
+                    due, chat_id, message_id = entry
+                    due, key = float(due), (int(chat_id), int(message_id))
+                except (TypeError, ValueError) as e:
+                    # One bad entry (e.g. a chat given by username) must not drop the others
+                    logger.warning(f"Skipping pending message deletion {entry!r}: {e}")
+                    continue
+                if key not in self._pending:
+                    self._pending.add(key)
+                    heapq.heappush(self._heap, (due, key[0], key[1]))
+                    loaded += 1
+            if self._heap:
+                self._ensure_thread()
+                self._cond.notify()
+        logger.info(f"Loaded {loaded} pending message deletions")
+
+    def save(self):
+        with self._cond:
+            entries = [[due, chat_id, message_id] for due, chat_id, message_id in self._heap]
+        write_json_atomic(self._path, entries)
+
+    def _ensure_thread(self):
+        # Caller holds self._cond
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="delete-scheduler", daemon=True)
+            self._thread.start()
+
+    def _pop_due(self):
+        """Wait until something is due, then return {chat_id: [message_id, ...]}."""
+        with self._cond:
+            while True:
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    break
+                self._cond.wait(self._heap[0][0] - now if self._heap else None)
+            due = {}
+            while self._heap and self._heap[0][0] <= now + _BATCH_WINDOW:
+                _, chat_id, message_id = heapq.heappop(self._heap)
+                self._pending.discard((chat_id, message_id))
+                due.setdefault(chat_id, []).append(message_id)
+            return due
+
+    def _client_ready(self):
+        app = get_app()
+        return get_outbound_queue() is not None and getattr(app, "is_connected", True)
+
+    def _run(self):
+        while True:
+            due = self._pop_due()
+            if not self._client_ready():
+                # Keep them until the client is up (e.g. entries loaded at startup)
+                for chat_id, message_ids in due.items():
+                    self.schedule(chat_id, message_ids, _NOT_READY_RETRY)
+                continue
+            for chat_id, message_ids in due.items():
+                for i in range(0, len(message_ids), _MAX_IDS_PER_CALL):
+                    batch = message_ids[i:i + _MAX_IDS_PER_CALL]
+                    try:
+                        self._delete_func(chat_id, batch)
+                        logger.debug(f"[AUTO-DELETE] Deleting {len(batch)} message(s) in {chat_id}")
+                    except Exception as e:
+                        logger.error(f"[AUTO-DELETE] Error while deleting messages {batch} in {chat_id}: {e}")
+            get_state_flusher().mark_dirty("pending_deletes")
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_delete_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                # Imported here: safe_messeger imports this module
+                from HELPERS.safe_messeger import safe_delete_messages
+
+                def _delete(chat_id, message_ids):
+                    # Queued without waiting, so one slow chat does not hold up the others
+                    safe_delete_messages(chat_id, message_ids, _wait=False)
+
+                scheduler = DeleteScheduler(_delete)
+                get_state_flusher().register("pending_deletes", scheduler.save)
+                scheduler.load()
+                _scheduler = scheduler
+    return _scheduler
+
+
+def schedule_message_deletion(chat_id, message_ids, delete_after_seconds):
+    """Delete message_ids in chat_id after delete_after_seconds."""
+    if isinstance(message_ids, int):
+        message_ids = [message_ids]
+    get_delete_scheduler().schedule(chat_id, message_ids, delete_after_seconds)
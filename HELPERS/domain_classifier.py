@@ -0,0 +1,170 @@
+# Domain classifier: one suffix trie over all domain lists
+import importlib
+import threading
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import tldextract
+
+from CONFIG.config import Config
+from HELPERS.logger import logger
+
+# --- categories a host can belong to ---
+WHITELIST = "whitelist"
+GREYLIST = "greylist"
+PORN = "porn"
+PROXY = "proxy"
+PROXY_2 = "proxy_2"
+NO_COOKIE = "no_cookie"
+NO_FILTER = "no_filter"
+GALLERYDL_ONLY = "gallerydl_only"
+YTDLP_ONLY = "ytdlp_only"
+
+# category -> list attribute (Config value if set there, otherwise CONFIG/domains.py)
+_LIST_SOURCES = {
+    WHITELIST: "WHITELIST",
+    GREYLIST: "GREYLIST",
+    PROXY: "PROXY_DOMAINS",
+    PROXY_2: "PROXY_2_DOMAINS",
+    NO_COOKIE: "NO_COOKIE_DOMAINS",
+    NO_FILTER: "NO_FILTER_DOMAINS",
+    GALLERYDL_ONLY: "GALLERYDL_ONLY_DOMAINS",
+    YTDLP_ONLY: "YTDLP_ONLY_DOMAINS",
+}
+
+_EMPTY = frozenset()
+# Key under which a trie node keeps the categories of the domain ending there
+_CATEGORIES = None
+
+
+def _normalize_domain(domain):
+    domain = (domain or "").strip().lower().rstrip(".")
+    if domain.startswith("*."):
+        domain = domain[2:]
+    return domain
+
+
+class DomainSuffixTrie(object):
+    """
+    Trie over reversed domain labels ("video.example.com" is stored as
+    com -> example -> video). A listed domain matches itself and all of its
+    subdomains, so one walk over a host's labels collects every category of
+    the host and of its parent domains down to the registered domain; a
+    listed public suffix ("xxx", "co.uk") matches no host.
+    """
+
+    def __init__(self):
+        self._root = {}
+
+    def add(self, domain, category):
+        domain = _normalize_domain(domain)
+        if not domain:
+            return
+        node = self._root
+        for label in reversed(domain.split(".")):
+            node = node.setdefault(label, {})
+        node.setdefault(_CATEGORIES, set()).add(category)
+
+    def lookup(self, host, min_labels=1):
+        """Return the categories of host and of its parent domains of at least min_labels labels."""
+        found = set()
+        node = self._root
+        for depth, label in enumerate(reversed(host.split(".")), 1):
+            node = node.get(label)
+            if node is None:
+                break
+            categories = node.get(_CATEGORIES)
+            if categories and depth >= min_labels:
+                found.update(categories)
+        return frozenset(found) if found else _EMPTY
+
+
+_trie = None
+_trie_lock = threading.Lock()
+
+
+def _current_domains_config():
+    # CONFIG.domains may have been reloaded at runtime (see reload_all_porn_caches)
+    try:
+        return importlib.import_module("CONFIG.domains").DomainsConfig
+    except Exception:
+        return None
+
+
+def rebuild_domain_classifier(porn_domains=()):
+    """Rebuild the trie from the configured domain lists and porn_domains.
+
+    HELPERS.porn calls this with its porn domain list whenever it (re)loads
+    the lists; until then hosts are not classified as PORN.
+    """
+    with _trie_lock:
+        _rebuild(porn_domains)
+
+
+def _rebuild(porn_domains):
+    global _trie
+    domains_config = _current_domains_config()
+    trie = DomainSuffixTrie()
+    counts = {}
+    for category, attr in _LIST_SOURCES.items():
+        values = getattr(Config, attr, None) if hasattr(Config, attr) else getattr(domains_config, attr, None)
+        values = values or []
+        if isinstance(values, str):
+            values = [values]
+        for domain in values:
+            trie.add(domain, category)
+        counts[category] = len(values)
+    for domain in porn_domains:
+        trie.add(domain, PORN)
+    counts[PORN] = len(porn_domains)
+    _trie = trie
+    _lookup.cache_clear()
+    logger.info(f"Domain classifier built: {counts}")
+
+
+def _get_trie():
+    if _trie is None:
+        with _trie_lock:
+            if _trie is None:
+                _rebuild(())
+    return _trie
+
+
+def get_host(url):
+    """Return the lower-case host name of a URL (also for URLs without a scheme)."""
+    try:
+        parsed = urlparse(url if "://" in url else "//" + url)
+        host = parsed.hostname or ""
+    except Exception:
+        return ""
+    return host.rstrip(".")
+
+
+def registered_domain_labels(host):
+    """Number of labels of host's registered domain ("example.co.uk" -> 3), 1 without a known suffix."""
+    ext = tldextract.extract(host)
+    if ext.domain and ext.suffix:
+        return len(ext.suffix.split(".")) + 1
+    return 1
+
+
+@lru_cache(maxsize=4096)
+def _lookup(trie, host):
+    # Keyed by the trie too, so a lookup racing with a rebuild cannot cache a stale answer
+    return trie.lookup(host, registered_domain_labels(host))
+
+
+def classify_host(host):
+    """Return the frozenset of categories (module constants) the host belongs to."""
+    if not host:
+        return _EMPTY
+    return _lookup(_get_trie(), host.lower())
+
+
+def classify_url(url):
+    """Return the frozenset of categories of the URL's host."""
+    return classify_host(get_host(url or ""))
+
+
+def is_url_in(url, category):
+    return category in classify_url(url)
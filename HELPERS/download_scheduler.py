@@ -0,0 +1,231 @@
+# Download scheduler: global and per-domain slot limits for download jobs
+import itertools
+import threading
+from collections import Counter
+
+from CONFIG.config import Config
+from CONFIG.limits import LimitsConfig
+from CONFIG.messages import safe_get_messages
+from HELPERS.domain_classifier import get_host, registered_domain_labels
+from HELPERS.logger import logger
+
+# The slot held by this thread (nested downloads, e.g. the /img fallback
+# started from down_and_up, reuse it instead of queueing behind themselves).
+# Only a slot that is still held counts, so a slot released from another
+# thread does not let a pooled thread skip the queue forever after.
+_slot_holder = threading.local()
+
+
+# Registered domains that serve the same site as another one
+_DOMAIN_ALIASES = {
+    "youtu.be": "youtube.com",
+    "youtube-nocookie.com": "youtube.com",
+}
+
+
+def _domain_key(url):
+    """Return the registered domain a download is counted against ("m.youtube.com" -> "youtube.com")."""
+    host = get_host(url or "")
+    if not host:
+        return "unknown"
+    labels = registered_domain_labels(host)
+    if labels > 1:  # hosts without a known public suffix (IPs, "localhost") are kept whole
+        host = ".".join(host.split(".")[-labels:])
+    return _DOMAIN_ALIASES.get(host, host)
+
+
+class _Ticket(object):
+    __slots__ = ("user_id", "domain", "is_admin", "seq")
+
+    def __init__(self, user_id, domain, is_admin, seq):
+        self.user_id = user_id
+        self.domain = domain
+        self.is_admin = is_admin
+        self.seq = seq
+
+
+class DownloadSlot(object):
+    """A granted slot. release() is idempotent."""
+
+    def __init__(self, scheduler=None, ticket=None):
+        self._scheduler = scheduler
+        self._ticket = ticket
+
+    @property
+    def held(self):
+        return self._scheduler is not None
+
+    def release(self):
+        scheduler, ticket = self._scheduler, self._ticket
+        self._scheduler = self._ticket = None
+        if getattr(_slot_holder, "slot", None) is self:
+            _slot_holder.slot = None
+        if scheduler is not None:
+            scheduler._release(ticket)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+class DownloadScheduler(object):
+    """
+    Limits concurrent download jobs globally and per domain.
+
+    Waiting jobs are started in order of (admin first, fewest running jobs of
+    the same user, arrival), so one user pasting many links cannot starve the
+    others. A limit of 0 disables it.
+    """
+
+    def __init__(self, global_slots=0, per_domain_slots=0):
+        self.global_slots = int(global_slots or 0)
+        self.per_domain_slots = int(per_domain_slots or 0)
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting = []
+        self._running_total = 0
+        self._running_by_domain = Counter()
+        self._running_by_user = Counter()
+
+    def _rank(self, ticket):
+        return (0 if ticket.is_admin else 1, self._running_by_user[ticket.user_id], ticket.seq)
+
+    def _fits(self, ticket):
+        if self.global_slots and self._running_total >= self.global_slots:
+            return False
+        if self.per_domain_slots and self._running_by_domain[ticket.domain] >= self.per_domain_slots:
+            return False
+        return True
+
+    def _can_start(self, ticket):
+        if not self._fits(ticket):
+            return False
+        rank = self._rank(ticket)
+        return not any(
+            other is not ticket and self._fits(other) and self._rank(other) < rank
+            for other in self._waiting
+        )
+
+    def _position(self, ticket):
+        rank = self._rank(ticket)
+        return 1 + sum(1 for other in self._waiting if other is not ticket and self._rank(other) < rank)
+
+    def acquire(self, user_id, url, is_admin=False, on_wait=None):
+        """
+        Block until a slot is free and return a DownloadSlot.
+
+        on_wait(position) is called (outside the lock) whenever the queue
+        position changes while waiting; on_wait(0) is called once the slot is
+        granted after waiting.
+        """
+        holder = getattr(_slot_holder, "slot", None)
+        if holder is not None and holder.held:
+            return DownloadSlot()
+        ticket = _Ticket(user_id, _domain_key(url), is_admin, next(self._seq))
+        reported = None
+        with self._cond:
+            self._waiting.append(ticket)
+        try:
+            while True:
+                with self._cond:
+                    if self._can_start(ticket):
+                        self._waiting.remove(ticket)
+                        self._running_total += 1
+                        self._running_by_domain[ticket.domain] += 1
+                        self._running_by_user[ticket.user_id] += 1
+                        break
+                    position = self._position(ticket)
+                    if position == reported:
+                        self._cond.wait(timeout=10)
+                        continue
+                if on_wait:
+                    try:
+                        on_wait(position)
+                    except Exception as e:
+                        logger.debug(f"[SCHEDULER] on_wait callback failed: {e}")
+                reported = position
+        except BaseException:
+            with self._cond:
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                self._cond.notify_all()
+            raise
+        slot = DownloadSlot(self, ticket)
+        _slot_holder.slot = slot
+        try:
+            if reported is not None and on_wait:
+                try:
+                    on_wait(0)
+                except Exception as e:
+                    logger.debug(f"[SCHEDULER] on_wait callback failed: {e}")
+            logger.info(f"[SCHEDULER] slot granted: user={user_id} domain={ticket.domain} running={self._running_total}")
+        except BaseException:
+            slot.release()
+            raise
+        return slot
+
+    def _release(self, ticket):
+        with self._cond:
+            self._running_total -= 1
+            self._running_by_domain[ticket.domain] -= 1
+            if self._running_by_domain[ticket.domain] <= 0:
+                del self._running_by_domain[ticket.domain]
+            self._running_by_user[ticket.user_id] -= 1
+            if self._running_by_user[ticket.user_id] <= 0:
+                del self._running_by_user[ticket.user_id]
+            self._cond.notify_all()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "running": self._running_total,
+                "waiting": len(self._waiting),
+                "by_domain": dict(self._running_by_domain),
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_download_scheduler():
+    """Return the process-wide scheduler (created from LimitsConfig on first use)."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = DownloadScheduler(
+                getattr(LimitsConfig, "DOWNLOAD_GLOBAL_SLOTS", 0),
+                getattr(LimitsConfig, "DOWNLOAD_PER_DOMAIN_SLOTS", 0),
+            )
+        return _scheduler
+
+
+def acquire_download_slot(message, url):
+    """
+    Wait for a download slot for this message's user, showing the queue
+    position in the chat while waiting. Call it inside the try whose finally
+    releases the slot (or use the slot as a context manager).
+    """
+    from HELPERS.safe_messeger import safe_send_message, safe_edit_message_text, safe_delete_messages
+
+    chat_id = message.chat.id
+    user_id = getattr(getattr(message, "from_user", None), "id", None) or chat_id
+    is_admin = int(user_id) in Config.ADMIN
+    queue_msg = {}
+
+    def on_wait(position):
+        if position == 0:
+            if queue_msg.get("id"):
+                safe_delete_messages(chat_id=chat_id, message_ids=[queue_msg["id"]], revoke=True, _wait=False)
+            return
+        text = safe_get_messages(user_id).DOWNLOAD_QUEUE_POSITION_MSG.format(position=position)
+        if queue_msg.get("id"):
+            safe_edit_message_text(chat_id, queue_msg["id"], text, _wait=False)
+        else:
+            sent = safe_send_message(chat_id, text, message=message)
+            queue_msg["id"] = getattr(sent, "id", None)
+
+    return get_download_scheduler().acquire(user_id, url, is_admin=is_admin, on_wait=on_wait)
@@ -9,21 +9,12 @@ def should_fallback_to_gallery_dl(error_message: str, url: str) -> bool:
     Returns True if the error indicates yt-dlp cannot handle the URL/content.
     """
     # Check whether the URL belongs to a yt-dlp-only domain
-    from CONFIG.domains import DomainsConfig
-    from urllib.parse import urlparse
+    from HELPERS.domain_classifier import classify_url, YTDLP_ONLY
     
     try:
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
-        
-        # Strip "www." prefix for comparison
-        if domain.startswith('www.'):
-            domain = domain[4:]
-            
         # Check if the domain is in YTDLP_ONLY_DOMAINS
-        for ytdlp_domain in DomainsConfig.YTDLP_ONLY_DOMAINS:
-            if domain == ytdlp_domain or domain.endswith('.' + ytdlp_domain):
-                return False  # Do not fall back for yt-dlp-only domains
+        if YTDLP_ONLY in classify_url(url):
+            return False  # Do not fall back for yt-dlp-only domains
     except Exception:
         # If URL parsing fails, continue with the normal checks
         pass
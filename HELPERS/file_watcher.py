@@ -0,0 +1,370 @@
+# File completion watcher: inotify on Linux, directory polling elsewhere
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import threading
+import time
+from collections import deque
+
+from CONFIG.limits import LimitsConfig
+from HELPERS.logger import logger
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_ONLYDIR
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then len bytes of name
+
+# Files still being written under a temporary name; they complete when renamed
+_PARTIAL_SUFFIXES = (".part", ".ytdl", ".temp", ".tmp")
+# A file seen without a completion event counts as complete once its size and
+# mtime have not changed for this long
+_SETTLE_SECONDS = 2.0
+
+_libc = None
+_libc_lock = threading.Lock()
+
+
+def _inotify_libc():
+    """libc with the inotify calls, or None where inotify is not available."""
+    global _libc
+    with _libc_lock:
+        if _libc is None:
+            _libc = False
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_init1.restype = ctypes.c_int
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                libc.inotify_add_watch.restype = ctypes.c_int
+                _libc = libc
+            except (OSError, AttributeError):
+                pass
+        return _libc or None
+
+
+class FileWatcher(object):
+    """
+    Reports each file under `root` once, as soon as it is complete.
+
+    With inotify a file is complete when it is closed after writing or moved
+    into place (downloaders write "name.part" and rename it). Where inotify is
+    not available, or the watch limit is reached, the tree is polled and a
+    file is complete once it has stopped changing. Producers that know when a
+    file is done (gallery-dl reports every finished file) can call notify()
+    to report it right away; every file is still reported only once.
+
+    completed(timeout) returns the newly completed paths, built as
+    os.path.join(root, ...) like os.walk(root) would. With track_created,
+    created() returns the names of new entries, e.g. to follow the fragments
+    of a running download.
+    """
+
+    def __init__(self, root, recursive=True, track_created=False, poll_interval=None):
+        self.root = root
+        self.recursive = recursive
+        self.track_created = track_created
+        self.poll_interval = float(poll_interval or getattr(LimitsConfig, "FILE_WATCHER_POLL_INTERVAL", 0.5))
+        self._root_abs = os.path.abspath(root)
+        self._lock = threading.Lock()
+        self._ready = deque()
+        self._reported = set()
+        self._unconfirmed = {}  # path -> ((size, mtime_ns), first seen with that signature)
+        self._created = []
+        self._partials = set()  # temporary files already listed by created()
+        self._wds = {}  # watch descriptor -> directory path
+        self._fd = None
+        self._next_check = 0.0
+        self._closed = False
+        # notify() from another thread wakes a completed() call that is waiting
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        libc = _inotify_libc()
+        if libc is not None:
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self._fd = fd
+            else:
+                logger.debug(f"[WATCHER] inotify_init1 failed ({os.strerror(ctypes.get_errno())}), polling {root}")
+        self._watch_root()
+
+    @property
+    def using_inotify(self):
+        return self._fd is not None
+
+    # ------------------------------------------------------------------
+    # Public interface
+    # ------------------------------------------------------------------
+
+    def completed(self, timeout=0):
+        """Paths completed since the last call; waits up to `timeout` seconds for the first one."""
+        deadline = time.monotonic() + max(0.0, timeout or 0)
+        while True:
+            self._process()
+            with self._lock:
+                if self._ready or self._closed:
+                    ready = list(self._ready)
+                    self._ready.clear()
+                    return ready
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            self._wait(remaining)
+
+    def created(self):
+        """Names of entries created since the last call (needs track_created)."""
+        self._process()
+        with self._lock:
+            names, self._created = self._created, []
+        return names
+
+    def notify(self, path):
+        """Report a file the producer knows to be complete (safe from any thread)."""
+        rel = os.path.relpath(os.path.abspath(path), self._root_abs)
+        if rel == os.curdir or rel.startswith(os.pardir):
+            return
+        with self._lock:
+            # After close() the wake pipe's fd numbers may belong to other files
+            if self._closed:
+                return
+            if self._report(os.path.join(self.root, rel)):
+                try:
+                    os.write(self._wake_w, b"\0")
+                except OSError:
+                    pass
+
+    def settle(self):
+        """The producer has finished writing: report the files still waiting to settle."""
+        self._process()
+        with self._lock:
+            for path in list(self._unconfirmed):
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    size = 0
+                if size > 0:
+                    self._report(path)
+            self._unconfirmed.clear()
+
+    def pending(self):
+        """True while files are on disk that have not been reported complete yet."""
+        with self._lock:
+            return bool(self._unconfirmed)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            fds = (self._fd, self._wake_r, self._wake_w)
+            self._fd = self._wake_r = self._wake_w = None
+        for fd in fds:
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _report(self, path):
+        # Caller holds self._lock
+        if path.endswith(_PARTIAL_SUFFIXES):
+            return False
+        self._unconfirmed.pop(path, None)
+        key = os.path.abspath(path)
+        if key in self._reported:
+            return False
+        self._reported.add(key)
+        self._ready.append(path)
+        return True
+
+    def _watch_root(self):
+        if self._fd is not None and not self._wds and os.path.isdir(self.root):
+            self._add_watch(self.root)
+
+    def _add_watch(self, directory):
+        wd = _inotify_libc().inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                # fs.inotify.max_user_watches reached; this watcher polls instead
+                logger.warning(f"[WATCHER] inotify watch limit reached, polling {self.root}")
+                self._switch_to_polling()
+            elif err != errno.ENOENT:
+                logger.debug(f"[WATCHER] cannot watch {directory}: {os.strerror(err)}")
+            return
+        self._wds[wd] = directory
+        # Entries created before the watch existed get no events of their own
+        self._scan(directory, recursive=False, watch_subdirs=self.recursive)
+
+    def _switch_to_polling(self):
+        fd, self._fd = self._fd, None
+        self._wds.clear()
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+    def _scan(self, directory, recursive, watch_subdirs=False):
+        """Record files not reported yet; with watch_subdirs, watch the subdirectories found."""
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        now = time.monotonic()
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if watch_subdirs and self._fd is not None:
+                    self._add_watch(entry.path)
+                elif recursive:
+                    self._scan(entry.path, recursive=True)
+                continue
+            path = os.path.join(directory, entry.name)
+            with self._lock:
+                if os.path.abspath(path) in self._reported:
+                    continue
+                if path.endswith(_PARTIAL_SUFFIXES):
+                    # Completes under its final name; only its creation is of interest
+                    if self.track_created and path not in self._partials:
+                        self._partials.add(path)
+                        self._created.append(entry.name)
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                sig = (st.st_size, st.st_mtime_ns)
+                previous = self._unconfirmed.get(path)
+                if previous is None:
+                    if self.track_created:
+                        self._created.append(entry.name)
+                    self._unconfirmed[path] = (sig, now)
+                elif previous[0] != sig:
+                    self._unconfirmed[path] = (sig, now)
+                elif sig[0] > 0 and now - previous[1] >= _SETTLE_SECONDS:
+                    self._report(path)
+
+    def _process(self):
+        if self._closed:
+            return
+        if self._fd is not None:
+            self._watch_root()
+            self._read_events()
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.poll_interval
+        if self._fd is None:
+            self._scan(self.root, recursive=self.recursive)
+            return
+        # Files found by a catch-up scan complete once they stop changing
+        with self._lock:
+            unconfirmed = list(self._unconfirmed.items())
+        for path, (sig, since) in unconfirmed:
+            try:
+                st = os.stat(path)
+            except OSError:
+                with self._lock:
+                    self._unconfirmed.pop(path, None)
+                continue
+            current = (st.st_size, st.st_mtime_ns)
+            with self._lock:
+                if path not in self._unconfirmed:
+                    continue
+                if current != sig:
+                    self._unconfirmed[path] = (current, now)
+                elif current[0] > 0 and now - since >= _SETTLE_SECONDS:
+                    self._report(path)
+
+    def _read_events(self):
+        while self._fd is not None:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                logger.debug(f"[WATCHER] inotify read failed ({e}), polling {self.root}")
+                self._switch_to_polling()
+                return
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                name = os.fsdecode(data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0"))
+                offset += _EVENT.size + length
+                self._handle_event(wd, mask, name)
+                if self._fd is None:
+                    return
+
+    def _handle_event(self, wd, mask, name):
+        if mask & _IN_Q_OVERFLOW:
+            # Events were lost; catch up from the tree itself
+            logger.debug(f"[WATCHER] inotify queue overflow, rescanning {self.root}")
+            self._scan(self.root, recursive=self.recursive)
+            return
+        if mask & _IN_IGNORED:
+            self._wds.pop(wd, None)
+            return
+        directory = self._wds.get(wd)
+        if directory is None or not name:
+            return
+        path = os.path.join(directory, name)
+        if mask & _IN_ISDIR:
+            if self.recursive and mask & (_IN_CREATE | _IN_MOVED_TO):
+                self._add_watch(path)
+            return
+        with self._lock:
+            if mask & _IN_CREATE:
+                if self.track_created:
+                    self._created.append(name)
+                # Its close event follows
+                self._unconfirmed.pop(path, None)
+            if mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                if mask & _IN_MOVED_TO and self.track_created:
+                    self._created.append(name)
+                self._report(path)
+
+    def _wait(self, timeout):
+        wake_r, fd = self._wake_r, self._fd
+        if wake_r is None:  # closed
+            return
+        fds = [wake_r] + ([fd] if fd is not None else [])
+        # Polling (and settling catch-up files) needs to wake up for the next check
+        if self._fd is None or self._unconfirmed or not self._wds:
+            timeout = min(timeout, max(0.01, self._next_check - time.monotonic()))
+        try:
+            readable, _, _ = select.select(fds, [], [], timeout)
+        except (OSError, ValueError):
+            time.sleep(min(timeout, self.poll_interval))
+            return
+        if wake_r in readable:
+            try:
+                os.read(wake_r, 4096)
+            except OSError:
+                pass
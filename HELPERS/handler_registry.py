@@ -1,7 +1,17 @@
 # Handler Registry System
 # This module provides a way to register handlers that will be applied when app is initialized
 
+import ast
+import builtins
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import sys
+
 from HELPERS.app_instance import get_app_lazy
+from HELPERS.logger import logger
 from CONFIG.messages import Messages, safe_get_messages
 
 class HandlerRegistry:
@@ -44,4 +54,184 @@ def on_callback_query(filters=None):
 
 def apply_all_handlers(app):
     """Apply all registered handlers to the app"""
-    registry.apply_handlers(app) 
\ No newline at end of file
+    registry.apply_handlers(app) 
+
+# ####################################################################################
+# Lazy handler loading
+# ####################################################################################
+# A normal (eager) start imports every handler module, which registers its
+# handlers through @app.on_message / @app.on_callback_query. While it does, the
+# registrations are recorded, in order, into a manifest together with the
+# source of each decorator's filter. With Config.LAZY_HANDLER_LOADING a later
+# start registers the same handlers from the manifest instead: filters are
+# rebuilt from their source, callbacks are proxies, and a handler module is
+# imported only when one of its handlers (or filters) is first used. The
+# manifest is rebuilt by the next eager start whenever a handler module changes.
+
+_HANDLER_MANIFEST_FILE = "CONFIG/.handler_manifest.json"
+_DECORATOR_KINDS = {"on_message": "message", "on_callback_query": "callback_query"}
+_HANDLER_KINDS = {"MessageHandler": "message", "CallbackQueryHandler": "callback_query"}
+
+
+def lazy_handler(module_name, attr_name, is_async=False):
+    """Return a function that imports module_name on first call and calls its attr_name."""
+    if is_async:
+        async def proxy(*args, **kwargs):
+            return await getattr(importlib.import_module(module_name), attr_name)(*args, **kwargs)
+    else:
+        def proxy(*args, **kwargs):
+            return getattr(importlib.import_module(module_name), attr_name)(*args, **kwargs)
+    proxy.__name__ = attr_name
+    proxy.__qualname__ = f"{module_name}.{attr_name}"
+    return proxy
+
+
+class _LazyModuleNames(dict):
+    # Names a filter expression takes from its module (e.g. the function given to
+    # filters.create) resolve to proxies, so building the filter imports nothing
+    def __init__(self, module_name, filters_module):
+        super().__init__(filters=filters_module)
+        self.module_name = module_name
+
+    def __missing__(self, name):
+        if hasattr(builtins, name):
+            return getattr(builtins, name)
+        return lazy_handler(self.module_name, name)
+
+
+def _module_fingerprint(module_name):
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or not spec.origin or not os.path.exists(spec.origin):
+        return None
+    stat = os.stat(spec.origin)
+    return [spec.origin, stat.st_mtime_ns, stat.st_size]
+
+
+def _decorator_filters(module_name):
+    """Map function name -> (kind, filter source or None) for @app.on_* decorators in a module."""
+    path = importlib.util.find_spec(module_name).origin
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    found = {}
+    for node in ast.walk(ast.parse(source)):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for decorator in node.decorator_list:
+            if not (isinstance(decorator, ast.Call) and isinstance(decorator.func, ast.Attribute)):
+                continue
+            kind = _DECORATOR_KINDS.get(decorator.func.attr)
+            if kind is None:
+                continue
+            filter_node = decorator.args[0] if decorator.args else None
+            for keyword in decorator.keywords:
+                if keyword.arg == "filters":
+                    filter_node = keyword.value
+            filter_source = ast.get_source_segment(source, filter_node) if filter_node is not None else None
+            found[node.name] = (kind, filter_source)
+    return found
+
+
+class HandlerRecorder(object):
+    """
+    Hooks app.add_handler to record the handlers registered by handler modules
+    (eager start), or to drop them when those modules are imported after their
+    handlers were registered from the manifest (lazy start).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.entries = []
+        self.lazy_modules = set()
+        self._add_handler = app.add_handler
+        app.add_handler = self._hooked_add_handler
+
+    def _hooked_add_handler(self, handler, group=0):
+        callback = getattr(handler, "callback", None)
+        module_name = getattr(callback, "__module__", None)
+        if module_name in self.lazy_modules:
+            # Already registered from the manifest
+            return None
+        if module_name and module_name != "__main__":
+            self.entries.append((type(handler).__name__, callback, module_name, group))
+        return self._add_handler(handler, group)
+
+    def save_manifest(self, path=_HANDLER_MANIFEST_FILE):
+        """Write the recorded registrations; skipped if a handler cannot be rebuilt from source."""
+        from HELPERS.limiter_state import write_json_atomic
+        handlers = []
+        sources = {}
+        for handler_type, callback, module_name, group in self.entries:
+            name = getattr(callback, "__name__", None)
+            kind = _HANDLER_KINDS.get(handler_type)
+            module = sys.modules.get(module_name)
+            if module_name not in sources:
+                try:
+                    sources[module_name] = _decorator_filters(module_name)
+                except Exception as e:
+                    logger.warning(f"Handler manifest not written: cannot parse {module_name}: {e}")
+                    return False
+            decorated = sources[module_name].get(name)
+            if kind is None or getattr(module, name or "", None) is not callback or decorated is None or decorated[0] != kind:
+                logger.warning(f"Handler manifest not written: {module_name}.{name} is not a plain @app.{handler_type} handler")
+                return False
+            handlers.append({
+                "module": module_name,
+                "name": name,
+                "kind": kind,
+                "group": group,
+                "filters": decorated[1],
+                "is_async": inspect.iscoroutinefunction(callback),
+            })
+        manifest = {
+            "modules": {module_name: _module_fingerprint(module_name) for module_name in sources},
+            "handlers": handlers,
+        }
+        write_json_atomic(path, manifest)
+        logger.info(f"Handler manifest written: {len(handlers)} handlers from {len(sources)} modules")
+        return True
+
+
+def load_handler_manifest(path=_HANDLER_MANIFEST_FILE):
+    """Return the manifest if it is still valid for the handler modules on disk, else None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        for module_name, fingerprint in manifest["modules"].items():
+            if fingerprint is None or _module_fingerprint(module_name) != fingerprint:
+                logger.info(f"Handler manifest is stale ({module_name} changed)")
+                return None
+        return manifest
+    except Exception as e:
+        logger.warning(f"Failed to read handler manifest: {e}")
+        return None
+
+
+def register_lazy_handlers(app, recorder, manifest):
+    """
+    Register every handler of the manifest without importing the handler modules.
+
+    All filters are rebuilt before anything is registered; if one of them
+    cannot be, nothing is registered and False is returned so the caller
+    imports the handler modules instead.
+    """
+    from pyrogram import filters as pyrogram_filters
+    from pyrogram.handlers import CallbackQueryHandler, MessageHandler
+    handler_classes = {"message": MessageHandler, "callback_query": CallbackQueryHandler}
+    handlers = []
+    for entry in manifest["handlers"]:
+        flt = None
+        try:
+            if entry["filters"] is not None:
+                flt = eval(entry["filters"], {"__builtins__": builtins}, _LazyModuleNames(entry["module"], pyrogram_filters))
+            callback = lazy_handler(entry["module"], entry["name"], entry.get("is_async", False))
+            handlers.append((handler_classes[entry["kind"]](callback, flt), entry["group"]))
+        except Exception as e:
+            logger.warning(f"Handler manifest not used: cannot rebuild {entry.get('module')}.{entry.get('name')}: {e}")
+            return False
+    for handler, group in handlers:
+        recorder._add_handler(handler, group)
+    recorder.lazy_modules.update(manifest["modules"])
+    logger.info(f"Registered {len(manifest['handlers'])} handlers lazily from {len(manifest['modules'])} modules")
+    return True
@@ -1,27 +1,141 @@
 """
-HTTP Session Manager with forced connection cleanup
-Prevents hanging connections and CLOSE-WAIT states
+HTTP Session Manager with pooled keep-alive connections
+Idle connections are reaped so they never pile up in CLOSE-WAIT
 """
 
 import threading
 import time
+import weakref
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from urllib3.util.retry import Retry
 from CONFIG.limits import LimitsConfig
 from HELPERS.logger import logger
 
 
+def _is_dropped(conn):
+    # The server closed its end; the socket would otherwise sit in CLOSE-WAIT
+    try:
+        return not conn.is_connected
+    except AttributeError:
+        from urllib3.util.connection import is_connection_dropped
+        return is_connection_dropped(conn)
+
+
+class _PoolStats(object):
+    """Connection counters of one managed session, shared by its per-host pools."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pools = weakref.WeakSet()
+        self.requests = 0      # connections checked out
+        self.opened = 0        # checkouts that needed a new TCP/TLS connection
+        self.discarded = 0     # connections closed because their host pool was full
+        self.reaped = 0        # idle or dropped connections closed by the reaper
+        self.in_use = 0
+        self.peak_in_use = 0
+
+
+def _tracked_pool_class(base, stats):
+    """`base` connection pool that records connection use in `stats`."""
+
+    class TrackedPool(base):
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.in_use = 0
+            with stats.lock:
+                stats.pools.add(self)
+
+        def _get_conn(self, timeout=None):
+            conn = super()._get_conn(timeout=timeout)
+            with stats.lock:
+                stats.requests += 1
+                if getattr(conn, "sock", None) is None:
+                    stats.opened += 1
+                self.in_use += 1
+                stats.in_use += 1
+                stats.peak_in_use = max(stats.peak_in_use, stats.in_use)
+            return conn
+
+        def _put_conn(self, conn):
+            if conn is not None:
+                conn.idle_since = time.monotonic()
+            queue = self.pool
+            with stats.lock:
+                self.in_use = max(0, self.in_use - 1)
+                stats.in_use = max(0, stats.in_use - 1)
+                if conn is not None and queue is not None and queue.full():
+                    stats.discarded += 1
+            super()._put_conn(conn)
+
+        def reap(self, idle_timeout):
+            """Close pooled connections idle for longer than idle_timeout or dropped by the server."""
+            queue = self.pool
+            if queue is None:
+                return 0
+            now = time.monotonic()
+            stale = []
+            # Swap stale connections for empty slots in place, so a concurrent
+            # checkout never blocks and the pool keeps its size
+            with queue.mutex:
+                for i, conn in enumerate(queue.queue):
+                    if conn is None or getattr(conn, "sock", None) is None:
+                        continue
+                    if now - getattr(conn, "idle_since", now) > idle_timeout or _is_dropped(conn):
+                        queue.queue[i] = None
+                        stale.append(conn)
+            for conn in stale:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            return len(stale)
+
+        def idle_count(self):
+            queue = self.pool
+            if queue is None:
+                return 0
+            with queue.mutex:
+                return sum(1 for conn in queue.queue if conn is not None and getattr(conn, "sock", None) is not None)
+
+    TrackedPool.__name__ = f"Tracked{base.__name__}"
+    return TrackedPool
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host connection pools report to a _PoolStats."""
+
+    def __init__(self, stats, **kwargs):
+        self._stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _tracked_pool_class(HTTPConnectionPool, self._stats),
+            "https": _tracked_pool_class(HTTPSConnectionPool, self._stats),
+        }
+
+
 class ManagedHTTPSession:
     """
-    HTTP Session with automatic cleanup and connection lifetime limits
+    HTTP Session with pooled keep-alive connections, one pool per host.
+    A background reaper closes connections idle for longer than
+    HTTP_POOL_IDLE_TIMEOUT (or already closed by the server), and drops
+    every pooled connection after the connection lifetime. The session
+    object itself stays the same, so callers may keep a reference to it.
     """
     
     def __init__(self, session_name="default", max_lifetime=None):
         self.session_name = session_name
         self.max_lifetime = max_lifetime or LimitsConfig.MAX_HTTP_CONNECTION_LIFETIME
+        self.idle_timeout = getattr(LimitsConfig, "HTTP_POOL_IDLE_TIMEOUT", 60)
+        self.pool_maxsize = getattr(LimitsConfig, "HTTP_POOL_MAXSIZE", 10)
         self.created_at = time.time()
         self._session = None
+        self._stats = _PoolStats()
         self._lock = threading.Lock()
         self._cleanup_thread = None
         self._stop_cleanup = threading.Event()
@@ -30,10 +144,8 @@ class ManagedHTTPSession:
         """Create a new requests session with proper configuration"""
         session = requests.Session()
         
-        # Set headers to minimize connection reuse
         session.headers.update({
             'User-Agent': 'tg-ytdlp-bot/1.0',
-            'Connection': 'close'  # Force close connections
         })
         
         # Configure retry strategy
@@ -43,10 +155,12 @@ class ManagedHTTPSession:
             status_forcelist=[429, 500, 502, 503, 504],
         )
         
-        # Configure HTTP adapter with connection limits
-        adapter = HTTPAdapter(
-            pool_connections=2,      # Minimal connection pools
-            pool_maxsize=5,          # Small pool size
+        # Keep-alive pools: up to pool_maxsize open connections for each of
+        # the HTTP_POOL_HOSTS most recently used hosts
+        adapter = _PooledAdapter(
+            self._stats,
+            pool_connections=getattr(LimitsConfig, "HTTP_POOL_HOSTS", 10),
+            pool_maxsize=self.pool_maxsize,
             max_retries=retry_strategy,
             pool_block=False,         # Don't block when pool is full
         )
@@ -57,63 +171,91 @@ class ManagedHTTPSession:
         return session
     
     def get_session(self):
-        """Get the current session, creating a new one if needed or expired"""
+        """Get the current session, creating it if needed"""
         with self._lock:
-            current_time = time.time()
-            
-            # Check if session is expired or doesn't exist
-            if (self._session is None or 
-                current_time - self.created_at > self.max_lifetime):
-                
-                # Close old session if exists
-                if self._session is not None:
-                    try:
-                        self._session.close()
-                        logger.debug(f"Closed expired HTTP session: {self.session_name}")
-                    except Exception as e:
-                        logger.warning(f"Error closing HTTP session: {e}")
-                
-                # Create new session
+            if self._session is None:
                 self._session = self._create_session()
-                self.created_at = current_time
+                self.created_at = time.time()
                 logger.debug(f"Created new HTTP session: {self.session_name}")
                 
-                # Start cleanup thread if not already running
-                if self._cleanup_thread is None or not self._cleanup_thread.is_alive():
-                    self._stop_cleanup.clear()
-                    self._cleanup_thread = threading.Thread(
-                        target=self._cleanup_worker, 
-                        daemon=True,
-                        name=f"HTTP-Cleanup-{self.session_name}"
-                    )
-                    self._cleanup_thread.start()
+            # Start cleanup thread if not already running
+            if self._cleanup_thread is None or not self._cleanup_thread.is_alive():
+                self._stop_cleanup.clear()
+                self._cleanup_thread = threading.Thread(
+                    target=self._cleanup_worker, 
+                    daemon=True,
+                    name=f"HTTP-Cleanup-{self.session_name}"
+                )
+                self._cleanup_thread.start()
             
             return self._session
     
+    def _reap_idle(self):
+        """Close idle and server-closed connections; returns how many were closed"""
+        with self._stats.lock:
+            pools = list(self._stats.pools)
+        reaped = 0
+        for pool in pools:
+            reaped += pool.reap(self.idle_timeout)
+        if reaped:
+            with self._stats.lock:
+                self._stats.reaped += reaped
+            logger.debug(f"Reaped {reaped} idle HTTP connections: {self.session_name}")
+        return reaped
+    
     def _cleanup_worker(self):
-        """Background worker to force cleanup expired sessions"""
+        """Background worker that reaps idle connections and recycles old ones"""
+        interval = max(1.0, min(self.idle_timeout / 2.0, self.max_lifetime))
         while not self._stop_cleanup.is_set():
             try:
-                # Wait for session lifetime or stop event
-                self._stop_cleanup.wait(self.max_lifetime)
+                self._stop_cleanup.wait(interval)
+                if self._stop_cleanup.is_set():
+                    break
+                self._reap_idle()
                 
-                if not self._stop_cleanup.is_set():
-                    # Force cleanup
-                    with self._lock:
-                        if self._session is not None:
-                            try:
-                                self._session.close()
-                                logger.debug(f"Forced cleanup of HTTP session: {self.session_name}")
-                            except Exception as e:
-                                logger.warning(f"Error in forced cleanup: {e}")
-                            finally:
-                                self._session = None
-                                self.created_at = time.time()
+                with self._lock:
+                    if self._session is not None and time.time() - self.created_at > self.max_lifetime:
+                        # Drop every pooled connection; the next requests reconnect
+                        try:
+                            self._session.close()
+                            logger.debug(f"Recycled HTTP connections of session: {self.session_name}")
+                        except Exception as e:
+                            logger.warning(f"Error in forced cleanup: {e}")
+                        finally:
+                            self.created_at = time.time()
                                 
             except Exception as e:
                 logger.error(f"Error in HTTP cleanup worker: {e}")
                 break
     
+    def stats(self):
+        """Connection pool utilization of this session"""
+        with self._stats.lock:
+            pools = list(self._stats.pools)
+            data = {
+                "requests": self._stats.requests,
+                "opened": self._stats.opened,
+                "reused": self._stats.requests - self._stats.opened,
+                "discarded": self._stats.discarded,
+                "reaped": self._stats.reaped,
+                "in_use": self._stats.in_use,
+                "peak_in_use": self._stats.peak_in_use,
+            }
+        by_host = {}
+        for pool in pools:
+            if pool.pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            by_host[host] = {
+                "in_use": pool.in_use,
+                "idle": pool.idle_count(),
+                "utilization": round(pool.in_use / float(self.pool_maxsize), 2),
+            }
+        data["idle"] = sum(host["idle"] for host in by_host.values())
+        data["hosts"] = by_host
+        data["reuse_ratio"] = round(data["reused"] / float(data["requests"]), 2) if data["requests"] else 0.0
+        return data
+    
     def close(self):
         """Manually close the session and stop cleanup thread"""
         self._stop_cleanup.set()
@@ -156,6 +298,13 @@ def get_managed_session(session_name="default"):
         return _http_managers[session_name]
 
 
+def get_pool_stats():
+    """Connection pool utilization of every managed session, by session name"""
+    with _managers_lock:
+        managers = dict(_http_managers)
+    return {name: manager.stats() for name, manager in managers.items()}
+
+
 def close_all_sessions():
     """Close all managed HTTP sessions"""
     with _managers_lock:
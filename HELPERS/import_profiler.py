@@ -0,0 +1,110 @@
+# Import time report (like `python -X importtime`), enabled with Config.IMPORT_TIME_REPORT
+import sys
+import time
+from importlib.abc import MetaPathFinder
+
+
+class _TimedLoader(object):
+    """Wraps a module's loader for one exec_module call, then puts the original back."""
+
+    def __init__(self, profiler, loader):
+        self._profiler = profiler
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        spec = getattr(module, "__spec__", None)
+        if spec is not None:
+            spec.loader = self._loader
+        module.__loader__ = self._loader
+        profiler = self._profiler
+        profiler._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = profiler._stack.pop()
+            if profiler._stack:
+                profiler._stack[-1] += cumulative
+            profiler.records.append((module.__name__, cumulative - children, cumulative, len(profiler._stack)))
+
+
+class ImportProfiler(MetaPathFinder):
+    """
+    Meta path finder that times the execution of every module imported after
+    install(): self time (the module body) and cumulative time (including the
+    modules it imported).
+    """
+
+    def __init__(self):
+        self.records = []
+        self._stack = []
+        self._finding = False
+        self.started = time.perf_counter()
+
+    def find_spec(self, fullname, path=None, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(self, spec.loader)
+        return spec
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def report(self, limit=30):
+        """Return the slowest top-level-ish imports as `-X importtime` style lines."""
+        lines = ["import time:       self [us] |  cumulative | imported package"]
+        slowest = sorted(self.records, key=lambda r: r[2], reverse=True)[:limit]
+        for name, self_time, cumulative, depth in slowest:
+            lines.append(f"import time: {int(self_time * 1e6):>15} | {int(cumulative * 1e6):>11} | {'  ' * depth}{name}")
+        total = sum(r[2] for r in self.records if r[3] == 0)
+        lines.append(f"{len(self.records)} modules imported in {total:.2f}s ({time.perf_counter() - self.started:.2f}s since profiling started)")
+        return "\n".join(lines)
+
+
+_profiler = None
+
+
+def install_import_profiler():
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler()
+        _profiler.install()
+    return _profiler
+
+
+def uninstall_import_profiler():
+    """Stop timing imports; the report keeps what was timed so far."""
+    if _profiler is not None:
+        _profiler.uninstall()
+
+
+def import_time_report(limit=30):
+    """Return the report for the imports timed so far ("" if profiling is off)."""
+    if _profiler is None:
+        return ""
+    return _profiler.report(limit)
@@ -0,0 +1,166 @@
+# Process-wide cache of yt-dlp extraction results
+import copy
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from CONFIG.limits import LimitsConfig
+from HELPERS.logger import logger
+
+# ydl params that change what the extractor fetches or returns. Everything else
+# (format selection, subtitles, match filters, output, hooks...) is applied by
+# process_ie_result, which runs per caller on a copy of the cached result.
+_EXTRACTION_PARAMS = (
+    "proxy", "source_address", "impersonate", "extractor_args", "http_headers",
+    "noplaylist", "playlist_items", "playliststart", "playlistend", "extract_flat",
+    "lazy_playlist", "username", "password", "videopassword", "usenetrc",
+    "cookiesfrombrowser", "geo_bypass", "geo_bypass_country", "geo_bypass_ip_block",
+    "geo_verification_proxy", "allowed_extractors", "force_generic_extractor",
+    "age_limit", "check_formats", "youtube_include_dash_manifest",
+    "youtube_include_hls_manifest", "include_ads",
+)
+# Signed media URLs carry their expiry time (YouTube "expire=", CDN "Expires=")
+_EXPIRE_RE = re.compile(r'[?&/](?:expire|Expires)[=/](\d{9,11})')
+# Entries are dropped this many seconds before their media URLs expire
+_EXPIRY_MARGIN = 120
+
+
+def _cookie_identity(cookiefile):
+    if not cookiefile:
+        return None
+    try:
+        stat = os.stat(cookiefile)
+        return [cookiefile, stat.st_mtime_ns, stat.st_size]
+    except OSError:
+        return [cookiefile, None]
+
+
+def info_cache_key(url, params):
+    """
+    Cache key: the exact URL, playlist range, cookie/proxy identity and the other extraction params.
+
+    The URL is not normalized: the sent-video cache normalization drops
+    query parameters the extractors read (e.g. list= of a /watch URL, which
+    turns a video into a playlist).
+    """
+    extraction = {name: params.get(name) for name in _EXTRACTION_PARAMS if params.get(name) is not None}
+    extraction["cookiefile"] = _cookie_identity(params.get("cookiefile"))
+    return url.strip() + "\n" + json.dumps(extraction, sort_keys=True, default=str)
+
+
+def _signed_url_deadline(info):
+    """Earliest expiry timestamp found in the media URLs of an info dict (or None)."""
+    deadline = None
+    for fmt in info.get("formats") or ():
+        match = _EXPIRE_RE.search(fmt.get("url") or "") if isinstance(fmt, dict) else None
+        if match:
+            expires = int(match.group(1))
+            deadline = expires if deadline is None else min(deadline, expires)
+    return deadline
+
+
+def _replayable(info):
+    # Playlists whose entries are still generators can be processed only once
+    if not isinstance(info, dict):
+        return False
+    entries = info.get("entries")
+    return entries is None or isinstance(entries, (list, tuple))
+
+
+def _cacheable(info):
+    return _replayable(info) and not info.get("is_live")
+
+
+class InfoDictCache(object):
+    """
+    LRU of raw extraction results (YoutubeDL.extract_info(..., process=False))
+    with a TTL, capped by the expiry of the signed media URLs they contain.
+    Concurrent requests for the same key share one extraction in flight.
+    """
+
+    def __init__(self, max_entries=128, ttl=600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, raw info)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_raw(self, key, extract):
+        """Return the cached raw result for key, or run extract() once for all concurrent callers."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                self.misses += 1
+        if not owner:
+            raw = future.result()
+            # A result that cannot be shared went to the caller that extracted it
+            return raw if _replayable(raw) else extract()
+        try:
+            raw = extract()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+        if _cacheable(raw):
+            expires_at = time.time() + self.ttl
+            deadline = _signed_url_deadline(raw)
+            if deadline is not None:
+                expires_at = min(expires_at, deadline - _EXPIRY_MARGIN)
+            with self._lock:
+                self._entries[key] = (expires_at, raw)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(raw)
+        return raw
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_info_cache = InfoDictCache(
+    max_entries=getattr(LimitsConfig, "INFO_CACHE_MAX_ENTRIES", 128),
+    ttl=getattr(LimitsConfig, "INFO_CACHE_TTL", 600),
+)
+
+
+def get_info_cache():
+    return _info_cache
+
+
+def extract_info_cached(ydl, url):
+    """
+    Drop-in replacement for ydl.extract_info(url, download=False).
+
+    The network part (extraction) is shared through the cache; processing
+    (format and subtitle selection, playlist items, filters) runs with this
+    ydl's own options on a private copy, so callers may modify the result.
+    """
+    if getattr(LimitsConfig, "INFO_CACHE_TTL", 600) <= 0:
+        return ydl.extract_info(url, download=False)
+    key = info_cache_key(url, ydl.params)
+    raw = _info_cache.get_raw(key, lambda: ydl.extract_info(url, download=False, process=False))
+    if not isinstance(raw, dict):
+        return raw
+    logger.debug(f"info_dict cache: {url} (hits={_info_cache.hits}, misses={_info_cache.misses})")
+    if _replayable(raw):
+        raw = copy.deepcopy(raw)
+    return ydl.process_ie_result(raw, download=False)
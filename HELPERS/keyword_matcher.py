@@ -0,0 +1,165 @@
+# Keyword matchers for NSFW detection (built once per keyword list)
+import re
+
+# Separators inside URLs: any run of characters that are not ASCII letters or digits
+_URL_DELIMITERS = re.compile(r"[^A-Za-z0-9]+")
+_URL_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _is_word_char(ch):
+    # Same definition of a "word" character as \b in a str regex
+    return ch.isalnum() or ch == "_"
+
+
+def _at_word_boundary(text, index):
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+class AhoCorasick(object):
+    """Aho-Corasick automaton: finds every occurrence of a fixed set of strings in one pass."""
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for keyword in keywords:
+            if keyword:
+                self._add(keyword)
+        self._link()
+
+    def __len__(self):
+        return sum(1 for out in self._out if out)
+
+    def _add(self, keyword):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] = (keyword,)
+
+    def _link(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        # Children of the root fail back to the root; deeper states are linked breadth-first
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                # Keywords ending here include the ones of the longest proper suffix
+                out[nxt] = out[nxt] + out[fail[nxt]]
+
+    def iter_matches(self, text):
+        """Yield (start, keyword) for every occurrence, overlapping ones included."""
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        state = 0
+        for i, ch in enumerate(text):
+            if state == 0:
+                state = root.get(ch, 0)
+            else:
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(ch, 0)
+            if out[state]:
+                for keyword in out[state]:
+                    yield i + 1 - len(keyword), keyword
+
+
+class TextKeywordMatcher(object):
+    """
+    Finds keywords that stand on word boundaries, i.e. what
+    re.search(r"\\b(kw1|kw2|...)\\b", text) finds, in a single pass.
+    Keywords and text are expected in lower case.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = frozenset(kw for kw in keywords if kw)
+        self._automaton = AhoCorasick(self.keywords)
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+    def _iter(self, text):
+        for start, keyword in self._automaton.iter_matches(text):
+            if _at_word_boundary(text, start) and _at_word_boundary(text, start + len(keyword)):
+                yield keyword
+
+    def search(self, text):
+        """Return the first keyword found in text, or None."""
+        if not self.keywords or not text:
+            return None
+        return next(self._iter(text), None)
+
+    def findall(self, text):
+        """Return the distinct keywords found in text, in order of appearance."""
+        if not self.keywords or not text:
+            return []
+        return list(dict.fromkeys(self._iter(text)))
+
+
+class UrlKeywordMatcher(object):
+    """
+    Finds keywords in a URL when they are delimited by non-alphanumeric
+    characters (or the ends of the URL); the words of a multi-word keyword may
+    be separated by any run of such characters ("big tits" matches
+    "/big-tits/" and "big__tits.html").
+
+    Keywords made of ASCII letters and digits are matched in one pass over
+    the URL with its delimiters collapsed to single spaces; the remaining ones
+    (non-Latin words, symbols) share one precompiled pattern.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = frozenset(kw for kw in keywords if kw and kw.split())
+        simple = {}
+        complex_parts = []
+        for keyword in sorted(self.keywords):
+            words = keyword.split()
+            if all(_URL_WORD.fullmatch(w) for w in words):
+                simple[" " + " ".join(words) + " "] = keyword
+            else:
+                complex_parts.append(r"[^A-Za-z0-9]+".join(re.escape(w) for w in words))
+        self._simple = simple
+        self._automaton = AhoCorasick(simple)
+        self._complex = None
+        if complex_parts:
+            complex_parts.sort(key=len, reverse=True)
+            self._complex = re.compile(
+                r"(?<![A-Za-z0-9])(?:" + "|".join(complex_parts) + r")(?![A-Za-z0-9])",
+                flags=re.IGNORECASE,
+            )
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+    def _iter(self, url):
+        if self._simple:
+            normalized = " " + _URL_DELIMITERS.sub(" ", url.lower()) + " "
+            for _, pattern in self._automaton.iter_matches(normalized):
+                yield self._simple[pattern]
+        if self._complex is not None:
+            for match in self._complex.finditer(url):
+                yield match.group(0)
+
+    def search(self, url):
+        """Return the first keyword (or matched URL fragment) found, or None."""
+        if not self.keywords or not url:
+            return None
+        return next(self._iter(url), None)
+
+    def findall(self, url):
+        """Return the distinct keywords (or matched URL fragments) found."""
+        if not self.keywords or not url:
+            return []
+        return list(dict.fromkeys(self._iter(url)))
@@ -0,0 +1,142 @@
+"""
+Shared state helpers for the URL and command limiters (the flusher also
+persists pending message deletions, see HELPERS/delete_scheduler.py):
+sliding-window counters and debounced persistence to JSON files.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+
+from CONFIG.limits import LimitsConfig
+from HELPERS.logger import logger
+
+
+class SlidingWindowCounter(object):
+    """
+    Number of events in the last `window` seconds, kept in a ring of
+    fixed-width buckets (window / buckets seconds each) instead of a list of
+    timestamps. A check costs one pass over the ring no matter how many
+    events were recorded; events leave the window one bucket at a time.
+    """
+
+    __slots__ = ("window", "width", "_slots", "_counts")
+
+    def __init__(self, window, buckets=60):
+        self.window = float(window)
+        self.width = self.window / int(buckets)
+        # Absolute bucket number held by each ring position (-1 = unused)
+        self._slots = [-1] * int(buckets)
+        self._counts = [0] * int(buckets)
+
+    def add(self, now, amount=1):
+        slot = int(now // self.width)
+        pos = slot % len(self._slots)
+        if self._slots[pos] != slot:
+            self._slots[pos] = slot
+            self._counts[pos] = 0
+        self._counts[pos] += amount
+
+    def count(self, now):
+        oldest = int(now // self.width) - len(self._slots)
+        return sum(c for s, c in zip(self._slots, self._counts) if s > oldest)
+
+    def clear(self):
+        self._slots = [-1] * len(self._slots)
+        self._counts = [0] * len(self._counts)
+
+    def to_state(self, now):
+        """Return the non-empty buckets still inside the window as JSON-friendly data."""
+        oldest = int(now // self.width) - len(self._slots)
+        return {"w": self.width, "b": [[s, c] for s, c in zip(self._slots, self._counts) if c and s > oldest]}
+
+    @classmethod
+    def from_state(cls, window, state, buckets=60):
+        """
+        Rebuild a counter from to_state() data, or from a plain list of event
+        timestamps (the format used before counters were introduced).
+        """
+        counter = cls(window, buckets)
+        try:
+            if isinstance(state, list):
+                for ts in state:
+                    counter.add(float(ts))
+            elif isinstance(state, dict):
+                width = float(state.get("w", counter.width))
+                for slot, count in state.get("b", []):
+                    counter.add(int(slot) * width, int(count))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring malformed limiter state: {e}")
+            counter.clear()
+        return counter
+
+
+def write_json_atomic(path, data):
+    """Write JSON through a temporary file so a crash never leaves a truncated file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+class StateFlusher(object):
+    """
+    Persists limiter state in the background: callers mark their state dirty
+    and a daemon thread runs the registered save functions every few seconds
+    (and once more at interpreter exit).
+    """
+
+    def __init__(self, interval):
+        self.interval = max(0.5, float(interval))
+        self._savers = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def register(self, name, save_func):
+        with self._lock:
+            self._savers[name] = save_func
+
+    def mark_dirty(self, name):
+        with self._lock:
+            self._dirty.add(name)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="limiter-flusher", daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """Run the save function of every dirty state now."""
+        with self._flush_lock:
+            with self._lock:
+                names, self._dirty = self._dirty, set()
+                savers = [(name, self._savers.get(name)) for name in names]
+            for name, save_func in savers:
+                if save_func is None:
+                    continue
+                try:
+                    save_func()
+                except Exception as e:
+                    logger.error(f"Failed to save {name} state: {e}")
+                    with self._lock:
+                        self._dirty.add(name)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+_flusher = StateFlusher(getattr(LimitsConfig, "LIMITER_FLUSH_INTERVAL", 5))
+atexit.register(_flusher.flush)
+
+
+def get_state_flusher():
+    return _flusher
+
+
+def flush_limiter_state():
+    """Write all pending limiter state to disk (called on shutdown)."""
+    _flusher.flush()
@@ -104,7 +104,8 @@ def is_user_in_channel(app, message):
         safe_send_message(
             chat_id=message.chat.id,
             text=text,
-            reply_markup=keyboard
+            reply_markup=keyboard,
+            _wait=False
         )
         return False
     
@@ -125,7 +126,8 @@ def is_user_in_channel(app, message):
     safe_send_message(
         chat_id=message.chat.id,
         text=text,
-        reply_markup=keyboard
+        reply_markup=keyboard,
+        _wait=False
     )
     return False
 
@@ -166,11 +168,11 @@ def ensure_group_admin(app, message):
                 status = getattr(member, 'status', None)
                 if status not in (ChatMemberStatus.ADMINISTRATOR, ChatMemberStatus.OWNER):
                     # Ask to grant admin. Reply in the same topic/thread when possible
-                    safe_send_message(chat_id, safe_get_messages(chat_id).HELPER_ADMIN_RIGHTS_REQUIRED_MSG, message=message)
+                    safe_send_message(chat_id, safe_get_messages(chat_id).HELPER_ADMIN_RIGHTS_REQUIRED_MSG, message=message, _wait=False)
                     return False
             except Exception:
                 # If check failed for any reason, be safe and request admin
-                safe_send_message(chat_id, safe_get_messages(chat_id).HELPER_ADMIN_RIGHTS_REQUIRED_MSG, message=message)
+                safe_send_message(chat_id, safe_get_messages(chat_id).HELPER_ADMIN_RIGHTS_REQUIRED_MSG, message=message, _wait=False)
                 return False
         return True
     except Exception:
@@ -373,12 +375,14 @@ def check_playlist_range_limits(url, video_start_with, video_end_with, app, mess
             f"<code>{suggested_command_vid_format}</code>\n\n"
             f"<code>{suggested_command_audio_format}</code>",
             parse_mode=enums.ParseMode.HTML,
-            reply_to_message_id=message.id
+            reply_to_message_id=message.id,
+            _wait=False
         )
         # We send a notification to the log channel
         safe_send_message(
             get_log_channel("general"),
             safe_get_messages(user_id).HELPER_RANGE_LIMIT_EXCEEDED_LOG_MSG.format(service=service, count=count, max_count=max_count, user_id=message.chat.id),
+            _wait=False,
         )
         return False
     return True
@@ -92,14 +92,15 @@ def send_to_logger(message, msg):
     msg_with_id = f"{message.chat.first_name} - {user_id}\n \n{msg}"
     # Print (user_id, "-", msg)
     safe_send_message(get_log_channel("general"), msg_with_id,
-                     parse_mode=enums.ParseMode.HTML)
+                     parse_mode=enums.ParseMode.HTML,
+                     _wait=False)
 
 # Send Message to User Only
 
 def send_to_user(message, msg):
     capture_message_context(message)
     user_id = message.chat.id
-    safe_send_message(user_id, msg, parse_mode=enums.ParseMode.HTML, message=message)
+    safe_send_message(user_id, msg, parse_mode=enums.ParseMode.HTML, message=message, _wait=False)
 
 # Send Message to All ...
 
@@ -107,8 +108,8 @@ def send_to_all(message, msg, parse_mode=None):
     capture_message_context(message)
     user_id = message.chat.id
     msg_with_id = f"{message.chat.first_name} - {user_id}\n \n{msg}"
-    safe_send_message(get_log_channel("general"), msg_with_id, parse_mode=enums.ParseMode.HTML)
-    safe_send_message(user_id, msg, parse_mode=parse_mode or enums.ParseMode.HTML, message=message)
+    safe_send_message(get_log_channel("general"), msg_with_id, parse_mode=enums.ParseMode.HTML, _wait=False)
+    safe_send_message(user_id, msg, parse_mode=parse_mode or enums.ParseMode.HTML, message=message, _wait=False)
 
 # --- Helpers for error logging -------------------------------------------------
 
@@ -138,9 +139,9 @@ def send_error_to_user(message, msg, url: str = None):
     else:
         msg_with_id = f"{message.chat.first_name} - {user_id}\n \n{msg}"
     # Send to LOG_EXCEPTION channel for error tracking
-    safe_send_message(Config.LOG_EXCEPTION, msg_with_id, parse_mode=enums.ParseMode.HTML)
+    safe_send_message(Config.LOG_EXCEPTION, msg_with_id, parse_mode=enums.ParseMode.HTML, _wait=False)
     # Send to user
-    safe_send_message(user_id, msg, parse_mode=enums.ParseMode.HTML, message=message)
+    safe_send_message(user_id, msg, parse_mode=enums.ParseMode.HTML, message=message, _wait=False)
 
 # Log error message to LOG_EXCEPTION channel (without sending to user)
 def log_error_to_channel(message, msg, url: str = None):
@@ -157,4 +158,4 @@ def log_error_to_channel(message, msg, url: str = None):
     else:
         msg_with_id = f"{message.chat.first_name} - {user_id}\n \n{msg}"
     # Send to LOG_EXCEPTION channel for error tracking
-    safe_send_message(Config.LOG_EXCEPTION, msg_with_id, parse_mode=enums.ParseMode.HTML)
+    safe_send_message(Config.LOG_EXCEPTION, msg_with_id, parse_mode=enums.ParseMode.HTML, _wait=False)
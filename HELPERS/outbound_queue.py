@@ -0,0 +1,182 @@
+# Outbound message pipeline: per-chat ordered queues on the client's event loop
+import asyncio
+import inspect
+import logging
+import re
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from pyrogram.errors import FloodWait
+
+from CONFIG.limits import LimitsConfig
+from HELPERS.app_instance import get_app
+
+# Local logger (HELPERS.logger imports safe_messeger, which imports this module)
+logger = logging.getLogger(__name__)
+
+_FLOOD_WAIT_RE = re.compile(r'A wait of (\d+) seconds is required')
+
+
+def retry_delay_for(error, max_flood_wait):
+    """
+    Seconds to park a chat before retrying a call that failed with `error`,
+    or None if the call should not be retried.
+    """
+    if isinstance(error, FloodWait):
+        value = int(getattr(error, "value", 0) or 0)
+        return value if value <= max_flood_wait else None
+    text = str(error)
+    if "FLOOD_WAIT" in text:
+        match = _FLOOD_WAIT_RE.search(text)
+        if not match:
+            return 5
+        value = int(match.group(1)) + 1
+        return value if value <= max_flood_wait else None
+    if "msg_seqno is too high" in text:
+        return 5
+    if "RANDOM_ID_DUPLICATE" in text:
+        return 0.5
+    return None
+
+
+class _Job(object):
+    __slots__ = ("method", "args", "kwargs", "future", "spacing", "attempts")
+
+    def __init__(self, method, args, kwargs, future, spacing):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.spacing = spacing
+        self.attempts = 0
+
+
+class OutboundQueue(object):
+    """
+    Runs client calls (send, edit, forward, delete) on the client's event loop.
+
+    Calls for one chat run in submission order. A flood wait parks only that
+    chat's queue: the call is retried after the wait when it is short
+    (max_flood_wait seconds or less) and failed otherwise, while other chats
+    keep going. A token bucket bounds the calls per second of the whole bot.
+    submit() may be called from any thread and returns a
+    concurrent.futures.Future with the call's result or exception.
+    """
+
+    def __init__(self, app, calls_per_second=25, max_flood_wait=30, max_attempts=3):
+        self.app = app
+        self.loop = app.loop
+        self.rate = float(calls_per_second)
+        self.max_flood_wait = max_flood_wait
+        self.max_attempts = max_attempts
+        # The state below is only touched on the event loop
+        self._queues = {}
+        self._parked_until = {}
+        self._last_call = {}
+        self._tokens = self.rate
+        self._tokens_ts = time.monotonic()
+
+    def submit(self, chat_id, method, /, *args, _spacing=0.0, **kwargs):
+        """Queue app.<method>(*args, **kwargs) behind earlier calls for chat_id."""
+        future = Future()
+        job = _Job(method, args, kwargs, future, _spacing)
+        self.loop.call_soon_threadsafe(self._enqueue, chat_id, job)
+        return future
+
+    def _enqueue(self, chat_id, job):
+        queue = self._queues.get(chat_id)
+        if queue is not None:
+            queue.append(job)
+            return
+        self._queues[chat_id] = deque([job])
+        self.loop.create_task(self._drain(chat_id))
+
+    async def _take_token(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._tokens_ts) * self.rate)
+            self._tokens_ts = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def _drain(self, chat_id):
+        queue = self._queues[chat_id]
+        try:
+            while queue:
+                job = queue[0]
+                if job.attempts == 0 and not job.future.set_running_or_notify_cancel():
+                    queue.popleft()
+                    continue
+                now = time.monotonic()
+                ready_at = max(
+                    self._parked_until.get(chat_id, 0.0),
+                    self._last_call.get((chat_id, job.method), 0.0) + job.spacing,
+                )
+                if ready_at > now:
+                    await asyncio.sleep(ready_at - now)
+                await self._take_token()
+                self._last_call[(chat_id, job.method)] = time.monotonic()
+                try:
+                    result = getattr(self.app, job.method)(*job.args, **job.kwargs)
+                    if inspect.isawaitable(result):
+                        result = await result
+                except Exception as e:
+                    job.attempts += 1
+                    delay = retry_delay_for(e, self.max_flood_wait)
+                    if delay is not None:
+                        self._parked_until[chat_id] = time.monotonic() + delay
+                        if job.attempts < self.max_attempts:
+                            logger.warning(f"[OUTBOUND] {job.method} to {chat_id} failed ({e}), retrying in {delay}s")
+                            continue
+                    elif isinstance(e, FloodWait):
+                        # Too long to wait out here: park the chat and fail this call
+                        self._parked_until[chat_id] = time.monotonic() + int(getattr(e, "value", 0) or 0)
+                    queue.popleft()
+                    job.future.set_exception(e)
+                    continue
+                queue.popleft()
+                job.future.set_result(result)
+        except BaseException as e:
+            while queue:
+                job = queue.popleft()
+                if not job.future.done():
+                    job.future.set_exception(e if isinstance(e, Exception) else RuntimeError("outbound queue stopped"))
+            raise
+        finally:
+            del self._queues[chat_id]
+            now = time.monotonic()
+            if self._parked_until.get(chat_id, 0.0) <= now:
+                self._parked_until.pop(chat_id, None)
+            if len(self._last_call) > 10000:
+                self._last_call = {k: ts for k, ts in self._last_call.items() if now - ts < 60}
+
+
+_queue = None
+
+
+def get_outbound_queue():
+    """
+    Return the pipeline for the current client, or None when calls have to be
+    made directly: no client yet, its loop is not running, or the caller is
+    already on that loop (blocking on a future there would deadlock).
+    """
+    global _queue
+    app = get_app()
+    loop = getattr(app, "loop", None)
+    if loop is None or not loop.is_running():
+        return None
+    try:
+        if asyncio.get_running_loop() is loop:
+            return None
+    except RuntimeError:
+        pass
+    if _queue is None or _queue.app is not app:
+        _queue = OutboundQueue(
+            app,
+            calls_per_second=getattr(LimitsConfig, "OUTBOUND_CALLS_PER_SECOND", 25),
+            max_flood_wait=getattr(LimitsConfig, "OUTBOUND_MAX_FLOOD_WAIT", 30),
+        )
+    return _queue
@@ -41,13 +41,30 @@ from CONFIG.messages import Messages, safe_get_messages
 from CONFIG.domains import DomainsConfig
 import importlib
 import types
+from functools import lru_cache
 from HELPERS.logger import logger
+from HELPERS.domain_classifier import classify_host, get_host, rebuild_domain_classifier, WHITELIST, GREYLIST, PORN
+from HELPERS.keyword_matcher import TextKeywordMatcher, UrlKeywordMatcher
 
 # --- global lists of domains and keywords ---
 PORN_DOMAINS = set()
 SUPPORTED_SITES = set()
 PORN_KEYWORDS = set()
 
+# --- keyword matchers, rebuilt whenever the lists are (re)loaded ---
+PORN_TEXT_MATCHER = TextKeywordMatcher(())
+PORN_URL_MATCHER = UrlKeywordMatcher(())
+WHITE_KEYWORD_MATCHER = TextKeywordMatcher(())
+
+def build_keyword_matchers():
+    global PORN_TEXT_MATCHER, PORN_URL_MATCHER, WHITE_KEYWORD_MATCHER
+    keywords = [kw.lower() for kw in PORN_KEYWORDS if kw.strip()]
+    # Config.WHITE_KEYWORDS is set by reload_all_porn_caches(); DomainsConfig holds the startup value
+    white_keywords = getattr(Config, 'WHITE_KEYWORDS', None) or getattr(DomainsConfig, 'WHITE_KEYWORDS', []) or []
+    PORN_TEXT_MATCHER = TextKeywordMatcher(keywords)
+    PORN_URL_MATCHER = UrlKeywordMatcher(keywords)
+    WHITE_KEYWORD_MATCHER = TextKeywordMatcher(kw.lower() for kw in white_keywords if kw.strip())
+
 # --- loading lists at start ---
 def load_domain_lists():
     global PORN_DOMAINS, SUPPORTED_SITES, PORN_KEYWORDS
@@ -72,28 +89,40 @@ def load_domain_lists():
     except Exception as e:
         logger.error(f"Failed to load {Config.SUPPORTED_SITES_FILE}: {e}")
         SUPPORTED_SITES = set()
+    build_keyword_matchers()
+    rebuild_domain_classifier(PORN_DOMAINS)
 
 load_domain_lists()
 
 # --- an auxiliary function for extracting a domain ---
+def _split_domain(target):
+    ext = tldextract.extract(target)
+    # We collect the domain: Domain.suffix (for example, xvideos.com)
+    if ext.domain and ext.suffix:
+        full_domain = f"{ext.domain}.{ext.suffix}".lower()
+        subdomain = ext.subdomain.lower() if ext.subdomain else ''
+        # We get all the suffixes: xvideos.com, b.xvideos.com, a.b.xvideos.com
+        parts = [full_domain]
+        if subdomain:
+            sub_parts = subdomain.split('.')
+            for i in range(len(sub_parts)):
+                parts.append('.'.join(sub_parts[i:] + [full_domain]))
+        return tuple(parts), ext.domain.lower()
+    elif ext.domain:
+        return (ext.domain.lower(),), ext.domain.lower()
+    return None
+
+# The same hosts come up for every message: parse each one only once
+_split_host = lru_cache(maxsize=4096)(_split_domain)
+
 def extract_domain_parts(url):
     try:
         # Try to unwrap redirectors before extracting the domain
         unwrapped = unwrap_redirect_url(url)
-        ext = tldextract.extract(unwrapped)
-        # We collect the domain: Domain.suffix (for example, xvideos.com)
-        if ext.domain and ext.suffix:
-            full_domain = f"{ext.domain}.{ext.suffix}".lower()
-            subdomain = ext.subdomain.lower() if ext.subdomain else ''
-            # We get all the suffixes: xvideos.com, b.xvideos.com, a.b.xvideos.com
-            parts = [full_domain]
-            if subdomain:
-                sub_parts = subdomain.split('.')
-                for i in range(len(sub_parts)):
-                    parts.append('.'.join(sub_parts[i:] + [full_domain]))
-            return parts, ext.domain.lower()
-        elif ext.domain:
-            return [ext.domain.lower()], ext.domain.lower()
+        host = get_host(unwrapped)
+        result = _split_host(host) if host else _split_domain(unwrapped)
+        if result:
+            return list(result[0]), result[1]
         else:
             return [url.lower()], url.lower()
     except Exception:
@@ -107,20 +136,21 @@ def extract_domain_parts(url):
 # --- White list of domains that are not considered porn ---
 # Now we take from config.py
 
+def _domain_categories(domain_parts):
+    # domain_parts run from the registered domain to the full host; the
+    # classifier lookup of the full host also covers all of its parents
+    return classify_host(max(domain_parts, key=len)) if domain_parts else frozenset()
+
 def is_porn_domain(domain_parts):
+    categories = _domain_categories(domain_parts)
     # If any suffix domain is on a whitelist, it is not porn
-    for dom in domain_parts:
-        if dom in Config.WHITELIST:
-            return False
+    if WHITELIST in categories:
+        return False
     # GREYLIST: exclude from domain list check entirely (keywords still apply via is_porn)
-    for dom in domain_parts:
-        if dom in Config.GREYLIST:
-            return False
+    if GREYLIST in categories:
+        return False
     # If any suffix domain is in the porn domains list, treat as porn
-    for dom in domain_parts:
-        if dom in PORN_DOMAINS:
-            return True
-    return False
+    return PORN in categories
 
 # --- a new function for checking for porn ---
 def is_porn(url, title, description, caption=None, tags=None):
@@ -134,10 +164,9 @@ def is_porn(url, title, description, caption=None, tags=None):
     # 1. Checking the domain (with redirect unwrapping)
     clean_url = unwrap_redirect_url(url).lower()
     domain_parts, _ = extract_domain_parts(clean_url)
-    for dom in Config.WHITELIST:
-        if dom in domain_parts:
-            logger.info(f"is_porn: domain in WHITELIST: {dom}")
-            return False
+    if WHITELIST in _domain_categories(domain_parts):
+        logger.info(f"is_porn: domain in WHITELIST: {domain_parts}")
+        return False
     if is_porn_domain(domain_parts):
         logger.info(f"is_porn: domain match: {domain_parts}")
         return True
@@ -164,53 +193,32 @@ def is_porn(url, title, description, caption=None, tags=None):
     # 4. We collect a single text for search (including URL and tags)
     combined = " ".join([title_lower, description_lower, caption_lower, tags_lower, url_lower])
     logger.debug(f"is_porn combined text: '{combined}'")
-    logger.debug(f"is_porn keywords: {PORN_KEYWORDS}")
 
     # 5. Check for white keywords first (override porn detection)
-    white_keywords = getattr(DomainsConfig, 'WHITE_KEYWORDS', [])
-    if white_keywords:
-        white_kws = [re.escape(kw.lower()) for kw in white_keywords if kw.strip()]
-        if white_kws:
-            white_pattern = re.compile(r"\b(" + "|".join(white_kws) + r")\b", flags=re.IGNORECASE)
-            if white_pattern.search(combined):
-                logger.info(f"is_porn: white keyword match found, content considered clean: {white_pattern.pattern}")
-                return False
-
-    # 6. Preparing regex patterns
-    # For text fields we use word boundaries with escaped keywords
-    text_kws = [re.escape(kw.lower()) for kw in PORN_KEYWORDS if kw.strip()]
-    # For URL checks we need raw lowercase keywords to build custom delimiter-aware patterns
-    url_kws = [kw.lower() for kw in PORN_KEYWORDS if kw.strip()]
-    if not text_kws:
+    white_match = WHITE_KEYWORD_MATCHER.search(combined)
+    if white_match:
+        logger.info(f"is_porn: white keyword match found, content considered clean: {white_match}")
+        return False
+
+    # 6. Keyword matchers are built once in load_domain_lists()
+    if not PORN_TEXT_MATCHER:
         # There is not a single valid key
         return False
 
     # 7. Check for keyword matches in text fields (with word boundaries)
     # Include tags in text fields check (tags already have underscores replaced with spaces)
-    text_pattern = re.compile(r"\b(" + "|".join(text_kws) + r")\b", flags=re.IGNORECASE)
     text_to_check = " ".join([title_lower, description_lower, caption_lower, tags_lower])
-    if text_pattern.search(text_to_check):
-        logger.info(f"is_porn: keyword match in text fields (regex): {text_pattern.pattern}")
+    text_match = PORN_TEXT_MATCHER.search(text_to_check)
+    if text_match:
+        logger.info(f"is_porn: keyword match in text fields: {text_match}")
         return True
 
     # 8. Check for keyword matches in URL with delimiter-aware patterns
     # We only trigger when keyword is delimited on both sides by non-alphanumeric chars (e.g. _, -, symbols) or string edges.
-    def _compile_url_keyword_regex(raw_keyword: str) -> re.Pattern:
-        words = [re.escape(w) for w in raw_keyword.split() if w]
-        if not words:
-            # Fallback: compile something that never matches
-            return re.compile(r"a^")
-        # allow ANY non-alphanumeric delimiters between words inside URL
-        joiner = r"[^A-Za-z0-9]+"
-        core = joiner.join(words)
-        # Require non-alphanumeric (or start/end) around the whole keyword
-        return re.compile(rf"(?<![A-Za-z0-9])(?:{core})(?![A-Za-z0-9])", flags=re.IGNORECASE)
-
-    for raw_kw in url_kws:
-        url_pattern = _compile_url_keyword_regex(raw_kw)
-        if url_pattern.search(url_lower):
-            logger.info(f"is_porn: keyword match in URL with delimiters: {raw_kw}")
-            return True
+    url_match = PORN_URL_MATCHER.search(url_lower)
+    if url_match:
+        logger.info(f"is_porn: keyword match in URL with delimiters: {url_match}")
+        return True
 
     logger.info("is_porn: no keyword matches found")
     return False
@@ -229,10 +237,10 @@ def check_porn_detailed(url, title, description, caption=None):
     domain_parts, _ = extract_domain_parts(clean_url)
     
     # Check whitelist first
-    for dom in Config.WHITELIST:
-        if dom in domain_parts:
-            explanation_parts.append(messages.PORN_DOMAIN_WHITELIST_MSG.format(domain=dom))
-            return False, " | ".join(explanation_parts)
+    if WHITELIST in _domain_categories(domain_parts):
+        dom = next((d for d in domain_parts if WHITELIST in classify_host(d)), domain_parts[0])
+        explanation_parts.append(messages.PORN_DOMAIN_WHITELIST_MSG.format(domain=dom))
+        return False, " | ".join(explanation_parts)
     
     # Check if domain is in porn domains
     if is_porn_domain(domain_parts):
@@ -253,49 +261,28 @@ def check_porn_detailed(url, title, description, caption=None):
     combined = " ".join([title_lower, description_lower, caption_lower])
     
     # 4. Check for white keywords first (override porn detection)
-    white_keywords = getattr(DomainsConfig, 'WHITE_KEYWORDS', [])
-    if white_keywords:
-        white_kws = [re.escape(kw.lower()) for kw in white_keywords if kw.strip()]
-        if white_kws:
-            white_pattern = re.compile(r"\b(" + "|".join(white_kws) + r")\b", flags=re.IGNORECASE)
-            white_matches = white_pattern.findall(combined)
-            if white_matches:
-                explanation_parts.append(messages.PORN_WHITELIST_KEYWORDS_MSG.format(keywords=', '.join(set(white_matches))))
-                return False, " | ".join(explanation_parts)
+    white_matches = WHITE_KEYWORD_MATCHER.findall(combined)
+    if white_matches:
+        explanation_parts.append(messages.PORN_WHITELIST_KEYWORDS_MSG.format(keywords=', '.join(white_matches)))
+        return False, " | ".join(explanation_parts)
 
     # 5. Check for porn keywords in text fields
-    text_kws = [re.escape(kw.lower()) for kw in PORN_KEYWORDS if kw.strip()]
-    if not text_kws:
+    if not PORN_TEXT_MATCHER:
         explanation_parts.append("ℹ️ No porn keywords loaded")
         return False, " | ".join(explanation_parts)
 
     # Check text fields with word boundaries
-    text_pattern = re.compile(r"\b(" + "|".join(text_kws) + r")\b", flags=re.IGNORECASE)
-    text_matches = text_pattern.findall(combined)
+    text_matches = PORN_TEXT_MATCHER.findall(combined)
     
     if text_matches:
-        explanation_parts.append(messages.PORN_KEYWORDS_FOUND_MSG.format(keywords=', '.join(set(text_matches))))
+        explanation_parts.append(messages.PORN_KEYWORDS_FOUND_MSG.format(keywords=', '.join(text_matches)))
         return True, " | ".join(explanation_parts)
 
     # 6. Check for porn keywords in URL with delimiter-aware patterns
-    url_matches = []
-    def _compile_url_keyword_regex(raw_keyword: str) -> re.Pattern:
-        words = [re.escape(w) for w in raw_keyword.split() if w]
-        if not words:
-            return re.compile(r"a^")
-        # allow ANY non-alphanumeric delimiters between words inside URL
-        joiner = r"[^A-Za-z0-9]+"
-        core = joiner.join(words)
-        return re.compile(rf"(?<![A-Za-z0-9])(?:{core})(?![A-Za-z0-9])", flags=re.IGNORECASE)
-
-    for raw_kw in [kw.lower() for kw in PORN_KEYWORDS if kw.strip()]:
-        url_pattern = _compile_url_keyword_regex(raw_kw)
-        matches = url_pattern.findall(url_lower)
-        if matches:
-            url_matches.extend(matches)
+    url_matches = PORN_URL_MATCHER.findall(url_lower)
     
     if url_matches:
-        explanation_parts.append(f"🔗 NSFW keywords found in URL: {', '.join(set(url_matches))}")
+        explanation_parts.append(f"🔗 NSFW keywords found in URL: {', '.join(url_matches)}")
         return True, " | ".join(explanation_parts)
 
     explanation_parts.append(messages.PORN_NO_KEYWORDS_FOUND_MSG)
@@ -0,0 +1,241 @@
+# Progress dispatcher: one scheduler thread for all progress-message edits
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from CONFIG.limits import LimitsConfig
+from HELPERS.logger import logger
+
+# A ticker is stopped after this many edits in a row fail (message deleted, flood wait...)
+_TICKER_MAX_FAILURES = 3
+
+
+class _Ticker(object):
+    __slots__ = ("key", "frame", "interval", "stop_event", "on_finish", "next_ts", "failures", "done")
+
+    def __init__(self, key, frame, interval, stop_event, on_finish=None):
+        self.key = key
+        self.frame = frame
+        self.interval = interval
+        self.stop_event = stop_event
+        self.on_finish = on_finish
+        self.next_ts = 0.0
+        self.failures = 0
+        self.done = threading.Event()
+
+
+class TickerHandle(object):
+    """Handle for a periodic progress animation (join()/is_alive() like the threads it replaces)."""
+
+    def __init__(self, ticker):
+        self._ticker = ticker
+
+    def is_alive(self):
+        return not self._ticker.done.is_set()
+
+    def join(self, timeout=None):
+        self._ticker.done.wait(timeout)
+
+
+class ProgressDispatcher(object):
+    """
+    Coalesces progress-message edits of all running jobs.
+
+    update() only records the latest text for a message; a single scheduler
+    thread sends it once the message's minimum interval has passed (5s per
+    chat in groups) and the global edits-per-second budget allows. Frames
+    superseded before they are sent are dropped, never queued. Periodic
+    animations are registered with add_ticker() and run on the same thread.
+    """
+
+    def __init__(self, edits_per_second=20, min_interval=3.0, group_interval=5.0, send_workers=4):
+        self.edits_per_second = float(edits_per_second)
+        self.min_interval = float(min_interval)
+        self.group_interval = float(group_interval)
+        self._cond = threading.Condition()
+        # (chat_id, message_id) -> (text, kwargs, ticker, final)
+        self._pending = {}
+        self._last_sent = {}
+        self._last_chat_sent = {}
+        self._in_flight = {}
+        self._tickers = []
+        self._tokens = self.edits_per_second
+        self._tokens_ts = time.monotonic()
+        self._pool = ThreadPoolExecutor(max_workers=send_workers, thread_name_prefix="progress-edit")
+        self._thread = threading.Thread(target=self._run, name="progress-dispatcher", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Public interface
+    # ------------------------------------------------------------------
+
+    def update(self, chat_id, message_id, text, final=False, **kwargs):
+        """Set the latest progress text of a message (replaces any unsent frame)."""
+        if not message_id:
+            return
+        with self._cond:
+            self._pending[(chat_id, message_id)] = (text, kwargs, None, final)
+            self._cond.notify()
+
+    def discard(self, chat_id, message_id, timeout=10.0):
+        """
+        Drop the unsent frame of a message and wait until an edit in flight is
+        queued, so a direct edit made right after this is queued behind it and
+        not overwritten by a stale frame.
+        """
+        key = (chat_id, message_id)
+        with self._cond:
+            if not self._pending and key not in self._in_flight:
+                return
+            self._pending.pop(key, None)
+            in_flight = self._in_flight.get(key)
+        if in_flight is not None and not threading.current_thread().name.startswith("progress-edit"):
+            in_flight.wait(timeout)
+
+    def add_ticker(self, chat_id, message_id, frame, interval, stop_event, on_finish=None):
+        """
+        Run an animation on the dispatcher thread.
+
+        frame() returns the next text (or None to stop); interval() returns
+        the seconds until the next frame. The ticker stops when stop_event is
+        set or after repeated failed edits; on_finish() is then called once.
+        """
+        ticker = _Ticker((chat_id, message_id), frame, interval, stop_event, on_finish)
+        with self._cond:
+            self._tickers.append(ticker)
+            self._cond.notify()
+        return TickerHandle(ticker)
+
+    # ------------------------------------------------------------------
+    # Scheduler thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        while True:
+            try:
+                self._run_tickers()
+                self._dispatch()
+            except Exception as e:
+                logger.error(f"[PROGRESS] dispatcher error: {e}")
+            with self._cond:
+                self._cond.wait(timeout=0.5)
+
+    def _run_tickers(self):
+        now = time.monotonic()
+        with self._cond:
+            due = [t for t in self._tickers if t.stop_event.is_set() or t.next_ts <= now]
+        for ticker in due:
+            text = None
+            if not ticker.stop_event.is_set():
+                try:
+                    text = ticker.frame()
+                except Exception as e:
+                    logger.warning(f"[PROGRESS] animation frame error: {e}")
+            if text is None:
+                self._finish_ticker(ticker)
+                continue
+            ticker.next_ts = now + max(0.5, float(ticker.interval()))
+            with self._cond:
+                # A frame from update() for the same message takes precedence
+                if ticker.key not in self._pending:
+                    self._pending[ticker.key] = (text, {}, ticker, False)
+
+    def _finish_ticker(self, ticker):
+        with self._cond:
+            if ticker.done.is_set():
+                return
+            if ticker in self._tickers:
+                self._tickers.remove(ticker)
+            pending = self._pending.get(ticker.key)
+            if pending is not None and pending[2] is ticker:
+                del self._pending[ticker.key]
+            ticker.done.set()
+        if ticker.on_finish is not None:
+            try:
+                ticker.on_finish()
+            except Exception as e:
+                logger.warning(f"[PROGRESS] animation cleanup error: {e}")
+
+    def _dispatch(self):
+        now = time.monotonic()
+        with self._cond:
+            self._tokens = min(self.edits_per_second, self._tokens + (now - self._tokens_ts) * self.edits_per_second)
+            self._tokens_ts = now
+            # Least recently updated messages first, so busy jobs cannot starve others
+            for key in sorted(self._pending, key=lambda k: self._last_sent.get(k, 0.0)):
+                if self._tokens < 1:
+                    break
+                if key in self._in_flight:
+                    continue
+                text, kwargs, ticker, final = self._pending[key]
+                chat_id = key[0]
+                if not final and now - self._last_sent.get(key, 0.0) < self.min_interval:
+                    continue
+                if isinstance(chat_id, int) and chat_id < 0 and now - self._last_chat_sent.get(chat_id, 0.0) < self.group_interval:
+                    continue
+                del self._pending[key]
+                self._tokens -= 1
+                self._last_sent[key] = now
+                self._last_chat_sent[chat_id] = now
+                self._in_flight[key] = threading.Event()
+                self._pool.submit(self._send, key, text, kwargs, ticker)
+            if len(self._last_sent) > 5000:
+                cutoff = now - 600
+                self._last_sent = {k: ts for k, ts in self._last_sent.items() if ts >= cutoff}
+                self._last_chat_sent = {k: ts for k, ts in self._last_chat_sent.items() if ts >= cutoff}
+
+    def _send(self, key, text, kwargs, ticker):
+        from HELPERS.safe_messeger import safe_edit_message_text
+        future = None
+        try:
+            # Not waiting for the result: the chat's outbound queue may hold the edit for seconds
+            future = safe_edit_message_text(key[0], key[1], text, _coalesced=True, _wait=False, **kwargs)
+        except Exception as e:
+            logger.error(f"Error updating progress: {e}")
+        with self._cond:
+            # Edits to the chat made from now on are queued behind this one (see discard())
+            self._in_flight[key].set()
+        if future is None:
+            self._sent(key, ticker, None)
+        else:
+            # The result arrives on the client's thread: account for it on a send worker
+            future.add_done_callback(lambda done: self._pool.submit(self._sent, key, ticker, done))
+
+    def _sent(self, key, ticker, future):
+        result = None
+        if future is not None:
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Error updating progress: {e}")
+        with self._cond:
+            # The message gets no new frame while this one is still queued
+            self._in_flight.pop(key, None)
+            self._cond.notify()
+        if ticker is not None:
+            ticker.failures = 0 if result is not None else ticker.failures + 1
+            if ticker.failures >= _TICKER_MAX_FAILURES:
+                logger.debug(f"[PROGRESS] stopping animation for message {key[1]} after failed edits")
+                self._finish_ticker(ticker)
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_progress_dispatcher():
+    """Return the process-wide dispatcher (created from LimitsConfig on first use)."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = ProgressDispatcher(
+                edits_per_second=getattr(LimitsConfig, "PROGRESS_EDITS_PER_SECOND", 20),
+                min_interval=getattr(LimitsConfig, "PROGRESS_MIN_EDIT_INTERVAL", 3.0),
+            )
+        return _dispatcher
+
+
+def discard_pending_progress(chat_id, message_id):
+    """Drop an unsent progress frame before a direct edit (no-op if no dispatcher is running)."""
+    if _dispatcher is not None:
+        _dispatcher.discard(chat_id, message_id)
@@ -267,21 +267,10 @@ def try_with_proxy_fallback(ytdl_opts: dict, url: str, user_id: int = None, oper
 
 def is_proxy_domain(url: str) -> bool:
     """Check if the domain is in PROXY_DOMAINS or PROXY_2_DOMAINS"""
-    from CONFIG.domains import DomainsConfig
+    from HELPERS.domain_classifier import classify_url, PROXY, PROXY_2
     
-    domain = extract_domain_from_url(url)
-    
-    # Check PROXY_DOMAINS
-    if hasattr(DomainsConfig, 'PROXY_DOMAINS') and DomainsConfig.PROXY_DOMAINS:
-        if is_domain_in_list(domain, DomainsConfig.PROXY_DOMAINS):
-            return True
-    
-    # Check PROXY_2_DOMAINS
-    if hasattr(DomainsConfig, 'PROXY_2_DOMAINS') and DomainsConfig.PROXY_2_DOMAINS:
-        if is_domain_in_list(domain, DomainsConfig.PROXY_2_DOMAINS):
-            return True
-    
-    return False
+    categories = classify_url(url)
+    return PROXY in categories or PROXY_2 in categories
 
 def get_proxy_config():
     """Get proxy configuration from config"""
@@ -368,25 +357,22 @@ def is_domain_in_list(domain, domain_list):
 
 def select_proxy_for_domain(url):
     """Select appropriate proxy for domain based on PROXY_DOMAINS and PROXY_2_DOMAINS"""
-    from CONFIG.domains import DomainsConfig
+    from HELPERS.domain_classifier import classify_url, PROXY, PROXY_2
     
     domain = extract_domain_from_url(url)
+    categories = classify_url(url)
     
     logger.info(f"select_proxy_for_domain: URL={url}, extracted_domain={domain}")
-    logger.info(f"PROXY_2_DOMAINS: {getattr(DomainsConfig, 'PROXY_2_DOMAINS', 'NOT_FOUND')}")
-    logger.info(f"PROXY_DOMAINS: {getattr(DomainsConfig, 'PROXY_DOMAINS', 'NOT_FOUND')}")
     
     # Check PROXY_2_DOMAINS first
-    if hasattr(DomainsConfig, 'PROXY_2_DOMAINS') and DomainsConfig.PROXY_2_DOMAINS:
-        if is_domain_in_list(domain, DomainsConfig.PROXY_2_DOMAINS):
-            logger.info(f"Domain {domain} found in PROXY_2_DOMAINS, using proxy 2")
-            return get_proxy_2_config()
+    if PROXY_2 in categories:
+        logger.info(f"Domain {domain} found in PROXY_2_DOMAINS, using proxy 2")
+        return get_proxy_2_config()
     
     # Check PROXY_DOMAINS
-    if hasattr(DomainsConfig, 'PROXY_DOMAINS') and DomainsConfig.PROXY_DOMAINS:
-        if is_domain_in_list(domain, DomainsConfig.PROXY_DOMAINS):
-            logger.info(f"Domain {domain} found in PROXY_DOMAINS, using proxy 1")
-            return get_proxy_config()
+    if PROXY in categories:
+        logger.info(f"Domain {domain} found in PROXY_DOMAINS, using proxy 1")
+        return get_proxy_config()
     
     logger.info(f"Domain {domain} not found in any proxy domain lists")
     return None
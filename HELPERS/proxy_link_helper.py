@@ -125,20 +125,17 @@ def get_proxy_2_config():
 def select_proxy_for_domain(url):
     """Select appropriate proxy for domain based on PROXY_DOMAINS and PROXY_2_DOMAINS"""
     try:
-        from CONFIG.domains import DomainsConfig
-        from HELPERS.proxy_helper import extract_domain_from_url, is_domain_in_list
+        from HELPERS.domain_classifier import classify_url, PROXY, PROXY_2
         
-        domain = extract_domain_from_url(url)
+        categories = classify_url(url)
         
         # Check PROXY_2_DOMAINS first
-        if hasattr(DomainsConfig, 'PROXY_2_DOMAINS') and DomainsConfig.PROXY_2_DOMAINS:
-            if is_domain_in_list(domain, DomainsConfig.PROXY_2_DOMAINS):
-                return get_proxy_2_config()
+        if PROXY_2 in categories:
+            return get_proxy_2_config()
         
         # Check PROXY_DOMAINS
-        if hasattr(DomainsConfig, 'PROXY_DOMAINS') and DomainsConfig.PROXY_DOMAINS:
-            if is_domain_in_list(domain, DomainsConfig.PROXY_DOMAINS):
-                return get_proxy_config()
+        if PROXY in categories:
+            return get_proxy_config()
         
         return None
     except Exception as e:
@@ -10,122 +10,117 @@ from typing import Optional, Tuple
 from CONFIG.config import Config
 from CONFIG.limits import LimitsConfig
 from HELPERS.logger import logger
+from HELPERS.limiter_state import SlidingWindowCounter, get_state_flusher, write_json_atomic
 
-# In-memory storage: {user_id: {'minute': [...], 'hour': [...], 'day': [...]}}
+# Sliding windows (seconds) per period
+_PERIODS = (('minute', 60), ('hour', 3600), ('day', 86400))
+
+# In-memory storage: {user_id: {'minute': SlidingWindowCounter, 'hour': ..., 'day': ...}}
 _rate_limits: dict = {}
-_rate_limits_lock = threading.Lock()
 
 # Cooldown storage: {user_id: {'period': 'minute'|'hour'|'day', 'until': timestamp}}
 _cooldowns: dict = {}
-_cooldowns_lock = threading.Lock()
+
+# One lock for both dicts (checks touch both)
+_state_lock = threading.Lock()
 
 # File for persistence
 _RATE_LIMITS_FILE = "CONFIG/.rate_limits.json"
 _COOLDOWNS_FILE = "CONFIG/.cooldowns.json"
 
 
+def _new_user_counters():
+    return {period: SlidingWindowCounter(window) for period, window in _PERIODS}
+
+
 def _load_from_disk():
     """Load rate limits and cooldowns from disk"""
     global _rate_limits, _cooldowns
-    
+
     # Load rate limits
+    rate_limits = {}
     if os.path.exists(_RATE_LIMITS_FILE):
         try:
             with open(_RATE_LIMITS_FILE, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                with _rate_limits_lock:
-                    _rate_limits = {int(k): v for k, v in data.items()}
+            for k, v in data.items():
+                rate_limits[int(k)] = {
+                    period: SlidingWindowCounter.from_state(window, v.get(period, []))
+                    for period, window in _PERIODS
+                }
         except Exception as e:
             logger.error(f"Failed to load rate limits: {e}")
-            _rate_limits = {}
-    else:
-        _rate_limits = {}
-    
+            rate_limits = {}
+
     # Load cooldowns
+    cooldowns = {}
     if os.path.exists(_COOLDOWNS_FILE):
         try:
             with open(_COOLDOWNS_FILE, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                with _cooldowns_lock:
-                    _cooldowns = {int(k): v for k, v in data.items()}
+                cooldowns = {int(k): v for k, v in data.items()}
         except Exception as e:
             logger.error(f"Failed to load cooldowns: {e}")
-            _cooldowns = {}
+            cooldowns = {}
+
+    with _state_lock:
+        _rate_limits = rate_limits
+        _cooldowns = cooldowns
 
 
 def _save_to_disk():
-    """Save rate limits and cooldowns to disk"""
-    try:
-        os.makedirs(os.path.dirname(_RATE_LIMITS_FILE), exist_ok=True)
-        
-        # Save rate limits
-        with _rate_limits_lock:
-            data = {str(k): v for k, v in _rate_limits.items()}
-        with open(_RATE_LIMITS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-        
-        # Save cooldowns
-        with _cooldowns_lock:
-            data = {str(k): v for k, v in _cooldowns.items()}
-        with open(_COOLDOWNS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
-    except Exception as e:
-        logger.error(f"Failed to save rate limits/cooldowns: {e}")
-
-
-def _cleanup_old_entries(user_id: int, current_time: float):
-    """Remove old entries outside the time windows"""
-    with _rate_limits_lock:
-        if user_id not in _rate_limits:
-            _rate_limits[user_id] = {'minute': [], 'hour': [], 'day': []}
-        
-        user_data = _rate_limits[user_id]
-        
-        # Clean minute entries (older than 60 seconds)
-        user_data['minute'] = [ts for ts in user_data['minute'] if current_time - ts < 60]
-        
-        # Clean hour entries (older than 3600 seconds)
-        user_data['hour'] = [ts for ts in user_data['hour'] if current_time - ts < 3600]
-        
-        # Clean day entries (older than 86400 seconds)
-        user_data['day'] = [ts for ts in user_data['day'] if current_time - ts < 86400]
+    """Save rate limits and cooldowns to disk (run by the background flusher)"""
+    current_time = time.time()
+    with _state_lock:
+        # Users without requests in the last day are dropped
+        idle = [uid for uid, counters in _rate_limits.items() if not counters['day'].count(current_time)]
+        for uid in idle:
+            del _rate_limits[uid]
+        limits_data = {
+            str(k): {period: counter.to_state(current_time) for period, counter in v.items()}
+            for k, v in _rate_limits.items()
+        }
+        cooldowns_data = {str(k): dict(v) for k, v in _cooldowns.items()}
+    write_json_atomic(_RATE_LIMITS_FILE, limits_data)
+    write_json_atomic(_COOLDOWNS_FILE, cooldowns_data)
+
+
+def _mark_dirty():
+    get_state_flusher().mark_dirty('rate_limits')
 
 
 def _check_cooldown(user_id: int, current_time: float) -> Optional[Tuple[str, float]]:
-    """Check if user is in cooldown. Returns (period, seconds_remaining) or None"""
-    with _cooldowns_lock:
-        if user_id not in _cooldowns:
-            return None
-        
-        cooldown = _cooldowns[user_id]
-        until = cooldown.get('until', 0)
-        
-        if current_time < until:
-            period = cooldown.get('period', 'unknown')
-            remaining = until - current_time
-            return (period, remaining)
-        
-        # Cooldown expired, remove it
-        del _cooldowns[user_id]
-        _save_to_disk()
+    """Check if user is in cooldown. Returns (period, seconds_remaining) or None. Caller holds _state_lock."""
+    if user_id not in _cooldowns:
         return None
 
+    cooldown = _cooldowns[user_id]
+    until = cooldown.get('until', 0)
+
+    if current_time < until:
+        period = cooldown.get('period', 'unknown')
+        remaining = until - current_time
+        return (period, remaining)
+
+    # Cooldown expired, remove it
+    del _cooldowns[user_id]
+    _mark_dirty()
+    return None
+
 
 def _set_cooldown(user_id: int, period: str, current_time: float):
-    """Set cooldown for user until end of the period"""
+    """Set cooldown for user until end of the period. Caller holds _state_lock."""
     period_durations = {
         'minute': LimitsConfig.RATE_LIMIT_COOLDOWN_MINUTE,
         'hour': LimitsConfig.RATE_LIMIT_COOLDOWN_HOUR,
         'day': LimitsConfig.RATE_LIMIT_COOLDOWN_DAY
     }
-    
+
     duration = period_durations.get(period, LimitsConfig.RATE_LIMIT_COOLDOWN_MINUTE)
     until = current_time + duration
-    
-    with _cooldowns_lock:
-        _cooldowns[user_id] = {'period': period, 'until': until}
-    
-    _save_to_disk()
+
+    _cooldowns[user_id] = {'period': period, 'until': until}
+    _mark_dirty()
 
 
 def check_rate_limit(user_id: int, is_admin: bool = False) -> Tuple[bool, Optional[str]]:
@@ -137,63 +132,60 @@ def check_rate_limit(user_id: int, is_admin: bool = False) -> Tuple[bool, Option
     # Admins bypass rate limits
     if is_admin:
         return (True, None)
-    
+
     current_time = time.time()
-    
-    # Check cooldown first
-    cooldown_info = _check_cooldown(user_id, current_time)
-    if cooldown_info:
-        period, remaining = cooldown_info
-        hours = int(remaining // 3600)
-        minutes = int((remaining % 3600) // 60)
-        seconds = int(remaining % 60)
-        
-        if period == 'day':
-            msg = f"Rate limit exceeded. Cooldown: {hours}h {minutes}m {seconds}s remaining"
-        elif period == 'hour':
-            msg = f"Rate limit exceeded. Cooldown: {minutes}m {seconds}s remaining"
-        else:
-            msg = f"Rate limit exceeded. Cooldown: {seconds}s remaining"
-        
-        return (False, msg)
-    
-    # Cleanup old entries
-    _cleanup_old_entries(user_id, current_time)
-    
-    # Check limits
-    with _rate_limits_lock:
-        user_data = _rate_limits[user_id]
-        
+
+    with _state_lock:
+        # Check cooldown first
+        cooldown_info = _check_cooldown(user_id, current_time)
+        if cooldown_info:
+            period, remaining = cooldown_info
+            hours = int(remaining // 3600)
+            minutes = int((remaining % 3600) // 60)
+            seconds = int(remaining % 60)
+
+            if period == 'day':
+                msg = f"Rate limit exceeded. Cooldown: {hours}h {minutes}m {seconds}s remaining"
+            elif period == 'hour':
+                msg = f"Rate limit exceeded. Cooldown: {minutes}m {seconds}s remaining"
+            else:
+                msg = f"Rate limit exceeded. Cooldown: {seconds}s remaining"
+
+            return (False, msg)
+
+        user_data = _rate_limits.get(user_id)
+        if user_data is None:
+            user_data = _rate_limits[user_id] = _new_user_counters()
+
         # Check minute limit
-        if len(user_data['minute']) >= LimitsConfig.RATE_LIMIT_PER_MINUTE:
+        if user_data['minute'].count(current_time) >= LimitsConfig.RATE_LIMIT_PER_MINUTE:
             _set_cooldown(user_id, 'minute', current_time)
             remaining = LimitsConfig.RATE_LIMIT_COOLDOWN_MINUTE
             minutes = int(remaining // 60)
             return (False, f"Rate limit exceeded (max {LimitsConfig.RATE_LIMIT_PER_MINUTE} URLs/minute). Cooldown: {minutes}m remaining")
-        
+
         # Check hour limit
-        if len(user_data['hour']) >= LimitsConfig.RATE_LIMIT_PER_HOUR:
+        if user_data['hour'].count(current_time) >= LimitsConfig.RATE_LIMIT_PER_HOUR:
             _set_cooldown(user_id, 'hour', current_time)
             remaining = LimitsConfig.RATE_LIMIT_COOLDOWN_HOUR
             hours = int(remaining // 3600)
             return (False, f"Rate limit exceeded (max {LimitsConfig.RATE_LIMIT_PER_HOUR} URLs/hour). Cooldown: {hours}h remaining")
-        
+
         # Check day limit
-        if len(user_data['day']) >= LimitsConfig.RATE_LIMIT_PER_DAY:
+        if user_data['day'].count(current_time) >= LimitsConfig.RATE_LIMIT_PER_DAY:
             _set_cooldown(user_id, 'day', current_time)
             remaining = LimitsConfig.RATE_LIMIT_COOLDOWN_DAY
             hours = int(remaining // 3600)
             return (False, f"Rate limit exceeded (max {LimitsConfig.RATE_LIMIT_PER_DAY} URLs/day). Cooldown: {hours}h remaining")
-        
+
         # All checks passed, record the request
-        user_data['minute'].append(current_time)
-        user_data['hour'].append(current_time)
-        user_data['day'].append(current_time)
-    
-    _save_to_disk()
+        for counter in user_data.values():
+            counter.add(current_time)
+
+    _mark_dirty()
     return (True, None)
 
 
 # Load on module import
 _load_from_disk()
-
+get_state_flusher().register('rate_limits', _save_to_disk)
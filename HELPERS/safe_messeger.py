@@ -1,11 +1,10 @@
 # #############################################################################################################################
-import re
-import time
 import logging
-import threading
-import asyncio
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
 from types import SimpleNamespace
 from HELPERS.app_instance import get_app
+from HELPERS.outbound_queue import get_outbound_queue
+from CONFIG.limits import LimitsConfig
 from CONFIG.messages import Messages, safe_get_messages
 from pyrogram.errors import FloodWait
 import os
@@ -15,16 +14,12 @@ from pyrogram import enums
 # Configure local logger
 logger = logging.getLogger(__name__)
 
-# Global message sending throttle to prevent msg_seqno issues
-_last_message_sent = {}
-_message_send_lock = threading.Lock()
-
 # Get app instance dynamically to avoid None issues
 def get_app_safe():
     messages = safe_get_messages(None)
     app = get_app()
     if app is None:
-        raise RuntimeError(safe_get_messages(user_id).HELPER_APP_INSTANCE_NOT_AVAILABLE_MSG)
+        raise RuntimeError(messages.HELPER_APP_INSTANCE_NOT_AVAILABLE_MSG)
     return app
 
 def fake_message(text, user_id, command=None, original_chat_id=None, message_thread_id=None, original_message=None):
@@ -91,20 +86,80 @@ def fake_message_with_context(text, user_id, context_message=None, command=None)
     else:
         return fake_message(text, user_id, command=command)
 
+def _record_flood_wait(chat_id, seconds):
+    # Write FloodWait seconds to per-user file (read by the flood-wait notices)
+    try:
+        user_dir = os.path.join("users", str(chat_id))
+        os.makedirs(user_dir, exist_ok=True)
+        with open(os.path.join(user_dir, "flood_wait.txt"), 'w') as f:
+            f.write(str(seconds))
+    except Exception:
+        pass
+
+def _call_outbound(chat_id, method, args, kwargs, on_error, spacing=0.0, wait=True):
+    """
+    Run app.<method>(*args, **kwargs) through the outbound queue of chat_id.
+
+    With wait=True the result is returned (errors go through on_error, whose
+    return value is returned instead). With wait=False a
+    concurrent.futures.Future resolving to the same value is returned.
+    Calls made on the client's event loop, or before it runs, go to the
+    client directly.
+    """
+    queue = get_outbound_queue()
+    if queue is None:
+        try:
+            result = getattr(get_app_safe(), method)(*args, **kwargs)
+        except Exception as e:
+            result = on_error(e)
+        if wait:
+            return result
+        future = Future()
+        future.set_result(result)
+        return future
+
+    inner = queue.submit(chat_id, method, *args, _spacing=spacing, **kwargs)
+    if not wait:
+        outer = Future()
+
+        def _relay(done):
+            try:
+                outer.set_result(done.result())
+            except BaseException as e:
+                try:
+                    outer.set_result(on_error(e))
+                except BaseException as handler_error:
+                    outer.set_exception(handler_error)
+
+        inner.add_done_callback(_relay)
+        return outer
+    try:
+        return inner.result(timeout=getattr(LimitsConfig, "OUTBOUND_RESULT_TIMEOUT", 120))
+    except FuturesTimeoutError:
+        # The caller gets None and may retry or fall back: the queued call must not run later
+        if inner.cancel():
+            logger.warning(f"Timed out waiting for {method} to {chat_id} in the outbound queue; call cancelled")
+        else:
+            logger.warning(f"Timed out waiting for {method} to {chat_id} in the outbound queue; call already running")
+        return None
+    except Exception as e:
+        return on_error(e)
+
 # Helper function for safe message sending with flood wait handling
 def safe_send_message(chat_id, text, **kwargs):
+    """
+    Send a message through the chat's outbound queue.
+
+    Returns the sent message, or None if sending failed. Pass _wait=False to
+    get a concurrent.futures.Future of that value instead of blocking.
+    """
     messages = safe_get_messages(None)
     # Normalize reply parameters and preserve topic/thread info
     original_message = kwargs.get('message')
     # Peek callback_query (will be popped later) to inherit thread context in topics
     cb_peek = kwargs.get('_callback_query', None)
-    
-    # DEBUG: Log all parameters
-    logger.info(f"[SAFE_SEND_DEBUG] chat_id={chat_id}, text_length={len(text) if text else 0}")
-    logger.info(f"[SAFE_SEND_DEBUG] original_message={original_message}")
-    logger.info(f"[SAFE_SEND_DEBUG] original_message.message_thread_id={getattr(original_message, 'message_thread_id', None) if original_message else None}")
-    logger.info(f"[SAFE_SEND_DEBUG] cb_peek={cb_peek}")
-    logger.info(f"[SAFE_SEND_DEBUG] kwargs keys: {list(kwargs.keys())}")
+
+    logger.debug(f"[SAFE_SEND] chat_id={chat_id}, text_length={len(text) if text else 0}, kwargs keys: {list(kwargs.keys())}")
     if 'reply_parameters' not in kwargs:
         if 'reply_to_message_id' in kwargs and kwargs['reply_to_message_id'] is not None:
             kwargs['reply_parameters'] = ReplyParameters(message_id=kwargs['reply_to_message_id'])
@@ -113,10 +168,10 @@ def safe_send_message(chat_id, text, **kwargs):
             # Check if this is a fake message with original message reference
             if hasattr(original_message, '_is_fake_message') and hasattr(original_message, '_original_message'):
                 if original_message._original_message is not None and getattr(original_message._original_message, 'id', None) is not None:
-                    logger.info(f"[SAFE_SEND] Using original message for reply: {original_message._original_message.id}")
+                    logger.debug(f"[SAFE_SEND] Using original message for reply: {original_message._original_message.id}")
                     kwargs['reply_parameters'] = ReplyParameters(message_id=original_message._original_message.id)
                 else:
-                    logger.info(f"[SAFE_SEND] Fake message but no original message available, using fake message id: {original_message.id}")
+                    logger.debug(f"[SAFE_SEND] Fake message but no original message available, using fake message id: {original_message.id}")
                     kwargs['reply_parameters'] = ReplyParameters(message_id=original_message.id)
             else:
                 kwargs['reply_parameters'] = ReplyParameters(message_id=original_message.id)
@@ -131,109 +186,50 @@ def safe_send_message(chat_id, text, **kwargs):
                 # For fake messages, use the original message's thread_id
                 if hasattr(original_message, '_is_fake_message') and hasattr(original_message, '_original_message') and original_message._original_message is not None:
                     message_thread_id = getattr(original_message._original_message, 'message_thread_id', None)
-                    logger.info(f"[SAFE_SEND] fake_message._original_message.message_thread_id={message_thread_id}, chat_id={chat_id}")
                 else:
                     message_thread_id = getattr(original_message, 'message_thread_id', None)
-                    logger.info(f"[SAFE_SEND] original_message.message_thread_id={message_thread_id}, chat_id={chat_id}")
-                
+
                 if message_thread_id:
                     kwargs.setdefault('message_thread_id', message_thread_id)
-                    logger.info(f"[SAFE_SEND] Set message_thread_id={message_thread_id} for chat_id={chat_id}")
+                    logger.debug(f"[SAFE_SEND] Set message_thread_id={message_thread_id} for chat_id={chat_id}")
             # Inherit thread_id from callback context when message is not provided
             elif cb_peek is not None and getattr(getattr(cb_peek, 'message', None), 'message_thread_id', None):
                 kwargs.setdefault('message_thread_id', cb_peek.message.message_thread_id)
-        else:
-            logger.info(f"[SAFE_SEND] Skipping topic routing for private chat_id={chat_id}")
     except Exception as e:
         logger.warning(f"[SAFE_SEND] Error in topic routing: {e}")
         pass
     # Remove helper-only key
     if 'message' in kwargs:
         del kwargs['message']
-    
-    # DEBUG: Log final parameters before sending
-    logger.info(f"[SAFE_SEND_FINAL] chat_id={chat_id}, message_thread_id={kwargs.get('message_thread_id', 'NOT_SET')}")
-    logger.info(f"[SAFE_SEND_FINAL] Final kwargs: {kwargs}")
-    
-    max_retries = 3
-    retry_delay = 5
+
     # Extract internal helper kwargs (not supported by pyrogram)
     cb = kwargs.pop('_callback_query', None)
     notice = kwargs.pop('_fallback_notice', None)
+    wait = kwargs.pop('_wait', True)
     # Drop any other underscored keys just in case
     for k in list(kwargs.keys()):
         if isinstance(k, str) and k.startswith('_'):
             kwargs.pop(k, None)
 
-    # Throttle message sending to prevent msg_seqno issues
-    with _message_send_lock:
-        last_sent = _last_message_sent.get(chat_id, 0)
-        now = time.time()
-        # Increase minimum spacing to reduce RANDOM_ID_DUPLICATE in high-throughput chats
-        min_spacing = 0.25  # seconds
-        if now - last_sent < min_spacing:
-            time.sleep(min_spacing - (now - last_sent))
-        _last_message_sent[chat_id] = time.time()
-
-    for attempt in range(max_retries):
-        try:
-            app = get_app_safe()
-            return app.send_message(chat_id, text, **kwargs)
-        except FloodWait as e:
-            # Write FloodWait seconds to per-user file and do not spin retries for huge waits
-            try:
-                user_dir = os.path.join("users", str(chat_id))
-                os.makedirs(user_dir, exist_ok=True)
-                with open(os.path.join(user_dir, "flood_wait.txt"), 'w') as f:
-                    f.write(str(e.value))
-            except Exception:
-                pass
+    def on_error(e):
+        if isinstance(e, FloodWait):
+            _record_flood_wait(chat_id, e.value)
             logger.warning(f"Flood wait detected ({e.value}s) while sending message to {chat_id}")
             # Try to fall back to answering the callback (if provided) to give user feedback
-            try:
-                if cb is not None:
-                    try:
-                        cb.answer(notice or safe_get_messages(user_id).HELPER_FLOOD_LIMIT_TRY_LATER_MSG, show_alert=False)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-            return None
-        except Exception as e:
-            if "FLOOD_WAIT" in str(e):
-                # Extract wait time
-                wait_match = re.search(r'A wait of (\d+) seconds is required', str(e))
-                if wait_match:
-                    wait_seconds = int(wait_match.group(1))
-                    logger.warning(safe_get_messages(user_id).HELPER_FLOOD_WAIT_DETECTED_SLEEPING_MSG.format(wait_seconds=wait_seconds))
-                    time.sleep(min(wait_seconds + 1, 5))  # short backoff
-                else:
-                    logger.warning(safe_get_messages(user_id).HELPER_FLOOD_WAIT_DETECTED_COULDNT_EXTRACT_MSG.format(retry_delay=retry_delay))
-                    time.sleep(retry_delay)
-                if attempt and attempt < max_retries - 1:
-                    continue
-            
-            # Handle msg_seqno errors
-            elif "msg_seqno is too high" in str(e):
-                logger.warning(safe_get_messages(user_id).HELPER_MSG_SEQNO_ERROR_DETECTED_MSG.format(retry_delay=retry_delay))
-                time.sleep(retry_delay)
-                if attempt and attempt < max_retries - 1:
-                    continue
-            # Handle RANDOM_ID_DUPLICATE errors by brief backoff and retry
-            elif "RANDOM_ID_DUPLICATE" in str(e):
+            if cb is not None:
                 try:
-                    logger.warning("RANDOM_ID_DUPLICATE detected, backing off briefly and retrying")
+                    cb.answer(notice or messages.HELPER_FLOOD_LIMIT_TRY_LATER_MSG, show_alert=False)
                 except Exception:
                     pass
-                time.sleep(0.5)
-                if attempt and attempt < max_retries - 1:
-                    continue
-            logger.error(f"Failed to send message after {max_retries} attempts: {e}")
             return None
+        logger.error(f"Failed to send message to {chat_id}: {e}")
+        return None
+
+    # Spacing between sends to one chat reduces msg_seqno / RANDOM_ID_DUPLICATE errors
+    return _call_outbound(chat_id, "send_message", (chat_id, text), kwargs, on_error, spacing=0.25, wait=wait)
 
 # Helper function for safe message forwarding with flood wait handling
 def safe_forward_messages(chat_id, from_chat_id, message_ids, **kwargs):
-    messages = safe_get_messages(None)
     """
     Safely forward messages with flood wait handling
 
@@ -242,38 +238,23 @@ def safe_forward_messages(chat_id, from_chat_id, message_ids, **kwargs):
         from_chat_id: The chat ID to forward from
         message_ids: The message IDs to forward
         **kwargs: Additional arguments for forward_messages
+            (_wait=False returns a Future of the result)
 
     Returns:
         The message objects or None if forwarding failed
     """
-    max_retries = 3
-    retry_delay = 5
-
-    for attempt in range(max_retries):
-        try:
-            app = get_app_safe()
-            return app.forward_messages(chat_id, from_chat_id, message_ids, **kwargs)
-        except Exception as e:
-            if "FLOOD_WAIT" in str(e):
-                # Extract wait time
-                wait_match = re.search(r'A wait of (\d+) seconds is required', str(e))
-                if wait_match:
-                    wait_seconds = int(wait_match.group(1))
-                    logger.warning(safe_get_messages(user_id).HELPER_FLOOD_WAIT_DETECTED_SLEEPING_MSG.format(wait_seconds=wait_seconds))
-                    time.sleep(min(wait_seconds + 1, 30))  # Wait the required time (max 30 sec)
-                else:
-                    logger.warning(safe_get_messages(user_id).HELPER_FLOOD_WAIT_DETECTED_COULDNT_EXTRACT_MSG.format(retry_delay=retry_delay))
-                    time.sleep(retry_delay)
+    wait = kwargs.pop('_wait', True)
 
-                if attempt and attempt < max_retries - 1:
-                    continue
+    def on_error(e):
+        if isinstance(e, FloodWait):
+            _record_flood_wait(chat_id, e.value)
+        logger.error(f"Failed to forward messages to {chat_id}: {e}")
+        return None
 
-            logger.error(f"Failed to forward messages after {max_retries} attempts: {e}")
-            return None
+    return _call_outbound(chat_id, "forward_messages", (chat_id, from_chat_id, message_ids), kwargs, on_error, wait=wait)
 
 # Helper function for safely editing message text with flood wait handling
 def safe_edit_message_text(chat_id, message_id, text, **kwargs):
-    messages = safe_get_messages(None)
     """
     Safely edit message text with flood wait handling
 
@@ -282,71 +263,47 @@ def safe_edit_message_text(chat_id, message_id, text, **kwargs):
         message_id: The message ID to edit
         text: The new text
         **kwargs: Additional arguments for edit_message_text
+            (_wait=False returns a Future of the result)
 
     Returns:
         The message object or None if editing failed
     """
-    max_retries = 3
-    retry_delay = 5
+    messages = safe_get_messages(None)
+    wait = kwargs.pop('_wait', True)
 
-    # Throttle edits in groups to no more than once per 5 seconds per chat
-    try:
-        is_group = isinstance(chat_id, int) and chat_id < 0
-    except Exception:
-        is_group = False
+    # A direct edit supersedes any progress frame still queued for this message
+    if not kwargs.pop("_coalesced", False):
+        from HELPERS.progress_dispatcher import discard_pending_progress
+        discard_pending_progress(chat_id, message_id)
 
-    # Module-level storage for last edit timestamps
-    global _last_edit_ts_per_chat
-    try:
-        _last_edit_ts_per_chat
-    except NameError:
-        _last_edit_ts_per_chat = {}
-
-    if is_group:
-        last_ts = _last_edit_ts_per_chat.get(chat_id, 0.0)
-        now = time.time()
-        elapsed = now - last_ts
-        if elapsed and elapsed < 5.0:
-            try:
-                time.sleep(5.0 - elapsed)
-            except Exception:
-                pass
-        _last_edit_ts_per_chat[chat_id] = time.time()
+    # Edits in groups are spaced at least 5 seconds apart per chat (by the chat's queue)
+    is_group = isinstance(chat_id, int) and chat_id < 0
 
-    for attempt in range(max_retries):
-        try:
-            app = get_app_safe()
-            return app.edit_message_text(chat_id, message_id, text, **kwargs)
-        except FloodWait as e:
-            # Persist FloodWait info and stop
-            try:
-                user_dir = os.path.join("users", str(chat_id))
-                os.makedirs(user_dir, exist_ok=True)
-                with open(os.path.join(user_dir, "flood_wait.txt"), 'w') as f:
-                    f.write(str(e.value))
-            except Exception:
-                pass
+    def on_error(e):
+        if isinstance(e, FloodWait):
+            _record_flood_wait(chat_id, e.value)
             logger.warning(f"Flood wait detected ({e.value}s) while editing message for {chat_id}")
             return None
-        except Exception as e:
-            # If message ID is invalid, it means the message was deleted
-            # No need to retry, just return immediately
-            if safe_get_messages().HELPER_MESSAGE_ID_INVALID_MSG in str(e):
-                # We only log this once, not for every retry
-                if attempt == 0:
-                    logger.debug(f"Tried to edit message that was already deleted: {message_id}")
-                return None
+        # If message ID is invalid, it means the message was deleted
+        if messages.HELPER_MESSAGE_ID_INVALID_MSG in str(e):
+            logger.debug(f"Tried to edit message that was already deleted: {message_id}")
+            return None
+        logger.debug(f"Failed to edit message {message_id} in {chat_id}: {e}")
+        return None
+
+    return _call_outbound(
+        chat_id, "edit_message_text", (chat_id, message_id, text), kwargs, on_error,
+        spacing=5.0 if is_group else 0.0, wait=wait,
+    )
 
 # Helper function for safely clearing reply markup (inline keyboard)
 def safe_edit_reply_markup(chat_id, message_id, reply_markup=None, **kwargs):
-    messages = safe_get_messages(None)
     """
     Safely edit message reply markup (e.g., clear inline keyboard) with flood wait handling
 
     Inherits message_thread_id from provided message or _callback_query for topics.
     """
-    max_retries = 3
-    retry_delay = 5
+    wait = kwargs.pop('_wait', True)
 
     # Inherit thread context from helpers
     original_message = kwargs.get('message')
@@ -364,44 +321,19 @@ def safe_edit_reply_markup(chat_id, message_id, reply_markup=None, **kwargs):
     if '_callback_query' in kwargs:
         kwargs.pop('_callback_query', None)
 
-    for attempt in range(max_retries):
-        try:
-            app = get_app_safe()
-            return app.edit_message_reply_markup(chat_id, message_id, reply_markup=reply_markup, **kwargs)
-        except FloodWait as e:
-            try:
-                user_dir = os.path.join("users", str(chat_id))
-                os.makedirs(user_dir, exist_ok=True)
-                with open(os.path.join(user_dir, "flood_wait.txt"), 'w') as f:
-                    f.write(str(e.value))
-            except Exception:
-                pass
+    def on_error(e):
+        if isinstance(e, FloodWait):
+            _record_flood_wait(chat_id, e.value)
             logger.warning(f"Flood wait detected ({e.value}s) while editing reply markup for {chat_id}")
             return None
-        except Exception as e:
-            if "FLOOD_WAIT" in str(e):
-                wait_match = re.search(r'A wait of (\d+) seconds is required', str(e))
-                if wait_match:
-                    wait_seconds = int(wait_match.group(1))
-                    logger.warning(safe_get_messages(user_id).HELPER_FLOOD_WAIT_DETECTED_SLEEPING_MSG.format(wait_seconds=wait_seconds))
-                    time.sleep(min(wait_seconds + 1, 5))
-                else:
-                    logger.warning(safe_get_messages(user_id).HELPER_FLOOD_WAIT_DETECTED_COULDNT_EXTRACT_MSG.format(retry_delay=retry_delay))
-                    time.sleep(retry_delay)
-                if attempt and attempt < max_retries - 1:
-                    continue
-            elif "msg_seqno is too high" in str(e):
-                logger.warning(safe_get_messages(user_id).HELPER_MSG_SEQNO_ERROR_DETECTED_MSG.format(retry_delay=retry_delay))
-                time.sleep(retry_delay)
-                if attempt and attempt < max_retries - 1:
-                    continue
-            if attempt == max_retries - 1:
-                logger.error(f"Failed to edit reply markup after {max_retries} attempts: {e}")
-            return None
+        logger.error(f"Failed to edit reply markup in {chat_id}: {e}")
+        return None
+
+    kwargs['reply_markup'] = reply_markup
+    return _call_outbound(chat_id, "edit_message_reply_markup", (chat_id, message_id), kwargs, on_error, wait=wait)
 
 # Helper function for safely deleting messages with flood wait handling
 def safe_delete_messages(chat_id, message_ids, **kwargs):
-    messages = safe_get_messages(None)
     """
     Safely delete messages with flood wait handling
 
@@ -409,44 +341,32 @@ def safe_delete_messages(chat_id, message_ids, **kwargs):
         chat_id: The chat ID
         message_ids: List of message IDs to delete
         **kwargs: Additional arguments for delete_messages
+            (_wait=False returns a Future of the result)
 
     Returns:
         True on success or None if deletion failed
     """
-    max_retries = 3
-    retry_delay = 5
+    messages = safe_get_messages(None)
+    wait = kwargs.pop('_wait', True)
 
-    for attempt in range(max_retries):
+    def on_error(e):
+        # If the message is already deleted/invalid, don't treat it as an error
         try:
-            app = get_app_safe()
-            return app.delete_messages(chat_id=chat_id, message_ids=message_ids, **kwargs)
-        except Exception as e:
-            # If the message is already deleted/invalid, don't treat it as an error
-            try:
-                msg = str(e)
-            except Exception:
-                msg = f"{type(e).__name__}"
-            if safe_get_messages(user_id).HELPER_MESSAGE_ID_INVALID_MSG in msg or safe_get_messages(user_id).HELPER_MESSAGE_DELETE_FORBIDDEN_MSG in msg:
-                if attempt == 0:
-                    logger.debug(f"Tried to delete non-existent message(s): {message_ids}")
-                return None
-            if "FLOOD_WAIT" in str(e):
-                # Extract wait time
-                wait_match = re.search(r'A wait of (\d+) seconds is required', str(e))
-                if wait_match:
-                    wait_seconds = int(wait_match.group(1))
-                    logger.warning(safe_get_messages(user_id).HELPER_FLOOD_WAIT_DETECTED_SLEEPING_MSG.format(wait_seconds=wait_seconds))
-                    time.sleep(min(wait_seconds + 1, 30))  # Wait the required time (max 30 sec)
-                else:
-                    logger.warning(safe_get_messages(user_id).HELPER_FLOOD_WAIT_DETECTED_COULDNT_EXTRACT_MSG.format(retry_delay=retry_delay))
-                    time.sleep(retry_delay)
-
-                if attempt and attempt < max_retries - 1:
-                    continue
-
-            # Avoid exception internal attributes (e.g., pts_count)
-            logger.error(f"Failed to delete messages after {max_retries} attempts: {type(e).__name__}")
+            msg = str(e)
+        except Exception:
+            msg = f"{type(e).__name__}"
+        if messages.HELPER_MESSAGE_ID_INVALID_MSG in msg or messages.HELPER_MESSAGE_DELETE_FORBIDDEN_MSG in msg:
+            logger.debug(f"Tried to delete non-existent message(s): {message_ids}")
             return None
+        if isinstance(e, FloodWait):
+            _record_flood_wait(chat_id, e.value)
+        # Avoid exception internal attributes (e.g., pts_count)
+        logger.error(f"Failed to delete messages in {chat_id}: {type(e).__name__}")
+        return None
+
+    kwargs['chat_id'] = chat_id
+    kwargs['message_ids'] = message_ids
+    return _call_outbound(chat_id, "delete_messages", (), kwargs, on_error, wait=wait)
 
 # Helper function for sending messages with auto-delete functionality
 def safe_send_message_with_auto_delete(chat_id, text, delete_after_seconds=60, **kwargs):
@@ -466,24 +386,7 @@ def safe_send_message_with_auto_delete(chat_id, text, delete_after_seconds=60, *
     message = safe_send_message(chat_id, text, **kwargs)
     
     if message and hasattr(message, 'id'):
-        # Schedule deletion in a separate thread with better error handling
-        def delete_message_after_delay():
-            try:
-                logger.info(f"[AUTO-DELETE] Scheduling message {message.id} for deletion in {delete_after_seconds} seconds")
-                time.sleep(delete_after_seconds)
-                logger.info(f"[AUTO-DELETE] Attempting to delete message {message.id}")
-                result = safe_delete_messages(chat_id, [message.id])
-                if result:
-                    logger.info(f"[AUTO-DELETE] Successfully deleted message {message.id}")
-                else:
-                    logger.warning(f"[AUTO-DELETE] Failed to delete message {message.id}")
-            except Exception as e:
-                logger.error(f"[AUTO-DELETE] Error in auto-delete thread for message {message.id}: {e}")
-        
-        # Start the deletion thread
-        delete_thread = threading.Thread(target=delete_message_after_delay, daemon=True)
-        delete_thread.start()
-        logger.info(f"[AUTO-DELETE] Started auto-delete thread for message {message.id} (thread: {delete_thread.name})")
+        schedule_delete_message(chat_id, message.id, delete_after_seconds)
     else:
         logger.warning(f"[AUTO-DELETE] Failed to send message or message has no ID: {message}")
     
@@ -503,58 +406,30 @@ def schedule_delete_message(chat_id, message_id, delete_after_seconds=60):
     try:
         if not chat_id or not message_id:
             return False
-
-        def _del():
-            try:
-                logger.info(f"[AUTO-DELETE] Scheduling message {message_id} for deletion in {delete_after_seconds} seconds")
-                time.sleep(delete_after_seconds)
-                safe_delete_messages(chat_id, [message_id])
-            except Exception as e:
-                logger.error(f"[AUTO-DELETE] Error while deleting message {message_id}: {e}")
-
-        t = threading.Thread(target=_del, daemon=True)
-        t.start()
+        # Imported here: HELPERS.delete_scheduler imports HELPERS.logger, which imports this module
+        from HELPERS.delete_scheduler import schedule_message_deletion
+        schedule_message_deletion(chat_id, message_id, delete_after_seconds)
+        logger.debug(f"[AUTO-DELETE] Scheduled message {message_id} for deletion in {delete_after_seconds} seconds")
         return True
-    except Exception:
+    except Exception as e:
+        logger.error(f"[AUTO-DELETE] Failed to schedule deletion of message {message_id}: {e}")
         return False
 
 def schedule_delete_processing_messages(chat_id, delete_after_seconds=5):
-    messages = safe_get_messages(None)
     """
     Schedule deletion of all "Processing..." messages for a user after a delay.
     This helps clean up duplicate processing messages.
 
+    Bots cannot use get_chat_history, so there is nothing to scan for here:
+    every processing message is deleted by its own scheduled deletion.
+
     Args:
         chat_id: The chat ID
         delete_after_seconds: Seconds to wait before deleting
     Returns:
         True if scheduled, False otherwise
     """
-    try:
-        if not chat_id:
-            return False
-
-        def _del_processing_messages():
-            try:
-                logger.info(f"[AUTO-DELETE] Scheduling deletion of all processing messages for user {chat_id} in {delete_after_seconds} seconds")
-                time.sleep(delete_after_seconds)
-                
-                # Get app instance
-                app = get_app_safe()
-                if not app:
-                    logger.error("[AUTO-DELETE] Cannot get app instance for deleting processing messages")
-                    return
-                
-                # Bots cannot use get_chat_history, so we'll skip this functionality
-                # Instead, we'll rely on the individual message deletion that's already scheduled
-                logger.info(f"[AUTO-DELETE] Skipping chat history scan for user {chat_id} (bots cannot use get_chat_history)")
-                logger.info(f"[AUTO-DELETE] Individual processing messages will be deleted by their own timers")
-                    
-            except Exception as e:
-                logger.error(f"[AUTO-DELETE] Error while deleting processing messages for user {chat_id}: {e}")
-
-        t = threading.Thread(target=_del_processing_messages, daemon=True)
-        t.start()
-        return True
-    except Exception:
+    if not chat_id:
         return False
+    logger.debug(f"[AUTO-DELETE] Processing messages for user {chat_id} are deleted by their own scheduled deletions")
+    return True
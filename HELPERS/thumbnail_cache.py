@@ -0,0 +1,213 @@
+# On-disk thumbnail cache shared by every download
+import hashlib
+import os
+import shutil
+import threading
+
+from CONFIG.config import Config
+from CONFIG.limits import LimitsConfig
+from HELPERS.logger import logger
+
+# After an eviction the cache is brought down to this share of its limit
+_EVICT_TO = 0.9
+
+
+class ThumbnailCache(object):
+    """
+    Thumbnails keyed by (service, video id), stored content-addressed.
+
+    objects/<sha256>.jpg holds an image (identical images are stored once)
+    and keys/<sha1 of "service:video_id"> names the object it resolves to.
+    A copy that fits Telegram's thumbnail limit (max_side on each side) is
+    made once and kept next to the original as objects/<sha256>.<max_side>.jpg.
+    Hits refresh the object's mtime; once the objects take more than
+    max_bytes, the least recently used ones are removed together with their
+    resized copies (keys pointing at removed objects read as misses).
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = int(max_bytes)
+        self._objects = os.path.join(root, "objects")
+        self._keys = os.path.join(root, "keys")
+        self._lock = threading.Lock()
+        self._size = None  # bytes under objects/, counted on first use
+
+    def get(self, service, video_id, max_side=None):
+        """Path of the cached thumbnail (resized to max_side if given), or None."""
+        digest = self._lookup(service, video_id)
+        if digest is None:
+            return None
+        original = self._object_path(digest)
+        if not max_side:
+            self._touch(original)
+            return original
+        resized = self._object_path(digest, max_side)
+        if not os.path.exists(resized) and not self._resize(original, resized, max_side):
+            return None
+        self._touch(original)
+        return resized
+
+    def has(self, service, video_id):
+        return self._lookup(service, video_id) is not None
+
+    def put(self, service, video_id, src_path):
+        """Store a downloaded image for (service, video_id); returns the cached path or None."""
+        try:
+            with open(src_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logger.warning(f"[THUMB CACHE] cannot read {src_path}: {e}")
+            return None
+        if not data:
+            return None
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        try:
+            os.makedirs(self._objects, exist_ok=True)
+            os.makedirs(self._keys, exist_ok=True)
+            if not os.path.exists(path):
+                self._write(path, data)
+            self._write(self._key_path(service, video_id), digest.encode("ascii"))
+        except OSError as e:
+            logger.warning(f"[THUMB CACHE] cannot store thumbnail for {service}:{video_id}: {e}")
+            return None
+        self._evict_if_needed()
+        return path
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _key_path(self, service, video_id):
+        key = hashlib.sha1(f"{service}:{video_id}".encode("utf-8")).hexdigest()
+        return os.path.join(self._keys, key)
+
+    def _object_path(self, digest, max_side=None):
+        name = f"{digest}.{int(max_side)}.jpg" if max_side else f"{digest}.jpg"
+        return os.path.join(self._objects, name)
+
+    def _lookup(self, service, video_id):
+        key_path = self._key_path(service, video_id)
+        try:
+            with open(key_path, "r", encoding="ascii") as f:
+                digest = f.read().strip()
+        except (OSError, ValueError):
+            return None
+        if digest and os.path.exists(self._object_path(digest)):
+            return digest
+        # The object was evicted
+        try:
+            os.remove(key_path)
+        except OSError:
+            pass
+        return None
+
+    def _write(self, path, data):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._size is not None and os.path.dirname(path) == self._objects:
+                self._size += len(data)
+
+    def _touch(self, path):
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _resize(self, src_path, dest_path, max_side):
+        try:
+            from PIL import Image
+        except ImportError:
+            logger.warning("[THUMB CACHE] Pillow is not installed, thumbnails are not resized")
+            return False
+        tmp_path = f"{dest_path}.{threading.get_ident()}.tmp"
+        try:
+            with Image.open(src_path) as img:
+                img = img.convert("RGB")
+                img.thumbnail((int(max_side), int(max_side)))
+                img.save(tmp_path, "JPEG", quality=85)
+            os.replace(tmp_path, dest_path)
+        except Exception as e:
+            logger.warning(f"[THUMB CACHE] cannot resize {src_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        with self._lock:
+            if self._size is not None:
+                self._size += os.path.getsize(dest_path)
+        self._evict_if_needed()
+        return True
+
+    def _scan_objects(self):
+        """{digest: (last use, [(path, size), ...])} for everything under objects/."""
+        groups = {}
+        try:
+            entries = list(os.scandir(self._objects))
+        except OSError:
+            return groups
+        for entry in entries:
+            if entry.name.endswith(".tmp"):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            digest = entry.name.split(".", 1)[0]
+            last_use, files = groups.get(digest, (0.0, []))
+            files.append((entry.path, st.st_size))
+            groups[digest] = (max(last_use, st.st_mtime), files)
+        return groups
+
+    def _evict_if_needed(self):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, files in self._scan_objects().values() for _, size in files)
+            if self._size <= self.max_bytes:
+                return
+            groups = self._scan_objects()
+            size = sum(s for _, files in groups.values() for _, s in files)
+            target = self.max_bytes * _EVICT_TO
+            removed = 0
+            for digest, (_, files) in sorted(groups.items(), key=lambda item: item[1][0]):
+                if size <= target:
+                    break
+                for path, file_size in files:
+                    try:
+                        os.remove(path)
+                        size -= file_size
+                    except OSError:
+                        pass
+                removed += 1
+            self._size = size
+        if removed:
+            logger.info(f"[THUMB CACHE] evicted {removed} thumbnails, {size // 1024} KiB left")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            max_mb = getattr(LimitsConfig, "THUMBNAIL_CACHE_MAX_MB", 200)
+            _cache = ThumbnailCache(getattr(Config, "THUMBNAIL_CACHE_DIR", "thumbnail_cache"), max_mb * 1024 * 1024)
+        return _cache
+
+
+def copy_thumbnail(src_path, dest):
+    """Copy a cached thumbnail to where the caller expects it."""
+    try:
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        shutil.copyfile(src_path, dest)
+        return True
+    except OSError as e:
+        logger.warning(f"[THUMB CACHE] cannot copy {src_path} to {dest}: {e}")
+        return False
@@ -3,7 +3,7 @@ from HELPERS.safe_messeger import fake_message
 from HELPERS.logger import logger
 from COMMANDS.image_cmd import image_command
 from CONFIG.domains import DomainsConfig
-from urllib.parse import urlparse
+from HELPERS.domain_classifier import classify_url, get_host, GALLERYDL_ONLY
 
 
 def route_if_gallerydl_only(app, message) -> bool:
@@ -21,9 +21,7 @@ def route_if_gallerydl_only(app, message) -> bool:
             return False
 
         url_l = url.lower()
-        domain = urlparse(url).netloc.lower()
-        if domain.startswith('www.'):
-            domain = domain[4:]
+        domain = get_host(url)
 
         # 1) Exact match by path segment from GALLERYDL_ONLY_PATH
         try:
@@ -48,27 +46,19 @@ def route_if_gallerydl_only(app, message) -> bool:
 
         # 2) Domains from GALLERYDL_ONLY_DOMAINS
         try:
-            domains_list = getattr(DomainsConfig, 'GALLERYDL_ONLY_DOMAINS', []) or []
-        except Exception:
-            domains_list = []
-        for d in domains_list:
-            try:
-                d_l = (d or '').strip().lower()
-                if not d_l:
-                    continue
-                if domain == d_l or domain.endswith('.' + d_l):
-                    fallback_text = f"/img {url}"
-                    if tags_text:
-                        fallback_text += f" {tags_text}"
-                    # For groups, preserve original chat_id and message_thread_id
-                    original_chat_id = message.chat.id if hasattr(message, 'chat') else message.chat.id
-                    message_thread_id = getattr(message, 'message_thread_id', None) if hasattr(message, 'message_thread_id') else None
-                    fake_msg = fake_message(fallback_text, message.chat.id, original_chat_id=original_chat_id, message_thread_id=message_thread_id, original_message=message)
-                    image_command(app, fake_msg)
-                    logger.info(f"[ENGINE_ROUTER] Routed by domain list to gallery-dl: {domain} -> {fallback_text}")
-                    return True
-            except Exception as e:
-                logger.error(f"[ENGINE_ROUTER] Error checking domain {d}: {e}")
+            if GALLERYDL_ONLY in classify_url(url):
+                fallback_text = f"/img {url}"
+                if tags_text:
+                    fallback_text += f" {tags_text}"
+                # For groups, preserve original chat_id and message_thread_id
+                original_chat_id = message.chat.id if hasattr(message, 'chat') else message.chat.id
+                message_thread_id = getattr(message, 'message_thread_id', None) if hasattr(message, 'message_thread_id') else None
+                fake_msg = fake_message(fallback_text, message.chat.id, original_chat_id=original_chat_id, message_thread_id=message_thread_id, original_message=message)
+                image_command(app, fake_msg)
+                logger.info(f"[ENGINE_ROUTER] Routed by domain list to gallery-dl: {domain} -> {fallback_text}")
+                return True
+        except Exception as e:
+            logger.error(f"[ENGINE_ROUTER] Error checking domain {domain}: {e}")
 
         return False
     except Exception as e:
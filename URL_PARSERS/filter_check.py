@@ -1,6 +1,5 @@
 # Filter check for domains
-from urllib.parse import urlparse
-from CONFIG.domains import DomainsConfig
+from HELPERS.domain_classifier import classify_url, NO_FILTER
 from HELPERS.logger import logger
 
 def is_no_filter_domain(url: str) -> bool:
@@ -14,25 +13,10 @@ def is_no_filter_domain(url: str) -> bool:
         bool: True if the domain is in NO_FILTER_DOMAINS
     """
     try:
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
-        
-        # Strip leading www.
-        if domain.startswith('www.'):
-            domain = domain[4:]
-            
-        # Check NO_FILTER_DOMAINS
-        if hasattr(DomainsConfig, 'NO_FILTER_DOMAINS') and DomainsConfig.NO_FILTER_DOMAINS:
-            # Exact match
-            if domain in DomainsConfig.NO_FILTER_DOMAINS:
-                logger.info(f"Domain {domain} found in NO_FILTER_DOMAINS list - skipping match_filter")
-                return True
-                
-            # Subdomain match
-            for no_filter_domain in DomainsConfig.NO_FILTER_DOMAINS:
-                if domain.endswith('.' + no_filter_domain) or domain == no_filter_domain:
-                    logger.info(f"Domain {domain} matches no-filter domain {no_filter_domain} - skipping match_filter")
-                    return True
+        # Check NO_FILTER_DOMAINS (exact and subdomain match)
+        if NO_FILTER in classify_url(url):
+            logger.info(f"URL {url} matches NO_FILTER_DOMAINS - skipping match_filter")
+            return True
                 
         return False
         
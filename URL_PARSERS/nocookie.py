@@ -1,5 +1,4 @@
-from urllib.parse import urlparse
-from CONFIG.config import Config
+from HELPERS.domain_classifier import classify_url, NO_COOKIE
 from HELPERS.logger import logger
 
 def is_no_cookie_domain(url: str) -> bool:
@@ -8,18 +7,10 @@ def is_no_cookie_domain(url: str) -> bool:
     For such domains, you need to use —no-Cookies instead of-Cookies.
     """
     try:
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
-        
-        # We remove www. If there is
-        if domain.startswith('www.'):
-            domain = domain[4:]
-            
         # Check the domain and its subdomain
-        for no_cookie_domain in Config.NO_COOKIE_DOMAINS:
-            if domain == no_cookie_domain or domain.endswith('.' + no_cookie_domain):
-                logger.info(f"URL {url} matches NO_COOKIE_DOMAINS pattern: {no_cookie_domain}")
-                return True
+        if NO_COOKIE in classify_url(url):
+            logger.info(f"URL {url} matches NO_COOKIE_DOMAINS")
+            return True
                 
         return False
     except Exception as e:
@@ -1,9 +1,147 @@
 import re
+from functools import lru_cache
 from urllib.parse import urlparse, parse_qs, urlunparse, urlencode, unquote
 from URL_PARSERS.tiktok import get_clean_url_for_tagging
 from HELPERS.logger import logger
 from CONFIG.config import Config
 
+# -------------------------------------------------------------------------------------------------
+# Normalization rules for the video/playlist cache keys
+# -------------------------------------------------------------------------------------------------
+#
+# Each rule is (name, path test, builder). Rules are grouped by domain family and tried in order;
+# when no rule of the family applies, the CLEAN_QUERY rule and then the fallback are used.
+
+def _query_params(parsed):
+    return parse_qs(parsed.query)
+
+def _path_only(parsed, domain):
+    return urlunparse((parsed.scheme, domain, parsed.path, '', '', ''))
+
+def _pornhub(parsed, domain):
+    # Keep full path and query parameters for unique video identification
+    return urlunparse((parsed.scheme, 'pornhub.com', parsed.path, parsed.params, parsed.query, parsed.fragment))
+
+def _youtube_watch(parsed, domain):
+    # /watch: only v
+    query_params = _query_params(parsed)
+    v = None
+    if 'v' in query_params:
+        v = query_params['v'][0]
+        # Fix: If v contains ? or &, only match up to those characters
+        v = v.split('?')[0].split('&')[0]
+    if v:
+        return urlunparse((parsed.scheme, domain, parsed.path, '', urlencode({'v': v}, doseq=True), ''))
+    return _path_only(parsed, domain)
+
+def _youtube_playlist(parsed, domain):
+    # /playlist: list only
+    query_params = _query_params(parsed)
+    if 'list' in query_params:
+        return urlunparse((parsed.scheme, domain, parsed.path, '', urlencode({'list': query_params['list']}, doseq=True), ''))
+    return _path_only(parsed, domain)
+
+def _youtube_embed(parsed, domain):
+    # /embed: playlist only
+    allowed_params = {k: v for k, v in _query_params(parsed).items() if k == 'playlist'}
+    return urlunparse((parsed.scheme, domain, parsed.path, '', urlencode(allowed_params, doseq=True), ''))
+
+def _any_path(path):
+    return True
+
+_NORMALIZATION_RULES = {
+    'pornhub.com': (
+        ('pornhub', _any_path, _pornhub),
+    ),
+    # TikTok: always strip all params, keep only path
+    'tiktok.com': (
+        ('tiktok', _any_path, _path_only),
+    ),
+    'youtube.com': (
+        ('shorts', lambda path: path.startswith('/shorts/'), _path_only),
+        ('watch', lambda path: path == '/watch', _youtube_watch),
+        ('playlist', lambda path: path == '/playlist', _youtube_playlist),
+        ('embed', lambda path: path.startswith('/embed/'), _youtube_embed),
+        # live: only path
+        ('live', lambda path: path.startswith('/live/') or path.endswith('/live'), _path_only),
+    ),
+    # youtu.be: always remove query
+    'youtu.be': (
+        ('youtu.be', _any_path, _path_only),
+    ),
+}
+
+# Host aliases rewritten before the rules are applied
+_DOMAIN_ALIASES = {
+    'youtube.com': 'www.youtube.com',
+    'www.youtu.be': 'youtu.be',
+}
+
+
+@lru_cache(maxsize=1024)
+def _domain_family(domain: str):
+    """Return the key of _NORMALIZATION_RULES that applies to a (lower-case) host, or None."""
+    if domain.endswith('.pornhub.com'):
+        return 'pornhub.com'
+    if 'tiktok.com' in domain:
+        return 'tiktok.com'
+    if 'youtube.com' in domain:
+        return 'youtube.com'
+    if domain == 'youtu.be':
+        return 'youtu.be'
+    return None
+
+
+_clean_query_source = None
+_clean_query_domains = frozenset()
+
+
+def _refresh_clean_query():
+    """Pick up a replaced Config.CLEAN_QUERY (reload_all_porn_caches) and drop cached results."""
+    global _clean_query_source, _clean_query_domains
+    source = getattr(Config, 'CLEAN_QUERY', [])
+    if source is not _clean_query_source:
+        _clean_query_domains = frozenset(source or ())
+        _clean_query_source = source
+        _normalize_cached.cache_clear()
+        _cache_url_variants.cache_clear()
+
+
+def _is_clean_query_domain(domain: str) -> bool:
+    """CLEAN_QUERY suffix match: the domain itself or any parent domain is listed."""
+    if domain in _clean_query_domains:
+        return True
+    pos = domain.find('.')
+    while pos != -1:
+        if domain[pos + 1:] in _clean_query_domains:
+            return True
+        pos = domain.find('.', pos + 1)
+    return False
+
+
+def _normalize(url: str):
+    clean_url = get_clean_url_for_tagging(extract_real_url_if_google(url))
+    parsed = urlparse(clean_url)
+    domain = parsed.netloc.lower()
+    domain = _DOMAIN_ALIASES.get(domain, domain)
+
+    for name, path_test, build in _NORMALIZATION_RULES.get(_domain_family(domain), ()):
+        if path_test(parsed.path):
+            return build(parsed, domain), name
+    # fallback for CLEAN_QUERY domains (suffix match)
+    if _is_clean_query_domain(domain):
+        return _path_only(parsed, domain), 'clean domain'
+    # For all other URLs, return them as they are
+    return urlunparse((parsed.scheme, domain, parsed.path, parsed.params, parsed.query, '')), 'fallback'
+
+
+@lru_cache(maxsize=4096)
+def _normalize_cached(url: str) -> str:
+    result, rule = _normalize(url)
+    logger.debug(f"normalize_url_for_cache: '{url}' -> '{result}' ({rule})")
+    return result
+
+
 def normalize_url_for_cache(url: str) -> str:
     """
     Normalizes URLs for caching based on a set of specific rules,
@@ -12,92 +150,34 @@ def normalize_url_for_cache(url: str) -> str:
     """
     if not isinstance(url, str):
         return ''
+    _refresh_clean_query()
+    return _normalize_cached(url)
 
-    original_url = url
-    url = extract_real_url_if_google(url)
-    clean_url = get_clean_url_for_tagging(url)
-    parsed = urlparse(clean_url)
-    domain = parsed.netloc.lower()
-    path = parsed.path
-    query_params = parse_qs(parsed.query)
 
-    # --- YouTube/youtu.be: always from www.youtube.com and youtu.be ---
-    if domain in ('youtube.com', 'www.youtube.com'):
-        domain = 'www.youtube.com'
-    if domain in ('youtu.be', 'www.youtu.be'):
-        domain = 'youtu.be'
+@lru_cache(maxsize=2048)
+def _cache_url_variants(url: str, strip_range: bool) -> tuple:
+    from URL_PARSERS.youtube import is_youtube_url, youtube_to_short_url, youtube_to_long_url
 
-    # Pornhub: keep full path and query parameters for unique video identification
-    if domain.endswith('.pornhub.com'):
-        base_domain = 'pornhub.com'
-        result = urlunparse((parsed.scheme, base_domain, path, parsed.params, parsed.query, parsed.fragment))
-        logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (pornhub)")
-        return result
+    def normalize(u):
+        return normalize_url_for_cache(strip_range_from_url(u) if strip_range else u)
 
-    # TikTok: always strip all params, keep only path
-    if 'tiktok.com' in domain:
-        result = urlunparse((parsed.scheme, domain, path, '', '', ''))
-        logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (tiktok)")
-        return result
+    variants = [normalize(url)]
+    if is_youtube_url(url):
+        variants.append(normalize(youtube_to_short_url(url)))
+        variants.append(normalize(youtube_to_long_url(url)))
+    return tuple(dict.fromkeys(variants))
 
-    # Shorts and youtu.be: always strip all params
-    if ("youtube.com" in domain and path.startswith('/shorts/')):
-        result = urlunparse((parsed.scheme, domain, path, '', '', ''))
-        logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (shorts)")
-        return result
-    if domain == 'youtu.be':
-        # For youtu.be always remove query
-        result = urlunparse((parsed.scheme, domain, path, '', '', ''))
-        logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (youtu.be)")
-        return result
 
-    # /watch: only v
-    if 'youtube.com' in domain and path == '/watch':
-        v = None
-        if 'v' in query_params:
-            v = query_params['v'][0]
-            # Fix: If v contains ? or &, only match up to those characters
-            v = v.split('?')[0].split('&')[0]
-        if v:
-            new_query = urlencode({'v': v}, doseq=True)
-            result = urlunparse((parsed.scheme, domain, path, '', new_query, ''))
-            logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (watch)")
-            return result
-        result = urlunparse((parsed.scheme, domain, path, '', '', ''))
-        logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (watch no v)")
-        return result
-    # /playlist: list only
-    if 'youtube.com' in domain and path == '/playlist':
-        if 'list' in query_params:
-            new_query = urlencode({'list': query_params['list']}, doseq=True)
-            result = urlunparse((parsed.scheme, domain, path, '', new_query, ''))
-            logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (playlist)")
-            return result
-        result = urlunparse((parsed.scheme, domain, path, '', '', ''))
-        logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (playlist no list)")
-        return result
-    # /embed: playlist only
-    if 'youtube.com' in domain and path.startswith('/embed/'):
-        allowed_params = {k: v for k, v in query_params.items() if k == 'playlist'}
-        new_query = urlencode(allowed_params, doseq=True)
-        result = urlunparse((parsed.scheme, domain, path, '', new_query, ''))
-        logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (embed)")
-        return result
-    # live: only way
-    if 'youtube.com' in domain and (path.startswith('/live/') or path.endswith('/live')):
-        result = urlunparse((parsed.scheme, domain, path, '', '', ''))
-        logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (live)")
-        return result
-    # fallback for CLEAN_QUERY domains (suffix match)
-    for clean_domain in getattr(Config, 'CLEAN_QUERY', []):
-        if domain == clean_domain or domain.endswith('.' + clean_domain):
-            result = urlunparse((parsed.scheme, domain, parsed.path, '', '', ''))
-            logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (clean domain)")
-            return result
-    # For all other URLs, return them as they are
-    result = urlunparse((parsed.scheme, domain, parsed.path, parsed.params, parsed.query, ''))
-    logger.info(f"normalize_url_for_cache: '{original_url}' -> '{result}' (fallback)")
-    return result
+def get_cache_url_variants(url: str, strip_range: bool = False) -> tuple:
+    """
+    All normalized forms a URL is cached under: the URL itself and, for YouTube,
+    its youtu.be and /watch forms (without duplicates, original form first).
+    With strip_range=True a trailing *start*end range is removed first (playlist cache).
+    """
+    if not isinstance(url, str):
+        return ('',)
+    _refresh_clean_query()
+    return _cache_url_variants(url, strip_range)
 
 
 def extract_real_url_if_google(url: str) -> str:
@@ -5,13 +5,75 @@ Universal thumbnail downloader for various video services
 
 import os
 import re
-import requests
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urlparse
 from typing import Optional, Tuple
 from CONFIG.config import Config
+from CONFIG.limits import LimitsConfig
 from CONFIG.messages import Messages, safe_get_messages
 from CONFIG.logger_msg import LoggerMsg
 from HELPERS.logger import logger
+from HELPERS.http_manager import get_managed_session
+from HELPERS.thumbnail_cache import get_thumbnail_cache, copy_thumbnail
+
+# Images this small are error placeholders, not thumbnails
+_MIN_THUMBNAIL_BYTES = 1000
+_THUMBNAIL_REQUEST_TIMEOUT = 10
+
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+# (service, video_id) -> Future of the fetch in progress
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def _http_get(url):
+    """GET through the shared thumbnail session, reusing its pooled connections."""
+    session = get_managed_session("thumbnails").get_session()
+    return session.get(url, timeout=_THUMBNAIL_REQUEST_TIMEOUT)
+
+
+def _get_fetch_pool():
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(
+                max_workers=getattr(LimitsConfig, "THUMBNAIL_FETCH_WORKERS", 8),
+                thread_name_prefix="thumb-fetch",
+            )
+        return _fetch_pool
+
+
+def _fetch_image(url):
+    """Image bytes at url, or None if it is missing or a placeholder."""
+    try:
+        response = _http_get(url)
+        if response.status_code == 200 and len(response.content) > _MIN_THUMBNAIL_BYTES:
+            return response.content
+    except Exception:
+        pass
+    return None
+
+
+def _fetch_first_available(urls):
+    """
+    Fetch all candidate URLs at once and return the bytes of the first one, in
+    list order, that exists. A candidate is taken as soon as every candidate
+    before it has failed, so a missing high resolution costs one round trip
+    instead of one per resolution.
+    """
+    futures = [_get_fetch_pool().submit(_fetch_image, url) for url in urls]
+    try:
+        for future in futures:
+            data = future.result()
+            if data:
+                return data
+        return None
+    finally:
+        for future in futures:
+            future.cancel()
 
 
 def extract_service_info(url: str) -> Tuple[str, str]:
@@ -395,14 +457,14 @@ def download_vimeo_thumbnail(video_id: str, dest: str) -> bool:
     try:
         # Vimeo API endpoint for video info
         api_url = f"https://vimeo.com/api/v2/video/{video_id}.json"
-        response = requests.get(api_url, timeout=10)
+        response = _http_get(api_url)
         if response.status_code == 200:
             data = response.json()
             if data and len(data) > 0:
                 video_info = data[0]
                 thumbnail_url = video_info.get('thumbnail_large') or video_info.get('thumbnail_medium')
                 if thumbnail_url:
-                    img_response = requests.get(thumbnail_url, timeout=10)
+                    img_response = _http_get(thumbnail_url)
                     if img_response.status_code == 200:
                         with open(dest, 'wb') as f:
                             f.write(img_response.content)
@@ -418,12 +480,12 @@ def download_dailymotion_thumbnail(video_id: str, dest: str) -> bool:
     try:
         # Dailymotion API endpoint
         api_url = f"https://api.dailymotion.com/video/{video_id}?fields=thumbnail_large_url"
-        response = requests.get(api_url, timeout=10)
+        response = _http_get(api_url)
         if response.status_code == 200:
             data = response.json()
             thumbnail_url = data.get('thumbnail_large_url')
             if thumbnail_url:
-                img_response = requests.get(thumbnail_url, timeout=10)
+                img_response = _http_get(thumbnail_url)
                 if img_response.status_code == 200:
                     with open(dest, 'wb') as f:
                         f.write(img_response.content)
@@ -536,7 +598,7 @@ def download_redtube_thumbnail(video_id: str, dest: str) -> bool:
 def download_youtube_thumbnail(video_id: str, dest: str) -> bool:
     """Download YouTube video thumbnail"""
     try:
-        # YouTube thumbnail URLs
+        # YouTube thumbnail URLs, best first
         thumbnail_urls = [
             f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg",
             f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg",
@@ -545,15 +607,11 @@ def download_youtube_thumbnail(video_id: str, dest: str) -> bool:
             f"https://img.youtube.com/vi/{video_id}/default.jpg"
         ]
         
-        for url in thumbnail_urls:
-            try:
-                response = requests.get(url, timeout=10)
-                if response.status_code == 200 and len(response.content) > 1000:  # Check if image is valid
-                    with open(dest, 'wb') as f:
-                        f.write(response.content)
-                    return True
-            except Exception:
-                continue
+        data = _fetch_first_available(thumbnail_urls)
+        if data:
+            with open(dest, 'wb') as f:
+                f.write(data)
+            return True
         
         return False
     except Exception as e:
@@ -748,9 +806,89 @@ def download_tidal_thumbnail(video_id: str, dest: str) -> bool:
         return False
 
 
-def download_thumbnail(url: str, dest: str) -> bool:
+_FETCHERS = {
+    'vk': download_vk_thumbnail,
+    'tiktok': download_tiktok_thumbnail,
+    'twitter': download_twitter_thumbnail,
+    'facebook': download_facebook_thumbnail,
+    'pornhub': download_pornhub_thumbnail,
+    'instagram': download_instagram_thumbnail,
+    'vimeo': download_vimeo_thumbnail,
+    'dailymotion': download_dailymotion_thumbnail,
+    'rutube': download_rutube_thumbnail,
+    'twitch': download_twitch_thumbnail,
+    'boosty': download_boosty_thumbnail,
+    'okru': download_okru_thumbnail,
+    'reddit': download_reddit_thumbnail,
+    'pikabu': download_pikabu_thumbnail,
+    'yandex_zen': download_yandex_zen_thumbnail,
+    'google_drive': download_google_drive_thumbnail,
+    'redtube': download_redtube_thumbnail,
+    'youtube': download_youtube_thumbnail,
+    'bilibili': download_bilibili_thumbnail,
+    'niconico': download_niconico_thumbnail,
+    'xvideos': download_xvideos_thumbnail,
+    'xnxx': download_xnxx_thumbnail,
+    'youporn': download_youporn_thumbnail,
+    'xhamster': download_xhamster_thumbnail,
+    'porntube': download_porntube_thumbnail,
+    'spankbang': download_spankbang_thumbnail,
+    'onlyfans': download_onlyfans_thumbnail,
+    'patreon': download_patreon_thumbnail,
+    'soundcloud': download_soundcloud_thumbnail,
+    'bandcamp': download_bandcamp_thumbnail,
+    'mixcloud': download_mixcloud_thumbnail,
+    'deezer': download_deezer_thumbnail,
+    'spotify': download_spotify_thumbnail,
+    'apple_music': download_apple_music_thumbnail,
+    'tidal': download_tidal_thumbnail,
+}
+
+
+def _fetch_into_cache(service: str, video_id: str) -> bool:
+    """
+    Download the thumbnail of (service, video_id) into the thumbnail cache.
+    Concurrent calls for the same video share one download.
+    """
+    fetcher = _FETCHERS.get(service)
+    if fetcher is None:
+        return False
+    key = (service, video_id)
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        owner = future is None
+        if owner:
+            future = _in_flight[key] = Future()
+    if not owner:
+        return future.result()
+    success = False
+    tmp_path = None
+    try:
+        cache = get_thumbnail_cache()
+        os.makedirs(cache.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache.root, suffix='.tmp')
+        os.close(fd)
+        success = fetcher(video_id, tmp_path) and cache.put(service, video_id, tmp_path) is not None
+    except Exception as e:
+        logger.error(LoggerMsg.THUMBNAIL_DOWNLOADER_ERROR_LOG_MSG.format(e=e))
+    finally:
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+        future.set_result(success)
+    return success
+
+
+def download_thumbnail(url: str, dest: str, max_side: Optional[int] = None) -> bool:
     """
     Universal thumbnail downloader for various video services
+    Thumbnails are kept in the shared thumbnail cache, so each video's thumbnail
+    is downloaded once; with max_side, dest gets a copy that fits within
+    max_side x max_side (made once and cached as well)
     Returns True if thumbnail was downloaded successfully, False otherwise
     """
     try:
@@ -766,80 +904,14 @@ def download_thumbnail(url: str, dest: str) -> bool:
         # Create destination directory if it doesn't exist
         os.makedirs(os.path.dirname(dest), exist_ok=True)
         
-        # Try service-specific thumbnail download
-        success = False
-        if service == 'vk':
-            success = download_vk_thumbnail(video_id, dest)
-        elif service == 'tiktok':
-            success = download_tiktok_thumbnail(video_id, dest)
-        elif service == 'twitter':
-            success = download_twitter_thumbnail(video_id, dest)
-        elif service == 'facebook':
-            success = download_facebook_thumbnail(video_id, dest)
-        elif service == 'pornhub':
-            success = download_pornhub_thumbnail(video_id, dest)
-        elif service == 'instagram':
-            success = download_instagram_thumbnail(video_id, dest)
-        elif service == 'vimeo':
-            success = download_vimeo_thumbnail(video_id, dest)
-        elif service == 'dailymotion':
-            success = download_dailymotion_thumbnail(video_id, dest)
-        elif service == 'rutube':
-            success = download_rutube_thumbnail(video_id, dest)
-        elif service == 'twitch':
-            success = download_twitch_thumbnail(video_id, dest)
-        elif service == 'boosty':
-            success = download_boosty_thumbnail(video_id, dest)
-        elif service == 'okru':
-            success = download_okru_thumbnail(video_id, dest)
-        elif service == 'reddit':
-            success = download_reddit_thumbnail(video_id, dest)
-        elif service == 'pikabu':
-            success = download_pikabu_thumbnail(video_id, dest)
-        elif service == 'yandex_zen':
-            success = download_yandex_zen_thumbnail(video_id, dest)
-        elif service == 'google_drive':
-            success = download_google_drive_thumbnail(video_id, dest)
-        elif service == 'redtube':
-            success = download_redtube_thumbnail(video_id, dest)
-        elif service == 'youtube':
-            success = download_youtube_thumbnail(video_id, dest)
-        elif service == 'bilibili':
-            success = download_bilibili_thumbnail(video_id, dest)
-        elif service == 'niconico':
-            success = download_niconico_thumbnail(video_id, dest)
-        elif service == 'xvideos':
-            success = download_xvideos_thumbnail(video_id, dest)
-        elif service == 'xnxx':
-            success = download_xnxx_thumbnail(video_id, dest)
-        elif service == 'youporn':
-            success = download_youporn_thumbnail(video_id, dest)
-        elif service == 'xhamster':
-            success = download_xhamster_thumbnail(video_id, dest)
-        elif service == 'porntube':
-            success = download_porntube_thumbnail(video_id, dest)
-        elif service == 'spankbang':
-            success = download_spankbang_thumbnail(video_id, dest)
-        elif service == 'onlyfans':
-            success = download_onlyfans_thumbnail(video_id, dest)
-        elif service == 'patreon':
-            success = download_patreon_thumbnail(video_id, dest)
-        elif service == 'soundcloud':
-            success = download_soundcloud_thumbnail(video_id, dest)
-        elif service == 'bandcamp':
-            success = download_bandcamp_thumbnail(video_id, dest)
-        elif service == 'mixcloud':
-            success = download_mixcloud_thumbnail(video_id, dest)
-        elif service == 'deezer':
-            success = download_deezer_thumbnail(video_id, dest)
-        elif service == 'spotify':
-            success = download_spotify_thumbnail(video_id, dest)
-        elif service == 'apple_music':
-            success = download_apple_music_thumbnail(video_id, dest)
-        elif service == 'tidal':
-            success = download_tidal_thumbnail(video_id, dest)
+        cache = get_thumbnail_cache()
+        cached = cache.get(service, video_id, max_side)
+        if cached is not None:
+            logger.info(LoggerMsg.THUMBNAIL_DOWNLOADER_CACHE_HIT_LOG_MSG.format(service=service, video_id=video_id))
+        elif not cache.has(service, video_id) and _fetch_into_cache(service, video_id):
+            cached = cache.get(service, video_id, max_side)
         
-        if success:
+        if cached is not None and copy_thumbnail(cached, dest):
             logger.info(LoggerMsg.THUMBNAIL_DOWNLOADER_SUCCESS_LOG_MSG.format(service=service, dest=dest))
             return True
         
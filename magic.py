@@ -3,6 +3,12 @@
 #        GLOBAL IMPORTS
 ###########################################################
 
+# Optional import time report: installed before anything heavy gets imported
+from CONFIG.config import Config
+if getattr(Config, 'IMPORT_TIME_REPORT', False):
+    from HELPERS.import_profiler import install_import_profiler
+    install_import_profiler()
+
 # GLOBAL PATCH TO PREVENT: 'name messages is not defined'
 try:
     from PATCH.GLOBAL_MESSAGES_PATCH import apply_global_messages_patch
@@ -37,7 +43,6 @@ import logging
 import math
 import os
 import re
-import requests
 import shutil
 import subprocess
 import random
@@ -47,15 +52,12 @@ import time
 import signal
 import atexit
 from datetime import datetime
-from PIL import Image
 from types import SimpleNamespace
 from typing import Tuple
 from urllib.parse import urlparse, parse_qs, urlunparse, unquote, urlencode
 import traceback
 # removed pyrebase (migrated to firebase_admin)
-import tldextract
-# from moviepy.editor import VideoFileClip
-from moviepy.video.io.ffmpeg_tools import ffmpeg_extract_subclip
+# yt_dlp, PIL, moviepy, tldextract and chardet are imported by the modules that use them
 from pyrogram import Client, filters, idle
 from pyrogram import enums
 from pyrogram.enums import ChatMemberStatus
@@ -66,12 +68,9 @@ from pyrogram.types import (
     InlineKeyboardButton,
     ReplyKeyboardMarkup
 )
-from yt_dlp import YoutubeDL
-import yt_dlp
 
 # Config is now imported from CONFIG.config
 
-import chardet
 ###########################################################
 #        MODULE IMPORTS
 ###########################################################
@@ -88,7 +87,6 @@ from HELPERS.filesystem_hlp import *
 from HELPERS.limitter import *
 from HELPERS.limitter import ensure_group_admin
 from HELPERS.logger import *
-from HELPERS.porn import *
 from HELPERS.qualifier import *
 from HELPERS.safe_messeger import *
 
@@ -106,55 +104,80 @@ app = Client(
 # Set global app instance BEFORE importing handlers
 set_app(app)
 
+# Handler modules register themselves with @app.on_message / @app.on_callback_query.
+# A normal start imports them all and records the registrations into a manifest;
+# with LAZY_HANDLER_LOADING the handlers are registered from that manifest and
+# each module is imported on first use (see HELPERS/handler_registry.py)
+from HELPERS.handler_registry import HandlerRecorder, lazy_handler, load_handler_manifest, register_lazy_handlers
+handler_recorder = HandlerRecorder(app)
+handler_manifest = load_handler_manifest() if getattr(Config, 'LAZY_HANDLER_LOADING', False) else None
+
 # DATABASE (without handlers)
 from DATABASE.cache_db import *
 from DATABASE.download_firebase import *
 from DATABASE.firebase_init import *
 
-# URL_PARSERS (without handlers)
-from URL_PARSERS.embedder import *
-from URL_PARSERS.nocookie import *
-from URL_PARSERS.normalizer import *
-from URL_PARSERS.tags import *
-from URL_PARSERS.tiktok import *
-from URL_PARSERS.url_extractor import *
-from URL_PARSERS.video_extractor import *
-from URL_PARSERS.youtube import *
-
-# DOWN_AND_UP (without handlers)
-from DOWN_AND_UP.down_and_audio import *
-from DOWN_AND_UP.down_and_up import *
-from DOWN_AND_UP.ffmpeg import *
-from DOWN_AND_UP.sender import *
-from DOWN_AND_UP.yt_dlp_hook import *
-
-# HELPERS (with handlers - import after app setup)
-from HELPERS.caption import *
-
-# COMMANDS (import after app setup)
-from COMMANDS.admin_cmd import *
-from COMMANDS.clean_cmd import *
-from COMMANDS.cookies_cmd import *
-from COMMANDS.format_cmd import *
-from COMMANDS.link_cmd import *
-from COMMANDS.mediainfo_cmd import *
-from COMMANDS.other_handlers import *
-from COMMANDS.proxy_cmd import *
-from COMMANDS.settings_cmd import *
-from COMMANDS.split_sizer import *
-from COMMANDS.subtitles_cmd import *
-from COMMANDS.tag_cmd import *
-# Register handlers via their own modules' decorators only (avoid global catch-all)
-from COMMANDS.proxy_cmd import proxy_command
-from COMMANDS.cookies_cmd import download_cookie
-
-# DOWN_AND_UP (with handlers - import after app setup)
-from DOWN_AND_UP.always_ask_menu import *
+if handler_manifest is not None and not register_lazy_handlers(app, handler_recorder, handler_manifest):
+    # Import the handlers as usual (a new manifest is written once the bot runs)
+    handler_manifest = None
+if handler_manifest is None:
+    from HELPERS.porn import *
+
+    # URL_PARSERS (without handlers)
+    from URL_PARSERS.embedder import *
+    from URL_PARSERS.nocookie import *
+    from URL_PARSERS.normalizer import *
+    from URL_PARSERS.tags import *
+    from URL_PARSERS.tiktok import *
+    from URL_PARSERS.url_extractor import *
+    from URL_PARSERS.video_extractor import *
+    from URL_PARSERS.youtube import *
+
+    # DOWN_AND_UP (without handlers)
+    from DOWN_AND_UP.down_and_audio import *
+    from DOWN_AND_UP.down_and_up import *
+    from DOWN_AND_UP.ffmpeg import *
+    from DOWN_AND_UP.sender import *
+    from DOWN_AND_UP.yt_dlp_hook import *
+
+    # HELPERS (with handlers - import after app setup)
+    from HELPERS.caption import *
+
+    # COMMANDS (import after app setup)
+    from COMMANDS.admin_cmd import *
+    from COMMANDS.clean_cmd import *
+    from COMMANDS.cookies_cmd import *
+    from COMMANDS.format_cmd import *
+    from COMMANDS.link_cmd import *
+    from COMMANDS.mediainfo_cmd import *
+    from COMMANDS.other_handlers import *
+    from COMMANDS.proxy_cmd import *
+    from COMMANDS.settings_cmd import *
+    from COMMANDS.split_sizer import *
+    from COMMANDS.subtitles_cmd import *
+    from COMMANDS.tag_cmd import *
+    # Register handlers via their own modules' decorators only (avoid global catch-all)
+    from COMMANDS.proxy_cmd import proxy_command
+    from COMMANDS.cookies_cmd import download_cookie
+
+    # DOWN_AND_UP (with handlers - import after app setup)
+    from DOWN_AND_UP.always_ask_menu import *
+
+    # COMMANDS used only by the group handlers below
+    import COMMANDS.image_cmd
+    import COMMANDS.nsfw_cmd
+    import COMMANDS.args_cmd
+    import COMMANDS.list_cmd
 
 # Initialize global messages instance
 messages = safe_get_messages(None)
 
 print(messages.MAGIC_ALL_MODULES_LOADED_MSG)
+if getattr(Config, 'IMPORT_TIME_REPORT', False):
+    from HELPERS.import_profiler import import_time_report, uninstall_import_profiler
+    print(import_time_report())
+    # Imports made while the bot runs are not timed
+    uninstall_import_profiler()
 
 ###########################################################
 #        BOT KEYBOARD
@@ -165,20 +188,23 @@ from HELPERS.decorators import reply_with_keyboard, get_main_reply_keyboard, sen
 ###########################################################
 #        GROUP HANDLERS FOR ALLOWED GROUPS
 ###########################################################
-from COMMANDS.image_cmd import image_command
-from COMMANDS.mediainfo_cmd import mediainfo_command
-from COMMANDS.nsfw_cmd import nsfw_command
-from COMMANDS.settings_cmd import settings_command
-from COMMANDS.format_cmd import set_format
-from COMMANDS.split_sizer import split_command
-from COMMANDS.other_handlers import link_command_handler
-from COMMANDS.other_handlers import audio_command_handler, playlist_command
-from COMMANDS.tag_cmd import tags_command
-from URL_PARSERS.url_extractor import url_distractor
-from COMMANDS.subtitles_cmd import subs_command
-from COMMANDS import args_cmd
-from COMMANDS.list_cmd import list_command
-from COMMANDS.cookies_cmd import cookies_from_browser
+# Resolved on first call, so lazy startup does not import the command modules here
+image_command = lazy_handler("COMMANDS.image_cmd", "image_command")
+mediainfo_command = lazy_handler("COMMANDS.mediainfo_cmd", "mediainfo_command")
+nsfw_command = lazy_handler("COMMANDS.nsfw_cmd", "nsfw_command")
+proxy_command = lazy_handler("COMMANDS.proxy_cmd", "proxy_command")
+settings_command = lazy_handler("COMMANDS.settings_cmd", "settings_command")
+set_format = lazy_handler("COMMANDS.format_cmd", "set_format")
+split_command = lazy_handler("COMMANDS.split_sizer", "split_command")
+link_command_handler = lazy_handler("COMMANDS.other_handlers", "link_command_handler")
+audio_command_handler = lazy_handler("COMMANDS.other_handlers", "audio_command_handler")
+playlist_command = lazy_handler("COMMANDS.other_handlers", "playlist_command")
+tags_command = lazy_handler("COMMANDS.tag_cmd", "tags_command")
+url_distractor = lazy_handler("URL_PARSERS.url_extractor", "url_distractor")
+subs_command = lazy_handler("COMMANDS.subtitles_cmd", "subs_command")
+args_command = lazy_handler("COMMANDS.args_cmd", "args_command")
+list_command = lazy_handler("COMMANDS.list_cmd", "list_command")
+cookies_from_browser = lazy_handler("COMMANDS.cookies_cmd", "cookies_from_browser")
 
 def _wrap_group(fn):
     def _inner(app, message):
@@ -218,7 +244,7 @@ if _allowed_groups:
     app.on_message(filters.group & filters.command("audio"))(_wrap_group(lambda a, m: audio_command_handler(a, m) if _is_allowed_group(m) else None))
     app.on_message(filters.group & filters.command("playlist"))(_wrap_group(lambda a, m: playlist_command(a, m) if _is_allowed_group(m) else None))
     app.on_message(filters.group & filters.command("subs"))(_wrap_group(lambda a, m: subs_command(a, m) if _is_allowed_group(m) else None))
-    app.on_message(filters.group & filters.command("args"))(_wrap_group(lambda a, m: args_cmd.args_command(a, m) if _is_allowed_group(m) else None))
+    app.on_message(filters.group & filters.command("args"))(_wrap_group(lambda a, m: args_command(a, m) if _is_allowed_group(m) else None))
     app.on_message(filters.group & filters.command("list"))(_wrap_group(lambda a, m: list_command(a, m) if _is_allowed_group(m) else None))
     app.on_message(filters.group & filters.command("cookies_from_browser"))(_wrap_group(lambda a, m: cookies_from_browser(a, m) if _is_allowed_group(m) else None))
 
@@ -371,6 +397,13 @@ def cleanup_on_exit():
         except Exception as e:
             print(f"⚠️ Error closing HTTP sessions: {e}")
         
+        # Write pending rate/command limiter state
+        try:
+            from HELPERS.limiter_state import flush_limiter_state
+            flush_limiter_state()
+        except Exception as e:
+            print(f"⚠️ Error saving limiter state: {e}")
+        
         # Close Firebase connections
         from DATABASE.cache_db import close_all_firebase_connections
         close_all_firebase_connections()
@@ -403,6 +436,12 @@ signal.signal(signal.SIGTERM, signal_handler)
 if __name__ == "__main__":
     app.start()
     start_channel_guard(app)
+    if handler_manifest is None:
+        # Parsing the handler modules for the manifest should not delay the first updates
+        threading.Thread(target=handler_recorder.save_manifest, name="handler-manifest", daemon=True).start()
+    # Resume auto-deletions scheduled before the last restart
+    from HELPERS.delete_scheduler import get_delete_scheduler
+    get_delete_scheduler()
     idle()
     try:
         app.loop.run_until_complete(stop_channel_guard())
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import time
+from typing import Any, Iterator, Optional, Sequence, TextIO, Tuple
+
+# --------------------------------------------------------------------------------------
+# Streaming reader for the Firebase dump
+# --------------------------------------------------------------------------------------
+#
+# dump.json can be hundreds of MB (mostly bot/<name>/logs). json.load() needs the whole
+# document in memory at once; the reader below walks it in chunks, decodes only the
+# values a caller asks for and skips everything else without building Python objects.
+
+_WS = re.compile(r"[ \t\n\r]*")
+_STRUCT = re.compile(r'[{}\[\]"]')
+_NUMBER = re.compile(r"[-+0-9.eE]*")
+# Rest of a JSON string after its opening quote, up to and including the closing quote
+_STRING_TAIL = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_DECODER = json.JSONDecoder()
+
+
+class JsonStreamReader:
+    """Pull-style JSON reader over a text file object.
+
+    ``iter_object()`` yields the keys of the object at the cursor; for every key
+    the caller must consume the value with ``read_value()``, ``skip_value()`` or
+    a nested ``iter_object()`` before asking for the next key.
+    """
+
+    def __init__(self, fh: TextIO, chunk_size: int = 1 << 20):
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Append at least one chunk (or min_size chars) to the unread part of the buffer."""
+        if self._eof:
+            return False
+        pending = self._buf[self._pos:]
+        parts = [pending]
+        read = 0
+        while read < max(self._chunk_size, min_size):
+            chunk = self._fh.read(self._chunk_size)
+            if not chunk:
+                self._eof = True
+                break
+            parts.append(chunk)
+            read += len(chunk)
+        self._buf = "".join(parts)
+        self._pos = 0
+        return read > 0
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise ValueError("unexpected end of JSON document")
+
+    def _expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """Decode the value at the cursor."""
+        if self.peek() in "-0123456789":
+            # A number may be cut at the chunk boundary: make sure it is followed by something
+            while _NUMBER.match(self._buf, self._pos).end() == len(self._buf) and self._fill():
+                pass
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Value continues past the buffer: grow it geometrically and retry
+                if not self._fill(len(self._buf) - self._pos):
+                    raise
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """Move the cursor past the value at the cursor without decoding it."""
+        if self.peek() not in "{[":
+            self.read_value()
+            return
+        depth = 0
+        while True:
+            match = _STRUCT.search(self._buf, self._pos)
+            if match is None:
+                self._pos = len(self._buf)
+                if not self._fill():
+                    raise ValueError("unexpected end of JSON document")
+                continue
+            char = match.group()
+            if char == '"':
+                tail = _STRING_TAIL.match(self._buf, match.end())
+                if tail is None:
+                    self._pos = match.start()
+                    if not self._fill():
+                        raise ValueError("unterminated string in JSON document")
+                    continue
+                self._pos = tail.end()
+                continue
+            self._pos = match.end()
+            if char in "{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the object at the cursor (values must be consumed by the caller)."""
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise ValueError("expected object key")
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"expected ',' or '}}', found {char!r}")
+
+
+def iter_bot_dump(
+    path: str,
+    bot_name: str,
+    sections: Sequence[str] = ("logs", "blocked_users", "channel_guard"),
+    *,
+    user_id: Optional[str] = None,
+    min_log_ts: int = 0,
+) -> Iterator[Tuple[str, Tuple[str, ...], Any]]:
+    """Stream selected sections of ``bot/<bot_name>`` from a dump file.
+
+    Yields ``("logs", (user_id, ts), payload)`` for every log entry and
+    ``(section, (), value)`` for the other requested sections. Log entries with
+    a timestamp key below ``min_log_ts`` (and users other than ``user_id``, if
+    given) are skipped without being decoded.
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        reader = JsonStreamReader(fh)
+        if reader.peek() != "{":
+            return
+        for root_key in reader.iter_object():
+            if root_key != "bot" or reader.peek() != "{":
+                reader.skip_value()
+                continue
+            for name in reader.iter_object():
+                if name != bot_name or reader.peek() != "{":
+                    reader.skip_value()
+                    continue
+                for section in reader.iter_object():
+                    if section not in sections:
+                        reader.skip_value()
+                        continue
+                    if section != "logs" or reader.peek() != "{":
+                        yield section, (), reader.read_value()
+                        continue
+                    for uid in reader.iter_object():
+                        if (user_id is not None and uid != str(user_id)) or reader.peek() != "{":
+                            reader.skip_value()
+                            continue
+                        for ts in reader.iter_object():
+                            if min_log_ts and _ts_key(ts) < min_log_ts:
+                                reader.skip_value()
+                                continue
+                            yield section, (uid, ts), reader.read_value()
+
+
+def _ts_key(value: str) -> int:
+    try:
+        return int(float(value))
+    except Exception:
+        return 0
+
+
+# --------------------------------------------------------------------------------------
+# Backfill marker
+# --------------------------------------------------------------------------------------
+#
+# Incremental readers (services/stats_collector.py) only parse log entries newer than the
+# newest one they already have. A writer that adds older entries to the dump (a delta sync
+# that fetched the logs of only some of the users) rewrites this file next to the dump, and
+# readers reload the dump in full whenever its content changed.
+
+BACKFILL_MARKER_SUFFIX = ".backfill"
+
+
+def mark_dump_backfilled(dump_path: str) -> None:
+    """Tell incremental readers that dump_path now holds log entries older than its newest ones."""
+    with open(f"{dump_path}{BACKFILL_MARKER_SUFFIX}", "w", encoding="utf-8") as fh:
+        fh.write(str(time.time_ns()))
+
+
+def dump_backfill_stamp(dump_path: str) -> Optional[str]:
+    """Stamp of the last mark_dump_backfilled() on dump_path (None if it was never marked)."""
+    try:
+        with open(f"{dump_path}{BACKFILL_MARKER_SUFFIX}", "r", encoding="utf-8") as fh:
+            return fh.read().strip() or None
+    except OSError:
+        return None
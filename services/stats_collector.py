@@ -4,6 +4,8 @@ import json
 import os
 import threading
 import time
+from array import array
+from bisect import bisect_left
 from collections import Counter, defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
@@ -15,6 +17,7 @@ import requests
 import logging
 
 from CONFIG.config import Config
+from services.dump_reader import dump_backfill_stamp, iter_bot_dump
 
 logger = logging.getLogger(__name__)
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -237,6 +240,162 @@ class ChannelActivity:
     description: str
 
 
+# --------------------------------------------------------------------------------------
+# Columnar download store
+# --------------------------------------------------------------------------------------
+
+_FLAG_NSFW = 1
+_FLAG_PLAYLIST = 2
+_HOUR = 3600
+_DAY = 86400
+
+
+class DownloadStore:
+    """Time-ordered columnar storage for download records.
+
+    Records are kept as parallel arrays (timestamp, interned user and domain
+    ids, a flag byte) together with per-hour and per-day rollups, so period
+    aggregations merge a handful of buckets instead of scanning every record.
+    Records must be appended in timestamp order. Not thread-safe: the owning
+    StatsCollector guards it with its lock.
+    """
+
+    def __init__(self, records: Iterable[DownloadRecord] = ()):
+        self.timestamps = array("q")
+        self._user_idx = array("I")
+        self._domain_idx = array("I")
+        self._flags = bytearray()
+        self._urls: List[str] = []
+        self._titles: List[str] = []
+        self._user_ids: List[int] = []
+        self._user_lookup: Dict[int, int] = {}
+        self._domains: List[str] = [""]
+        self._domain_lookup: Dict[str, int] = {"": 0}
+        # bucket -> (downloads per user idx, downloads per domain idx)
+        self._hourly: Dict[int, Tuple[Counter, Counter]] = {}
+        self._daily: Dict[int, Tuple[Counter, Counter]] = {}
+        self._totals: Tuple[Counter, Counter] = (Counter(), Counter())
+        self._nsfw: Tuple[Counter, Counter] = (Counter(), Counter())
+        self._playlist: Tuple[Counter, Counter] = (Counter(), Counter())
+        self.extend(records)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def last_timestamp(self) -> int:
+        return self.timestamps[-1] if self.timestamps else 0
+
+    def _intern_user(self, user_id: int) -> int:
+        idx = self._user_lookup.get(user_id)
+        if idx is None:
+            idx = self._user_lookup[user_id] = len(self._user_ids)
+            self._user_ids.append(user_id)
+        return idx
+
+    def _intern_domain(self, domain: str) -> int:
+        idx = self._domain_lookup.get(domain)
+        if idx is None:
+            idx = self._domain_lookup[domain] = len(self._domains)
+            self._domains.append(domain)
+        return idx
+
+    def append(self, record: DownloadRecord) -> None:
+        ts = record.timestamp
+        if self.timestamps and ts < self.timestamps[-1]:
+            raise ValueError("records must be appended in timestamp order")
+        uidx = self._intern_user(record.user_id)
+        didx = self._intern_domain(record.domain or "")
+        flags = (_FLAG_NSFW if record.is_nsfw else 0) | (_FLAG_PLAYLIST if record.is_playlist else 0)
+        self.timestamps.append(ts)
+        self._user_idx.append(uidx)
+        self._domain_idx.append(didx)
+        self._flags.append(flags)
+        self._urls.append(record.url)
+        self._titles.append(record.title)
+
+        targets = [
+            self._totals,
+            self._hourly.setdefault(ts // _HOUR, (Counter(), Counter())),
+            self._daily.setdefault(ts // _DAY, (Counter(), Counter())),
+        ]
+        if flags & _FLAG_NSFW:
+            targets.append(self._nsfw)
+        if flags & _FLAG_PLAYLIST:
+            targets.append(self._playlist)
+        for users, domains in targets:
+            users[uidx] += 1
+            if didx:
+                domains[didx] += 1
+
+    def extend(self, records: Iterable[DownloadRecord]) -> None:
+        for record in records:
+            self.append(record)
+
+    def _record_at(self, i: int) -> DownloadRecord:
+        flags = self._flags[i]
+        return DownloadRecord(
+            user_id=self._user_ids[self._user_idx[i]],
+            timestamp=self.timestamps[i],
+            url=self._urls[i],
+            title=self._titles[i],
+            domain=self._domains[self._domain_idx[i]],
+            is_nsfw=bool(flags & _FLAG_NSFW),
+            is_playlist=bool(flags & _FLAG_PLAYLIST),
+        )
+
+    def records(self, since: int = 0) -> List[DownloadRecord]:
+        """Materialize the records with timestamp >= since."""
+        start = bisect_left(self.timestamps, since) if since else 0
+        return [self._record_at(i) for i in range(start, len(self.timestamps))]
+
+    def iter_user_timestamps(self, since: int = 0) -> Iterable[Tuple[int, int]]:
+        """Yield (user_id, timestamp) for records with timestamp >= since."""
+        start = bisect_left(self.timestamps, since) if since else 0
+        user_ids, user_idx, timestamps = self._user_ids, self._user_idx, self.timestamps
+        for i in range(start, len(timestamps)):
+            yield user_ids[user_idx[i]], timestamps[i]
+
+    def _resolve(self, users: Counter, domains: Counter) -> Tuple[Counter, Counter]:
+        return (
+            Counter({self._user_ids[idx]: count for idx, count in users.items()}),
+            Counter({self._domains[idx]: count for idx, count in domains.items()}),
+        )
+
+    def counts_since(self, since: Optional[int] = None) -> Tuple[Counter, Counter]:
+        """Downloads per user id and per domain for records with timestamp >= since.
+
+        The window is split into the raw records before the first full hour,
+        hourly buckets up to the first full day and daily buckets after that.
+        """
+        if not since:
+            return self._resolve(*self._totals)
+        users: Counter = Counter()
+        domains: Counter = Counter()
+        first_hour = -(-since // _HOUR)
+        first_day = -(-since // _DAY)
+        end = bisect_left(self.timestamps, first_hour * _HOUR)
+        for i in range(bisect_left(self.timestamps, since), end):
+            users[self._user_idx[i]] += 1
+            if self._domain_idx[i]:
+                domains[self._domain_idx[i]] += 1
+        buckets = [self._hourly.get(hour) for hour in range(first_hour, first_day * (_DAY // _HOUR))]
+        buckets.extend(bucket for day, bucket in self._daily.items() if day >= first_day)
+        for bucket in buckets:
+            if bucket:
+                users.update(bucket[0])
+                domains.update(bucket[1])
+        return self._resolve(users, domains)
+
+    def flag_counts(self, flag: int) -> Tuple[Counter, Counter]:
+        """Downloads per user id and per domain for records carrying flag."""
+        return self._resolve(*(self._nsfw if flag == _FLAG_NSFW else self._playlist))
+
+    def daily_user_counts(self) -> Dict[int, Counter]:
+        """Downloads per user id for every UTC day (day = timestamp // 86400)."""
+        return {day: self._resolve(users, Counter())[0] for day, (users, _) in self._daily.items()}
+
+
 # --------------------------------------------------------------------------------------
 # Telegram profile fetcher
 # --------------------------------------------------------------------------------------
@@ -327,9 +486,9 @@ class StatsCollector:
         self.active_timeout = int(getattr(Config, "STATS_ACTIVE_TIMEOUT", active_timeout))
 
         self._lock = threading.RLock()
-        self._historical_downloads: List[DownloadRecord] = []
+        # Downloads ingested from the dump (columnar, time-ordered)
+        self._downloads = DownloadStore()
         self._live_downloads: Deque[DownloadRecord] = deque(maxlen=10_000)
-        self._download_timestamps: List[int] = []
         self._active_sessions: Dict[int, ActiveSession] = {}
         self._profiles: Dict[int, ProfileInfo] = {}
         self._blocked_users: Dict[int, BlockRecord] = {}
@@ -337,6 +496,12 @@ class StatsCollector:
         # Timestamp of the first recorded user activity
         self._first_seen: Dict[int, int] = {}
         self._latest_dump_ts: int = 0
+        # (user_id, timestamp) of dump records at _latest_dump_ts, to skip them on incremental reloads
+        self._latest_dump_keys: Set[Tuple[int, int]] = set()
+        # (mtime_ns, size) of the dump at the last reload
+        self._dump_signature: Optional[Tuple[int, int]] = None
+        # Backfill marker of the dump at the last reload (see services/dump_reader.py)
+        self._dump_backfill: Optional[str] = None
         self._last_reload_ts: float = 0
         self._profile_fetcher = TelegramProfileFetcher()
         self._active_sessions_file = Path(
@@ -373,89 +538,122 @@ class StatsCollector:
             except Exception as exc:
                 logger.error(f"[stats] dump reload failed: {exc}")
 
-    def reload_from_dump(self) -> None:
-        if not os.path.exists(self.dump_path):
-            return
+    def reload_from_dump(self, force: bool = False) -> None:
+        """Ingest the dump file.
+
+        The dump is streamed (see services/dump_reader.py) instead of being
+        json.load()-ed, the reload is skipped while its mtime and size are
+        unchanged, and when the file only grew just the log entries newer than
+        ``_latest_dump_ts`` are parsed and appended. Parsing runs without
+        holding ``self._lock``. A changed backfill marker (older entries were
+        added to the dump) means a full reload.
+        """
+        # Read before the dump: a marker written after this reload's dump shows up as changed next time
+        backfill = dump_backfill_stamp(self.dump_path)
         try:
-            with open(self.dump_path, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
-        except Exception as exc:
-            logger.error(f"[stats] unable to read dump {self.dump_path}: {exc}")
+            stat = os.stat(self.dump_path)
+        except OSError:
             return
-        bot_root = (
-            data.get("bot", {})
-            .get(getattr(Config, "BOT_NAME_FOR_USERS", "tgytdlp_bot"), {})
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            previous = self._dump_signature
+            previous_backfill = self._dump_backfill
+            since_ts = self._latest_dump_ts
+            seen_at_since = set(self._latest_dump_keys)
+        if not force and signature == previous and backfill == previous_backfill:
+            return
+        incremental = (
+            not force
+            and previous is not None
+            and stat.st_size >= previous[1]
+            and backfill == previous_backfill
         )
+        if not incremental:
+            since_ts, seen_at_since = 0, set()
+
+        bot_name = getattr(Config, "BOT_NAME_FOR_USERS", "tgytdlp_bot")
         download_records: List[DownloadRecord] = []
-        first_seen: Dict[int, int] = {}
         blocked_users: Dict[int, BlockRecord] = {}
         channel_events: List[ChannelActivity] = []
-        latest_ts = 0
-
-        logs = bot_root.get("logs")
-        if isinstance(logs, dict):
-            for user_id_str, entries in logs.items():
-                if not isinstance(entries, dict):
-                    continue
-                for ts_str, payload in entries.items():
-                    record = self._record_from_payload(user_id_str, ts_str, payload)
+        try:
+            for section, keys, value in iter_bot_dump(self.dump_path, bot_name, min_log_ts=since_ts):
+                if section == "logs":
+                    record = self._record_from_payload(keys[0], keys[1], value)
                     if not record:
                         continue
+                    if record.timestamp == since_ts and (record.user_id, record.timestamp) in seen_at_since:
+                        continue
                     download_records.append(record)
-                    prev = first_seen.get(record.user_id)
-                    if not prev or record.timestamp < prev:
-                        first_seen[record.user_id] = record.timestamp
-                    latest_ts = max(latest_ts, record.timestamp)
-        else:
-            if logs not in (None, {}):
-                logger.debug("[stats] unexpected logs payload type: %s", type(logs).__name__)
-
-        blocked_source = bot_root.get("blocked_users")
-        if isinstance(blocked_source, dict):
-            iterator = blocked_source.items()
-        else:
-            iterator = []
-            if blocked_source not in (None, {}):
-                logger.debug("[stats] unexpected blocked_users payload type: %s", type(blocked_source).__name__)
-        for user_id_str, payload in iterator:
-            if not isinstance(payload, dict):
-                continue
-            uid = _safe_int(user_id_str)
-            blocked_users[uid] = BlockRecord(
-                user_id=uid,
-                timestamp=_safe_int(payload.get("timestamp")),
-                reason=str(payload.get("blocked_reason") or "manual"),
-            )
-
-        channel_guard = bot_root.get("channel_guard")
-        if not isinstance(channel_guard, dict):
-            channel_guard = {}
-            if bot_root.get("channel_guard") not in (None, {}):
-                logger.debug("[stats] unexpected channel_guard payload type: %s", type(bot_root.get("channel_guard")).__name__)
-        leavers = channel_guard.get("leavers")
-        if isinstance(leavers, dict):
-            for user_id_str, payload in leavers.items():
-                if not isinstance(payload, dict):
-                    continue
-                entry = ChannelActivity(
-                    entry_type="leave",
-                    timestamp=float(payload.get("last_left_ts") or payload.get("first_left_ts") or 0),
-                    user_id=_safe_int(user_id_str),
-                    name=payload.get("name"),
-                    username=payload.get("username"),
-                    description="Left the channel",
-                )
-                channel_events.append(entry)
+                elif section == "blocked_users":
+                    if not isinstance(value, dict):
+                        if value not in (None, {}):
+                            logger.debug("[stats] unexpected blocked_users payload type: %s", type(value).__name__)
+                        continue
+                    for user_id_str, payload in value.items():
+                        if not isinstance(payload, dict):
+                            continue
+                        uid = _safe_int(user_id_str)
+                        blocked_users[uid] = BlockRecord(
+                            user_id=uid,
+                            timestamp=_safe_int(payload.get("timestamp")),
+                            reason=str(payload.get("blocked_reason") or "manual"),
+                        )
+                elif section == "channel_guard":
+                    if not isinstance(value, dict):
+                        if value not in (None, {}):
+                            logger.debug("[stats] unexpected channel_guard payload type: %s", type(value).__name__)
+                        continue
+                    leavers = value.get("leavers")
+                    if not isinstance(leavers, dict):
+                        continue
+                    for user_id_str, payload in leavers.items():
+                        if not isinstance(payload, dict):
+                            continue
+                        channel_events.append(
+                            ChannelActivity(
+                                entry_type="leave",
+                                timestamp=float(payload.get("last_left_ts") or payload.get("first_left_ts") or 0),
+                                user_id=_safe_int(user_id_str),
+                                name=payload.get("name"),
+                                username=payload.get("username"),
+                                description="Left the channel",
+                            )
+                        )
+        except Exception as exc:
+            logger.error(f"[stats] unable to read dump {self.dump_path}: {exc}")
+            return
 
+        download_records.sort(key=lambda rec: rec.timestamp)
         channel_events.sort(key=lambda item: item.timestamp)
+        if not incremental:
+            fresh_store = DownloadStore(download_records)
 
         with self._lock:
-            self._historical_downloads = sorted(download_records, key=lambda rec: rec.timestamp)
-            self._download_timestamps = [rec.timestamp for rec in self._historical_downloads]
-            self._blocked_users = blocked_users
+            if incremental:
+                store = self._downloads
+                first_seen = self._first_seen
+                if download_records and download_records[0].timestamp < store.last_timestamp:
+                    store = DownloadStore(
+                        sorted(store.records() + download_records, key=lambda rec: rec.timestamp)
+                    )
+                else:
+                    store.extend(download_records)
+            else:
+                store = fresh_store
+                first_seen = {}
+            for record in download_records:
+                prev = first_seen.get(record.user_id)
+                if not prev or record.timestamp < prev:
+                    first_seen[record.user_id] = record.timestamp
+            self._downloads = store
+            latest_ts = store.last_timestamp
+            self._latest_dump_keys = set(store.iter_user_timestamps(latest_ts)) if latest_ts else set()
             self._latest_dump_ts = latest_ts
+            self._blocked_users = blocked_users
             self._channel_events = deque(channel_events[-500:], maxlen=500)
             self._last_reload_ts = time.time()
+            self._dump_signature = signature
+            self._dump_backfill = backfill
             # Drop live records that already made it into the dump
             self._live_downloads = deque(
                 [rec for rec in self._live_downloads if rec.timestamp > self._latest_dump_ts],
@@ -464,8 +662,10 @@ class StatsCollector:
             # Update first-seen map
             self._first_seen = first_seen
         logger.debug(
-            "[stats] dump reloaded: downloads=%s blocked=%s events=%s latest_ts=%s",
-            len(self._historical_downloads),
+            "[stats] dump reloaded (%s): new downloads=%s total=%s blocked=%s events=%s latest_ts=%s",
+            "incremental" if incremental else "full",
+            len(download_records),
+            len(self._downloads),
             len(self._blocked_users),
             len(self._channel_events),
             self._latest_dump_ts,
@@ -493,11 +693,14 @@ class StatsCollector:
             is_playlist=_is_playlist(url, title),
         )
 
-    def _get_all_downloads(self) -> List[DownloadRecord]:
+    def _get_all_downloads(self, since: int = 0) -> List[DownloadRecord]:
         with self._lock:
-            return list(self._historical_downloads) + list(self._live_downloads)
+            return self._downloads.records(since) + [
+                rec for rec in self._live_downloads if rec.timestamp >= since
+            ]
 
-    def _filter_downloads(self, period: str) -> List[DownloadRecord]:
+    @staticmethod
+    def _period_threshold(period: str) -> Optional[int]:
         delta_map = {
             "today": timedelta(days=1),
             "week": timedelta(days=7),
@@ -506,9 +709,31 @@ class StatsCollector:
         }
         window = delta_map.get(period, None)
         if window is None:
-            return self._get_all_downloads()
-        threshold = int((datetime.now(tz=timezone.utc) - window).timestamp())
-        return [rec for rec in self._get_all_downloads() if rec.timestamp >= threshold]
+            return None
+        return int((datetime.now(tz=timezone.utc) - window).timestamp())
+
+    def _count_downloads(self, period: str) -> Tuple[Counter, Counter]:
+        """Downloads per user id and per domain within the period (dump rollups + live records)."""
+        threshold = self._period_threshold(period)
+        with self._lock:
+            users, domains = self._downloads.counts_since(threshold)
+            live = [rec for rec in self._live_downloads if threshold is None or rec.timestamp >= threshold]
+        for rec in live:
+            users[rec.user_id] += 1
+            if rec.domain:
+                domains[rec.domain] += 1
+        return users, domains
+
+    def _count_flagged(self, flag: int) -> Tuple[Counter, Counter]:
+        with self._lock:
+            users, domains = self._downloads.flag_counts(flag)
+            live = list(self._live_downloads)
+        for rec in live:
+            if (rec.is_nsfw if flag == _FLAG_NSFW else rec.is_playlist):
+                users[rec.user_id] += 1
+                if rec.domain:
+                    domains[rec.domain] += 1
+        return users, domains
 
     def _get_profile(self, user_id: int, hints: Optional[Dict[str, Any]] = None) -> ProfileInfo:
         with self._lock:
@@ -778,10 +1003,7 @@ class StatsCollector:
         now = time.time()
         window = (minutes or 0) * 60
         threshold = now - (window or self.active_timeout)
-        recent_downloads = [
-            rec for rec in self._get_all_downloads()
-            if rec.timestamp >= threshold
-        ]
+        recent_downloads = self._get_all_downloads(int(threshold))
         user_last_activity: Dict[int, Tuple[float, Optional[str], Optional[str], Optional[float], Dict[str, Any]]] = {}
         for rec in recent_downloads:
             existing = user_last_activity.get(rec.user_id, (0, None, None, None, {}))
@@ -872,12 +1094,15 @@ class StatsCollector:
         with self._lock:
             blocked_user_ids = set(self._blocked_users.keys())
         per_user: Dict[int, List[int]] = defaultdict(list)
-        for record in self._get_all_downloads():
-            if record.user_id in blocked_user_ids:
-                continue
-            if window_delta is not None and record.timestamp < window_start:
+        with self._lock:
+            events = list(self._downloads.iter_user_timestamps(window_start))
+            events.extend(
+                (rec.user_id, rec.timestamp) for rec in self._live_downloads if rec.timestamp >= window_start
+            )
+        for user_id, timestamp in events:
+            if user_id in blocked_user_ids:
                 continue
-            per_user[record.user_id].append(record.timestamp)
+            per_user[user_id].append(timestamp)
 
         MIN_EVENTS = 10
         MIN_COVERAGE = 0.5
@@ -925,15 +1150,8 @@ class StatsCollector:
             )
         return result
 
-    def _aggregate_by_user(self, downloads: Iterable[DownloadRecord]) -> Counter:
-        counter: Counter = Counter()
-        for record in downloads:
-            counter[record.user_id] += 1
-        return counter
-
     def get_top_downloaders(self, period: str, limit: int = 10) -> List[Dict[str, Any]]:
-        downloads = self._filter_downloads(period)
-        counter = self._aggregate_by_user(downloads)
+        counter, _ = self._count_downloads(period)
         top = counter.most_common(limit * 2)
         # Filter out blocked users
         with self._lock:
@@ -954,20 +1172,19 @@ class StatsCollector:
         return result
 
     def get_top_domains(self, period: str, limit: int = 10) -> List[Dict[str, Any]]:
-        downloads = self._filter_downloads(period)
-        counter: Counter = Counter(record.domain for record in downloads if record.domain)
+        _, counter = self._count_downloads(period)
         return [{"domain": domain, "count": count} for domain, count in counter.most_common(limit)]
 
     def get_top_countries(self, period: str, limit: int = 10) -> List[Dict[str, Any]]:
-        downloads = self._filter_downloads(period)
+        per_user, _ = self._count_downloads(period)
         with self._lock:
             blocked_user_ids = set(self._blocked_users.keys())
         counter: Counter = Counter()
-        for record in downloads:
-            if record.user_id not in blocked_user_ids:
-                profile = self._get_profile(record.user_id)
+        for user_id, count in per_user.items():
+            if user_id not in blocked_user_ids:
+                profile = self._get_profile(user_id)
                 country = profile.country_code or "UN"
-                counter[country] += 1
+                counter[country] += count
         result = []
         for country, count in counter.most_common(limit):
             flag = _flag_from_country(country if country != "UN" else None)
@@ -975,22 +1192,22 @@ class StatsCollector:
         return result
 
     def get_gender_stats(self, period: str) -> List[Dict[str, Any]]:
-        downloads = self._filter_downloads(period)
+        per_user, _ = self._count_downloads(period)
         with self._lock:
             blocked_user_ids = set(self._blocked_users.keys())
         counter: Counter = Counter()
-        for record in downloads:
-            if record.user_id not in blocked_user_ids:
-                profile = self._get_profile(record.user_id)
-                counter[profile.gender or "unknown"] += 1
+        for user_id, count in per_user.items():
+            if user_id not in blocked_user_ids:
+                profile = self._get_profile(user_id)
+                counter[profile.gender or "unknown"] += count
         return [{"gender": gender, "count": count} for gender, count in counter.most_common()]
 
     def get_age_stats(self, period: str) -> List[Dict[str, Any]]:
         """Account "age" stats: first recorded activity date."""
-        downloads = self._filter_downloads(period)
+        per_user, _ = self._count_downloads(period)
         with self._lock:
             blocked_user_ids = set(self._blocked_users.keys())
-        user_ids = {rec.user_id for rec in downloads if rec.user_id not in blocked_user_ids}
+        user_ids = {user_id for user_id in per_user if user_id not in blocked_user_ids}
         counter: Counter = Counter()
         for user_id in user_ids:
             first_ts = self._first_seen.get(user_id)
@@ -1002,15 +1219,8 @@ class StatsCollector:
             counter[bucket] += 1
         return [{"age_group": group, "count": count} for group, count in counter.most_common()]
 
-    def _filter_downloads_by_flag(
-        self,
-        predicate,
-        limit: int = 10,
-    ) -> List[Dict[str, Any]]:
-        counter: Counter = Counter()
-        for record in self._get_all_downloads():
-            if predicate(record):
-                counter[record.user_id] += 1
+    def _top_flagged_users(self, flag: int, limit: int = 10) -> List[Dict[str, Any]]:
+        counter, _ = self._count_flagged(flag)
         result = []
         for user_id, count in counter.most_common(limit):
             profile = self._get_profile(user_id)
@@ -1018,29 +1228,29 @@ class StatsCollector:
         return result
 
     def get_top_nsfw_users(self, limit: int = 10) -> List[Dict[str, Any]]:
-        return self._filter_downloads_by_flag(lambda rec: rec.is_nsfw, limit=limit)
+        return self._top_flagged_users(_FLAG_NSFW, limit=limit)
 
     def get_top_nsfw_domains(self, limit: int = 10) -> List[Dict[str, Any]]:
-        counter: Counter = Counter()
-        for record in self._get_all_downloads():
-            if record.is_nsfw and record.domain:
-                counter[record.domain] += 1
+        _, counter = self._count_flagged(_FLAG_NSFW)
         return [{"domain": domain, "count": count} for domain, count in counter.most_common(limit)]
 
     def get_top_playlist_users(self, limit: int = 10) -> List[Dict[str, Any]]:
-        return self._filter_downloads_by_flag(lambda rec: rec.is_playlist, limit=limit)
+        return self._top_flagged_users(_FLAG_PLAYLIST, limit=limit)
 
     def get_power_users(self, min_urls: int = 10, days: int = 7, limit: int = 10) -> List[Dict[str, Any]]:
         """Users who sent >M URLs for N consecutive days."""
-        downloads = self._get_all_downloads()
         with self._lock:
             blocked_user_ids = set(self._blocked_users.keys())
-        per_user_per_day: Dict[int, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
-        for record in downloads:
-            if record.user_id in blocked_user_ids:
-                continue
-            day = datetime.fromtimestamp(record.timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
-            per_user_per_day[record.user_id][day] += 1
+            daily = self._downloads.daily_user_counts()
+            live = list(self._live_downloads)
+        per_user_per_day: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        for day, users in daily.items():
+            for user_id, count in users.items():
+                if user_id not in blocked_user_ids:
+                    per_user_per_day[user_id][day] += count
+        for record in live:
+            if record.user_id not in blocked_user_ids:
+                per_user_per_day[record.user_id][record.timestamp // _DAY] += 1
         qualified: List[Tuple[int, int]] = []
         for user_id, day_counts in per_user_per_day.items():
             days_sorted = sorted(day_counts.items())
@@ -1065,33 +1275,28 @@ class StatsCollector:
         """Get a user's download history from dump.json (logs)."""
         result = []
         
-        # Read logs directly from dump.json
+        # Read logs directly from dump.json (only this user's entries are decoded)
         if not os.path.exists(self.dump_path):
             return result
         
         try:
-            with open(self.dump_path, "r", encoding="utf-8") as fh:
-                data = json.load(fh)
+            user_logs = [
+                (keys[1], value)
+                for _, keys, value in iter_bot_dump(
+                    self.dump_path,
+                    getattr(Config, "BOT_NAME_FOR_USERS", "tgytdlp_bot"),
+                    ("logs",),
+                    user_id=str(user_id),
+                )
+            ]
         except Exception as exc:
             logger.error(f"[stats] unable to read dump {self.dump_path}: {exc}")
             return result
         
-        bot_root = (
-            data.get("bot", {})
-            .get(getattr(Config, "BOT_NAME_FOR_USERS", "tgytdlp_bot"), {})
-        )
-        
-        logs = bot_root.get("logs", {})
-        if not isinstance(logs, dict):
-            return result
-        
-        user_id_str = str(user_id)
-        user_logs = logs.get(user_id_str, {})
-        if not isinstance(user_logs, dict):
-            return result
-        
         # Process all user logs
-        for ts_str, payload in user_logs.items():
+        for ts_str, payload in user_logs:
+            if not isinstance(payload, dict):
+                continue
             try:
                 timestamp = int(ts_str)
             except (ValueError, TypeError):
@@ -0,0 +1,33 @@
+import importlib
+import os
+
+import pytest
+
+
+class _App(object):
+    """Stands in for the bot client so modules can apply their handler decorators."""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: (lambda handler: handler)
+
+
+@pytest.fixture(scope="session")
+def import_bot_module(tmp_path_factory):
+    """Import a module that registers bot handlers, without a running bot or its working directory."""
+    pytest.importorskip("pyrogram")
+    from HELPERS.app_instance import get_app, set_app
+
+    if get_app() is None:
+        set_app(_App())
+    workdir = str(tmp_path_factory.mktemp("bot"))
+
+    def import_module(name):
+        # Importing the bot's modules loads (and rewrites) the local database in the working directory
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            return importlib.import_module(name)
+        finally:
+            os.chdir(cwd)
+
+    return import_module
@@ -0,0 +1,107 @@
+"""Always Ask format caches in HELPERS.ask_formats_cache: compact rows, parse once, disk as source of truth."""
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.logger needs it
+
+from HELPERS import ask_formats_cache
+from HELPERS.ask_formats_cache import JsonFileCache, compact_format, read_ask_info, write_ask_info, read_format_lines
+
+URL = "https://example.com/v/1"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(ask_formats_cache, "_files", JsonFileCache(max_files=2))
+
+
+def full_format(**fields):
+    fmt = {"format_id": "137", "ext": "mp4", "vcodec": "avc1.640028", "acodec": "none", "width": 1920,
+           "height": 1080, "url": "https://cdn.example/137", "http_headers": {"User-Agent": "x"},
+           "fragments": [{"url": "https://cdn.example/f1"}], "manifest_url": "https://cdn.example/m.mpd"}
+    fmt.update(fields)
+    return fmt
+
+
+def test_compact_format_keeps_only_menu_fields():
+    assert compact_format(full_format()) == {
+        "format_id": "137", "ext": "mp4", "vcodec": "avc1.640028", "acodec": "none",
+        "width": 1920, "height": 1080, "manifest_url": "",
+    }
+    # The URL is kept when it is the only hint about the quality
+    assert compact_format(full_format(width=None, height=None))["url"] == "https://cdn.example/137"
+
+
+def test_ask_info_is_parsed_once_and_legacy_files_are_compacted(tmp_path, monkeypatch):
+    path = str(tmp_path / "ask_formats.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({URL: {"title": "T", "id": "1", "formats": [full_format()]}}, f)
+    loads = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda f: loads.append(1) or real_load(f))
+
+    first = read_ask_info(path, URL)
+    assert read_ask_info(path, URL) is first and len(loads) == 1
+    assert "fragments" not in first["formats"][0]
+
+    write_ask_info(path, "https://example.com/v/2", {"title": "U", "formats": [full_format(format_id="22")]})
+    assert read_ask_info(path, "https://example.com/v/2")["formats"][0]["format_id"] == "22"
+    assert len(loads) == 1
+    with open(path, encoding="utf-8") as f:
+        assert "http_headers" not in f.read()
+
+
+def test_removed_or_rewritten_files_are_not_served_from_memory(tmp_path):
+    path = str(tmp_path / "formats_cache_x.json")
+    ask_formats_cache.write_format_lines(path, URL, ["18 mp4 640x360"], "t")
+    assert read_format_lines(path, URL) == ["18 mp4 640x360"]
+    assert read_format_lines(path, "https://example.com/other") == []
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"url": URL, "formats": ["22 mp4 1280x720", "18 mp4 640x360"]}, f)
+    assert read_format_lines(path, URL)[0] == "22 mp4 1280x720"
+
+    os.remove(path)
+    assert read_format_lines(path, URL) == []
+
+
+def full_info():
+    return {
+        "id": "abc", "title": "T", "duration": 212.5, "thumbnail": "https://i.example/abc.jpg",
+        "webpage_url": "https://www.youtube.com/watch?v=abc", "original_url": "https://youtu.be/abc",
+        "uploader": "Uploader", "channel": "Channel", "tags": ["one", "two"],
+        "formats": [full_format()], "requested_formats": [full_format()], "http_headers": {"User-Agent": "x"},
+        "_playlist_entries": [
+            {"id": "abc", "url": "https://youtu.be/abc", "formats": [full_format()]},
+            None,
+        ],
+    }
+
+
+# Fields load_ask_info callers read: size estimates, thumbnails, NSFW tags, the unique-URL cache lookup
+MENU_FIELDS = ("id", "title", "duration", "thumbnail", "webpage_url", "original_url", "uploader", "channel", "tags")
+
+
+def test_compact_info_keeps_what_the_menus_read(tmp_path):
+    path = str(tmp_path / "ask_formats.json")
+    write_ask_info(path, URL, full_info())
+    ask_formats_cache._files.forget(path)  # read back from disk
+
+    info = read_ask_info(path, URL)
+
+    assert {name: info[name] for name in MENU_FIELDS} == {name: full_info()[name] for name in MENU_FIELDS}
+    assert info["_playlist_entries"] == [{"id": "abc", "url": "https://youtu.be/abc"}, None]
+    assert "http_headers" not in info and "requested_formats" not in info
+
+
+def test_ask_menu_gets_the_cached_fields(import_bot_module, tmp_path):
+    pytest.importorskip("yt_dlp")
+    menu = import_bot_module("DOWN_AND_UP.always_ask_menu")
+
+    menu.save_ask_info(1, URL, full_info(), download_dir=str(tmp_path))
+    info = menu.load_ask_info(1, URL, download_dir=str(tmp_path))
+
+    assert info["duration"] == 212.5 and info["thumbnail"] == "https://i.example/abc.jpg"
+    assert info["uploader"] == "Uploader" and info["_playlist_entries"][0]["id"] == "abc"
@@ -0,0 +1,86 @@
+"""Delayed message deletion (HELPERS.delete_scheduler): batching, persistence and waiting for the client."""
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.outbound_queue needs it
+
+from HELPERS import delete_scheduler
+from HELPERS.delete_scheduler import DeleteScheduler
+
+
+class Deletes(object):
+    def __init__(self):
+        self.calls = []
+        self.event = threading.Event()
+
+    def __call__(self, chat_id, message_ids):
+        self.calls.append((chat_id, list(message_ids)))
+        self.event.set()
+
+    def wait_for(self, count, timeout=5.0):
+        deadline = time.time() + timeout
+        while len(self.calls) < count and time.time() < deadline:
+            time.sleep(0.02)
+        return self.calls
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    deletes = Deletes()
+    scheduler = DeleteScheduler(deletes, path=str(tmp_path / "pending_deletes.json"))
+    scheduler._client_ready = lambda: True
+    scheduler.deletes = deletes
+    return scheduler
+
+
+def test_due_messages_are_deleted_per_chat_at_most_100_at_a_time(scheduler):
+    with scheduler._cond:  # schedule both chats before the thread looks at the heap
+        scheduler.schedule(1, list(range(250)), 0)
+        scheduler.schedule(2, [7], 0)
+
+    calls = scheduler.deletes.wait_for(4)
+
+    assert sorted(len(ids) for chat_id, ids in calls if chat_id == 1) == [50, 100, 100]
+    assert sorted(i for chat_id, ids in calls if chat_id == 1 for i in ids) == list(range(250))
+    assert [ids for chat_id, ids in calls if chat_id == 2] == [[7]]
+    assert scheduler.pending_count() == 0
+
+
+def test_pending_deletions_survive_a_restart(scheduler, tmp_path):
+    scheduler.schedule(5, [1, 2], 3600)
+    scheduler.schedule(5, [2], 3600)  # already pending
+    scheduler.save()
+
+    restored = DeleteScheduler(Deletes(), path=scheduler._path)
+    restored.load()
+
+    assert restored.pending_count() == 2
+    assert sorted(restored._heap) == sorted(scheduler._heap)
+
+
+def test_a_bad_entry_does_not_drop_the_others(tmp_path):
+    path = tmp_path / "pending_deletes.json"
+    due = time.time() + 3600
+    path.write_text(json.dumps([[due, "@channel", 1], [due, 5, 3], "junk", [due, -100, "4"]]), encoding="utf-8")
+
+    restored = DeleteScheduler(Deletes(), path=str(path))
+    restored.load()
+
+    assert sorted(key[1:] for key in restored._heap) == [(-100, 4), (5, 3)]
+
+
+def test_deletions_wait_until_the_client_is_ready(scheduler, monkeypatch):
+    monkeypatch.setattr(delete_scheduler, "_NOT_READY_RETRY", 0.1)
+    ready = threading.Event()
+    scheduler._client_ready = ready.is_set
+
+    scheduler.schedule(1, [10], 0)
+    assert not scheduler.deletes.event.wait(0.5)
+    assert scheduler.pending_count() == 1
+
+    ready.set()
+    assert scheduler.deletes.event.wait(5)
+    assert scheduler.deletes.calls == [(1, [10])]
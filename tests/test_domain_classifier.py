@@ -0,0 +1,45 @@
+"""Domain classification (HELPERS.domain_classifier): the suffix trie and registered-domain boundaries."""
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.logger needs it
+pytest.importorskip("tldextract")
+
+from HELPERS import domain_classifier
+from HELPERS.domain_classifier import PORN, WHITELIST, DomainSuffixTrie, classify_host, classify_url
+
+
+@pytest.fixture
+def trie():
+    trie = DomainSuffixTrie()
+    trie.add("example.com", WHITELIST)
+    trie.add("*.Videos.Example.com.", PORN)
+    trie.add("xxx", PORN)
+    trie.add("co.uk", PORN)
+    return trie
+
+
+def test_listed_domain_matches_itself_and_its_subdomains(trie):
+    assert trie.lookup("example.com") == {WHITELIST}
+    assert trie.lookup("www.example.com") == {WHITELIST}
+    assert trie.lookup("a.videos.example.com") == {WHITELIST, PORN}
+
+
+def test_other_hosts_do_not_match(trie):
+    assert trie.lookup("notexample.com") == frozenset()
+    assert trie.lookup("example.com.evil.org") == frozenset()
+    assert trie.lookup("com") == frozenset()
+
+
+def test_entries_above_the_registered_domain_are_ignored(trie):
+    assert trie.lookup("site.xxx") == {PORN}
+    assert trie.lookup("site.xxx", min_labels=2) == frozenset()
+    assert trie.lookup("shop.co.uk", min_labels=3) == frozenset()
+
+
+def test_classify_host_matches_from_the_registered_domain(trie, monkeypatch):
+    monkeypatch.setattr(domain_classifier, "_trie", trie)
+
+    assert classify_host("site.xxx") == frozenset()
+    assert classify_host("news.bbc.co.uk") == frozenset()
+    assert classify_host("WWW.Example.com") == {WHITELIST}
+    assert classify_url("https://user@videos.example.com:8443/v/1") == {WHITELIST, PORN}
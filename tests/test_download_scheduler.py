@@ -0,0 +1,47 @@
+"""Download slots (HELPERS.download_scheduler): nested acquires and releases from other threads."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.logger needs it
+
+from HELPERS.download_scheduler import DownloadScheduler, _domain_key
+
+
+def test_nested_acquire_reuses_the_held_slot():
+    scheduler = DownloadScheduler(global_slots=1)
+    with scheduler.acquire(1, "https://example.com/a"):
+        inner = scheduler.acquire(1, "https://example.com/b")  # would wait forever if it queued
+        assert not inner.held
+        inner.release()
+        assert scheduler.stats()["running"] == 1
+    assert scheduler.stats()["running"] == 0
+
+
+def test_slot_released_elsewhere_does_not_exempt_the_thread():
+    scheduler = DownloadScheduler(global_slots=1)
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        slot = pool.submit(scheduler.acquire, 1, "https://example.com/a").result()
+        slot.release()  # from this thread, not the pool thread that acquired it
+
+        other = scheduler.acquire(2, "https://example.com/b")
+        queued = pool.submit(scheduler.acquire, 1, "https://example.com/c")
+        time.sleep(0.2)
+        # The pool thread queues behind the slot now held by this thread
+        assert not queued.done() and scheduler.stats()["waiting"] == 1
+        other.release()
+        queued.result(timeout=5).release()
+    finally:
+        pool.shutdown(wait=True)
+    assert scheduler.stats()["running"] == 0
+
+
+def test_downloads_are_counted_against_the_registered_domain():
+    assert _domain_key("https://www.youtube.com/watch?v=1") == "youtube.com"
+    assert _domain_key("https://m.youtube.com/watch?v=1") == "youtube.com"
+    assert _domain_key("https://youtu.be/1") == "youtube.com"
+    assert _domain_key("https://cdn.example.co.uk/a") == "example.co.uk"
+    assert _domain_key("http://127.0.0.1:8080/a") == "127.0.0.1"
+    assert _domain_key("") == "unknown"
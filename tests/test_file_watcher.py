@@ -0,0 +1,91 @@
+"""Completion events from HELPERS.file_watcher: inotify, polling fallback, producer reports."""
+import os
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.logger needs it
+
+from HELPERS import file_watcher
+from HELPERS.file_watcher import FileWatcher
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def make_watcher(request, monkeypatch):
+    if request.param == "polling":
+        monkeypatch.setattr(file_watcher, "_libc", False)
+    elif file_watcher._inotify_libc() is None:
+        pytest.skip("inotify is not available")
+    watchers = []
+
+    def make(root, **kwargs):
+        watcher = FileWatcher(str(root), poll_interval=0.05, **kwargs)
+        watchers.append(watcher)
+        return watcher
+
+    yield make
+    for watcher in watchers:
+        watcher.close()
+
+
+def write(path, data=b"data"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def test_files_are_reported_once_when_complete(make_watcher, tmp_path):
+    watcher = make_watcher(tmp_path)
+    album = tmp_path / "instagram" / "user"
+    write(album / "1.jpg.part")
+    os.rename(album / "1.jpg.part", album / "1.jpg")
+    watcher.notify(str(album / "1.jpg"))
+
+    assert watcher.completed(timeout=5) == [os.path.join(str(tmp_path), "instagram", "user", "1.jpg")]
+    watcher.settle()
+    assert watcher.completed() == []
+
+
+def test_waiting_call_wakes_up_on_a_producer_report(make_watcher, tmp_path):
+    watcher = make_watcher(tmp_path)
+    target = tmp_path / "2.mp4"
+
+    def producer():
+        time.sleep(0.2)
+        write(target)
+        watcher.notify(str(target))
+
+    threading.Thread(target=producer).start()
+    started = time.monotonic()
+    assert watcher.completed(timeout=10) == [str(target)]
+    assert time.monotonic() - started < 5
+
+
+def test_created_follows_new_fragments(make_watcher, tmp_path):
+    watcher = make_watcher(tmp_path, recursive=False, track_created=True)
+    write(tmp_path / "video.mp4.part-Frag1.part")
+    write(tmp_path / "video.mp4.part-Frag2.part")
+    deadline = time.monotonic() + 5
+    names = []
+    while len(names) < 2 and time.monotonic() < deadline:
+        names += watcher.created()
+        time.sleep(0.05)
+    assert sorted(names) == ["video.mp4.part-Frag1.part", "video.mp4.part-Frag2.part"]
+    # Temporary files never complete under their own name
+    watcher.settle()
+    assert watcher.completed() == []
+
+
+def test_notify_after_close_writes_nothing(make_watcher, tmp_path):
+    watcher = make_watcher(tmp_path)
+    watcher.close()
+    # The closed pipe's fd numbers are free to be reused by unrelated files
+    others = [open(tmp_path / f"other{i}", "wb") for i in range(3)]
+    try:
+        write(tmp_path / "late.jpg")
+        watcher.notify(str(tmp_path / "late.jpg"))
+    finally:
+        for f in others:
+            f.close()
+    assert all((tmp_path / f"other{i}").read_bytes() == b"" for i in range(3))
+    assert watcher.completed() == []
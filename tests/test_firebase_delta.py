@@ -0,0 +1,93 @@
+"""Firebase delta sync (DATABASE.download_firebase): merging fetched changes and batching log requests."""
+import copy
+import json
+
+import pytest
+
+from CONFIG.config import Config
+from DATABASE import download_firebase
+from DATABASE.download_firebase import _merge_delta, _next_log_batch, save_dump, sync_firebase_delta
+
+
+def test_log_requests_rotate_through_users():
+    download_firebase._log_sync_cursor.clear()
+    uids = ["a", "b", "c", "d", "e"]
+
+    batches = [_next_log_batch("bot1", uids, 2) for _ in range(3)]
+
+    assert batches == [["a", "b"], ["c", "d"], ["e", "a"]]
+    assert _next_log_batch("bot1", ["a", "b"], 2) == ["a", "b"]
+
+
+def test_merge_applies_fetched_changes():
+    cache = {"bot": {
+        "bot1": {"logs": {"1": {"10": "old"}, "gone": {"1": "x"}}, "users": {"1": {}}},
+        "video_cache": {"h1": {"720p": "1"}, "h2": {"720p": "2"}},
+        "removed": {},
+    }}
+    nodes = {"bot1": (
+        {"logs": True, "users": True},
+        {"users": {"2": {}}},
+        ({"1": True, "2": True}, {"1": {"10": "old", "11": "new"}, "2": {"5": "new"}}),
+    )}
+
+    delta = _merge_delta(cache, {"bot1": True, "video_cache": True}, {"h1": {"720p": "3"}}, nodes)
+
+    assert delta == {"changed_hashes": {"h1"}, "removed_hashes": {"h2"}, "new_logs": 2}
+    assert cache == {"bot": {
+        "bot1": {"logs": {"1": {"10": "old", "11": "new"}, "2": {"5": "new"}}, "users": {"2": {}}},
+        "video_cache": {"h1": {"720p": "3"}},
+    }}
+
+
+def log(uid, ts):
+    return {"ID": str(uid), "timestamp": str(ts), "name": f"user{uid}", "urls": "https://example.com/v", "title": "v"}
+
+
+def serve(remote):
+    """_rest_get over an in-memory database (shallow and orderBy="$key"/startAt queries only)."""
+    def get(session, database_url, id_token, path, **params):
+        node = remote
+        for key in path.strip("/").split("/"):
+            node = node.get(key) if isinstance(node, dict) else None
+        if params.get("shallow") and isinstance(node, dict):
+            return {key: True for key in node}
+        if "startAt" in params:
+            start = json.loads(params["startAt"])
+            node = {key: value for key, value in node.items() if key >= start}
+        return copy.deepcopy(node)
+    return get
+
+
+def test_a_sync_spanning_several_batches_reaches_the_stats(tmp_path, monkeypatch):
+    pytest.importorskip("pyrogram")  # HELPERS.http_manager needs it
+    pytest.importorskip("firebase_admin")  # download_firebase disables the sync without it
+    from services.stats_collector import StatsCollector
+
+    remote = {"bot": {"test_bot": {"logs": {
+        "100": {"1700000000": log(100, 1700000000), "1700030000": log(100, 1700030000)},
+        "200": {"1700020000": log(200, 1700020000)},
+        "300": {"1700010000": log(300, 1700010000)},  # older than what the first batch brings
+    }}}}
+    monkeypatch.setattr(download_firebase, "FIREBASE_CONFIG", {"databaseURL": "https://db", "apiKey": "key"})
+    monkeypatch.setattr(download_firebase, "_sign_in", lambda session: "token")
+    monkeypatch.setattr(download_firebase, "_rest_get", serve(remote))
+    monkeypatch.setattr(Config, "FIREBASE_SYNC_MAX_LOG_REQUESTS", 2, raising=False)
+    monkeypatch.setattr(Config, "BOT_NAME_FOR_USERS", "test_bot", raising=False)
+    monkeypatch.setattr(Config, "ACTIVE_SESSIONS_FILE", str(tmp_path / "active_sessions.json"), raising=False)
+    download_firebase._log_sync_cursor.clear()
+
+    cache = {"bot": {"test_bot": {"logs": {"100": {"1700000000": log(100, 1700000000)}}}}}
+    dump_path = str(tmp_path / "dump.json")
+    save_dump(cache, dump_path)
+    collector = StatsCollector(dump_path=dump_path, start_background=False)
+
+    for _ in range(2):  # users 100 and 200, then 300
+        delta = sync_firebase_delta(cache, lock=None)
+        assert delta["backfill"]
+        save_dump(cache, dump_path, backfill=delta["backfill"])
+        collector.reload_from_dump()
+
+    assert cache == remote
+    counts = {item["user_id"]: item["count"] for item in collector.get_top_downloaders("all", limit=5)}
+    assert counts == {100: 2, 200: 1, 300: 1}
@@ -0,0 +1,55 @@
+"""Line protocol of the long-lived gallery-dl worker (DOWN_AND_UP/gallery_dl_worker.py)."""
+import json
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("gallery_dl")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "DOWN_AND_UP"))
+import gallery_dl_worker  # noqa: E402  (run as a script in production, not as part of the package)
+
+
+class ProtocolOut(object):
+    def __init__(self):
+        self.messages = []
+
+    def write(self, text):
+        self.messages.extend(json.loads(line) for line in text.splitlines())
+
+    def flush(self):
+        pass
+
+
+@pytest.fixture
+def worker():
+    out = ProtocolOut()
+    return gallery_dl_worker.Worker(out), out
+
+
+def test_each_printed_line_is_streamed_before_the_result(worker, tmp_path):
+    wk, out = worker
+    wk.run_job({"id": 7, "args": ["--simulate", "https://example.org/media/a.jpg"], "config": {"base-directory": str(tmp_path)}})
+    assert [m["type"] for m in out.messages] == ["line", "done"]
+    assert out.messages[0]["text"].endswith("a.jpg") and out.messages[1] == {"id": 7, "type": "done", "code": 0, "stderr": ""}
+
+
+def test_worker_survives_bad_command_lines(worker, tmp_path):
+    wk, out = worker
+    original_stdin, original_stdout = sys.stdin, sys.stdout
+    wk.run_job({"id": 1, "args": ["--no-such-option", "https://example.org/a.jpg"], "config": {}})
+    wk.run_job({"id": 2, "args": ["--simulate", "https://example.org/b.jpg"], "config": {"base-directory": str(tmp_path)}})
+    done = [m for m in out.messages if m["type"] == "done"]
+    assert done[0]["code"] == 2 and "--no-such-option" in done[0]["stderr"]
+    assert done[1]["code"] == 0
+    assert (sys.stdin, sys.stdout) == (original_stdin, original_stdout)
+
+
+def test_sessions_are_shared_only_across_ranges_of_the_same_command():
+    scope = gallery_dl_worker._session_scope
+    url = "https://example.org/user"
+    first = scope("cfg.json", ["--range", "1-10", "--cookies", "users/1/cookie.txt", url])
+    assert first == scope("cfg.json", ["--range", "11-20", "--cookies", "users/1/cookie.txt", url])
+    assert first != scope("cfg.json", ["--range", "1-10", "--cookies", "users/2/cookie.txt", url])
+    assert first != scope("cfg.json", ["--range", "1-10", url])
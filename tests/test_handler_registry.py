@@ -0,0 +1,126 @@
+"""Lazy handler registration (HELPERS.handler_registry) from a handler manifest."""
+import asyncio
+import importlib
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pyrogram")
+
+from HELPERS.handler_registry import (
+    HandlerRecorder, _module_fingerprint, lazy_handler, load_handler_manifest, register_lazy_handlers,
+)
+
+
+class Recorder(object):
+    def __init__(self):
+        self.lazy_modules = set()
+        self.added = []
+
+    def _add_handler(self, handler, group):
+        self.added.append((handler, group))
+
+
+def manifest(*filter_exprs):
+    return {
+        "modules": {"COMMANDS.example_cmd": "fingerprint"},
+        "handlers": [
+            {"module": "COMMANDS.example_cmd", "name": f"handler_{i}", "kind": "message",
+             "group": 0, "filters": expr, "is_async": False}
+            for i, expr in enumerate(filter_exprs)
+        ],
+    }
+
+
+def test_handlers_are_registered_without_importing_their_module():
+    recorder = Recorder()
+
+    assert register_lazy_handlers(None, recorder, manifest("filters.private", None))
+    assert len(recorder.added) == 2
+    assert recorder.lazy_modules == {"COMMANDS.example_cmd"}
+
+
+def test_a_filter_that_cannot_be_rebuilt_registers_nothing():
+    recorder = Recorder()
+
+    assert not register_lazy_handlers(None, recorder, manifest("filters.private", "filters.private &"))
+    assert recorder.added == [] and not recorder.lazy_modules
+
+
+HANDLER_MODULE = """
+from types import SimpleNamespace
+
+imported = True
+
+
+def handler(value):
+    return value * 2
+
+
+async def async_handler(value):
+    return value * 3
+
+
+def register(app):
+    app.add_handler(SimpleNamespace(callback=handler), 0)
+"""
+
+
+@pytest.fixture
+def handler_module(tmp_path, monkeypatch):
+    """Name of a fresh, not yet imported handler module."""
+    name = "lazy_handlers_example"
+    (tmp_path / f"{name}.py").write_text(HANDLER_MODULE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+    monkeypatch.delitem(sys.modules, name, raising=False)
+    yield name
+    sys.modules.pop(name, None)
+
+
+class App(object):
+    def __init__(self):
+        self.added = []
+
+    def add_handler(self, handler, group=0):
+        self.added.append((handler, group))
+
+
+def test_proxy_imports_its_module_on_first_call(handler_module):
+    proxy = lazy_handler(handler_module, "handler")
+    async_proxy = lazy_handler(handler_module, "async_handler", is_async=True)
+    assert handler_module not in sys.modules
+
+    assert proxy(2) == 4
+    assert sys.modules[handler_module].imported
+    assert asyncio.run(async_proxy(2)) == 6
+
+
+def test_module_imported_after_lazy_registration_does_not_register_twice(handler_module):
+    app = App()
+    recorder = HandlerRecorder(app)
+    lazy = {"modules": {handler_module: "fingerprint"}, "handlers": [
+        {"module": handler_module, "name": "handler", "kind": "message", "group": 0, "filters": None, "is_async": False},
+    ]}
+    assert register_lazy_handlers(None, recorder, lazy)
+    assert len(app.added) == 1
+
+    importlib.import_module(handler_module).register(app)  # what its @app.on_message decorators do
+
+    assert len(app.added) == 1 and recorder.entries == []
+    app.add_handler(SimpleNamespace(callback=test_proxy_imports_its_module_on_first_call))
+    assert len(app.added) == 2 and len(recorder.entries) == 1
+
+
+def test_manifest_is_rejected_once_a_module_changed(handler_module, tmp_path):
+    path = tmp_path / "manifest.json"
+    saved = {"modules": {handler_module: _module_fingerprint(handler_module)}, "handlers": []}
+    path.write_text(json.dumps(saved), encoding="utf-8")
+    assert load_handler_manifest(str(path)) == saved
+
+    with open(tmp_path / f"{handler_module}.py", "a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+
+    assert load_handler_manifest(str(path)) is None
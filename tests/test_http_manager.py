@@ -0,0 +1,76 @@
+"""Keep-alive pools of HELPERS.http_manager: connection reuse and idle reaping."""
+import http.server
+import socketserver
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.logger needs it
+
+from HELPERS.http_manager import ManagedHTTPSession
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    close_after_reply = False
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+        # Closing without "Connection: close" leaves the client's pooled socket in CLOSE-WAIT
+        self.close_connection = self.close_after_reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(close_after_reply=False):
+        handler = type("TestHandler", (Handler,), {"close_after_reply": close_after_reply})
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def manager():
+    manager = ManagedHTTPSession("test")
+    yield manager
+    manager.close()
+
+
+def test_requests_reuse_pooled_connections(serve, manager):
+    url = serve()
+    session = manager.get_session()
+    for _ in range(5):
+        assert session.get(url, timeout=5).text == "ok"
+
+    stats = manager.stats()
+    assert (stats["requests"], stats["opened"], stats["reused"]) == (5, 1, 4)
+    assert stats["idle"] == 1 and stats["in_use"] == 0
+
+
+def test_idle_and_server_closed_connections_are_reaped(serve, manager):
+    session = manager.get_session()
+    session.get(serve(), timeout=5)
+    session.get(serve(close_after_reply=True), timeout=5)
+    time.sleep(0.2)
+
+    assert manager._reap_idle() == 1  # only the one the server closed
+    manager.idle_timeout = 0
+    time.sleep(0.01)
+    assert manager._reap_idle() == 1
+    assert manager.stats()["idle"] == 0 and manager.stats()["reaped"] == 2
@@ -0,0 +1,91 @@
+"""/img media preparation (COMMANDS.image_cmd): conversion outputs, probe caching and per-file preparation."""
+import os
+import subprocess
+
+import pytest
+
+pytest.importorskip("pyrogram")
+pytest.importorskip("gallery_dl")
+
+
+@pytest.fixture(scope="module")
+def image_cmd(import_bot_module):
+    return import_bot_module("COMMANDS.image_cmd")
+
+
+@pytest.fixture(autouse=True)
+def clear_probe_cache(image_cmd):
+    image_cmd._probe_cache.clear()
+    yield
+    image_cmd._probe_cache.clear()
+
+
+@pytest.fixture
+def ffprobe_calls(image_cmd, monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd[-1])
+        return subprocess.CompletedProcess(cmd, 0, stdout='{"format": {"duration": "%d"}}' % len(calls), stderr="")
+
+    monkeypatch.setattr(image_cmd.subprocess, "run", fake_run)
+    return calls
+
+
+def test_conversion_outputs_follow_both_conversions(image_cmd):
+    folder = os.path.join("run", "dir")
+
+    assert image_cmd._conversion_outputs(os.path.join(folder, "a.webm")) == [
+        os.path.join(folder, "a.mp4"), os.path.join(folder, "a._fast.mp4")]
+    assert image_cmd._conversion_outputs(os.path.join(folder, "b.webp")) == [os.path.join(folder, "b.jpg")]
+    assert image_cmd._conversion_outputs(os.path.join(folder, "c.jpg")) == []
+
+
+def test_ffprobe_results_are_cached_per_file_version(image_cmd, tmp_path, ffprobe_calls):
+    video = tmp_path / "v.mp4"
+    video.write_bytes(b"x" * 10)
+
+    first = image_cmd._ffprobe_json(str(video))
+    assert image_cmd._ffprobe_json(str(video)) == first
+    assert len(ffprobe_calls) == 1
+
+    video.write_bytes(b"x" * 20)  # another size: another version of the file
+    assert image_cmd._ffprobe_json(str(video)) != first
+    assert len(ffprobe_calls) == 2
+
+
+def test_missing_files_are_not_cached(image_cmd, tmp_path, ffprobe_calls):
+    missing = str(tmp_path / "gone.mp4")
+
+    image_cmd._ffprobe_json(missing)
+    image_cmd._ffprobe_json(missing)
+
+    assert len(ffprobe_calls) == 2
+    assert not image_cmd._probe_cache
+
+
+def test_prepare_media_file_converts_and_probes_videos(image_cmd, tmp_path, monkeypatch):
+    src = str(tmp_path / "clip.webm")
+    converted = str(tmp_path / "clip.mp4")
+    done = []
+    monkeypatch.setattr(image_cmd, "convert_file_to_telegram_format",
+                        lambda path: converted if path == src else path)
+    monkeypatch.setattr(image_cmd, "_probe_video_info", lambda path: done.append(("probe", path)))
+    monkeypatch.setattr(image_cmd, "generate_video_thumbnail", lambda path: done.append(("thumb", path)) or "t.jpg")
+    monkeypatch.setattr(image_cmd, "ensure_paid_cover_embedded", lambda path, thumb: done.append(("cover", thumb)))
+
+    assert image_cmd._prepare_media_file(src) == (converted, "video", src, [converted, src])
+    assert done == [("probe", converted), ("thumb", converted)]
+
+    done.clear()
+    image_cmd._prepare_media_file(src, paid=True)
+    assert done[-1] == ("cover", "t.jpg")
+
+
+def test_prepare_media_file_keeps_other_files(image_cmd, tmp_path, monkeypatch):
+    monkeypatch.setattr(image_cmd, "convert_file_to_telegram_format", lambda path: path)
+    photo = str(tmp_path / "p.jpg")
+    doc = str(tmp_path / "d.pdf")
+
+    assert image_cmd._prepare_media_file(photo) == (photo, "photo", photo, [photo])
+    assert image_cmd._prepare_media_file(doc) == (doc, "other", doc, [doc])
@@ -0,0 +1,90 @@
+"""Extraction cache in HELPERS.info_cache: sharing, single-flight, expiry."""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.logger needs it
+
+from HELPERS import info_cache
+from HELPERS.info_cache import InfoDictCache, extract_info_cached
+
+
+class FakeYDL(object):
+    """Stands in for yt_dlp.YoutubeDL: counts extractions, 'processes' by picking a format."""
+
+    extractions = 0
+
+    def __init__(self, params, delay=0.0, formats=None):
+        self.params = params
+        self.delay = delay
+        self.formats = formats or [{"format_id": "18", "url": "https://cdn.example/v.mp4"}]
+
+    def extract_info(self, url, download=False, process=True):
+        assert process is False
+        FakeYDL.extractions += 1
+        time.sleep(self.delay)
+        return {"id": "x", "webpage_url": url, "formats": [dict(f) for f in self.formats]}
+
+    def process_ie_result(self, info, download=False):
+        info["format_id"] = self.params.get("format", "best")
+        return info
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(info_cache, "_info_cache", InfoDictCache(max_entries=2, ttl=600))
+    FakeYDL.extractions = 0
+
+
+def test_callers_with_different_processing_share_one_extraction():
+    first = extract_info_cached(FakeYDL({"format": "best"}), "https://example.com/v/1")
+    second = extract_info_cached(FakeYDL({"format": "bv*+ba"}), "https://example.com/v/1")
+    assert FakeYDL.extractions == 1
+    assert (first["format_id"], second["format_id"]) == ("best", "bv*+ba")
+    first["formats"].clear()
+    assert extract_info_cached(FakeYDL({}), "https://example.com/v/1")["formats"]
+
+
+def test_cookie_and_proxy_identity_are_part_of_the_key(tmp_path):
+    cookies = tmp_path / "cookie.txt"
+    cookies.write_text("a")
+    extract_info_cached(FakeYDL({"cookiefile": str(cookies)}), "https://example.com/v/1")
+    extract_info_cached(FakeYDL({"cookiefile": str(cookies), "proxy": "socks5://p:1"}), "https://example.com/v/1")
+    cookies.write_text("changed")
+    extract_info_cached(FakeYDL({"cookiefile": str(cookies)}), "https://example.com/v/1")
+    assert FakeYDL.extractions == 3
+
+
+def test_playlist_url_is_not_served_the_plain_video():
+    video = extract_info_cached(FakeYDL({}), "https://www.youtube.com/watch?v=abc")
+    playlist = extract_info_cached(FakeYDL({}), "https://www.youtube.com/watch?v=abc&list=PL123")
+    assert FakeYDL.extractions == 2
+    assert playlist["webpage_url"].endswith("list=PL123") and not video["webpage_url"].endswith("list=PL123")
+
+
+def test_concurrent_requests_share_the_extraction_in_flight():
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(extract_info_cached(FakeYDL({}, delay=0.2), "https://example.com/v/2")))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert FakeYDL.extractions == 1
+    assert len(results) == 5 and len({id(r) for r in results}) == 5
+
+
+def test_entries_expire_with_signed_urls_and_lru_is_bounded():
+    soon = int(time.time()) + 60  # inside the expiry margin
+    signed = [{"format_id": "22", "url": f"https://rr1.example/videoplayback?expire={soon}&sig=x"}]
+    extract_info_cached(FakeYDL({}, formats=signed), "https://example.com/v/3")
+    extract_info_cached(FakeYDL({}, formats=signed), "https://example.com/v/3")
+    assert FakeYDL.extractions == 2
+
+    for n in (4, 5, 6):
+        extract_info_cached(FakeYDL({}), f"https://example.com/v/{n}")
+    extract_info_cached(FakeYDL({}), "https://example.com/v/4")
+    assert FakeYDL.extractions == 6
@@ -0,0 +1,130 @@
+"""Keyword matchers used by HELPERS.porn.
+
+Run this file directly for a benchmark against the previous per-call regex
+implementation:  python tests/test_keyword_matcher.py
+"""
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from HELPERS.keyword_matcher import TextKeywordMatcher, UrlKeywordMatcher
+
+KEYWORDS = [
+    "porn", "pornhub", "sex", "fuck", "slut", "whore", "tits", "boobs", "vagina",
+    "penis", "dildo", "big tits", "hot milf", "18+", "# porn", "секс", "ебля",
+    "трахает", "порно", "xxx", "milf", "anal", "nude", "nsfw",
+]
+WHITE_KEYWORDS = ["a55", "hassas", "assasinate", "assassination"]
+
+TITLES = [
+    "Lo-fi hip hop radio - beats to relax/study to",
+    "How to assemble a PC in 2024 (step by step)",
+    "Big Tits compilation vol. 3",
+    "Middlesex University graduation ceremony",
+    "Essex vs Sussex - County Championship highlights",
+    "Порно не найдено: обзор новостей недели",
+    "Секс в большом городе — трейлер",
+    "Vinyl unboxing: 18+ edition",
+    "NSFW_warning: spoilers ahead",
+    "The assassination of Franz Ferdinand explained",
+    "Top 10 dildo-shaped vegetables (not clickbait)",
+    "sextant navigation for beginners",
+]
+URLS = [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://example.com/videos/big-tits-hd.mp4",
+    "https://example.com/videos/big__tits/123",
+    "https://example.com/sextant/manual.pdf",
+    "https://cdn.example.org/media/hot_milf_2024.html",
+    "https://example.ru/%D0%BF%D0%BE%D1%80%D0%BD%D0%BE/",
+    "https://example.ru/порно-видео/1",
+    "https://example.com/tag/18+/page/2",
+    "https://example.com/watch?id=XXX-123",
+]
+
+
+def legacy_text_search(keywords, text):
+    kws = [re.escape(kw.lower()) for kw in keywords if kw.strip()]
+    pattern = re.compile(r"\b(" + "|".join(kws) + r")\b", flags=re.IGNORECASE)
+    return pattern.search(text) is not None
+
+
+def legacy_url_search(keywords, url):
+    for raw_kw in [kw.lower() for kw in keywords if kw.strip()]:
+        words = [re.escape(w) for w in raw_kw.split() if w]
+        core = r"[^A-Za-z0-9]+".join(words)
+        if re.search(rf"(?<![A-Za-z0-9])(?:{core})(?![A-Za-z0-9])", url, flags=re.IGNORECASE):
+            return True
+    return False
+
+
+def _random_corpus(count, seed=7):
+    rng = random.Random(seed)
+    pieces = KEYWORDS + WHITE_KEYWORDS + ["a", "ex", "x", "_", "-", "/", " ", "+", "#", "й", "0"]
+    return ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 8))) for _ in range(count)]
+
+
+def test_text_matcher_agrees_with_word_boundary_regex():
+    matcher = TextKeywordMatcher(KEYWORDS)
+    for text in [t.lower() for t in TITLES] + _random_corpus(2000):
+        assert (matcher.search(text) is not None) == legacy_text_search(KEYWORDS, text), text
+
+
+def test_url_matcher_agrees_with_delimiter_regex():
+    matcher = UrlKeywordMatcher(KEYWORDS)
+    for url in [u.lower() for u in URLS] + _random_corpus(2000, seed=11):
+        assert (matcher.search(url) is not None) == legacy_url_search(KEYWORDS, url), url
+
+
+def test_findall_reports_distinct_keywords():
+    matcher = TextKeywordMatcher(KEYWORDS)
+    assert matcher.findall("big tits, more tits and porn") == ["big tits", "tits", "porn"]
+    assert matcher.findall("sextant") == []
+    assert UrlKeywordMatcher(KEYWORDS).findall("https://x.com/big-tits/hot_milf") == ["big tits", "tits", "hot milf", "milf"]
+    assert not TextKeywordMatcher([])
+
+
+def _bench(label, func, samples, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for sample in samples:
+            func(sample)
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / (rounds * len(samples)) * 1e6
+    print(f"{label:<34} {per_call:9.1f} µs/call")
+    return per_call
+
+
+def main():
+    keyword_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(1)
+    keywords = list(KEYWORDS)
+    while len(keywords) < keyword_count:
+        keywords.append("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10))))
+    samples = [(t.lower() + " " + t.lower(), u.lower()) for t, u in zip(TITLES * 3, URLS * 4)]
+    rounds = 20
+    print(f"{len(keywords)} keywords, {len(samples)} title/url pairs")
+
+    def legacy(sample):
+        title, url = sample
+        return legacy_text_search(WHITE_KEYWORDS, title + " " + url) or legacy_text_search(keywords, title) or legacy_url_search(keywords, url)
+
+    start = time.perf_counter()
+    white, text, url_matcher = TextKeywordMatcher(WHITE_KEYWORDS), TextKeywordMatcher(keywords), UrlKeywordMatcher(keywords)
+    print(f"{'matcher build (once per reload)':<34} {(time.perf_counter() - start) * 1e3:9.1f} ms")
+
+    def current(sample):
+        title, url = sample
+        return white.search(title + " " + url) or text.search(title) or url_matcher.search(url)
+
+    before = _bench("per-call regex (previous)", legacy, samples, rounds)
+    after = _bench("precompiled matchers", current, samples, rounds)
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""User language cache of CONFIG.LANGUAGES.language_router, as seen through CONFIG.messages."""
+import pytest
+
+from CONFIG import messages
+from CONFIG.LANGUAGES import language_router
+
+
+@pytest.fixture
+def users_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # lang.txt lives under ./users/<id>/
+    language_router.language_router.clear_cache()
+    yield tmp_path
+    language_router.language_router.clear_cache()
+
+
+def test_language_change_is_seen_by_messages(users_dir):
+    assert messages.get_language_code(1) == "en"
+    assert language_router.set_user_language(1, "ru")
+    assert messages.get_language_code(1) == "ru"
+
+
+def test_cached_user_languages_are_bounded(users_dir, monkeypatch):
+    monkeypatch.setattr(language_router, "_MAX_CACHED_USER_LANGUAGES", 2)
+    language_router.set_user_language(1, "ru")
+    for user_id in (2, 3):
+        language_router.get_language_code(user_id)
+    assert list(language_router.language_router._user_languages) == ["2", "3"]
+    # Evicted users are read back from lang.txt
+    assert language_router.get_language_code(1) == "ru"
@@ -0,0 +1,96 @@
+"""Limiter state (HELPERS.limiter_state): sliding-window counters, the state flusher and the limiters using them."""
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.logger needs it
+
+from CONFIG.limits import LimitsConfig
+from HELPERS import command_limiter, rate_limiter
+from HELPERS.limiter_state import SlidingWindowCounter, StateFlusher
+
+
+def test_event_counts_until_its_bucket_leaves_the_window():
+    counter = SlidingWindowCounter(60, buckets=60)
+    counter.add(100.5)
+
+    assert counter.count(100.5) == 1
+    assert counter.count(159.99) == 1
+    assert counter.count(160.0) == 0
+
+
+def test_reused_ring_position_drops_the_old_bucket():
+    counter = SlidingWindowCounter(60, buckets=60)
+    counter.add(10.0, 3)
+    counter.add(70.0)  # same ring position, one window later
+
+    assert counter.count(70.0) == 1
+    assert counter.to_state(70.0) == {"w": 1.0, "b": [[70, 1]]}
+
+
+def test_state_round_trip_and_legacy_timestamp_lists():
+    counter = SlidingWindowCounter(3600)
+    for ts in (1000.0, 1100.0, 1100.0, 4000.0):
+        counter.add(ts)
+
+    restored = SlidingWindowCounter.from_state(3600, counter.to_state(4000.0))
+    legacy = SlidingWindowCounter.from_state(3600, [1000.0, 1100.0, "1100", 4000])
+
+    for now in (4000.0, 4599.0, 4700.0):
+        assert restored.count(now) == legacy.count(now) == counter.count(now)
+    assert legacy.count(4000.0) == 4
+    assert SlidingWindowCounter.from_state(3600, ["not a timestamp"]).count(4000.0) == 0
+
+
+def test_failed_save_is_retried_on_the_next_flush():
+    flusher = StateFlusher(60)
+    attempts = []
+
+    def save():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("disk full")
+
+    flusher.register("limits", save)
+    flusher._dirty.add("limits")  # mark_dirty() would also start the background thread
+
+    flusher.flush()
+    flusher.flush()
+    flusher.flush()
+
+    assert len(attempts) == 2
+
+
+@pytest.fixture
+def limiters(monkeypatch):
+    for module in (rate_limiter, command_limiter):
+        monkeypatch.setattr(module, "_mark_dirty", lambda: None)
+    monkeypatch.setattr(rate_limiter, "_rate_limits", {})
+    monkeypatch.setattr(rate_limiter, "_cooldowns", {})
+    monkeypatch.setattr(command_limiter, "_command_limits", {})
+    monkeypatch.setattr(command_limiter, "_command_cooldowns", {})
+
+
+def test_url_limit_enters_cooldown_at_the_configured_limit(limiters):
+    for _ in range(LimitsConfig.RATE_LIMIT_PER_MINUTE):
+        assert rate_limiter.check_rate_limit(1)[0]
+
+    allowed, message = rate_limiter.check_rate_limit(1)
+
+    assert not allowed and message
+    assert rate_limiter._cooldowns[1]["period"] == "minute"
+    assert not rate_limiter.check_rate_limit(1)[0]
+    assert rate_limiter.check_rate_limit(2)[0]
+    assert rate_limiter.check_rate_limit(1, is_admin=True)[0]
+
+
+def test_command_limit_enters_cooldown_at_the_configured_limit(limiters):
+    for _ in range(LimitsConfig.COMMAND_LIMIT_PER_MINUTE):
+        assert command_limiter.check_command_limit(1)[0]
+
+    allowed, message = command_limiter.check_command_limit(1)
+
+    assert not allowed and message
+    cooldown = command_limiter._command_cooldowns[1]
+    assert cooldown["violations"] == 1
+    assert cooldown["duration"] == LimitsConfig.COMMAND_COOLDOWN_INITIAL * LimitsConfig.COMMAND_COOLDOWN_MULTIPLIER
+    assert not command_limiter.check_command_limit(1)[0]
+    assert command_limiter.check_command_limit(2)[0]
@@ -0,0 +1,159 @@
+"""Local database stores (DATABASE.firebase_init): journal replay and compaction, the SQLite path tree."""
+import json
+
+import pytest
+
+pytest.importorskip("firebase_admin")
+
+
+@pytest.fixture(scope="module")
+def firebase_init(import_bot_module):
+    return import_bot_module("DATABASE.firebase_init")
+
+
+@pytest.fixture
+def stores():
+    opened = []
+    yield opened
+    for store in opened:
+        store.close()
+
+
+@pytest.fixture
+def open_journal(firebase_init, tmp_path, stores):
+    def open_store(dump=None, journal="", rotated=""):
+        if dump is not None:
+            (tmp_path / "dump.json").write_text(json.dumps(dump), encoding="utf-8")
+        for name, text in (("dump.json.journal", journal), ("dump.json.journal.1", rotated)):
+            if text:
+                (tmp_path / name).write_text(text, encoding="utf-8")
+        store = firebase_init._LocalJournalStore(str(tmp_path / "dump.json"), compact_interval=3600)
+        stores.append(store)
+        return store
+
+    return open_store
+
+
+@pytest.fixture
+def open_sqlite(firebase_init, tmp_path, stores):
+    def open_store(dump=None):
+        cache_file = tmp_path / "dump.json"
+        if dump is not None:
+            cache_file.write_text(dump if isinstance(dump, str) else json.dumps(dump), encoding="utf-8")
+        store = firebase_init._LocalSQLiteStore(str(tmp_path / "dump.sqlite3"), str(cache_file), compact_interval=3600)
+        stores.append(store)
+        return store
+
+    return open_store
+
+
+def entry(op, path, data=None):
+    return json.dumps({"op": op, "path": path, "data": data}) + "\n"
+
+
+def read_dump(tmp_path):
+    return json.loads((tmp_path / "dump.json").read_text(encoding="utf-8"))
+
+
+def test_journal_is_replayed_and_folded_into_the_snapshot(open_journal, tmp_path):
+    store = open_journal({"a": {"x": 1}, "c": 0}, journal=(
+        entry("set", "/a/y", 2)
+        + entry("update", "/a", {"x": 3})
+        + entry("remove", "/a/y")
+        + entry("set", "/b", [1])
+    ))
+
+    expected = {"a": {"x": 3}, "b": [1], "c": 0}
+    assert store.read("/") == expected
+    assert read_dump(tmp_path) == expected
+    assert (tmp_path / "dump.json.journal").read_text(encoding="utf-8") == ""
+
+
+def test_torn_last_journal_line_is_skipped(open_journal):
+    torn = entry("set", "/b", 2)[:-5]
+    store = open_journal({}, journal=entry("set", "/a", 1) + torn)
+    assert store.read("/") == {"a": 1}
+
+    store.mutate("set", "/c", 3)
+    # Replayed again after a crash: the write after the torn line was not glued onto it
+    assert open_journal().read("/") == {"a": 1, "c": 3}
+
+
+def test_a_journal_holding_only_a_torn_line_keeps_later_writes(open_journal):
+    store = open_journal({}, journal=entry("set", "/b", 2)[:-5])
+
+    store.mutate("set", "/c", 3)
+
+    assert open_journal().read("/") == {"c": 3}
+
+
+def test_interrupted_compaction_keeps_the_rotated_journal(open_journal, tmp_path):
+    # The crash came after the journal was rotated out, before the snapshot replaced dump.json
+    store = open_journal(
+        {"a": 0},
+        rotated=entry("set", "/a", 1) + entry("set", "/b", 1),
+        journal=entry("set", "/a", 2),
+    )
+
+    assert store.read("/") == {"a": 2, "b": 1}
+    assert read_dump(tmp_path) == {"a": 2, "b": 1}
+    assert not (tmp_path / "dump.json.journal.1").exists()
+
+    store.mutate("set", "/c", 3)
+    store.close()
+    assert read_dump(tmp_path) == {"a": 2, "b": 1, "c": 3}
+
+
+def test_sqlite_round_trip(open_sqlite):
+    tree = {"bot": {"b": {"users": {"1": {"lang": "en", "ids": [1, 2]}, "2": {}}, "flag": True}}}
+    store = open_sqlite()
+
+    store.mutate("set", "/", tree)
+
+    assert store.read("/") == tree
+    assert store.read("/bot/b/users/1") == {"lang": "en", "ids": [1, 2]}
+    assert store.read("/bot/b/users/1/lang") == "en"
+    assert store.read("/bot/missing") is None
+
+
+def test_sqlite_subtree_operations_stay_inside_the_subtree(open_sqlite):
+    store = open_sqlite()
+    # "a/b0" and "a/b-c" sort around the "a/b/" .. "a/b0" range of a/b
+    store.mutate("set", "/", {"a": {"b": {"x": 1, "y": {"z": 2}}, "b0": 3, "b-c": 4}})
+
+    store.mutate("update", "/a/b", {"x": 10, "w": {"v": 5}})
+    assert store.read("/a") == {"b": {"x": 10, "y": {"z": 2}, "w": {"v": 5}}, "b0": 3, "b-c": 4}
+
+    store.mutate("set", "/a/b", {"only": 1})
+    assert store.read("/a") == {"b": {"only": 1}, "b0": 3, "b-c": 4}
+
+    store.mutate("set", "/a/b0/deeper", 6)  # a scalar becomes a dict
+    store.mutate("remove", "/a/b")
+    assert store.read("/a") == {"b0": {"deeper": 6}, "b-c": 4}
+
+
+def test_sqlite_is_seeded_from_the_json_dump(open_sqlite, tmp_path):
+    store = open_sqlite({"bot": {"b": {"users": {"1": {}}}}})
+    assert store.read("/bot/b/users") == {"1": {}}
+
+    store.mutate("set", "/bot/b/users/2", {"lang": "ru"})
+    store.close()
+    (tmp_path / "dump.json").write_text(json.dumps({"stale": True}), encoding="utf-8")
+
+    # Seeded once: reopening does not import the dump again
+    assert open_sqlite().read("/") == {"bot": {"b": {"users": {"1": {}, "2": {"lang": "ru"}}}}}
+
+
+def test_sqlite_retries_seeding_and_never_exports_unseeded(open_sqlite, tmp_path):
+    store = open_sqlite('{"bot": {"b": {"users": {"1": {}')  # torn dump
+    store.mutate("set", "/bot/b/users/2", {"lang": "ru"})
+
+    assert not store.compact()
+    assert (tmp_path / "dump.json").read_text(encoding="utf-8").startswith('{"bot"')
+
+    (tmp_path / "dump.json").write_text(json.dumps({"bot": {"b": {"users": {"1": {}, "2": {}}}}}), encoding="utf-8")
+    assert store.compact()
+    # What was written while unseeded wins over the dump
+    expected = {"bot": {"b": {"users": {"1": {}, "2": {"lang": "ru"}}}}}
+    assert store.read("/") == expected
+    assert json.loads((tmp_path / "dump.json").read_text(encoding="utf-8")) == expected
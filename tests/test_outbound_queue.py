@@ -0,0 +1,80 @@
+"""Per-chat outbound queue (HELPERS.outbound_queue) and the timeout path of safe_messeger."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pyrogram")
+
+from HELPERS import safe_messeger
+from HELPERS.outbound_queue import OutboundQueue
+
+
+class FakeApp(object):
+    """Client whose calls are recorded; a call can be held until released."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.calls = []
+        self.gates = {}
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    async def send_message(self, chat_id, text):
+        gate = self.gates.get(text)
+        if gate is not None:
+            await self.loop.run_in_executor(None, gate.wait)
+        self.calls.append((chat_id, text))
+        return text
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+@pytest.fixture
+def app():
+    app = FakeApp()
+    yield app
+    for gate in app.gates.values():
+        gate.set()
+    app.stop()
+
+
+def test_calls_for_one_chat_run_in_order_while_other_chats_go_on(app):
+    queue = OutboundQueue(app, calls_per_second=1000)
+    app.gates["slow"] = threading.Event()
+    first = [queue.submit(1, "send_message", 1, text) for text in ("slow", "a", "b")]
+    other = queue.submit(2, "send_message", 2, "other")
+
+    assert other.result(timeout=5) == "other"
+    assert not first[1].done()
+    app.gates["slow"].set()
+    assert [f.result(timeout=5) for f in first] == ["slow", "a", "b"]
+    assert [text for chat_id, text in app.calls if chat_id == 1] == ["slow", "a", "b"]
+
+
+def test_cancelled_calls_are_skipped(app):
+    queue = OutboundQueue(app, calls_per_second=1000)
+    app.gates["slow"] = threading.Event()
+    queue.submit(1, "send_message", 1, "slow")
+    dropped = queue.submit(1, "send_message", 1, "dropped")
+    kept = queue.submit(1, "send_message", 1, "kept")
+
+    assert dropped.cancel()
+    app.gates["slow"].set()
+    assert kept.result(timeout=5) == "kept"
+    assert (1, "dropped") not in app.calls
+
+
+def test_timed_out_call_is_cancelled(app, monkeypatch):
+    queue = OutboundQueue(app, calls_per_second=1000)
+    monkeypatch.setattr(safe_messeger, "get_outbound_queue", lambda: queue)
+    monkeypatch.setattr(safe_messeger.LimitsConfig, "OUTBOUND_RESULT_TIMEOUT", 0.2, raising=False)
+    app.gates["slow"] = threading.Event()
+    queue.submit(1, "send_message", 1, "slow")
+
+    assert safe_messeger._call_outbound(1, "send_message", (1, "late"), {}, lambda e: "error") is None
+    app.gates["slow"].set()
+    assert queue.submit(1, "send_message", 1, "next").result(timeout=5) == "next"
+    time.sleep(0.1)
+    assert (1, "late") not in app.calls
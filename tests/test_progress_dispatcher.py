@@ -0,0 +1,115 @@
+"""Progress edits (HELPERS.progress_dispatcher): coalescing, per-message and per-group spacing, tickers."""
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.logger needs it
+
+from HELPERS import safe_messeger
+from HELPERS.progress_dispatcher import ProgressDispatcher
+
+
+class Edits(object):
+    def __init__(self, result="ok"):
+        self.result = result
+        self.sent = []
+
+    def __call__(self, chat_id, message_id, text, **kwargs):
+        self.sent.append((chat_id, message_id, text, time.monotonic()))
+        future = Future()
+        future.set_result(self.result)
+        return future
+
+    def texts(self, chat_id=1, message_id=1):
+        return [text for c, m, text, _ in self.sent if (c, m) == (chat_id, message_id)]
+
+    def wait_for(self, count, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while len(self.sent) < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+
+@pytest.fixture
+def edits(monkeypatch):
+    edits = Edits()
+    monkeypatch.setattr(safe_messeger, "safe_edit_message_text", edits)
+    return edits
+
+
+def test_only_the_last_frame_of_an_interval_is_sent(edits):
+    dispatcher = ProgressDispatcher(min_interval=0.6)
+    dispatcher.update(1, 1, "10%")
+    edits.wait_for(1)
+
+    for text in ("20%", "30%", "40%"):
+        dispatcher.update(1, 1, text)
+    edits.wait_for(2)
+    time.sleep(0.8)
+
+    assert edits.texts() == ["10%", "40%"]
+    assert edits.sent[1][3] - edits.sent[0][3] >= 0.6
+
+
+def test_final_frame_skips_the_message_interval(edits):
+    dispatcher = ProgressDispatcher(min_interval=30)
+    dispatcher.update(1, 1, "10%")
+    edits.wait_for(1)
+
+    dispatcher.update(1, 1, "done", final=True)
+    edits.wait_for(2)
+
+    assert edits.texts() == ["10%", "done"]
+
+
+def test_messages_in_one_group_are_spaced_private_chats_are_not(edits):
+    dispatcher = ProgressDispatcher(min_interval=0.1, group_interval=0.8)
+    for chat_id, message_id in ((-100, 1), (-100, 2), (5, 1), (5, 2)):
+        dispatcher.update(chat_id, message_id, "1%")
+    edits.wait_for(4)
+
+    sent_at = {(c, m): ts for c, m, _, ts in edits.sent}
+    assert abs(sent_at[(-100, 2)] - sent_at[(-100, 1)]) >= 0.8
+    assert abs(sent_at[(5, 2)] - sent_at[(5, 1)]) < 0.4
+
+
+def test_discard_drops_the_pending_frame(edits):
+    dispatcher = ProgressDispatcher(min_interval=0.5)
+    dispatcher.update(1, 1, "10%")
+    edits.wait_for(1)
+
+    dispatcher.update(1, 1, "20%")  # held back by the interval
+    dispatcher.discard(1, 1)
+    time.sleep(1.2)
+
+    assert edits.texts() == ["10%"]
+
+
+def test_ticker_runs_until_its_frames_end_then_finishes_once(edits):
+    dispatcher = ProgressDispatcher(min_interval=0.1)
+    frames = iter(["⏳", "⌛"])
+    finished = []
+
+    handle = dispatcher.add_ticker(1, 1, lambda: next(frames, None), lambda: 0.1, threading.Event(),
+                                   on_finish=lambda: finished.append(True))
+    handle.join(5)
+
+    assert not handle.is_alive()
+    assert edits.texts() == ["⏳", "⌛"]
+    assert finished == [True]
+
+
+def test_ticker_stops_after_repeated_failed_edits(monkeypatch):
+    edits = Edits(result=None)
+    monkeypatch.setattr(safe_messeger, "safe_edit_message_text", edits)
+    dispatcher = ProgressDispatcher(min_interval=0.1)
+    finished = []
+
+    handle = dispatcher.add_ticker(1, 1, lambda: "⏳", lambda: 0.1, threading.Event(),
+                                   on_finish=lambda: finished.append(True))
+    handle.join(10)
+
+    assert not handle.is_alive()
+    assert len(edits.sent) == 3
+    assert finished == [True]
@@ -0,0 +1,64 @@
+"""Split planning (DOWN_AND_UP.ffmpeg.plan_split_points): keyframe-aligned parts from windowed probes."""
+import pytest
+
+pytest.importorskip("pyrogram")
+pytest.importorskip("moviepy")
+
+MB = 1024 * 1024
+
+
+def keyframe_index(rates, interval=2.0):
+    """Keyframes every `interval` seconds of a video with the given (seconds, bytes per second) stretches."""
+    keyframes, t, pos = [], 0.0, 0
+    for seconds, rate in rates:
+        end = t + seconds
+        while t < end:
+            keyframes.append((t, int(pos)))
+            t += interval
+            pos += rate * interval
+    return keyframes, int(pos), t
+
+
+class Probe(object):
+    def __init__(self, keyframes):
+        self.keyframes = keyframes
+        self.seconds_read = 0.0
+
+    def __call__(self, start, end):
+        self.seconds_read += end - start
+        # Like ffprobe -read_intervals: reading starts at the keyframe before `start`
+        before = [kf for kf in self.keyframes if kf[0] <= start][-1:]
+        return before + [kf for kf in self.keyframes if start < kf[0] <= end]
+
+
+@pytest.fixture(scope="module")
+def plan_split_points(import_bot_module):
+    return import_bot_module("DOWN_AND_UP.ffmpeg").plan_split_points
+
+
+def greedy_parts(keyframes, video_size, budget):
+    """Furthest keyframe within budget for every part, from the full index."""
+    parts, start = [], (0.0, 0)
+    while video_size - start[1] > budget:
+        end = [kf for kf in keyframes if kf[0] > start[0] and kf[1] - start[1] <= budget][-1]
+        parts.append((start[0], end[0]))
+        start = end
+    return parts + [(start[0], None)]
+
+
+@pytest.mark.parametrize("rates", [
+    [(1000, 1 * MB)],
+    [(300, 2 * MB), (700, MB // 2)],  # cut points before, then past the average-bitrate estimate
+])
+def test_parts_match_the_full_index_while_reading_a_fraction(plan_split_points, rates):
+    keyframes, video_size, duration = keyframe_index(rates)
+    probe = Probe(keyframes)
+
+    parts = plan_split_points(probe, video_size, 300 * MB, duration)
+
+    assert parts == greedy_parts(keyframes, video_size, 300 * MB * 0.97)
+    assert probe.seconds_read < duration / 2
+
+
+def test_no_keyframes_means_no_plan(plan_split_points):
+    assert plan_split_points(lambda start, end: [], 1000 * MB, 300 * MB, 1000) is None
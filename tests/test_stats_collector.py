@@ -1,10 +1,11 @@
 import json
+from collections import Counter
 from pathlib import Path
 
 import pytest
 
 from CONFIG.config import Config
-from services.stats_collector import StatsCollector
+from services.stats_collector import DownloadRecord, DownloadStore, StatsCollector
 
 
 def _write_dump(tmp_path: Path, bot_name: str) -> Path:
@@ -63,6 +64,7 @@ def _write_dump(tmp_path: Path, bot_name: str) -> Path:
 def collector(tmp_path, monkeypatch):
     bot_name = "test_bot"
     monkeypatch.setattr(Config, "BOT_NAME_FOR_USERS", bot_name, raising=False)
+    monkeypatch.setattr(Config, "ACTIVE_SESSIONS_FILE", str(tmp_path / "active_sessions.json"), raising=False)
     dump_path = _write_dump(tmp_path, bot_name)
     return StatsCollector(
         dump_path=str(dump_path),
@@ -97,3 +99,45 @@ def test_handle_db_event_updates_live_data(collector):
     active_ids = [item["user_id"] for item in active["items"]]
     assert 500 in active_ids
 
+
+
+def test_reload_from_dump_ingests_only_new_logs(collector, tmp_path):
+    dump_path = Path(collector.dump_path)
+    data = json.loads(dump_path.read_text(encoding="utf-8"))
+    data["bot"]["test_bot"]["logs"]["100"]["1700020000"] = {
+        "ID": "100",
+        "timestamp": "1700020000",
+        "name": "Alice",
+        "urls": "https://example.com/video3",
+        "title": "Video 3",
+    }
+    dump_path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+    collector.reload_from_dump()
+
+    top_all = collector.get_top_downloaders("all", limit=5)
+    assert top_all[0]["user_id"] == 100
+    assert top_all[0]["count"] == 3
+    assert collector._latest_dump_ts == 1700020000
+
+
+def test_download_store_rollups_match_scan():
+    base = 1700000000
+    records = [
+        DownloadRecord(
+            user_id=100 + (i % 7),
+            timestamp=base + i * 1234,
+            url=f"https://example{i % 3}.com/v{i}",
+            title=f"Video {i}",
+            domain=f"example{i % 3}.com",
+            is_nsfw=i % 5 == 0,
+            is_playlist=False,
+        )
+        for i in range(2000)
+    ]
+    store = DownloadStore(records)
+    for since in (None, base + 1, base + 777_777, base + 2_000_000):
+        users, domains = store.counts_since(since)
+        window = [rec for rec in records if since is None or rec.timestamp >= since]
+        assert users == Counter(rec.user_id for rec in window)
+        assert domains == Counter(rec.domain for rec in window)
+    assert store.records(base + 777_777) == [rec for rec in records if rec.timestamp >= base + 777_777]
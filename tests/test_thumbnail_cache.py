@@ -0,0 +1,56 @@
+"""On-disk thumbnail cache (HELPERS.thumbnail_cache): content addressing and LRU eviction."""
+import os
+import time
+
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.logger needs it
+
+from HELPERS.thumbnail_cache import ThumbnailCache
+
+
+def image(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_identical_images_are_stored_once(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "cache"), max_bytes=10 ** 6)
+    src = image(tmp_path, "a.jpg", b"x" * 2000)
+    first = cache.put("youtube", "abc", src)
+    second = cache.put("vimeo", "123", src)
+
+    assert first == second == cache.get("youtube", "abc") == cache.get("vimeo", "123")
+    assert open(first, "rb").read() == b"x" * 2000
+    assert cache.get("youtube", "other") is None
+
+
+def test_least_recently_used_thumbnails_are_evicted(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "cache"), max_bytes=5000)
+    for i, video_id in enumerate(("old", "used", "new")):
+        cache.put("youtube", video_id, image(tmp_path, f"{video_id}.jpg", bytes([i]) * 2000))
+        if video_id == "used":
+            past = time.time() - 100
+            os.utime(cache.get("youtube", "old"), (past, past))
+            os.utime(cache.get("youtube", "used"), (past + 50, past + 50))
+            cache.get("youtube", "used")  # a hit makes it the most recently used
+
+    assert cache.get("youtube", "old") is None
+    assert cache.get("youtube", "used") is not None
+    assert cache.get("youtube", "new") is not None
+
+
+def test_resized_copy_is_made_once(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    src = str(tmp_path / "big.jpg")
+    Image.new("RGB", (1280, 720), "red").save(src, "JPEG")
+    cache = ThumbnailCache(str(tmp_path / "cache"), max_bytes=10 ** 7)
+    cache.put("youtube", "abc", src)
+
+    resized = cache.get("youtube", "abc", max_side=320)
+    with Image.open(resized) as img:
+        assert img.size == (320, 180)
+    mtime = os.stat(resized).st_mtime_ns
+    assert cache.get("youtube", "abc", max_side=320) == resized
+    assert os.stat(resized).st_mtime_ns == mtime
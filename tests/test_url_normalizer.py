@@ -0,0 +1,38 @@
+"""Golden-file check for the cache key normalization in URL_PARSERS.normalizer.
+
+tests/data/url_normalization_golden.json holds the output of the previous
+if-chain implementation for a corpus of URLs (normalized form, and all
+variants used by the video and playlist caches).
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyrogram")  # HELPERS.logger needs it
+
+from CONFIG.config import Config
+from URL_PARSERS import normalizer
+
+GOLDEN = json.loads((Path(__file__).parent / "data" / "url_normalization_golden.json").read_text(encoding="utf-8"))
+
+
+@pytest.fixture(autouse=True)
+def clean_query(monkeypatch):
+    monkeypatch.setattr(Config, "CLEAN_QUERY", list(GOLDEN["clean_query"]), raising=False)
+
+
+@pytest.mark.parametrize("case", GOLDEN["cases"], ids=lambda case: str(case["url"])[:60])
+def test_matches_golden_output(case):
+    assert normalizer.normalize_url_for_cache(case["url"]) == case["normalized"]
+    assert list(normalizer.get_cache_url_variants(case["url"])) == case["variants"]
+    if case["playlist_variants"] is not None:
+        assert list(normalizer.get_cache_url_variants(case["url"], strip_range=True)) == case["playlist_variants"]
+
+
+def test_replacing_clean_query_drops_cached_results(monkeypatch):
+    url = "https://example.org/video?id=1"
+    assert normalizer.normalize_url_for_cache(url) == url
+    monkeypatch.setattr(Config, "CLEAN_QUERY", ["example.org"])
+    assert normalizer.normalize_url_for_cache(url) == "https://example.org/video"
+    assert normalizer.get_cache_url_variants(url) == ("https://example.org/video",)